@@ -3,13 +3,32 @@
 🤖 Epicentra Debug TUI - Terminal Boyut Uyumlu
 """
 
+import argparse
 import os
+import select
 import subprocess
 import json
 import shutil
+import sys
+import termios
+import time
+import tty
+from datetime import datetime
+
+from epicentra_tools.collector_client import CollectorClient, CollectorError, default_socket_path
+from epicentra_tools.log_tailer import format_log_line, tail_recent
+from epicentra_tools.pm2_client import Pm2RpcClient, get_pm2_processes
+from epicentra_tools.term_diff import AdaptiveRate, DiffRenderer
+
+# PM2 daemon'una kalıcı bağlantı (menü döngüsü boyunca tekrar kullanılır)
+PM2_CLIENT = Pm2RpcClient()
+
+# Ortak toplayıcı daemon'u çalışıyorsa süreç listesi ondan okunur
+COLLECTOR_CLIENT = CollectorClient(default_socket_path(os.path.dirname(os.path.abspath(__file__))))
 
 def clear_screen():
-    os.system('clear')
+    # `clear` süreci başlatmadan ANSI ile temizle
+    print("\x1b[H\x1b[2J", end="", flush=True)
 
 def get_terminal_size():
     """Terminal boyutunu al"""
@@ -40,27 +59,39 @@ def print_menu():
     print("6. 🔧 PM2 Süreçleri")
     print("7. 📋 Logları Göster")
     print("8. 🔄 Ekranı Yenile")
+    print("9. 📺 İzleme Modu (düşük bant)")
     print("0. 🚪 Çıkış")
     print()
 
-def get_project_status():
-    """Proje durumunu kontrol et"""
+def get_daemon_processes():
+    """Toplayıcı daemon'undan süreç listesi; daemon yoksa None"""
+    if not os.path.exists(COLLECTOR_CLIENT.socket_path):
+        return None
+    try:
+        return COLLECTOR_CLIENT.snapshot().get("pm2")
+    except (OSError, ValueError, CollectorError):
+        return None
+
+def get_file_status():
+    """Proje dosyalarının durumu"""
     project_root = os.path.dirname(os.path.abspath(__file__))
-    
-    status = {
+    return {
         "package_json": os.path.exists(os.path.join(project_root, "package.json")),
         "node_modules": os.path.exists(os.path.join(project_root, "node_modules")),
         "build": os.path.exists(os.path.join(project_root, ".output")),
     }
+
+def get_project_status():
+    """Proje durumunu kontrol et"""
+    status = get_file_status()
     
     # PM2 durumu
+    processes = get_daemon_processes()
+    if processes is not None:
+        status["pm2_count"] = len(processes)
+        return status
     try:
-        result = subprocess.run(["pm2", "jlist"], capture_output=True, text=True, timeout=5)
-        if result.returncode == 0:
-            processes = json.loads(result.stdout)
-            status["pm2_count"] = len(processes)
-        else:
-            status["pm2_count"] = 0
+        status["pm2_count"] = len(get_pm2_processes(PM2_CLIENT, timeout=5))
     except:
         status["pm2_count"] = 0
     
@@ -87,6 +118,19 @@ def show_processes():
     print("🔧 PM2 SÜREÇLERİ:")
     print("-" * 40)
     
+    processes = get_daemon_processes()
+    if processes is not None:
+        print(f"{'ID':<4} {'İsim':<24} {'PID':<8} {'Durum':<10} {'CPU':>6} {'Bellek':>8} {'Restart':>8}")
+        for process in processes:
+            env = process.get("pm2_env", {})
+            monit = process.get("monit", {})
+            print(f"{str(process.get('pm_id', '-')):<4} {str(process.get('name', '-'))[:24]:<24} "
+                  f"{str(process.get('pid', '-')):<8} {env.get('status', '?'):<10} "
+                  f"{monit.get('cpu', 0):>5}% {monit.get('memory', 0) // (1024*1024):>6}MB "
+                  f"{env.get('restart_time', 0):>8}")
+        print()
+        return
+    
     try:
         result = subprocess.run(["pm2", "list"], capture_output=True, text=True, timeout=10)
         if result.returncode == 0:
@@ -102,6 +146,18 @@ def show_logs():
     print("📋 PM2 LOGLAR (Son 20 satır):")
     print("-" * 40)
     
+    # Log dosyalarını doğrudan oku; bulunamazsa pm2 CLI'a düş
+    project_root = os.path.dirname(os.path.abspath(__file__))
+    try:
+        lines = tail_recent(project_root, 20)
+    except OSError:
+        lines = []
+    if lines:
+        for line in lines:
+            print(format_log_line(line))
+        print()
+        return
+    
     try:
         result = subprocess.run(["pm2", "logs", "--lines", "20", "--nostream"], 
                               capture_output=True, text=True, timeout=10)
@@ -141,8 +197,171 @@ def execute_command(command):
     
     print()
 
+def read_cpu_times():
+    """/proc/stat'tan (toplam, boşta) CPU süreleri"""
+    with open("/proc/stat") as f:
+        values = [int(v) for v in f.readline().split()[1:9]]
+    idle = values[3] + (values[4] if len(values) > 4 else 0)
+    return sum(values), idle
+
+def get_system_info(previous_cpu=None):
+    """Sistem bilgisi (psutil olmadan /proc ve statvfs ile); (bilgi, cpu ölçümü) döndürür"""
+    info = {"cpu_percent": 0.0, "memory_percent": 0.0, "memory_used": 0, "memory_total": 0,
+            "disk_percent": 0.0, "disk_used": 0, "disk_total": 0}
+    cpu = None
+    try:
+        cpu = read_cpu_times()
+        if previous_cpu is not None and cpu[0] > previous_cpu[0]:
+            busy = (cpu[0] - previous_cpu[0]) - (cpu[1] - previous_cpu[1])
+            info["cpu_percent"] = 100.0 * busy / (cpu[0] - previous_cpu[0])
+        meminfo = {}
+        with open("/proc/meminfo") as f:
+            for line in f:
+                key, value = line.split(":", 1)
+                meminfo[key] = int(value.split()[0]) * 1024
+        total = meminfo.get("MemTotal", 0)
+        used = total - meminfo.get("MemAvailable", meminfo.get("MemFree", 0))
+        if total:
+            info.update(memory_percent=100.0 * used / total,
+                        memory_used=used // (1024**3), memory_total=total // (1024**3))
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        disk = os.statvfs("/")
+        total = disk.f_blocks * disk.f_frsize
+        used = total - disk.f_bfree * disk.f_frsize
+        if total:
+            info.update(disk_percent=100.0 * used / total,
+                        disk_used=used // (1024**3), disk_total=total // (1024**3))
+    except OSError:
+        pass
+    return info, cpu
+
+def collect_watch_data(previous_cpu=None):
+    """İzleme modu verisi: toplayıcı daemon'u, yoksa pm2 soketi ve /proc"""
+    files = get_file_status()
+    if os.path.exists(COLLECTOR_CLIENT.socket_path):
+        try:
+            snapshot = COLLECTOR_CLIENT.snapshot()
+        except (OSError, ValueError, CollectorError):
+            snapshot = None
+        if snapshot:
+            return {"files": files, "processes": snapshot.get("pm2") or [],
+                    "system": snapshot.get("system") or get_system_info()[0],
+                    "source": "daemon"}, previous_cpu
+    try:
+        processes = get_pm2_processes(PM2_CLIENT, timeout=5)
+    except Exception:
+        processes = []
+    system, cpu = get_system_info(previous_cpu)
+    return {"files": files, "processes": processes, "system": system, "source": "yerel"}, cpu
+
+def bar(percent, width=10):
+    filled = max(0, min(width, int(percent / 100 * width)))
+    return "█" * filled + "░" * (width - filled)
+
+def build_watch_rows(data, rate, full_bytes):
+    """İzleme ekranının satırları: [(metin, SGR), ...] listeleri"""
+    def icon(ok):
+        return ("✅", "") if ok else ("❌", "")
+    
+    files, system, processes = data["files"], data["system"], data["processes"]
+    rows = [
+        [("EPICENTRA DEBUG İZLEME", "1;36")],
+        [(datetime.now().strftime("%d.%m.%Y %H:%M:%S"), ""), (f" | kaynak: {data['source']}", "2"),
+         (" | q: çıkış  r: yeniden çiz", "2")],
+        [],
+        [("PROJE  ", "1"), ("package.json ", ""), icon(files["package_json"]),
+         ("  node_modules ", ""), icon(files["node_modules"]), ("  build ", ""), icon(files["build"])],
+        [],
+        [("SİSTEM ", "1"), ("CPU ", ""), (f"{system['cpu_percent']:5.1f}% ", "33"),
+         (bar(system["cpu_percent"]), "36")],
+        [("       ", ""), ("RAM ", ""), (f"{system['memory_percent']:5.1f}% ", "33"),
+         (bar(system["memory_percent"]), "35"), (f" {system['memory_used']}/{system['memory_total']}GB", "2")],
+        [("       ", ""), ("Disk", ""), (f"{system['disk_percent']:5.1f}% ", "33"),
+         (bar(system["disk_percent"]), "34"), (f" {system['disk_used']}/{system['disk_total']}GB", "2")],
+        [],
+        [(f"PM2 SÜREÇLERİ ({len(processes)})", "1")],
+        [(f"{'ID':<4}{'İsim':<22}{'PID':<8}{'Durum':<12}{'CPU':>5}{'Bellek':>9}{'Restart':>9}", "2")],
+    ]
+    colors = {"online": "32", "stopped": "31", "errored": "31", "error": "31"}
+    for process in processes:
+        env = process.get("pm2_env", {})
+        monit = process.get("monit", {})
+        status = env.get("status", "?")
+        rows.append([
+            (f"{str(process.get('pm_id', '-')):<4}{str(process.get('name', '-'))[:21]:<22}"
+             f"{str(process.get('pid', '-')):<8}", ""),
+            (f"{status:<12}", colors.get(status, "33")),
+            (f"{monit.get('cpu', 0):>4}%{monit.get('memory', 0) // (1024*1024):>7}MB"
+             f"{env.get('restart_time', 0):>9}", ""),
+        ])
+    rows.append([])
+    throughput = f"{rate.throughput:.0f} B/s" if rate.throughput is not None else "-"
+    rows.append([(
+        f"kare {rate.frames} | son {rate.last_bytes} B (ort {rate.avg_bytes:.0f}, tam çizim {full_bytes}) | "
+        f"aralık {rate.interval:.1f}s | bütçe {rate.effective_budget:.0f} B/s | ölçülen {throughput}", "2"
+    )])
+    return rows
+
+def watch(budget=2048.0):
+    """Düşük bant izleme modu: yalnızca değişen hücreler yazılır, aralık çıkışa göre ayarlanır"""
+    if not sys.stdin.isatty():
+        print("❌ İzleme modu etkileşimli bir terminal gerektirir")
+        return
+    
+    fd = sys.stdin.fileno()
+    old_attrs = termios.tcgetattr(fd)
+    out = sys.stdout.buffer
+    renderer = DiffRenderer(*get_terminal_size())
+    rate = AdaptiveRate(budget)
+    cpu = None
+    full_bytes = 0
+    try:
+        tty.setcbreak(fd)
+        # Alternatif ekran, imleç gizli
+        out.write(b"\x1b[?1049h\x1b[?25l")
+        while True:
+            size = get_terminal_size()
+            if size != (renderer.width, renderer.height):
+                renderer.resize(*size)
+            data, cpu = collect_watch_data(cpu)
+            frame = renderer.render(build_watch_rows(data, rate, full_bytes)).encode("utf-8")
+            full_bytes = DiffRenderer.full_size(renderer.previous)
+            started = time.monotonic()
+            out.write(frame)
+            out.flush()
+            rate.record(len(frame), time.monotonic() - started)
+            
+            ready, _, _ = select.select([fd], [], [], rate.interval)
+            if ready:
+                keys = os.read(fd, 32).decode("utf-8", errors="ignore").lower()
+                if "q" in keys:
+                    break
+                if "r" in keys:
+                    renderer.invalidate()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        out.write(b"\x1b[0m\x1b[?25h\x1b[?1049l")
+        out.flush()
+        termios.tcsetattr(fd, termios.TCSADRAIN, old_attrs)
+    
+    if rate.frames:
+        print(f"📶 {rate.frames} kare, toplam {rate.total_bytes} bayt, "
+              f"ortalama {rate.total_bytes / rate.frames:.0f} bayt/kare, {rate.rate():.0f} bayt/s")
+
 def main():
     """Ana fonksiyon"""
+    parser = argparse.ArgumentParser(description="Epicentra Debug TUI")
+    parser.add_argument("--watch", action="store_true", help="düşük bant izleme modunda başla")
+    parser.add_argument("--budget", type=float, default=2048.0,
+                        help="izleme modu çıkış bütçesi (bayt/s, varsayılan 2048)")
+    args = parser.parse_args()
+    if args.watch:
+        watch(args.budget)
+        return
+    
     # Terminal boyutunu kontrol et
     cols, rows = get_terminal_size()
     print(f"🖥️  Terminal boyutu: {cols}x{rows}")
@@ -158,13 +377,13 @@ def main():
         
         # Terminal boyutunu tekrar kontrol et
         cols, rows = get_terminal_size()
-        print(f"Terminal: {cols}x{rows} | Zaman: {subprocess.check_output(['date'], text=True).strip()}")
+        print(f"Terminal: {cols}x{rows} | Zaman: {datetime.now().strftime('%d.%m.%Y %H:%M:%S')}")
         print()
         
         print_menu()
         
         try:
-            choice = input("Seçiminiz (0-8): ").strip()
+            choice = input("Seçiminiz (0-9): ").strip()
             
             if choice == "0":
                 print("👋 Görüşmek üzere!")
@@ -186,6 +405,10 @@ def main():
                 show_logs()
             elif choice == "8":
                 continue  # Ekranı yenile
+            elif choice == "9":
+                watch(args.budget)
+                input("Devam etmek için Enter tuşuna basın...")
+                continue
             else:
                 print("❌ Geçersiz seçim!")
                 input("Enter tuşuna basın...")
@@ -6,13 +6,22 @@ Versiyon: 1.0.0 (Stable)
 """
 
 import os
+import select
 import subprocess
+import sys
 import json
+import termios
 import time
+import tty
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 import psutil
 
+from epicentra_tools.collector import Collector, CollectorThread
+from epicentra_tools.collector_client import CollectorClient, CollectorError, default_socket_path
+from epicentra_tools.log_tailer import format_log_line, tail_recent
+from epicentra_tools.pm2_client import Pm2RpcClient, get_pm2_processes
+
 try:
     from rich.console import Console
     from rich.panel import Panel
@@ -30,19 +39,33 @@ except ImportError:
     exit(1)
 
 
+STATUS_ICONS = {
+    "online": "🟢",
+    "stopped": "🔴",
+    "error": "🟡"
+}
+
+
 class EpicentraSimpleTUI:
     """Basit TUI Bot"""
     
+    # Canlı panel: saniyede en fazla bu kadar çizim, yerel toplayıcı aralığı (saniye)
+    FRAME_RATE = 4
+    LIVE_INTERVAL = 2.0
+    
     def __init__(self):
         self.console = Console()
         self.project_root = os.path.dirname(os.path.abspath(__file__))
         self.bot_script = os.path.join(self.project_root, "epicentra-bot.sh")
+        self.pm2_client = Pm2RpcClient()
+        # Ortak toplayıcı daemon'u çalışıyorsa pm2/psutil ölçümü ondan okunur
+        self.collector_client = CollectorClient(default_socket_path(self.project_root))
         self.running = True
         self.current_view = "main"
         
     def clear_screen(self):
-        """Ekranı temizle"""
-        os.system('clear' if os.name == 'posix' else 'cls')
+        """Ekranı temizle (ANSI ile, `clear` süreci başlatmadan)"""
+        self.console.clear()
     
     def show_header(self):
         """Başlık göster"""
@@ -69,24 +92,30 @@ class EpicentraSimpleTUI:
         status["pm2_running"] = len(status["pm2_processes"]) > 0
         return status
     
+    def daemon_snapshot(self) -> Optional[Dict]:
+        """Toplayıcı daemon'unun son snapshot'ı (daemon yoksa None)"""
+        if not os.path.exists(self.collector_client.socket_path):
+            return None
+        try:
+            return self.collector_client.snapshot() or None
+        except (OSError, ValueError, CollectorError):
+            return None
+    
     def get_pm2_status(self) -> List[Dict]:
-        """PM2 durumunu al"""
+        """PM2 durumunu al (toplayıcı daemon'u, pm2 soketi, yoksa pm2 jlist)"""
+        snapshot = self.daemon_snapshot()
+        if snapshot is not None and "pm2" in snapshot:
+            return snapshot["pm2"]
         try:
-            result = subprocess.run(
-                ["pm2", "jlist"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                return json.loads(result.stdout)
-            return []
+            return get_pm2_processes(self.pm2_client, timeout=10)
         except Exception:
             return []
     
     def get_system_info(self) -> Dict:
         """Sistem bilgilerini al"""
+        snapshot = self.daemon_snapshot()
+        if snapshot is not None and snapshot.get("system"):
+            return snapshot["system"]
         try:
             cpu_percent = psutil.cpu_percent(interval=1)
             memory = psutil.virtual_memory()
@@ -112,11 +141,8 @@ class EpicentraSimpleTUI:
                 "disk_total": 0,
             }
     
-    def show_status_panel(self):
-        """Durum paneli göster"""
-        status = self.get_project_status()
-        
-        # Durum tablosu
+    def build_status_table(self, status: Dict) -> Table:
+        """Proje durumu tablosu"""
         table = Table(title="📊 Proje Durumu", show_header=True, header_style="bold magenta")
         table.add_column("Bileşen", style="cyan", no_wrap=True)
         table.add_column("Durum", style="green")
@@ -149,15 +175,15 @@ class EpicentraSimpleTUI:
             status_icon(status.get("pm2_running", False)),
             f"{pm2_count} süreç" if pm2_count > 0 else "Durmuş"
         )
-        
-        self.console.print(table)
+        return table
+    
+    def show_status_panel(self):
+        """Durum paneli göster"""
+        self.console.print(self.build_status_table(self.get_project_status()))
         self.console.print()
     
-    def show_system_panel(self):
-        """Sistem paneli göster"""
-        info = self.get_system_info()
-        
-        # Sistem tablosu
+    def build_system_table(self, info: Dict) -> Table:
+        """Sistem kaynakları tablosu"""
         table = Table(title="💻 Sistem Durumu", show_header=True, header_style="bold blue")
         table.add_column("Kaynak", style="cyan", no_wrap=True)
         table.add_column("Kullanım", style="yellow")
@@ -179,31 +205,17 @@ class EpicentraSimpleTUI:
             f"{info['disk_percent']:.1f}%", 
             f"{disk_bar} ({info['disk_used']}GB/{info['disk_total']}GB)"
         )
-        
-        self.console.print(table)
+        return table
+    
+    def show_system_panel(self):
+        """Sistem paneli göster"""
+        self.console.print(self.build_system_table(self.get_system_info()))
         self.console.print()
     
-    def show_process_panel(self):
-        """Süreç paneli göster"""
-        processes = self.get_pm2_status()
-        
-        if not processes:
-            self.console.print(Panel(
-                "[yellow]Çalışan PM2 süreci bulunamadı[/yellow]",
-                title="🔧 PM2 Süreçleri"
-            ))
-            self.console.print()
-            return
-        
-        # Süreç tablosu
-        table = Table(title="🔧 PM2 Süreçleri", show_header=True, header_style="bold green")
-        table.add_column("İsim", style="cyan")
-        table.add_column("PID", style="yellow")
-        table.add_column("Durum", style="green")
-        table.add_column("CPU", style="blue")
-        table.add_column("Bellek", style="magenta")
-        table.add_column("Restart", style="red")
-        
+    @staticmethod
+    def process_rows(processes: List[Dict]) -> List[Tuple[str, ...]]:
+        """Süreç tablosunun satırları (canlı panelde değişiklik karşılaştırması için düz demet)"""
+        rows = []
         for process in processes:
             name = process.get("name", "N/A")
             pid = str(process.get("pid", "N/A"))
@@ -214,25 +226,40 @@ class EpicentraSimpleTUI:
             cpu = f"{monit.get('cpu', 0)}%" if monit else "N/A"
             memory = f"{monit.get('memory', 0) // (1024*1024)}MB" if monit else "N/A"
             
-            # Durum ikonu
-            status_icon = {
-                "online": "🟢",
-                "stopped": "🔴",
-                "error": "🟡"
-            }.get(status, "⚪")
-            
             restart_count = process.get("pm2_env", {}).get("restart_time", 0)
             
-            table.add_row(
+            rows.append((
                 name,
                 pid,
-                f"{status_icon} {status}",
+                f"{STATUS_ICONS.get(status, '⚪')} {status}",
                 cpu,
                 memory,
                 str(restart_count)
+            ))
+        return rows
+    
+    def build_process_table(self, rows: List[Tuple[str, ...]]):
+        """Süreç tablosu; süreç yoksa bilgi paneli"""
+        if not rows:
+            return Panel(
+                "[yellow]Çalışan PM2 süreci bulunamadı[/yellow]",
+                title="🔧 PM2 Süreçleri"
             )
         
-        self.console.print(table)
+        table = Table(title="🔧 PM2 Süreçleri", show_header=True, header_style="bold green")
+        table.add_column("İsim", style="cyan")
+        table.add_column("PID", style="yellow")
+        table.add_column("Durum", style="green")
+        table.add_column("CPU", style="blue")
+        table.add_column("Bellek", style="magenta")
+        table.add_column("Restart", style="red")
+        for row in rows:
+            table.add_row(*row)
+        return table
+    
+    def show_process_panel(self):
+        """Süreç paneli göster"""
+        self.console.print(self.build_process_table(self.process_rows(self.get_pm2_status())))
         self.console.print()
     
     def show_main_menu(self):
@@ -251,6 +278,7 @@ class EpicentraSimpleTUI:
             "[cyan]10.[/cyan] 🔧 Süreç Görünümü\n"
             "[cyan]11.[/cyan] 📋 Logları Göster\n"
             "[cyan]12.[/cyan] 🔄 Ekranı Yenile\n"
+            "[cyan]13.[/cyan] 📺 Canlı Panel\n"
             "[cyan]0.[/cyan] 🚪 Çıkış",
             title="Menü",
             style="green"
@@ -296,6 +324,21 @@ class EpicentraSimpleTUI:
         """Logları göster"""
         self.console.print("[blue]📋 PM2 Logları (Son 50 satır):[/blue]")
         
+        # Log dosyalarını doğrudan oku; bulunamazsa pm2 CLI'a düş
+        try:
+            lines = tail_recent(self.project_root, 50)
+        except OSError:
+            lines = []
+        if lines:
+            self.console.print(Panel(
+                "\n".join(format_log_line(line) for line in lines),
+                title="Loglar",
+                style="blue"
+            ))
+            self.console.print()
+            input("Devam etmek için Enter tuşuna basın...")
+            return
+        
         try:
             result = subprocess.run(
                 ["pm2", "logs", "--lines", "50", "--nostream"],
@@ -315,6 +358,140 @@ class EpicentraSimpleTUI:
         self.console.print()
         input("Devam etmek için Enter tuşuna basın...")
     
+    def open_live_source(self) -> Tuple[object, str]:
+        """Canlı panelin veri kaynağı: daemon aboneliği, yoksa kendi toplayıcısı
+        
+        İkisi de fileno()/read()/refresh()/close() sunar; pm2 ve psutil
+        görünüm başına değil, toplayıcının aralığıyla bir kez sorgulanır.
+        """
+        if self.collector_client.available():
+            return self.collector_client.subscribe(), "📡 toplayıcı daemon'u"
+        source = CollectorThread(Collector(self.project_root, interval=self.LIVE_INTERVAL))
+        source.start()
+        return source, f"🔁 yerel toplayıcı ({self.LIVE_INTERVAL:g}s)"
+    
+    def build_live_layout(self) -> Layout:
+        """Canlı panel yerleşimi"""
+        layout = Layout()
+        layout.split_column(
+            Layout(name="header", size=3),
+            Layout(name="body"),
+            Layout(name="footer", size=1)
+        )
+        layout["body"].split_row(Layout(name="left"), Layout(name="processes", ratio=2))
+        layout["left"].split_column(Layout(name="status"), Layout(name="system"))
+        layout["header"].update(Panel(
+            Align.center("[bold cyan]🤖 EPICENTRA CANLI PANEL[/bold cyan]"), style="cyan"
+        ))
+        for name in ("status", "system", "processes"):
+            layout[name].update(Align.center("[dim]Veri bekleniyor...[/dim]", vertical="middle"))
+        return layout
+    
+    def update_live_panels(self, layout: Layout, snapshot: Dict, cache: Dict) -> bool:
+        """Snapshot'tan yalnızca verisi değişen panelleri yeniden kur"""
+        processes = snapshot.get("pm2") or []
+        status = dict(snapshot.get("project") or {})
+        status["pm2_processes"] = processes
+        status["pm2_running"] = len(processes) > 0
+        keys = {
+            "status": (tuple(sorted((snapshot.get("project") or {}).items())), len(processes)),
+            "system": tuple(sorted((snapshot.get("system") or {}).items())),
+            "processes": tuple(self.process_rows(processes)),
+        }
+        changed = False
+        for name, key in keys.items():
+            if cache.get(name) == key:
+                continue
+            cache[name] = key
+            changed = True
+            if name == "status":
+                layout[name].update(self.build_status_table(status))
+            elif name == "system" and key:
+                layout[name].update(self.build_system_table(snapshot["system"]))
+            elif name == "processes":
+                layout[name].update(self.build_process_table(list(key)))
+        return changed
+    
+    def run_live(self):
+        """Canlı panel: durum, sistem ve süreç panelleri yerinde güncellenir
+        
+        Ekran sabit kare hızında (FRAME_RATE) ve yalnızca bir şey değiştiğinde
+        çizilir; tuşlar terminal cbreak kipinde select() ile beklenmeden okunur.
+        """
+        if not sys.stdin.isatty():
+            self.console.print("[red]❌ Canlı panel etkileşimli bir terminal gerektirir[/red]")
+            time.sleep(1)
+            return
+        
+        source, source_name = self.open_live_source()
+        layout = self.build_live_layout()
+        cache: Dict = {}
+        paused = False
+        notice = ""
+        updated_at = "-"
+        frame = 1.0 / self.FRAME_RATE
+        fd = sys.stdin.fileno()
+        old_attrs = termios.tcgetattr(fd)
+        
+        def footer() -> Text:
+            state = "⏸️ duraklatıldı" if paused else f"son veri {updated_at}"
+            return Text(
+                f" q: çıkış  r: yenile  p: duraklat | {source_name} | {state} {notice}",
+                style="dim", no_wrap=True, overflow="ellipsis"
+            )
+        
+        try:
+            tty.setcbreak(fd)
+            with Live(layout, console=self.console, screen=True, auto_refresh=False) as live:
+                dirty = True
+                next_frame = time.monotonic()
+                while True:
+                    # Çizilecek bir şey yoksa tuş ya da veri gelene kadar bekle
+                    timeout = max(0.0, next_frame - time.monotonic()) if dirty else None
+                    ready, _, _ = select.select([fd, source], [], [], timeout)
+                    
+                    if fd in ready:
+                        keys = os.read(fd, 32).decode("utf-8", errors="ignore").lower()
+                        if "q" in keys:
+                            break
+                        if "r" in keys:
+                            source.refresh()
+                            notice = "🔄 yenileme istendi"
+                            dirty = True
+                        if "p" in keys:
+                            paused = not paused
+                            if not paused and source.snapshot:
+                                self.update_live_panels(layout, source.snapshot, cache)
+                            dirty = True
+                    
+                    if source in ready:
+                        try:
+                            changed = source.read()
+                        except (OSError, ValueError):
+                            # Daemon kapandı: kendi toplayıcımıza geç
+                            source.close()
+                            source, source_name = self.open_live_source()
+                            notice = "⚠️ daemon bağlantısı koptu"
+                            dirty = True
+                            continue
+                        if changed and not paused:
+                            updated_at = datetime.now().strftime("%H:%M:%S")
+                            self.update_live_panels(layout, source.snapshot, cache)
+                            notice = ""
+                            dirty = True
+                    
+                    # Çizimler kare sınırlarında birleştirilir; değişiklik yoksa çizilmez
+                    now = time.monotonic()
+                    if now < next_frame or not dirty:
+                        continue
+                    next_frame = now + frame
+                    layout["footer"].update(footer())
+                    live.refresh()
+                    dirty = False
+        finally:
+            termios.tcsetattr(fd, termios.TCSADRAIN, old_attrs)
+            source.close()
+    
     def run(self):
         """Ana döngü"""
         while self.running:
@@ -340,7 +517,7 @@ class EpicentraSimpleTUI:
                 continue
             
             try:
-                choice = input("Seçiminiz (0-12): ").strip()
+                choice = input("Seçiminiz (0-13): ").strip()
                 
                 if choice == "0":
                     self.running = False
@@ -371,6 +548,8 @@ class EpicentraSimpleTUI:
                     self.show_logs()
                 elif choice == "12":
                     continue  # Ekranı yenile
+                elif choice == "13":
+                    self.run_live()
                 
                 else:
                     self.console.print("[red]❌ Geçersiz seçim![/red]")
@@ -396,9 +575,12 @@ def main():
         print("❌ Bu script Epicentra proje dizininde çalıştırılmalıdır!")
         return
     
-    # Simple TUI'yi başlat
+    # Simple TUI'yi başlat (--live: doğrudan canlı panel)
     tui = EpicentraSimpleTUI()
-    tui.run()
+    if "--live" in sys.argv[1:]:
+        tui.run_live()
+    else:
+        tui.run()
 
 
 if __name__ == "__main__":
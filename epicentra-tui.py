@@ -9,10 +9,14 @@ import asyncio
 import subprocess
 import os
 import json
+import re
+import sys
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, Deque, List, Dict, Optional, Set, Tuple
 
 from textual.app import App, ComposeResult
 from textual.containers import Container, Horizontal, Vertical, ScrollableContainer
@@ -21,6 +25,9 @@ from textual.widgets import (
     DataTable, Tabs, TabPane, Label, Input, Switch
 )
 from textual.reactive import reactive
+from textual.geometry import Size
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
 from textual.message import Message
 from textual.screen import Screen
 from textual import events
@@ -30,148 +37,330 @@ from rich.panel import Panel
 from rich.progress import Progress
 from rich.table import Table
 from rich.align import Align
+from rich.console import Group
+from rich.cells import cell_len
+from rich.segment import Segment
+from rich.style import Style
 import psutil
 
+from epicentra_tools.alert_latency import POLLER_WINDOW, AlertLatencyMonitor, format_event as format_alert_event
+from epicentra_tools.collector import Collector, default_history_path
+from epicentra_tools.collector_client import CollectorClient, RemoteCollector, default_socket_path
+from epicentra_tools.command_stream import CommandStream
+from epicentra_tools.ecosystem import get_server_url
+from epicentra_tools.health_prober import default_targets, format_event
+from epicentra_tools.job_scheduler import (
+    CANCELLED, DONE, FAILED, QUEUED, RUNNING, TIMED_OUT, Job, JobScheduler
+)
+from epicentra_tools.log_store import LogEntry, LogStore, parse_query
+from epicentra_tools.log_tailer import LogTailer, parse_ecosystem_logs
+from epicentra_tools.metric_history import MetricHistory, process_series
+from epicentra_tools.quake_feed import QuakeFeed
+from epicentra_tools.quake_index import QuakeIndex, SpatialQuery
+
+
+# Komut bazlı zaman aşımları (saniye); None = sınırsız (dev sunucusu ön planda çalışır)
+COMMAND_TIMEOUTS = {
+    "dev": None,
+    "install": 900.0,
+    "update": 900.0,
+    "bench": 1800.0,
+    "catalog": 600.0,
+    "synth": 1800.0,
+    "push": 1800.0,
+}
+
+# epicentra-bot.sh yerine doğrudan çalıştırılan Python modülleri (modül ve argümanları)
+MODULE_COMMANDS = {
+    # Girdiler son başarılı çalışmadan bu yana değişmediyse atlanır
+    "install": ["epicentra_tools.build_cache", "run", "install"],
+    "build": ["epicentra_tools.build_cache", "run", "build"],
+    "bench": ["epicentra_tools.load_bench"],
+    "catalog": ["epicentra_tools.quake_catalog", "update"],
+    "synth": ["epicentra_tools.quake_synth", "replay"],
+    "push": ["epicentra_tools.push_bench"],
+}
+
 
 class CommandRunner:
     """Komut çalıştırma sınıfı"""
     
-    def __init__(self, project_root: str):
+    def __init__(self, project_root: str, timeout: Optional[float] = 300.0):
         self.project_root = project_root
         self.bot_script = os.path.join(project_root, "epicentra-bot.sh")
+        self.timeout = timeout
+        self.active_streams: Set[CommandStream] = set()
     
-    async def run_command(self, command: str) -> Dict:
-        """Async komut çalıştırma"""
+    async def run_command(self, command: str,
+                          on_output: Optional[Callable[[float, str, str], None]] = None,
+                          on_start: Optional[Callable[[CommandStream], None]] = None) -> Dict:
+        """Async komut çalıştırma; çıktı satırları üretildikçe on_output'a iletilir
+
+        on_start süreç başlar başlamaz akışla çağrılır (tek komutu iptal edebilmek için).
+        """
+        if command in MODULE_COMMANDS:
+            argv = [sys.executable, "-m"] + MODULE_COMMANDS[command]
+        elif not os.path.exists(self.bot_script):
+            return {
+                "success": False,
+                "error": "epicentra-bot.sh bulunamadı!",
+                "returncode": None,
+                "timed_out": False,
+                "cancelled": False,
+                "duration": 0.0
+            }
+        else:
+            argv = ["bash", self.bot_script, command]
+        
+        stream = CommandStream(
+            argv,
+            cwd=self.project_root,
+            timeout=COMMAND_TIMEOUTS.get(command, self.timeout)
+        )
         try:
-            if not os.path.exists(self.bot_script):
-                return {
-                    "success": False,
-                    "error": "epicentra-bot.sh bulunamadı!",
-                    "stdout": "",
-                    "stderr": ""
-                }
-            
-            process = await asyncio.create_subprocess_exec(
-                "bash", self.bot_script, command,
-                cwd=self.project_root,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await process.communicate()
+            await stream.start()
+            self.active_streams.add(stream)
+            if on_start is not None:
+                on_start(stream)
+            async for elapsed, pipe, line in stream.lines():
+                if on_output is not None:
+                    on_output(elapsed, pipe, line)
             
             return {
-                "success": process.returncode == 0,
+                "success": stream.returncode == 0 and not stream.timed_out and not stream.cancelled,
                 "error": None,
-                "stdout": stdout.decode('utf-8', errors='ignore'),
-                "stderr": stderr.decode('utf-8', errors='ignore'),
-                "returncode": process.returncode
+                "returncode": stream.returncode,
+                "timed_out": stream.timed_out,
+                "cancelled": stream.cancelled,
+                "duration": stream.elapsed
             }
             
         except Exception as e:
             return {
                 "success": False,
                 "error": str(e),
-                "stdout": "",
-                "stderr": ""
+                "returncode": stream.returncode,
+                "timed_out": stream.timed_out,
+                "cancelled": stream.cancelled,
+                "duration": stream.elapsed
             }
+        finally:
+            self.active_streams.discard(stream)
+            await stream.close()
     
-    def get_pm2_status(self) -> List[Dict]:
-        """PM2 durumunu al"""
-        try:
-            result = subprocess.run(
-                ["pm2", "jlist"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                return json.loads(result.stdout)
-            return []
-        except Exception:
-            return []
-    
-    def get_project_status(self) -> Dict:
-        """Proje durumunu kontrol et"""
-        status = {
-            "project_exists": os.path.exists(os.path.join(self.project_root, "package.json")),
-            "node_modules_exists": os.path.exists(os.path.join(self.project_root, "node_modules")),
-            "build_exists": os.path.exists(os.path.join(self.project_root, ".output")),
-            "pm2_processes": self.get_pm2_status()
-        }
-        status["pm2_running"] = len(status["pm2_processes"]) > 0
-        return status
+    def cancel_all(self) -> int:
+        """Çalışan tüm komutları iptal et"""
+        streams = list(self.active_streams)
+        for stream in streams:
+            stream.cancel()
+        return len(streams)
 
 
-class SystemMonitor:
-    """Sistem izleme sınıfı"""
-    
-    @staticmethod
-    def get_system_info() -> Dict:
-        """Sistem bilgilerini al"""
-        try:
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
-            
-            return {
-                "cpu_percent": cpu_percent,
-                "memory_percent": memory.percent,
-                "memory_used": memory.used // (1024**3),  # GB
-                "memory_total": memory.total // (1024**3),  # GB
-                "disk_percent": disk.percent,
-                "disk_used": disk.used // (1024**3),  # GB
-                "disk_total": disk.total // (1024**3),  # GB
-            }
-        except Exception:
-            return {
-                "cpu_percent": 0,
-                "memory_percent": 0,
-                "memory_used": 0,
-                "memory_total": 0,
-                "disk_percent": 0,
-                "disk_used": 0,
-                "disk_total": 0,
-            }
+def line_width(line: str) -> int:
+    """Satırın terminal hücre genişliği (ASCII satırlarda hızlı yol)"""
+    return len(line) if line.isascii() else cell_len(line)
+
+
+class LineRing:
+    """Sabit kapasiteli halka; deque'nin aksine ortadaki satıra erişim O(1)"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.items: List[Tuple[str, str]] = []
+        self.head = 0
 
+    def __len__(self) -> int:
+        return len(self.items)
 
-class LogViewer(Static):
-    """Log görüntüleme widget'ı"""
+    def __getitem__(self, index: int) -> Tuple[str, str]:
+        return self.items[(self.head + index) % len(self.items)]
+
+    def extend(self, entries: List[Tuple[str, str]]) -> None:
+        """Satırları ekle; kapasite doluysa en eskilerin üzerine yaz"""
+        entries = entries[-self.capacity:]
+        room = self.capacity - len(self.items)
+        self.items.extend(entries[:room])
+        for entry in entries[room:]:
+            self.items[self.head] = entry
+            self.head = (self.head + 1) % self.capacity
+
+    def clear(self) -> None:
+        self.items.clear()
+        self.head = 0
+
+
+class LogViewer(ScrollView, can_focus=True):
+    """Log görüntüleme widget'ı
+
+    Loglar sabit boyutlu bir halka tamponda tutulur. Yeni satırlar önce bekleme
+    listesine eklenir ve ekran saniyede en fazla `max_fps` kez toplu olarak
+    güncellenir; yalnızca görünen satırlar render edilir. `store` verilirse tüm
+    satırlar ayrıca arka plandaki aranabilir log deposuna yazılır; yazımlar
+    sırayı korumak için uygulamanın tek thread'li `store_executor`'ünde yapılır.
+    """
     
-    def __init__(self, **kwargs):
+    DEFAULT_CSS = """
+    LogViewer {
+        height: 1fr;
+    }
+    """
+    
+    LEVEL_STYLES = {
+        "success": Style(color="green"),
+        "warning": Style(color="yellow"),
+        "error": Style(color="red"),
+    }
+    
+    def __init__(self, max_logs: int = 20000, max_fps: float = 10.0,
+                 store: Optional[LogStore] = None,
+                 store_executor: Optional[ThreadPoolExecutor] = None, **kwargs):
         super().__init__(**kwargs)
-        self.logs = []
-        self.max_logs = 1000
+        self.max_logs = max_logs
+        self.max_fps = max_fps
+        self.store = store
+        self.store_executor = store_executor
+        self.logs = LineRing(max_logs)
+        self.pending: List[Tuple[str, str]] = []
+        self.store_pending: List[Tuple[float, str, str, str]] = []
+        self.max_width = 0
+        self._clock_second = -1
+        self._clock_text = ""
     
-    def add_log(self, message: str, level: str = "info"):
-        """Log ekle"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] [{level.upper()}] {message}"
+    def on_mount(self) -> None:
+        """Toplu yenileme zamanlayıcısını başlat"""
+        self.set_interval(1.0 / self.max_fps, self.flush)
+    
+    def _timestamp(self) -> str:
+        """Saniyede bir kez biçimlendirilen zaman damgası"""
+        now = int(time.time())
+        if now != self._clock_second:
+            self._clock_second = now
+            self._clock_text = datetime.fromtimestamp(now).strftime("%H:%M:%S")
+        return self._clock_text
+    
+    def add_log(self, message: str, level: str = "info", timestamp: Optional[float] = None,
+                source: str = "tui"):
+        """Log ekle (ekran bir sonraki karede güncellenir)"""
+        if timestamp is None:
+            clock = self._timestamp()
+        else:
+            clock = datetime.fromtimestamp(timestamp).strftime("%H:%M:%S")
+        log_entry = f"[{clock}] [{level.upper()}] {message}"
+        self.pending.append((log_entry, level))
+        if self.store is not None:
+            self.store_pending.append((timestamp or time.time(), level, source, message))
+    
+    def show_entries(self, entries: List[LogEntry]) -> None:
+        """Depo sorgusu sonuçlarını göster"""
+        self.clear_logs()
+        for ts_ms, level, source, message in entries:
+            clock = datetime.fromtimestamp(ts_ms / 1000).strftime("%m-%d %H:%M:%S")
+            self.pending.append((f"[{clock}] [{level.upper()}] [{source}] {message}", level))
+        self.flush()
+    
+    def flush(self) -> None:
+        """Bekleyen satırları tampona aktar ve ekranı bir kez yenile"""
+        if self.store_pending:
+            batch, self.store_pending = self.store_pending, []
+            self.store_executor.submit(self.store.extend, batch)
+        if not self.pending:
+            return
         
-        self.logs.append(log_entry)
-        if len(self.logs) > self.max_logs:
-            self.logs = self.logs[-500:]  # Son 500 log'u tut
+        # Kullanıcı en alttaysa yeni satırları takip et, yukarı kaydırdıysa yerinde kal
+        follow = self.scroll_offset.y >= self.max_scroll_y
+        pending, self.pending = self.pending, []
+        if len(pending) > self.max_logs:
+            pending = pending[-self.max_logs:]
         
-        self.update_display()
+        self.logs.extend(pending)
+        self.max_width = max(self.max_width, max(line_width(line) for line, _ in pending))
+        self.virtual_size = Size(self.max_width, len(self.logs))
+        if follow:
+            self.scroll_end(animate=False)
+        self.refresh()
     
-    def update_display(self):
-        """Ekranı güncelle"""
-        content = "\n".join(self.logs[-50:])  # Son 50 log'u göster
-        self.update(content)
+    def render_line(self, y: int) -> Strip:
+        """Görünen tek satırı render et"""
+        scroll_x, scroll_y = self.scroll_offset
+        index = scroll_y + y
+        width = self.size.width
+        if index >= len(self.logs):
+            return Strip.blank(width, self.rich_style)
+        line, level = self.logs[index]
+        style = self.rich_style + self.LEVEL_STYLES.get(level, Style())
+        strip = Strip([Segment(line, style)], line_width(line))
+        return strip.crop_extend(scroll_x, scroll_x + width, self.rich_style)
     
     def clear_logs(self):
         """Logları temizle"""
         self.logs.clear()
-        self.update("")
+        self.pending.clear()
+        self.max_width = 0
+        self.virtual_size = Size(0, 0)
+        self.refresh()
 
 
-class StatusPanel(Static):
-    """Durum paneli widget'ı"""
+class PanelRow(Static):
+    """Panel satırı; yalnızca değerleri değiştiğinde yeniden çizilir"""
+    
+    DEFAULT_CSS = """
+    PanelRow {
+        height: 1;
+    }
+    """
+    
+    def __init__(self, widths: Tuple[int, ...], column_styles: Tuple[str, ...], **kwargs):
+        super().__init__(**kwargs)
+        self.widths = widths
+        self.column_styles = column_styles
+        self.values: Optional[Tuple[str, ...]] = None
+    
+    def set_values(self, values: Tuple[str, ...]) -> bool:
+        """Satırı güncelle; değişiklik yoksa hiçbir şey yapma"""
+        if values == self.values:
+            return False
+        self.values = values
+        grid = Table.grid(padding=(0, 2))
+        for width, style in zip(self.widths, self.column_styles):
+            grid.add_column(width=width, style=style, no_wrap=True)
+        grid.add_row(*values)
+        self.update(grid)
+        return True
+
+
+class StatusPanel(Vertical):
+    """Durum paneli widget'ı
+    
+    Her satır ayrı bir widget'tır; yenilemede yalnızca değeri değişen
+    satırlar yeniden çizilir, hiçbir şey değişmediyse iş yapılmaz.
+    """
+    
+    DEFAULT_CSS = """
+    StatusPanel {
+        height: auto;
+        padding: 1 2;
+    }
+    """
+    
+    WIDTHS = (14, 6, 24)
+    ROWS = ("project", "dependencies", "build", "pm2")
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.status_data = {}
+        self.last_key: Optional[Tuple] = None
+        self.rows_updated = 0
+    
+    def compose(self) -> ComposeResult:
+        yield Static(Text("📊 Proje Durumu", style="italic"))
+        yield PanelRow(self.WIDTHS, ("bold magenta",) * 3, id="status-header")
+        for key in self.ROWS:
+            yield PanelRow(self.WIDTHS, ("cyan", "green", "yellow"), id=f"status-{key}")
+    
+    def on_mount(self) -> None:
+        self.rows = {key: self.query_one(f"#status-{key}", PanelRow) for key in self.ROWS}
+        self.query_one("#status-header", PanelRow).set_values(("Bileşen", "Durum", "Detay"))
+        self.rows["project"].set_values(("Durum yükleniyor...", "", ""))
     
     def update_status(self, status: Dict):
         """Durumu güncelle"""
@@ -181,131 +370,726 @@ class StatusPanel(Static):
     def render_status(self):
         """Durumu render et"""
         if not self.status_data:
-            self.update("Durum yükleniyor...")
             return
         
-        console = Console()
-        
-        # Proje durumu tablosu
-        table = Table(title="📊 Proje Durumu", show_header=True, header_style="bold magenta")
-        table.add_column("Bileşen", style="cyan", no_wrap=True)
-        table.add_column("Durum", style="green")
-        table.add_column("Detay", style="yellow")
-        
         # Durum ikonları
         status_icon = lambda x: "✅" if x else "❌"
         
-        table.add_row(
-            "Proje", 
-            status_icon(self.status_data.get("project_exists", False)),
-            "Mevcut" if self.status_data.get("project_exists", False) else "Bulunamadı"
-        )
+        project = self.status_data.get("project_exists", False)
+        dependencies = self.status_data.get("node_modules_exists", False)
+        build = self.status_data.get("build_exists", False)
+        pm2_running = self.status_data.get("pm2_running", False)
+        pm2_count = len(self.status_data.get("pm2_processes", []))
+        steps = self.status_data.get("steps", {})
         
-        table.add_row(
-            "Dependencies", 
-            status_icon(self.status_data.get("node_modules_exists", False)),
-            "Yüklü" if self.status_data.get("node_modules_exists", False) else "Eksik"
+        def step_cell(exists: bool, state: Optional[str], present: str, absent: str) -> Tuple[str, str]:
+            # Girdiler son başarılı çalışmadan bu yana değiştiyse uyar
+            if exists and state == "stale":
+                return "⚠️", f"{present}, girdiler değişti"
+            if exists and state == "fresh":
+                return "✅", f"{present}, güncel"
+            return status_icon(exists), present if exists else absent
+        
+        rows = (
+            ("Proje", status_icon(project), "Mevcut" if project else "Bulunamadı"),
+            ("Dependencies",) + step_cell(dependencies, steps.get("install"), "Yüklü", "Eksik"),
+            ("Build",) + step_cell(build, steps.get("build"), "Mevcut", "Gerekli"),
+            ("PM2", status_icon(pm2_running), f"{pm2_count} süreç" if pm2_count > 0 else "Durmuş"),
         )
         
-        table.add_row(
-            "Build", 
-            status_icon(self.status_data.get("build_exists", False)),
-            "Mevcut" if self.status_data.get("build_exists", False) else "Gerekli"
+        # İçerik aynıysa (çoğu yenileme) hiçbir widget'a dokunma
+        if rows == self.last_key:
+            self.rows_updated = 0
+            return
+        self.last_key = rows
+        self.rows_updated = sum(
+            self.rows[key].set_values(values) for key, values in zip(self.ROWS, rows)
         )
+
+
+def sort_value(value) -> Tuple:
+    """Tablo hücresini sıralama anahtarına çevir ("12%", "80MB" sayısal sıralanır)"""
+    match = re.match(r"\s*(-?\d+(?:\.\d+)?)", str(value))
+    if match:
+        return (0, float(match.group(1)), "")
+    return (1, 0.0, str(value))
+
+
+class ProcessTable(DataTable):
+    """Süreç tablosu widget'ı
+    
+    Satırlar pm_id ile anahtarlanır: her yenilemede yalnızca değişen hücreler
+    güncellenir, satır yalnızca süreç eklenip kaldırıldığında eklenir/silinir.
+    İmleç aynı süreçte kalır; başlığa tıklamak o sütuna göre sıralar.
+    """
+    
+    COLUMNS = (
+        ("id", "ID"),
+        ("name", "İsim"),
+        ("pid", "PID"),
+        ("status", "Durum"),
+        ("cpu", "CPU"),
+        ("memory", "Bellek"),
+        ("restarts", "Yeniden Başlatma"),
+        ("cpu_trend", "CPU (5 dk)"),
+        ("memory_trend", "Bellek (5 dk)"),
+    )
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        for key, label in self.COLUMNS:
+            self.add_column(label, key=key)
+        self.column_order = [key for key, _ in self.COLUMNS]
+        self.row_values: Dict[str, Tuple[str, ...]] = {}
+        self.sort_column = "id"
+        self.sort_reverse = False
+        self.cells_updated = 0
+    
+    @staticmethod
+    def process_row(process: Dict, history: Optional[MetricHistory]) -> Tuple[str, Tuple[str, ...]]:
+        """Süreçten (satır anahtarı, hücre değerleri) üret"""
+        name = process.get("name", "N/A")
+        pm_id = process.get("pm_id", name)
+        pid = str(process.get("pid", "N/A"))
+        status = process.get("pm2_env", {}).get("status", "unknown")
         
-        pm2_count = len(self.status_data.get("pm2_processes", []))
-        table.add_row(
-            "PM2", 
-            status_icon(self.status_data.get("pm2_running", False)),
-            f"{pm2_count} süreç" if pm2_count > 0 else "Durmuş"
+        # CPU ve bellek bilgisi
+        monit = process.get("monit", {})
+        cpu = f"{monit.get('cpu', 0)}%" if monit else "N/A"
+        memory = f"{monit.get('memory', 0) // (1024*1024)}MB" if monit else "N/A"
+        
+        # Durum ikonu
+        status_icon = {
+            "online": "🟢",
+            "stopped": "🔴",
+            "error": "🟡"
+        }.get(status, "⚪")
+        
+        restart_count = process.get("pm2_env", {}).get("restart_time", 0)
+        
+        # Geçmiş grafikleri (süreç adıyla, kümede örnek numarasıyla kaydedilir)
+        cpu_trend = memory_trend = ""
+        prefix = process_series(process)
+        if history is not None and prefix is not None:
+            cpu_trend = history.sparkline(f"{prefix}.cpu", 300, width=20, low=0)
+            memory_trend = history.sparkline(f"{prefix}.memory_mb", 300, width=20, low=0)
+        
+        return str(pm_id), (
+            str(pm_id),
+            name,
+            pid,
+            f"{status_icon} {status}",
+            cpu,
+            memory,
+            str(restart_count),
+            cpu_trend,
+            memory_trend
         )
+    
+    def update_processes(self, processes: List[Dict], history: Optional[MetricHistory] = None):
+        """Süreçleri güncelle (yalnızca farklar uygulanır)"""
+        rows = dict(self.process_row(process, history) for process in processes)
         
-        with console.capture() as capture:
-            console.print(table)
+        # İmlecin bulunduğu süreci hatırla
+        cursor_key = None
+        if self.row_count:
+            try:
+                cursor_key = self.coordinate_to_cell_key(self.cursor_coordinate).row_key.value
+            except Exception:
+                cursor_key = None
         
-        self.update(capture.get())
+        needs_sort = False
+        updated = 0
+        
+        for key in [key for key in self.row_values if key not in rows]:
+            self.remove_row(key)
+            del self.row_values[key]
+        
+        for key, values in rows.items():
+            old = self.row_values.get(key)
+            if old is None:
+                self.add_row(*values, key=key)
+                needs_sort = True
+            else:
+                for column, before, after in zip(self.column_order, old, values):
+                    if before != after:
+                        self.update_cell(key, column, after, update_width=len(after) > len(before))
+                        updated += 1
+                        if column == self.sort_column:
+                            needs_sort = True
+            self.row_values[key] = values
+        self.cells_updated = updated
+        
+        if needs_sort:
+            self.sort(self.sort_column, key=sort_value, reverse=self.sort_reverse)
+        
+        if cursor_key in self.row_values:
+            row = self.get_row_index(cursor_key)
+            if row != self.cursor_coordinate.row:
+                self.move_cursor(row=row)
+    
+    def on_data_table_header_selected(self, event: DataTable.HeaderSelected) -> None:
+        """Başlığa tıklanınca o sütuna göre sırala (tekrar tıklamak yönü çevirir)"""
+        column = event.column_key.value
+        if column == self.sort_column:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_column = column
+            self.sort_reverse = False
+        cursor_key = None
+        if self.row_count:
+            cursor_key = self.coordinate_to_cell_key(self.cursor_coordinate).row_key.value
+        self.sort(self.sort_column, key=sort_value, reverse=self.sort_reverse)
+        if cursor_key is not None:
+            self.move_cursor(row=self.get_row_index(cursor_key))
 
 
-class ProcessTable(DataTable):
-    """Süreç tablosu widget'ı"""
+def format_bytes(value: Optional[float], suffix: str = "") -> str:
+    """Bayt değerini okunur birime çevir (None -> "-")"""
+    if value is None:
+        return "-"
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(value) < 1024 or unit == "GB":
+            return f"{value:.0f}{unit}{suffix}" if unit == "B" else f"{value:.1f}{unit}{suffix}"
+        value /= 1024
+
+
+class ProcessDetails(Static):
+    """pm2 süreçlerinin ayrıntılı ölçümü (alt süreçler dahil, psutil ile)"""
+    
+    DEFAULT_CSS = """
+    ProcessDetails {
+        height: auto;
+        margin-top: 1;
+    }
+    """
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.add_columns("İsim", "PID", "Durum", "CPU", "Bellek", "Yeniden Başlatma")
+        self.last_key: Optional[Tuple] = None
     
-    def update_processes(self, processes: List[Dict]):
-        """Süreçleri güncelle"""
-        self.clear()
-        
+    def update_stats(self, processes: List[Dict], stats: Dict[str, Dict], error: Optional[str] = None):
+        """Ayrıntı tablosunu güncelle; değerler aynıysa yeniden kurma"""
+        fmt = lambda value, spec="": "-" if value is None else format(value, spec)
+        rows = []
         for process in processes:
-            name = process.get("name", "N/A")
-            pid = str(process.get("pid", "N/A"))
-            status = process.get("pm2_env", {}).get("status", "unknown")
-            
-            # CPU ve bellek bilgisi
-            monit = process.get("monit", {})
-            cpu = f"{monit.get('cpu', 0)}%" if monit else "N/A"
-            memory = f"{monit.get('memory', 0) // (1024*1024)}MB" if monit else "N/A"
-            
-            # Durum ikonu
-            status_icon = {
-                "online": "🟢",
-                "stopped": "🔴",
-                "error": "🟡"
-            }.get(status, "⚪")
-            
-            restart_count = process.get("pm2_env", {}).get("restart_time", 0)
-            
-            self.add_row(
-                name,
-                pid,
-                f"{status_icon} {status}",
-                cpu,
-                memory,
-                str(restart_count)
-            )
+            item = stats.get(str(process.get("pm_id", process.get("name"))))
+            if item is None:
+                continue
+            rows.append((
+                process.get("name", "N/A"),
+                str(item["processes"]),
+                fmt(item.get("cpu_percent"), ".1f"),
+                format_bytes(item["rss"]),
+                format_bytes(item["uss"]),
+                str(item["threads"]),
+                fmt(item["fds"]),
+                fmt(item["sockets"]),
+                fmt(item["ctx_rate"], ".0f"),
+                format_bytes(item["read_rate"], "/s"),
+                format_bytes(item["write_rate"], "/s"),
+            ))
+        key = (tuple(rows), error)
+        if key == self.last_key:
+            return
+        self.last_key = key
+        
+        table = Table(title="🔬 Ayrıntılı Ölçüm (alt süreçler dahil)", show_header=True,
+                      header_style="bold blue", expand=True)
+        table.add_column("İsim", style="cyan", no_wrap=True)
+        for label in ("Süreç", "CPU %", "RSS", "USS", "Thread", "FD", "Soket", "Bağlam/s", "Okuma", "Yazma"):
+            table.add_column(label, justify="right")
+        for row in rows:
+            table.add_row(*row)
+        if error:
+            self.update(Group(table, Text(f"⚠️ {error}", style="yellow")))
+        else:
+            self.update(table)
 
 
-class SystemInfoPanel(Static):
-    """Sistem bilgi paneli"""
+class QuakeTable(DataTable):
+    """Deprem akışı tablosu
+    
+    Yalnızca yeni depremler sona eklenir, tablo baştan kurulmaz; satır sınırı
+    aşılınca en eski satırlar silinir. Her tablo değişikliği görünen tüm
+    satırları yeniden çizdirdiği için gelen depremler bekleme listesinde
+    toplanır ve saniyede en fazla `max_fps` kez topluca eklenir (artçı
+    fırtınasında olay başına çizim yapılmaz). İmleç son satırdaysa tablo
+    yeni satırları izler.
+    
+    DataTable.remove_row tüm satır konumlarını yeniden kurar (satır başına
+    ~3 ms); çok satır atılacaksa tablo tutulan hücrelerden yeniden kurulur
+    (~0.2 ms/satır).
+    
+    `distance=True` ile başa mesafe sütunu eklenir (konum sorgusu sonuçları).
+    """
+    
+    DEFAULT_CSS = """
+    QuakeTable {
+        height: 1fr;
+    }
+    """
+    
+    COLUMNS = (
+        ("date", "Tarih"),
+        ("magnitude", "Büyüklük"),
+        ("depth", "Derinlik"),
+        ("location", "Yer"),
+        ("source", "Kaynak"),
+    )
+    # Atılacak satır, kalan satırların bu oranını aşarsa tablo yeniden kurulur
+    REBUILD_RATIO = 1 / 16
+    
+    def __init__(self, max_rows: int = 1000, max_fps: float = 2.0, distance: bool = False, **kwargs):
+        super().__init__(**kwargs)
+        self.max_rows = max_rows
+        self.max_fps = max_fps
+        self.distance = distance
+        if distance:
+            self.add_column("Mesafe", key="distance")
+        for key, label in self.COLUMNS:
+            self.add_column(label, key=key)
+        self.row_keys: Deque[str] = deque()
+        self.row_cells: Dict[str, Tuple] = {}
+        self.pending: List[Dict] = []
+        self.cursor_type = "row"
+    
+    def on_mount(self) -> None:
+        """Toplu ekleme zamanlayıcısını başlat"""
+        self.set_interval(1.0 / self.max_fps, self.flush)
+    
+    def add_quakes(self, quakes: List[Dict]) -> None:
+        """Depremleri bir sonraki toplu eklemeye bırak"""
+        self.pending.extend(quakes)
+    
+    def flush(self) -> None:
+        """Bekleyen depremleri tek seferde ekle"""
+        if self.pending:
+            # Sınırı aşan kısım eklenir eklenmez silineceği için hiç eklenmez
+            pending, self.pending = self.pending[-self.max_rows:], []
+            self.append_quakes(pending)
+    
+    @staticmethod
+    def quake_cells(quake: Dict) -> Tuple:
+        """Depremden hücre değerleri"""
+        try:
+            magnitude = float(quake.get("Magnitude"))
+        except (TypeError, ValueError):
+            magnitude = None
+        if magnitude is None:
+            magnitude_text = Text("-")
+        else:
+            style = "bold red" if magnitude >= 5 else "yellow" if magnitude >= 4 else ""
+            magnitude_text = Text(f"{magnitude:.1f}", style=style)
+        region = quake.get("Region") or {}
+        location = ", ".join(part for part in (region.get("District"), region.get("City")) if part)
+        depth = quake.get("Depth")
+        return (
+            str(quake.get("Date") or "")[:19].replace("T", " "),
+            magnitude_text,
+            f"{depth} km" if depth is not None else "-",
+            location or "-",
+            quake.get("Source") or "-",
+        )
+    
+    def show_hits(self, hits: List[Tuple[Optional[float], Dict]]) -> None:
+        """Konum sorgusu sonuçlarını göster (tablo baştan kurulur)"""
+        self.clear()
+        self.row_keys.clear()
+        self.row_cells.clear()
+        for distance, quake in hits[:self.max_rows]:
+            key = str(quake.get("ID"))
+            if key in self.row_cells:
+                continue
+            cells = self.quake_cells(quake)
+            if self.distance:
+                cells = ("-" if distance is None else f"{distance:.1f} km",) + cells
+            self.add_row(*cells, key=key)
+            self.row_keys.append(key)
+            self.row_cells[key] = cells
+    
+    def append_quakes(self, quakes: List[Dict]) -> int:
+        """Yeni depremleri sona ekle; eklenen satır sayısını döndür"""
+        follow = self.row_count == 0 or self.cursor_coordinate.row >= self.row_count - 1
+        added = 0
+        for quake in quakes:
+            key = str(quake["ID"])
+            if key in self.row_cells:
+                continue
+            cells = self.quake_cells(quake)
+            self.add_row(*cells, key=key)
+            self.row_keys.append(key)
+            self.row_cells[key] = cells
+            added += 1
+        excess = len(self.row_keys) - self.max_rows
+        if excess > self.max_rows * self.REBUILD_RATIO:
+            cursor_row = self.cursor_coordinate.row
+            for _ in range(excess):
+                del self.row_cells[self.row_keys.popleft()]
+            self.clear()
+            for key in self.row_keys:
+                self.add_row(*self.row_cells[key], key=key)
+            if not follow:
+                self.move_cursor(row=max(0, cursor_row - excess))
+        else:
+            for _ in range(max(0, excess)):
+                key = self.row_keys.popleft()
+                del self.row_cells[key]
+                self.remove_row(key)
+        if added and follow:
+            self.move_cursor(row=self.row_count - 1)
+        return added
+
+
+class JobTable(DataTable):
+    """İş kuyruğu tablosu
+    
+    Satırlar iş numarasıyla anahtarlanır ve yalnızca değişen hücreler
+    güncellenir; süre ve ilerleme sütunları için tablo çalışan iş varken
+    saniyede bir yenilenir.
+    """
+    
+    DEFAULT_CSS = """
+    JobTable {
+        height: 1fr;
+    }
+    """
+    
+    COLUMNS = (
+        ("id", "#"),
+        ("command", "Komut"),
+        ("state", "Durum"),
+        ("duration", "Süre"),
+        ("progress", "İlerleme"),
+        ("lines", "Satır"),
+        ("last_line", "Son Çıktı"),
+    )
+    STATES = {
+        QUEUED: "⏳ bekliyor",
+        RUNNING: "▶️ çalışıyor",
+        DONE: "✅ bitti",
+        FAILED: "❌ başarısız",
+        CANCELLED: "⛔ iptal",
+        TIMED_OUT: "⏱️ zaman aşımı",
+    }
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        for key, label in self.COLUMNS:
+            self.add_column(label, key=key)
+        self.column_order = [key for key, _ in self.COLUMNS]
+        self.row_values: Dict[str, Tuple[str, ...]] = {}
+        self.cursor_type = "row"
+    
+    @classmethod
+    def job_row(cls, job: Job, expected: Optional[float]) -> Tuple[str, ...]:
+        """İşten hücre değerleri"""
+        state = cls.STATES.get(job.state, job.state)
+        if job.state == QUEUED and job.blocked_by:
+            state = f"{state} ({job.blocked_by})"
+        elif job.state == RUNNING and job.cancel_requested:
+            state = "⛔ iptal ediliyor"
+        progress = job.progress(expected)
+        if progress is None:
+            progress_text = "-"
+        else:
+            filled = int(progress * 10)
+            progress_text = f"{'█' * filled}{'░' * (10 - filled)} {progress * 100:3.0f}%"
+        duration = f"{job.duration:.1f}s" if job.started_at else "-"
+        if job.state == RUNNING and job.timeout:
+            duration = f"{duration} / {job.timeout:.0f}s"
+        return (
+            str(job.id),
+            job.command,
+            state,
+            duration,
+            progress_text,
+            str(job.lines),
+            job.last_line[:80],
+        )
+    
+    def update_jobs(self, jobs: List[Job], scheduler: JobScheduler) -> None:
+        """Tabloyu işlerle eşitle (yalnızca farklar uygulanır)"""
+        rows = {str(job.id): self.job_row(job, scheduler.expected_duration(job.command)) for job in jobs}
+        for key in [key for key in self.row_values if key not in rows]:
+            self.remove_row(key)
+            del self.row_values[key]
+        for key, values in rows.items():
+            old = self.row_values.get(key)
+            if old is None:
+                self.add_row(*values, key=key)
+            else:
+                for column, before, after in zip(self.column_order, old, values):
+                    if before != after:
+                        self.update_cell(key, column, after, update_width=len(after) > len(before))
+            self.row_values[key] = values
+    
+    def selected_job(self) -> Optional[int]:
+        """İmlecin bulunduğu işin numarası"""
+        if not self.row_count:
+            return None
+        try:
+            return int(self.coordinate_to_cell_key(self.cursor_coordinate).row_key.value)
+        except Exception:
+            return None
+
+
+class SystemInfoPanel(Vertical):
+    """Sistem bilgi paneli
+    
+    Kaynak ve geçmiş satırları ayrı widget'lardır; değerler, geçmiş yazım
+    sayaçları ve grafik zaman dilimi aynıysa yenileme hiçbir iş yapmaz.
+    """
+    
+    DEFAULT_CSS = """
+    SystemInfoPanel {
+        height: auto;
+        padding: 1 2;
+    }
+    SystemInfoPanel .panel-title {
+        margin-top: 1;
+    }
+    """
     
-    def update_system_info(self, info: Dict):
+    RESOURCES = (("CPU", "cpu_percent"), ("Bellek", "memory_percent"), ("Disk", "disk_percent"))
+    INFO_WIDTHS = (8, 8, 36)
+    HISTORY_WIDTHS = (8, 24, 24, 14)
+    SPARK_WIDTH = 24
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.last_key: Optional[Tuple] = None
+        self.rows_updated = 0
+    
+    def compose(self) -> ComposeResult:
+        yield Static(Text("💻 Sistem Durumu", style="italic"))
+        yield PanelRow(self.INFO_WIDTHS, ("bold blue",) * 3, id="system-header")
+        for _, key in self.RESOURCES:
+            yield PanelRow(self.INFO_WIDTHS, ("cyan", "yellow", "green"), id=f"system-{key}")
+        yield Static(Text("📈 Kullanım Geçmişi (min/ort/maks: son 1 saat)", style="italic"),
+                     classes="panel-title")
+        yield PanelRow(self.HISTORY_WIDTHS, ("bold blue",) * 4, id="history-header")
+        for _, key in self.RESOURCES:
+            yield PanelRow(self.HISTORY_WIDTHS, ("cyan", "magenta", "blue", ""), id=f"history-{key}")
+    
+    def on_mount(self) -> None:
+        self.rows = {row.id: row for row in self.query(PanelRow)}
+        self.query_one("#system-header", PanelRow).set_values(("Kaynak", "Kullanım", "Detay"))
+        self.query_one("#history-header", PanelRow).set_values(
+            ("Kaynak", "Son 5 dk", "Son 24 saat", "min/ort/maks"))
+    
+    @staticmethod
+    def bar(percent: float) -> str:
+        """20 karakterlik doluluk çubuğu"""
+        filled = min(max(int(percent / 5), 0), 20)
+        return "█" * filled + "░" * (20 - filled)
+    
+    def update_system_info(self, info: Dict, history: Optional[MetricHistory] = None):
         """Sistem bilgilerini güncelle"""
-        console = Console()
+        key = (
+            tuple(sorted(info.items())),
+            tuple(history.generation(f"system.{name}") for _, name in self.RESOURCES) if history else None,
+            # Veri gelmese de 5 dakikalık grafik bir karakter sola kayar
+            int(time.time() * self.SPARK_WIDTH // 300),
+        )
+        if key == self.last_key:
+            self.rows_updated = 0
+            return
+        self.last_key = key
         
-        # Sistem durumu tablosu
-        table = Table(title="💻 Sistem Durumu", show_header=True, header_style="bold blue")
-        table.add_column("Kaynak", style="cyan", no_wrap=True)
-        table.add_column("Kullanım", style="yellow")
-        table.add_column("Detay", style="green")
+        details = {
+            "cpu_percent": self.bar(info["cpu_percent"]),
+            "memory_percent": f"{self.bar(info['memory_percent'])} ({info['memory_used']}GB/{info['memory_total']}GB)",
+            "disk_percent": f"{self.bar(info['disk_percent'])} ({info['disk_used']}GB/{info['disk_total']}GB)",
+        }
+        updated = 0
+        for label, name in self.RESOURCES:
+            updated += self.rows[f"system-{name}"].set_values((label, f"{info[name]:.1f}%", details[name]))
+            
+            if history is not None:
+                series = f"system.{name}"
+                stats = history.stats(series, 3600)
+                updated += self.rows[f"history-{name}"].set_values((
+                    label,
+                    history.sparkline(series, 300, width=self.SPARK_WIDTH, low=0, high=100),
+                    history.sparkline(series, 86400, width=self.SPARK_WIDTH, low=0, high=100),
+                    f"{stats[0]:.0f}/{stats[2]:.0f}/{stats[1]:.0f}%" if stats else "-",
+                ))
+        self.rows_updated = updated
+
+
+class MetricsPanel(Static):
+    """Sunucu metrikleri paneli (/api/metrics)"""
+    
+    PROVIDER_NAMES = {"afad": "AFAD", "koeri": "KOERI", "unknown": "Diğer"}
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.last_key: Optional[Tuple] = None
+    
+    def update_metrics(self, report: Dict, error: Optional[str] = None):
+        """Metrik raporunu göster"""
+        # Yeni kazıma yoksa tabloyu yeniden kurma
+        key = (report.get("timestamp"), error)
+        if key == self.last_key:
+            return
+        self.last_key = key
+        if not report:
+            self.update(f"📈 Metrikler bekleniyor... {error or ''}")
+            return
         
-        # CPU
-        cpu_bar = "█" * int(info["cpu_percent"] / 5) + "░" * (20 - int(info["cpu_percent"] / 5))
-        table.add_row("CPU", f"{info['cpu_percent']:.1f}%", cpu_bar)
+        fmt = lambda value, unit="": "-" if value is None else f"{value:.1f}{unit}"
+        table = Table(title="📈 Sunucu Metrikleri", show_header=True, header_style="bold blue")
+        table.add_column("Sağlayıcı", style="cyan", no_wrap=True)
+        table.add_column("İstek/s", justify="right")
+        table.add_column("Hata/s", justify="right", style="red")
+        table.add_column("p50", justify="right", style="green")
+        table.add_column("p95", justify="right", style="yellow")
+        table.add_column("p99", justify="right", style="magenta")
+        table.add_column("Toplam", justify="right")
+        table.add_column("Hata Kodları")
         
-        # Bellek
-        memory_bar = "█" * int(info["memory_percent"] / 5) + "░" * (20 - int(info["memory_percent"] / 5))
+        for name, item in sorted(report["providers"].items()):
+            statuses = ", ".join(f"{code}: {rate:.2f}/s"
+                                 for code, rate in sorted(item["errors_by_status"].items()) if rate)
+            table.add_row(
+                self.PROVIDER_NAMES.get(name, name),
+                fmt(item["rps"]), fmt(item["error_rps"]),
+                fmt(item["p50"], "ms"), fmt(item["p95"], "ms"), fmt(item["p99"], "ms"),
+                f"{item['total']:.0f}", statuses or "-"
+            )
+        overall = report["overall"]
         table.add_row(
-            "Bellek", 
-            f"{info['memory_percent']:.1f}%", 
-            f"{cpu_bar} ({info['memory_used']}GB/{info['memory_total']}GB)"
+            "Tümü",
+            fmt(overall["rps"]), fmt(overall["error_rps"]),
+            fmt(overall["p50"], "ms"), fmt(overall["p95"], "ms"), fmt(overall["p99"], "ms"),
+            f"{overall['total']:.0f}", "", style="bold"
         )
         
-        # Disk
-        disk_bar = "█" * int(info["disk_percent"] / 5) + "░" * (20 - int(info["disk_percent"] / 5))
-        table.add_row(
-            "Disk", 
-            f"{info['disk_percent']:.1f}%", 
-            f"{disk_bar} ({info['disk_used']}GB/{info['disk_total']}GB)"
-        )
+        footer = (f"{report['url']} | kazıma {report['scrape_ms']:.0f}ms, "
+                  f"{report['bytes']} bayt, {report['series']} seri | "
+                  f"yüzdelik penceresi {report['window']:.0f}s")
+        if error:
+            footer += f" | ⚠️ {error}"
+        self.update(Group(table, Text(footer, style="dim")))
+
+
+class HealthPanel(Static):
+    """Uç nokta sağlık paneli (sürekli yoklama sonuçları ve SLO durumu)"""
+    
+    DEFAULT_CSS = """
+    HealthPanel {
+        height: auto;
+        margin-top: 1;
+    }
+    """
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.last_key: Optional[Tuple] = None
+    
+    def update_health(self, report: Dict, error: Optional[str] = None):
+        """Yoklama raporunu göster"""
+        key = (tuple((item["requests"], item["breach"]) for item in report.get("endpoints", ())), error)
+        if key == self.last_key:
+            return
+        self.last_key = key
+        if not report.get("endpoints"):
+            self.update(f"🩺 Uç nokta yoklaması bekleniyor... {error or ''}")
+            return
+        
+        fmt = lambda value, unit="": "-" if value is None else f"{value:.0f}{unit}"
+        table = Table(title="🩺 Uç Nokta Sağlığı", show_header=True, header_style="bold blue")
+        table.add_column("Uygulama", style="cyan", no_wrap=True)
+        table.add_column("Uç Nokta", no_wrap=True)
+        table.add_column("Durum", justify="center")
+        table.add_column("Son", justify="right")
+        table.add_column("p50", justify="right", style="green")
+        table.add_column("p95", justify="right", style="yellow")
+        table.add_column("SLO p95", justify="right", style="dim")
+        table.add_column("Zaman Aşımı", justify="right")
+        table.add_column("Hata", justify="right", style="red")
+        table.add_column("Boyut", justify="right")
+        
+        for item in report["endpoints"]:
+            window = item["window"]
+            if item["last_status"] is None and item["requests"] == 0:
+                status = "⏳"
+            elif item["last_error"]:
+                status = f"🔴 {item['last_status'] or item['last_error']}"
+            else:
+                status = f"🟢 {item['last_status']}"
+            table.add_row(
+                item["app"], item["path"], status,
+                fmt(item["last_ms"], "ms"), fmt(window["p50"], "ms"), fmt(window["p95"], "ms"),
+                fmt(item["slo"]["p95_ms"], "ms"),
+                str(item["timeouts"]), f"{item['failures']}/{item['requests']}",
+                format_bytes(item["last_bytes"]),
+                style="bold red" if item["breach"] else None
+            )
+        
+        connections = ", ".join(f"{app}: {count}" for app, count in sorted(report["connections"].items()))
+        footer = (f"her {report['interval']:g}s yoklanıyor | açılan bağlantı {connections} | "
+                  f"p50/p95 SLO penceresi içinde")
+        if report["breaches"]:
+            footer += f" | 🚨 {report['breaches']} uç nokta SLO dışında"
+        if error:
+            footer += f" | ⚠️ {error}"
+        self.update(Group(table, Text(footer, style="dim")))
+
+
+class AlertLatencyPanel(Static):
+    """Uyarı gecikmesi paneli (deprem anından liste/SSE/poller bildirimine)"""
+    
+    DEFAULT_CSS = """
+    AlertLatencyPanel {
+        height: auto;
+        margin-top: 1;
+    }
+    """
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.last_key: Optional[Tuple] = None
+    
+    def update_latency(self, report: Dict):
+        """İzleyici raporunu göster"""
+        key = (tuple((stage["count"], stage["missed"], stage["breach"]) for stage in report["stages"]),
+               report["tracking"], report["poller_lines"], report["primed"])
+        if key == self.last_key:
+            return
+        self.last_key = key
+        
+        fmt = lambda value: "-" if value is None else f"{value:.1f}s"
+        table = Table(title="⏱️ Uyarı Gecikmesi (deprem anından)", show_header=True, header_style="bold blue")
+        table.add_column("Aşama", style="cyan", no_wrap=True)
+        table.add_column("Deprem", justify="right")
+        table.add_column("Son", justify="right")
+        table.add_column("p50", justify="right", style="green")
+        table.add_column("p95", justify="right", style="yellow")
+        table.add_column("p99", justify="right")
+        table.add_column("Maks", justify="right")
+        table.add_column("SLO p95", justify="right", style="dim")
+        table.add_column("Kaçan", justify="right", style="red")
         
-        with console.capture() as capture:
-            console.print(table)
+        for stage in report["stages"]:
+            table.add_row(
+                stage["label"], str(stage["count"]), fmt(stage["last"]),
+                fmt(stage["p50"]), fmt(stage["p95"]), fmt(stage["p99"]), fmt(stage["max"]),
+                f"{stage['slo']['p95_s']:g}s",
+                str(stage["missed"]) if stage["name"] == "poller" else "-",
+                style="bold red" if stage["breach"] else None
+            )
         
-        self.update(capture.get())
+        footer = (f"P² akan yüzdelik | poller yalnızca {POLLER_WINDOW:.0f}s'den genç depremleri bildirir | "
+                  f"izlenen {report['tracking']} deprem")
+        if not report["primed"]:
+            footer += " | ilk liste bekleniyor"
+        if not report["poller_lines"]:
+            footer += " | ⚠️ poller logu henüz görülmedi"
+        if report["breaches"]:
+            footer += f" | 🚨 {report['breaches']} aşama SLO dışında"
+        self.update(Group(table, Text(footer, style="dim")))
 
 
 class EpicentraTUI(App):
@@ -315,19 +1099,75 @@ class EpicentraTUI(App):
     TITLE = "🤖 Epicentra TUI Bot"
     SUB_TITLE = "Terminal Grafik Arayüzlü Proje Yöneticisi"
     
+    # Komut butonları
+    COMMAND_MAP = {
+        "start-btn": "start",
+        "stop-btn": "stop",
+        "restart-btn": "restart",
+        "dev-btn": "dev",
+        "build-btn": "build",
+        "install-btn": "install",
+        "clean-btn": "clean",
+        "update-btn": "update",
+        "bench-btn": "bench",
+        "catalog-btn": "catalog",
+        "synth-btn": "synth",
+        "push-btn": "push"
+    }
+    
     def __init__(self):
         super().__init__()
         self.project_root = os.path.dirname(os.path.abspath(__file__))
         self.command_runner = CommandRunner(self.project_root)
-        self.system_monitor = SystemMonitor()
+        # Çakışan komutlar (ör. build ve restart) sıraya girer, diğerleri paralel çalışır
+        self.job_scheduler = JobScheduler(
+            self.command_runner.run_command,
+            timeouts={command: COMMAND_TIMEOUTS.get(command, self.command_runner.timeout)
+                      for command in self.COMMAND_MAP.values()},
+            history_path=os.path.join(self.project_root, "logs", "job-durations.json"),
+            on_output=self.on_job_output
+        )
+        self.job_scheduler.subscribe(self.on_job_event)
+        self.collector = self.create_collector()
+        self.log_tailer = LogTailer(parse_ecosystem_logs(self.project_root), self.on_server_logs)
+        self.log_store = LogStore()
+        # Depo yazımları, dışa aktarma ve sorgular sırayı korumak için tek thread'de yapılır
+        self.store_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-store")
+        self.probe_errors: Dict[str, str] = {}
+        self.health_seq: Optional[int] = None
+        self.quake_feed = QuakeFeed(get_server_url(self.project_root), self.on_quakes, poll_during_sse=True)
+        # Deprem anından liste/SSE/poller log satırına kadar geçen süre
+        self.alert_monitor = AlertLatencyMonitor()
+        self.quake_feed.subscribe(self.alert_monitor.observe)
+        self.alert_monitor.subscribe(self.on_alert_event)
+        # Alınan tüm depremler konum sorguları için dizinde tutulur
+        self.quake_index = QuakeIndex()
+        self.quake_status_key: Optional[Tuple] = None
+        self.applied_version = -1
         self.auto_refresh_enabled = True
+    
+    def create_collector(self):
+        """Ortak toplayıcı daemon'u çalışıyorsa ona bağlan, yoksa kendi ölçümünü yap"""
+        socket_path = default_socket_path(self.project_root)
+        client = CollectorClient(socket_path, timeout=1.0)
+        try:
+            if client.available():
+                return RemoteCollector(socket_path)
+        finally:
+            client.close()
+        collector = Collector(self.project_root, interval=5.0,
+                              history_path=default_history_path(self.project_root))
+        # Sunucu metrikleri toplayıcıda engellemeyen bir probe olarak kazınır
+        collector.enable_metrics(get_server_url(self.project_root))
+        collector.enable_health(default_targets(self.project_root))
+        return collector
         
     def compose(self) -> ComposeResult:
         """UI bileşenlerini oluştur"""
         yield Header()
         
         with Container(id="main-container"):
-            with Tabs("Kontrol", "Durum", "Süreçler", "Sistem", "Loglar"):
+            with Tabs("Kontrol", "İşler", "Durum", "Süreçler", "Sistem", "Metrikler", "Depremler", "Loglar"):
                 # Kontrol Paneli
                 with TabPane("Kontrol", id="control-tab"):
                     with Vertical(id="control-panel"):
@@ -344,12 +1184,25 @@ class EpicentraTUI(App):
                             yield Button("📦 Install", id="install-btn", variant="default")
                             yield Button("🧹 Temizle", id="clean-btn", variant="default")
                             yield Button("🔄 Güncelle", id="update-btn", variant="default")
+                            yield Button("🏋️ Yük Testi", id="bench-btn", variant="default")
+                            yield Button("📚 Katalog", id="catalog-btn", variant="default")
+                            yield Button("🌋 Artçı Testi", id="synth-btn", variant="default")
+                            yield Button("📨 Push Testi", id="push-btn", variant="default")
                         
                         with Horizontal(id="quick-actions"):
                             yield Button("📊 Durumu Yenile", id="refresh-btn", variant="default")
+                            yield Button("⛔ İptal", id="cancel-btn", variant="error")
                             yield Switch(value=True, id="auto-refresh-switch")
                             yield Static("Otomatik Yenileme", id="auto-refresh-label")
                 
+                # İş Kuyruğu
+                with TabPane("İşler", id="jobs-tab"):
+                    with Vertical():
+                        with Horizontal(id="job-controls"):
+                            yield Button("⛔ Seçili İşi İptal", id="cancel-job-btn", variant="error")
+                            yield Static("Çakışan komutlar sıraya girer, diğerleri paralel çalışır", id="job-info")
+                        yield JobTable(id="job-table")
+                
                 # Durum Paneli
                 with TabPane("Durum", id="status-tab"):
                     yield StatusPanel(id="status-panel")
@@ -359,94 +1212,244 @@ class EpicentraTUI(App):
                     with Vertical():
                         yield Static("🔧 PM2 Süreç Yöneticisi", id="processes-title")
                         yield ProcessTable(id="process-table")
+                        yield ProcessDetails(id="process-details")
                 
                 # Sistem Paneli
                 with TabPane("Sistem", id="system-tab"):
                     yield SystemInfoPanel(id="system-info")
                 
+                # Metrik Paneli
+                with TabPane("Metrikler", id="metrics-tab"):
+                    with Vertical():
+                        yield MetricsPanel(id="metrics-panel")
+                        yield HealthPanel(id="health-panel")
+                        yield AlertLatencyPanel(id="alert-latency-panel")
+                
+                # Deprem Akışı
+                with TabPane("Depremler", id="quakes-tab"):
+                    with Vertical():
+                        yield Static("🌍 Deprem akışı başlıyor...", id="quake-status")
+                        yield QuakeTable(id="quake-table")
+                        yield Input(
+                            placeholder="🗺️ Konum: 38.42,27.14 100 (km)  yakın 38.42,27.14 10  36,26,42,45 (kutu)",
+                            id="quake-query"
+                        )
+                        yield Static("", id="quake-query-info")
+                        yield QuakeTable(id="quake-results", max_rows=500, distance=True)
+                
                 # Log Paneli
                 with TabPane("Loglar", id="logs-tab"):
                     with Vertical():
                         with Horizontal(id="log-controls"):
                             yield Button("🗑️ Temizle", id="clear-logs-btn", variant="error")
                             yield Button("📋 Kaydet", id="save-logs-btn", variant="default")
-                            yield Static("Son 50 log gösteriliyor", id="log-info")
+                            yield Static("Son 20000 log tutuluyor (yukarı kaydırılabilir)", id="log-info")
                         
-                        yield ScrollableContainer(
-                            LogViewer(id="log-viewer"),
-                            id="log-container"
+                        yield LogViewer(id="log-viewer", store=self.log_store,
+                                        store_executor=self.store_executor)
+                        yield Input(
+                            placeholder="🔎 Ara: regex  level:error  source:epicentra-server  id:abc123  since:30m  -i",
+                            id="log-query"
                         )
+                        yield LogViewer(id="log-results", max_logs=5000)
         
         yield Footer()
     
     def on_mount(self) -> None:
         """Uygulama başlatıldığında"""
         self.log_viewer = self.query_one("#log-viewer", LogViewer)
+        # Paneller her snapshot'ta aranmasın (query_one tüm DOM'u tarar)
+        self.status_panel = self.query_one("#status-panel", StatusPanel)
+        self.process_table = self.query_one("#process-table", ProcessTable)
+        self.process_details = self.query_one("#process-details", ProcessDetails)
+        self.system_panel = self.query_one("#system-info", SystemInfoPanel)
+        self.metrics_panel = self.query_one("#metrics-panel", MetricsPanel)
+        self.health_panel = self.query_one("#health-panel", HealthPanel)
+        self.alert_latency_panel = self.query_one("#alert-latency-panel", AlertLatencyPanel)
+        self.quake_table = self.query_one("#quake-table", QuakeTable)
+        self.quake_status = self.query_one("#quake-status", Static)
+        self.job_table = self.query_one("#job-table", JobTable)
         self.log_viewer.add_log("🤖 Epicentra TUI Bot başlatıldı!", "info")
         self.log_viewer.add_log("Proje durumu kontrol ediliyor...", "info")
+        if isinstance(self.collector, RemoteCollector):
+            self.log_viewer.add_log(
+                f"📡 Ortak toplayıcı daemon'una bağlanıldı: {self.collector.socket_path}", "info"
+            )
+        if self.collector.history_error:
+            self.log_viewer.add_log(
+                f"⚠️ Metrik geçmişi dosyası açılamadı, geçmiş yalnızca bellekte: {self.collector.history_error}",
+                "warning"
+            )
+        
+        # Toplayıcı probeları arka planda çalıştırır, snapshot'lar widget'lara yayınlanır
+        self.collector.subscribe(self.apply_snapshot)
+        self.collector.subscribe_events(self.on_pm2_event)
+        self.collector.start()
+        
+        # Sunucu logları (pm2 log dosyaları) canlı olarak log sekmesine akar
+        self.log_tailer.start()
         
-        # İlk veri yüklemesi
-        self.call_after_refresh(self.initial_data_load)
+        # Deprem akışı (SSE, yoksa yoklama); durum satırı akış modu değişince de güncellenir
+        self.quake_feed.start()
+        self.set_interval(2.0, self.update_quake_status)
+        self.set_interval(2.0, self.update_alert_latency)
+        self.set_interval(1.0, self.update_running_jobs)
+    
+    async def on_unmount(self) -> None:
+        """Uygulama kapanırken"""
+        await self.job_scheduler.shutdown()
+        await self.log_tailer.stop()
+        await self.quake_feed.stop()
+        await self.collector.stop()
+        self.store_executor.shutdown(wait=True)
+        self.log_store.close()
+    
+    def on_server_logs(self, lines: List) -> None:
+        """Takipçiden gelen sunucu log satırlarını ekle"""
+        for timestamp, app, stream, text in lines:
+            self.alert_monitor.observe_log(timestamp, app, text)
+            level = "error" if stream == "err" else "info"
+            self.log_viewer.add_log(f"{app}: {text}", level, timestamp=timestamp, source=app)
+    
+    def on_quakes(self, quakes: List[Dict]) -> None:
+        """Akıştan gelen yeni depremleri tabloya ekle"""
+        self.quake_index.extend(quakes)
+        self.quake_table.add_quakes(quakes)
+    
+    def on_alert_event(self, event: Dict) -> None:
+        """Kaçan uyarı ve uyarı gecikmesi SLO olaylarını log ekranına yaz"""
+        level = "success" if event["kind"] == "recovered" else "error"
+        self.log_viewer.add_log(format_alert_event(event), level, timestamp=event["timestamp"],
+                                source="alert-latency")
     
-    async def initial_data_load(self) -> None:
-        """İlk veri yüklemesi"""
-        await self.update_data()
-        # Otomatik yenileme başlat
-        if self.auto_refresh_enabled:
-            self.set_timer(5.0, self.update_data)
+    def update_alert_latency(self) -> None:
+        """Poller penceresi kapanan depremleri değerlendir ve paneli yenile"""
+        self.alert_monitor.tick()
+        self.alert_latency_panel.update_latency(self.alert_monitor.report())
     
-    async def update_data(self) -> None:
-        """Verileri güncelle"""
+    def update_quake_status(self) -> None:
+        """Deprem akışının durum satırı (değişmediyse dokunma)"""
+        status = self.quake_feed.status()
+        key = (status["mode"], status["received"], status["last_update"], status["error"])
+        if key == self.quake_status_key:
+            return
+        self.quake_status_key = key
+        icon = "📡" if status["mode"] == "SSE" else "🔁"
+        line = f"{icon} {status['mode']} | {status['received']} deprem, tabloda {self.quake_table.row_count}"
+        if status["last_update"]:
+            line += f" | son veri {datetime.fromtimestamp(status['last_update']).strftime('%H:%M:%S')}"
+        if status["error"]:
+            line += f" | ⚠️ {status['error']}"
+        self.quake_status.update(line)
+    
+    def apply_snapshot(self, snapshot: Dict) -> None:
+        """Toplayıcı snapshot'ını panellere uygula"""
+        # Aynı sürüm ikinci kez gelirse (ör. yenileme çakışması) panellere dokunma
+        if snapshot["version"] == self.applied_version:
+            return
+        self.applied_version = snapshot["version"]
         try:
             # Proje durumunu güncelle
-            status = self.command_runner.get_project_status()
-            status_panel = self.query_one("#status-panel", StatusPanel)
-            status_panel.update_status(status)
+            status = dict(snapshot["project"])
+            status["pm2_processes"] = snapshot["pm2"]
+            status["pm2_running"] = len(snapshot["pm2"]) > 0
+            self.status_panel.update_status(status)
             
             # Süreçleri güncelle
-            process_table = self.query_one("#process-table", ProcessTable)
-            process_table.update_processes(status["pm2_processes"])
+            self.process_table.update_processes(snapshot["pm2"], self.collector.history)
+            self.process_details.update_stats(snapshot["pm2"], snapshot.get("process_stats") or {},
+                                              snapshot["errors"].get("process_stats"))
             
             # Sistem bilgilerini güncelle
-            system_info = self.system_monitor.get_system_info()
-            system_panel = self.query_one("#system-info", SystemInfoPanel)
-            system_panel.update_system_info(system_info)
+            self.system_panel.update_system_info(snapshot["system"], self.collector.history)
+            
+            # Sunucu metriklerini güncelle
+            self.metrics_panel.update_metrics(snapshot["metrics"], snapshot["errors"].get("metrics"))
+            
+            # Uç nokta sağlığı ve SLO ihlalleri
+            health = snapshot.get("health") or {}
+            self.health_panel.update_health(health, snapshot["errors"].get("health"))
+            self.log_health_events(health)
             
         except Exception as e:
             if hasattr(self, 'log_viewer'):
                 self.log_viewer.add_log(f"Veri güncelleme hatası: {str(e)}", "error")
         
-        # Tekrar zamanlayıcı kur
-        if self.auto_refresh_enabled:
-            self.set_timer(5.0, self.update_data)
+        # Başarısız probeları yalnızca hata değiştiğinde bildir
+        for probe, error in snapshot["errors"].items():
+            if self.probe_errors.get(probe) != error and hasattr(self, 'log_viewer'):
+                if probe.startswith("abone:"):
+                    self.log_viewer.add_log(f"❌ {probe[6:]} hata verdi: {error}", "error")
+                else:
+                    self.log_viewer.add_log(f"⚠️ {probe} verisi alınamadı: {error}", "warning")
+        self.probe_errors = dict(snapshot["errors"])
+    
+    def log_health_events(self, health: Dict) -> None:
+        """Yeni SLO ihlali / düzelme olaylarını loga yaz"""
+        if not health.get("endpoints"):
+            return
+        events = health.get("events") or []
+        latest = events[-1]["seq"] if events else 0
+        if self.health_seq is None or latest < self.health_seq:
+            # İlk rapor ya da yoklayıcı yeniden başladı: geçmiş olaylar yerine süren ihlaller
+            self.health_seq = latest
+            for item in health.get("endpoints", ()):
+                if item["breach"]:
+                    self.log_viewer.add_log(
+                        f"🚨 SLO ihlali sürüyor: {item['app']} {item['path']}: {item['breach']}", "error"
+                    )
+            return
+        for event in events:
+            if event["seq"] > self.health_seq:
+                level = "error" if event["kind"] == "breach" else "success"
+                self.log_viewer.add_log(format_event(event), level, timestamp=event["timestamp"],
+                                        source="health")
+        self.health_seq = latest
+    
+    def on_pm2_event(self, event: Dict) -> None:
+        """PM2 süreç olaylarını loga yaz"""
+        process = event.get("process", {})
+        name = process.get("name", "?")
+        action = event.get("event", "?")
+        level = "error" if action in ("exit", "error") else "info"
+        self.log_viewer.add_log(f"🔔 PM2: {name} -> {action}", level)
+    
+    def update_data(self) -> None:
+        """Verileri hemen yenilet"""
+        self.collector.refresh()
     
     async def on_button_pressed(self, event: Button.Pressed) -> None:
         """Buton tıklama olayları"""
         button_id = event.button.id
         
-        # Komut butonları
-        command_map = {
-            "start-btn": "start",
-            "stop-btn": "stop",
-            "restart-btn": "restart",
-            "dev-btn": "dev",
-            "build-btn": "build",
-            "install-btn": "install",
-            "clean-btn": "clean",
-            "update-btn": "update"
-        }
+        if button_id in self.COMMAND_MAP:
+            command = self.COMMAND_MAP[button_id]
+            job, added = self.job_scheduler.submit(command)
+            if not added:
+                self.log_viewer.add_log(f"⏳ {command} zaten kuyrukta (iş #{job.id})", "info")
         
-        if button_id in command_map:
-            command = command_map[button_id]
-            await self.execute_command(command)
+        elif button_id == "cancel-btn":
+            count = self.job_scheduler.cancel_all()
+            if count:
+                self.log_viewer.add_log(f"⛔ {count} iş iptal ediliyor...", "warning")
+            else:
+                self.log_viewer.add_log("Çalışan komut yok", "info")
+        
+        elif button_id == "cancel-job-btn":
+            job_id = self.job_table.selected_job()
+            job = self.job_scheduler.get(job_id) if job_id is not None else None
+            if job is None or job.finished:
+                self.log_viewer.add_log("İptal edilecek iş seçilmedi", "info")
+            elif self.job_scheduler.cancel(job.id):
+                self.log_viewer.add_log(f"⛔ İş #{job.id} ({job.command}) iptal ediliyor...", "warning")
         
         elif button_id == "refresh-btn":
             self.log_viewer.add_log("🔄 Durum yenileniyor...", "info")
-            await self.update_data()
+            self.update_data()
         
         elif button_id == "clear-logs-btn":
             self.log_viewer.clear_logs()
-            self.log_viewer.add_log("🗑️ Loglar temizlendi", "info")
+            self.log_viewer.add_log("🗑️ Ekran temizlendi (geçmiş aramada duruyor)", "info")
         
         elif button_id == "save-logs-btn":
             await self.save_logs()
@@ -455,53 +1458,120 @@ class EpicentraTUI(App):
         """Switch değişiklik olayları"""
         if event.switch.id == "auto-refresh-switch":
             self.auto_refresh_enabled = event.value
+            self.collector.paused = not event.value
             status = "açık" if event.value else "kapalı"
             self.log_viewer.add_log(f"🔄 Otomatik yenileme {status}", "info")
     
-    async def execute_command(self, command: str) -> None:
-        """Komut çalıştır"""
-        self.log_viewer.add_log(f"🚀 Komut çalıştırılıyor: {command}", "info")
-        
-        try:
-            result = await self.command_runner.run_command(command)
-            
-            if result["success"]:
-                self.log_viewer.add_log(f"✅ Komut başarılı: {command}", "success")
-                if result["stdout"]:
-                    for line in result["stdout"].strip().split('\n'):
-                        if line.strip():
-                            self.log_viewer.add_log(line, "info")
+    def on_job_output(self, job: Job, elapsed: float, pipe: str, line: str) -> None:
+        """İş çıktısını satır satır log'a aktar"""
+        if line.strip():
+            level = "error" if pipe == "stderr" else "info"
+            self.log_viewer.add_log(f"+{elapsed:6.1f}s {line}", level, source=f"cmd:{job.command}")
+    
+    def on_job_event(self, job: Job) -> None:
+        """İş durumu değişince log'a yaz ve iş tablosunu güncelle"""
+        if job.state == QUEUED and job.blocked_by:
+            self.log_viewer.add_log(f"⏳ Komut kuyrukta: {job.command} (bekliyor: {job.blocked_by})", "info")
+        elif job.state == RUNNING and job.lines == 0 and not job.cancel_requested:
+            self.log_viewer.add_log(f"🚀 Komut çalıştırılıyor: {job.command}", "info")
+        elif job.finished:
+            result = job.result or {}
+            duration = job.duration
+            if job.state == DONE:
+                self.log_viewer.add_log(f"✅ Komut başarılı: {job.command} ({duration:.1f}s)", "success")
+            elif job.state == CANCELLED:
+                self.log_viewer.add_log(f"⛔ Komut iptal edildi: {job.command} ({duration:.1f}s)", "warning")
+            elif job.state == TIMED_OUT:
+                self.log_viewer.add_log(f"⏱️ Komut zaman aşımına uğradı: {job.command} ({duration:.1f}s)", "error")
             else:
-                self.log_viewer.add_log(f"❌ Komut başarısız: {command}", "error")
-                if result["error"]:
+                self.log_viewer.add_log(f"❌ Komut başarısız: {job.command} (çıkış kodu {result.get('returncode')})", "error")
+                if result.get("error"):
                     self.log_viewer.add_log(f"Hata: {result['error']}", "error")
-                if result["stderr"]:
-                    for line in result["stderr"].strip().split('\n'):
-                        if line.strip():
-                            self.log_viewer.add_log(line, "error")
-            
-            # Durum güncelle
-            await self.update_data()
-            
-        except Exception as e:
-            self.log_viewer.add_log(f"❌ Komut çalıştırma hatası: {str(e)}", "error")
+            if job.started_at is not None:
+                # Durum güncelle
+                self.update_data()
+        self.job_table.update_jobs(self.job_scheduler.jobs, self.job_scheduler)
+    
+    def update_running_jobs(self) -> None:
+        """Çalışan işlerin süre ve ilerleme hücrelerini yenile"""
+        if self.job_scheduler.running:
+            self.job_table.update_jobs(self.job_scheduler.jobs, self.job_scheduler)
     
     async def save_logs(self) -> None:
-        """Logları dosyaya kaydet"""
+        """Tüm log geçmişini dosyaya kaydet"""
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             log_file = f"epicentra_logs_{timestamp}.txt"
             
-            with open(log_file, 'w', encoding='utf-8') as f:
-                f.write("# Epicentra TUI Bot Logları\n")
-                f.write(f"# Oluşturulma Tarihi: {datetime.now()}\n\n")
-                for log in self.log_viewer.logs:
-                    f.write(f"{log}\n")
+            # Bekleyen satırlar önce depoya yazılsın; dosya yazımı aynı thread'de sırayla yapılır
+            self.log_viewer.flush()
+            loop = asyncio.get_running_loop()
+            count = await loop.run_in_executor(
+                self.store_executor, self.log_store.export, log_file
+            )
             
-            self.log_viewer.add_log(f"💾 Loglar kaydedildi: {log_file}", "success")
+            self.log_viewer.add_log(f"💾 {count} log kaydedildi: {log_file}", "success")
             
         except Exception as e:
             self.log_viewer.add_log(f"❌ Log kaydetme hatası: {str(e)}", "error")
+    
+    async def on_input_submitted(self, event: Input.Submitted) -> None:
+        """Arama kutusu"""
+        if event.input.id == "log-query":
+            await self.search_logs(event.value)
+        elif event.input.id == "quake-query":
+            self.search_quakes(event.value)
+    
+    def search_quakes(self, text: str) -> None:
+        """Alınan depremlerde konum sorgusu çalıştır ve sonuçları alt tabloda göster"""
+        info = self.query_one("#quake-query-info", Static)
+        results = self.query_one("#quake-results", QuakeTable)
+        if not text.strip():
+            results.show_hits([])
+            info.update("")
+            return
+        
+        try:
+            query = SpatialQuery.parse(text)
+        except ValueError as e:
+            info.update(f"❌ Geçersiz konum sorgusu: {e}")
+            return
+        
+        start = time.perf_counter()
+        hits = query.run(self.quake_index)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        results.show_hits(hits)
+        line = f"🗺️ {query.describe()}: {len(hits)} deprem ({len(self.quake_index)} içinde, {elapsed_ms:.1f}ms)"
+        if len(hits) > results.max_rows:
+            line += f" | ilk {results.max_rows} gösteriliyor"
+        info.update(line)
+    
+    async def search_logs(self, text: str) -> None:
+        """Log deposunda ara ve sonuçları alt panelde göster"""
+        log_info = self.query_one("#log-info", Static)
+        results_view = self.query_one("#log-results", LogViewer)
+        if not text.strip():
+            results_view.clear_logs()
+            log_info.update("Son 20000 log tutuluyor (yukarı kaydırılabilir)")
+            return
+        
+        try:
+            query = parse_query(text)
+            self.log_viewer.flush()
+            loop = asyncio.get_running_loop()
+            start = time.perf_counter()
+            entries = await loop.run_in_executor(
+                self.store_executor, self.log_store.query, query
+            )
+            elapsed_ms = (time.perf_counter() - start) * 1000
+        except (ValueError, re.error) as e:
+            log_info.update(f"❌ Geçersiz arama: {e}")
+            return
+        
+        results_view.show_entries(entries)
+        log_info.update(
+            f"🔎 {len(entries)} sonuç, {elapsed_ms:.0f} ms ({self.log_store.total} kayıt içinde)"
+        )
 
 
 def main():
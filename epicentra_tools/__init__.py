@@ -0,0 +1,3 @@
+"""
+🤖 Epicentra TUI araçları - TUI'ların ortak kullandığı yardımcı modüller
+"""
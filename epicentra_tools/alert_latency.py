@@ -0,0 +1,383 @@
+"""
+Uyarı gecikmesi izleyici - deprem anından push bildirimine kadar geçen süre
+
+server/tasks/earthquake-poller.ts yalnızca 30 saniyeden genç depremleri
+"yeni" sayar; yoklama ya da listeye düşme gecikirse uyarı sessizce hiç
+gönderilmez. Burada her deprem için şu aralar ölçülür:
+
+    liste   deprem `Date` -> /api/earthquakes-combined'da ilk görülme (TUI yoklaması)
+    SSE     deprem `Date` -> /api/early-warning-sse'den gelme
+    poller  deprem `Date` -> "New earthquake detected" log satırı (pm2 logu)
+
+Gecikmeler P² algoritmasıyla (Jain & Chlamtac 1985) sabit bellekte akan
+yüzdeliklere dönüştürülür. Listede görülüp poller penceresi kapandığı hâlde
+log satırı gelmeyen depremler "kaçan uyarı" sayılır ve hemen bildirilir;
+aşama p95'i ya da kaçan uyarı oranı hedefi aşarsa ihlal olayı üretilir.
+Açılıştaki ilk liste (önceden olmuş depremler) ölçülmez.
+"""
+
+import math
+import re
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from epicentra_tools.health_prober import MAX_EVENTS, percentile
+from epicentra_tools.quake_catalog import parse_time
+from epicentra_tools.quake_feed import SeenIds
+
+
+# earthquake-poller.ts: bu süreden eski depremler için bildirim gönderilmez
+POLLER_WINDOW = 30.0
+
+# (aşama, başlık)
+STAGES: Tuple[Tuple[str, str], ...] = (
+    ("list", "Birleşik liste"),
+    ("sse", "SSE"),
+    ("poller", "Poller bildirimi"),
+)
+
+# "[earthquake-poller] New earthquake detected: M4.2 İzmir (2025-10-02 19:53:59_38.1_27.2)"
+# Eski sürümler kimliği yazmaz; o durumda büyüklük + şehirle eşleştirilir
+DETECTED_RE = re.compile(
+    r"\[earthquake-poller\] New earthquake detected: M(\S+) (.*?)(?: \(([^()]*)\))?\s*$"
+)
+
+
+class P2Quantile:
+    """P² akan yüzdelik tahmini (beş işaretçi, sabit bellek)"""
+
+    def __init__(self, q: float):
+        self.q = q
+        self.count = 0
+        self.heights: List[float] = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1.0, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5.0]
+        self.increments = (0.0, q / 2, q, (1 + q) / 2, 1.0)
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        heights = self.heights
+        if self.count <= 5:
+            heights.append(value)
+            heights.sort()
+            return
+
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = 0
+            while value >= heights[cell + 1]:
+                cell += 1
+        positions = self.positions
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # Ara işaretçileri istenen konumlarına parabolik (olmazsa doğrusal) kaydır
+        for i in (1, 2, 3):
+            delta = self.desired[i] - positions[i]
+            if ((delta >= 1 and positions[i + 1] - positions[i] > 1)
+                    or (delta <= -1 and positions[i - 1] - positions[i] < -1)):
+                step = 1 if delta > 0 else -1
+                candidate = self._parabolic(i, step)
+                if not heights[i - 1] < candidate < heights[i + 1]:
+                    candidate = heights[i] + step * (heights[i + step] - heights[i]) / (
+                        positions[i + step] - positions[i])
+                heights[i] = candidate
+                positions[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        n, h = self.positions, self.heights
+        return h[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (h[i] - h[i - 1]) / (n[i] - n[i - 1]))
+
+    def value(self) -> Optional[float]:
+        if self.count == 0:
+            return None
+        if self.count <= 5:
+            return percentile(self.heights, self.q)
+        return self.heights[2]
+
+
+class AlertSlo:
+    """Aşama hedefi: p95 gecikme ve (poller için) kaçan uyarı oranı"""
+
+    def __init__(self, p95_s: float, max_missed_rate: float = 0.05, min_samples: int = 5):
+        self.p95_s = p95_s
+        self.max_missed_rate = max_missed_rate
+        # Tek geç deprem ihlal sayılmasın diye en az bu kadar ölçüm aranır
+        self.min_samples = min_samples
+
+    def to_dict(self) -> Dict:
+        return {"p95_s": self.p95_s, "max_missed_rate": self.max_missed_rate}
+
+
+DEFAULT_ALERT_SLOS = {
+    "list": AlertSlo(20.0),
+    "sse": AlertSlo(20.0),
+    # Poller 30 saniyelik pencereden sonra bildirim göndermez; 5 saniye pay bırakılır
+    "poller": AlertSlo(POLLER_WINDOW - 5.0),
+}
+
+
+class StageStats:
+    """Tek aşamanın gecikme yüzdelikleri ve SLO durumu"""
+
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self, name: str, label: str, slo: AlertSlo):
+        self.name = name
+        self.label = label
+        self.slo = slo
+        self.count = 0
+        self.missed = 0
+        self.last: Optional[float] = None
+        self.max: Optional[float] = None
+        self.estimators = {q: P2Quantile(q) for q in self.QUANTILES}
+        self.breach: Optional[str] = None
+
+    def record(self, seconds: float) -> None:
+        # Saat farkı yüzünden eksi çıkan gecikmeler sıfır sayılır
+        seconds = max(0.0, seconds)
+        self.count += 1
+        self.last = seconds
+        self.max = seconds if self.max is None else max(self.max, seconds)
+        for estimator in self.estimators.values():
+            estimator.add(seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        return self.estimators[q].value()
+
+    def check_slo(self) -> Optional[str]:
+        """Aşama hedefi aşıyorsa nedenini döndür"""
+        p95 = self.quantile(0.95)
+        if self.count >= self.slo.min_samples and p95 is not None and p95 > self.slo.p95_s:
+            return f"p95 {p95:.1f}s > {self.slo.p95_s:g}s"
+        total = self.count + self.missed
+        if total >= self.slo.min_samples and self.missed / total > self.slo.max_missed_rate:
+            return f"kaçan uyarı %{self.missed / total * 100:.0f} ({self.missed}/{total})"
+        return None
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "label": self.label,
+            "count": self.count,
+            "missed": self.missed,
+            "last": self.last,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "slo": self.slo.to_dict(),
+            "breach": self.breach,
+        }
+
+
+class EventTrack:
+    """Tek depremin aşamalardaki ilk görülme zamanları"""
+
+    def __init__(self, quake_id: str, event_time: float, magnitude: Optional[float],
+                 city: str, first_seen: float):
+        self.quake_id = quake_id
+        self.event_time = event_time
+        self.magnitude = magnitude
+        self.city = city
+        self.first_seen = first_seen
+        self.seen: Dict[str, float] = {}
+        self.missed = False
+
+    def describe(self) -> str:
+        magnitude = "?" if self.magnitude is None else f"{self.magnitude:g}"
+        return f"M{magnitude} {self.city}"
+
+
+def _magnitude(value: object) -> Optional[float]:
+    try:
+        magnitude = float(value)
+    except (TypeError, ValueError):
+        return None
+    return magnitude if math.isfinite(magnitude) else None
+
+
+class AlertLatencyMonitor:
+    """Deprem başına uyarı hattı gecikmesi ve kaçan uyarılar"""
+
+    def __init__(self, slos: Optional[Dict[str, AlertSlo]] = None,
+                 max_age: float = 3600.0, log_grace: float = 15.0, settle: float = 120.0):
+        slos = DEFAULT_ALERT_SLOS if slos is None else slos
+        self.stages = {name: StageStats(name, label, slos.get(name, AlertSlo(20.0)))
+                       for name, label in STAGES}
+        # İlk görüldüğünde bundan eski depremler (geç yayın, kimlik değişikliği) ölçülmez
+        self.max_age = max_age
+        # Log satırının dosyaya düşüp takipçiye ulaşması için beklenen süre
+        self.log_grace = log_grace
+        # İzlenen deprem bu süre sonunda kapatılır (geç gelen SSE/liste artık ölçülmez)
+        self.settle = settle
+        self.started = time.time()
+        self.primed = False
+        self.tracks: "OrderedDict[str, EventTrack]" = OrderedDict()
+        # Açılış listesi ve kapatılmış depremler; tekrar izlenmez
+        self.known = SeenIds(2000)
+        # Depremden önce gelen poller satırları: (zaman, büyüklük, şehir, kimlik)
+        self.pending_logs: Deque[Tuple[float, Optional[float], str, Optional[str]]] = deque(maxlen=200)
+        self.poller_lines = 0
+        self.ignored = 0
+        self.events: Deque[Dict] = deque(maxlen=MAX_EVENTS)
+        self.event_seq = 0
+        self.listeners: List[Callable[[Dict], None]] = []
+
+    def subscribe(self, callback: Callable[[Dict], None]) -> None:
+        """Kaçan uyarı ve SLO ihlali / düzelme olaylarında çağrılacak fonksiyonu kaydet"""
+        self.listeners.append(callback)
+
+    def _emit(self, kind: str, **fields) -> None:
+        self.event_seq += 1
+        event = dict(fields, seq=self.event_seq, timestamp=time.time(), kind=kind)
+        self.events.append(event)
+        for callback in list(self.listeners):
+            try:
+                callback(event)
+            except Exception:
+                pass
+
+    def _check(self, stats: StageStats) -> None:
+        breach = stats.check_slo()
+        if breach and not stats.breach:
+            self._emit("breach", stage=stats.name, label=stats.label, reason=breach)
+        elif stats.breach and not breach:
+            self._emit("recovered", stage=stats.name, label=stats.label, reason=None)
+        stats.breach = breach
+
+    def _record(self, track: EventTrack, stage: str, at: float) -> None:
+        if stage in track.seen:
+            return
+        track.seen[stage] = at
+        stats = self.stages[stage]
+        stats.record(at - track.event_time)
+        self._check(stats)
+
+    def observe(self, channel: str, quakes: List[Dict], received_at: float) -> None:
+        """Deprem akışından gelen teslimat (QuakeFeed.subscribe; kanal "poll" ya da "sse")"""
+        if channel == "poll" and not self.primed:
+            # Açılıştaki liste zaten olmuş depremlerdir: yalnızca hatırlanır
+            self.primed = True
+            self.known.ensure_capacity(len(quakes))
+            for quake in quakes:
+                if isinstance(quake, dict) and quake.get("ID") is not None:
+                    self.known.add(str(quake["ID"]))
+            return
+
+        stage = "list" if channel == "poll" else "sse"
+        self.known.ensure_capacity(len(quakes))
+        for quake in quakes:
+            if not isinstance(quake, dict) or quake.get("ID") is None:
+                continue
+            key = str(quake["ID"])
+            track = self.tracks.get(key)
+            if track is None:
+                if key in self.known:
+                    continue
+                moment = parse_time(quake.get("Date"))
+                if moment is None or received_at - moment / 1000 > self.max_age:
+                    self.known.add(key)
+                    self.ignored += 1
+                    continue
+                region = quake.get("Region") or {}
+                track = EventTrack(key, moment / 1000, _magnitude(quake.get("Magnitude")),
+                                   str(region.get("City") or "undefined"), received_at)
+                self.tracks[key] = track
+                self._match_pending(track)
+            self._record(track, stage, received_at)
+
+    def observe_log(self, timestamp: float, app: str, text: str) -> None:
+        """Sunucu log satırı (LogTailer); yalnızca poller satırlarına bakılır"""
+        if "[earthquake-poller]" not in text:
+            return
+        self.poller_lines += 1
+        match = DETECTED_RE.search(text)
+        if not match:
+            return
+        magnitude, city, quake_id = _magnitude(match.group(1)), match.group(2), match.group(3)
+        track = self._find(timestamp, magnitude, city, quake_id)
+        if track is None:
+            # Poller depremi TUI yoklamasından önce görmüş olabilir
+            self.pending_logs.append((timestamp, magnitude, city, quake_id))
+        else:
+            self._record(track, "poller", timestamp)
+
+    def _matches(self, track: EventTrack, timestamp: float, magnitude: Optional[float],
+                 city: str, quake_id: Optional[str]) -> bool:
+        if "poller" in track.seen or track.missed:
+            return False
+        if quake_id:
+            return track.quake_id == quake_id
+        return (track.magnitude == magnitude and track.city == city
+                and -self.log_grace <= timestamp - track.event_time <= POLLER_WINDOW + self.log_grace)
+
+    def _find(self, timestamp: float, magnitude: Optional[float], city: str,
+              quake_id: Optional[str]) -> Optional[EventTrack]:
+        if quake_id:
+            track = self.tracks.get(quake_id)
+            return track if track is not None and self._matches(track, timestamp, magnitude, city, quake_id) else None
+        for track in reversed(self.tracks.values()):
+            if self._matches(track, timestamp, magnitude, city, None):
+                return track
+        return None
+
+    def _match_pending(self, track: EventTrack) -> None:
+        for entry in list(self.pending_logs):
+            timestamp, magnitude, city, quake_id = entry
+            if self._matches(track, timestamp, magnitude, city, quake_id):
+                self.pending_logs.remove(entry)
+                self._record(track, "poller", timestamp)
+                return
+
+    def tick(self, now: Optional[float] = None) -> None:
+        """Poller penceresi kapanan depremleri değerlendir, eski kayıtları kapat"""
+        now = time.time() if now is None else now
+        poller = self.stages["poller"]
+        for key, track in list(self.tracks.items()):
+            if ("poller" not in track.seen and not track.missed
+                    and now >= track.event_time + POLLER_WINDOW + self.log_grace
+                    and now >= track.first_seen + self.log_grace):
+                track.missed = True
+                poller.missed += 1
+                first = min(track.seen.values()) if track.seen else track.first_seen
+                self._emit("missed", quake=track.describe(), quake_id=track.quake_id,
+                           delay=first - track.event_time)
+                self._check(poller)
+            if now - track.first_seen >= self.settle and ("poller" in track.seen or track.missed):
+                del self.tracks[key]
+                self.known.add(key)
+        while self.pending_logs and now - self.pending_logs[0][0] > self.settle:
+            self.pending_logs.popleft()
+
+    def report(self) -> Dict:
+        """Panel için durum"""
+        return {
+            "stages": [stats.to_dict() for stats in self.stages.values()],
+            "tracking": len(self.tracks),
+            "ignored": self.ignored,
+            "poller_lines": self.poller_lines,
+            "primed": self.primed,
+            "breaches": sum(1 for stats in self.stages.values() if stats.breach),
+            "events": list(self.events),
+        }
+
+
+def format_event(event: Dict) -> str:
+    """Olayın log satırı"""
+    if event["kind"] == "missed":
+        return (f"🚨 Uyarı gönderilmedi: {event['quake']} depremden {event['delay']:.0f}s sonra "
+                f"görüldü, poller {POLLER_WINDOW:.0f}s içinde bildirmedi")
+    if event["kind"] == "breach":
+        return f"🚨 Uyarı gecikmesi SLO ihlali: {event['label']}: {event['reason']}"
+    return f"✅ Uyarı gecikmesi normale döndü: {event['label']}"
@@ -0,0 +1,365 @@
+"""
+Build/install önbelleği - girdiler değişmediyse npm install ve nuxt build'i atlar
+
+Her adımın girdileri (install: package.json ve kilit dosyaları; build:
+kaynak dizinleri, nuxt.config.ts, kurulu paket ağacı) içerik özetiyle
+parmak izine çevrilir. Dosya özetleri mtime/boyut/inode ile önbelleğe
+alınır; yalnızca değişen dosyalar thread havuzunda paralel olarak yeniden
+okunur. Son başarılı çalışmanın parmak izi ve dosya listesi saklanır,
+girdiler aynıysa ve çıktı yerindeyse adım atlanır; değilse hangi
+dosyaların değiştiği gösterilir.
+
+epicentra-bot.sh'in install adımı node_modules varsa hiçbir şey yapmaz,
+kilit dosyası değişse bile. Burada node_modules varken girdiler
+değiştiyse npm install doğrudan çalıştırılır.
+
+    python3 -m epicentra_tools.build_cache run build|install [--force]
+    python3 -m epicentra_tools.build_cache check build|install
+    python3 -m epicentra_tools.build_cache status
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+
+class Step:
+    """Önbelleğe alınan adımın girdi ve çıktıları (proje köküne göre yollar)"""
+
+    def __init__(self, files: Tuple[str, ...], dirs: Tuple[str, ...], outputs: Tuple[str, ...]):
+        self.files = files
+        self.dirs = dirs
+        # Adımın atlanabilmesi için hepsi mevcut olmalı
+        self.outputs = outputs
+
+
+STEPS = {
+    "install": Step(
+        files=("package.json", "package-lock.json", "yarn.lock", ".npmrc",
+               "monitoring/package.json", "monitoring/package-lock.json"),
+        dirs=(),
+        outputs=("node_modules/.package-lock.json",),
+    ),
+    "build": Step(
+        files=("nuxt.config.ts", "app.config.ts", "app.vue", "error.vue", "tsconfig.json",
+               "package.json", "package-lock.json", ".env",
+               # npm her kurulumda yazar: kilit dosyası değişmeden yapılan kurulumları da yakalar
+               "node_modules/.package-lock.json"),
+        dirs=("assets", "components", "composables", "constants", "interfaces", "layouts",
+              "middleware", "pages", "plugins", "public", "server", "store", "types", "utils"),
+        outputs=(".output/server/index.mjs",),
+    ),
+}
+
+SKIP_DIRS = {"node_modules", ".nuxt", ".output", ".git", "__pycache__", ".cache"}
+CACHE_VERSION = 1
+# Yazımı bu kadar yeni olan dosyanın özeti saklanmaz: aynı saniyede yeniden
+# yazılırsa mtime/boyut aynı kalabilir (git'in "racy clean" durumu)
+RACY_WINDOW = 2.0
+HASH_CHUNK = 1024 * 1024
+MAX_LISTED_CHANGES = 10
+
+
+def default_cache_dir(project_root: str) -> str:
+    """Önbellek dizini"""
+    return os.path.join(project_root, "logs", "build-cache")
+
+
+def hash_file(path: str) -> str:
+    """Dosya içeriğinin özeti (hashlib büyük bloklarda GIL'i bırakır)"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(HASH_CHUNK)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def node_version() -> str:
+    """Kurulu node sürümü (yerel modüller sürüme bağlı derlenir); yoksa boş"""
+    try:
+        result = subprocess.run(["node", "--version"], stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        return ""
+    return result.stdout.decode(errors="replace").strip()
+
+
+class BuildCache:
+    """Dosya özeti önbelleği ve adımların son başarılı parmak izleri"""
+
+    def __init__(self, project_root: str, cache_dir: Optional[str] = None,
+                 max_workers: Optional[int] = None):
+        self.project_root = project_root
+        self.cache_dir = cache_dir or default_cache_dir(project_root)
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self.files_path = os.path.join(self.cache_dir, "files.json")
+        self.state_path = os.path.join(self.cache_dir, "state.json")
+        # relpath -> [mtime_ns, size, inode, özet]
+        self.file_hashes: Dict[str, list] = self._load(self.files_path).get("files", {})
+        self.dirty = False
+        self._node_version: Optional[str] = None
+        self.stats = {"stat": 0, "hashed": 0}
+
+    def _load(self, path: str) -> Dict:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return {}
+        return data
+
+    def _save(self, path: str, data: Dict) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp = f"{path}.{os.getpid()}.tmp"
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump(dict(data, version=CACHE_VERSION), f, separators=(",", ":"))
+        os.replace(temp, path)
+
+    def node_version(self) -> str:
+        if self._node_version is None:
+            self._node_version = node_version()
+        return self._node_version
+
+    def _walk(self, step: Step) -> Dict[str, os.stat_result]:
+        """Adımın girdi dosyaları ve stat bilgileri"""
+        found: Dict[str, os.stat_result] = {}
+        for rel in step.files:
+            try:
+                stat = os.stat(os.path.join(self.project_root, rel))
+            except OSError:
+                continue
+            found[rel] = stat
+        pending = [rel for rel in step.dirs if os.path.isdir(os.path.join(self.project_root, rel))]
+        while pending:
+            rel_dir = pending.pop()
+            try:
+                entries = list(os.scandir(os.path.join(self.project_root, rel_dir)))
+            except OSError:
+                continue
+            for entry in entries:
+                rel = f"{rel_dir}/{entry.name}"
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS:
+                            pending.append(rel)
+                    elif entry.is_file():
+                        found[rel] = entry.stat()
+                except OSError:
+                    continue
+        self.stats["stat"] += len(found)
+        return found
+
+    def manifest(self, step_name: str) -> Dict[str, str]:
+        """Girdi dosyalarının özetleri; yalnızca değişen dosyalar okunur"""
+        step = STEPS[step_name]
+        found = self._walk(step)
+        # Adımın kapsamında olup artık bulunmayan dosyalar önbellekten atılır
+        prefixes = tuple(f"{rel}/" for rel in step.dirs)
+        for rel in [rel for rel in self.file_hashes
+                    if rel not in found and (rel in step.files or rel.startswith(prefixes))]:
+            del self.file_hashes[rel]
+            self.dirty = True
+        now = time.time()
+        results: Dict[str, str] = {}
+        to_hash: List[Tuple[str, os.stat_result]] = []
+        for rel, stat in found.items():
+            cached = self.file_hashes.get(rel)
+            if cached and cached[:3] == [stat.st_mtime_ns, stat.st_size, stat.st_ino]:
+                results[rel] = cached[3]
+            else:
+                to_hash.append((rel, stat))
+        if to_hash:
+            paths = [os.path.join(self.project_root, rel) for rel, _ in to_hash]
+            if len(to_hash) > 1 and self.max_workers > 1:
+                with ThreadPoolExecutor(max_workers=self.max_workers,
+                                        thread_name_prefix="build-cache") as pool:
+                    digests = list(pool.map(self._safe_hash, paths))
+            else:
+                digests = [self._safe_hash(path) for path in paths]
+            for (rel, stat), digest in zip(to_hash, digests):
+                if digest is None:
+                    continue
+                results[rel] = digest
+                self.stats["hashed"] += 1
+                if now - stat.st_mtime_ns / 1e9 > RACY_WINDOW:
+                    self.file_hashes[rel] = [stat.st_mtime_ns, stat.st_size, stat.st_ino, digest]
+                    self.dirty = True
+        return results
+
+    @staticmethod
+    def _safe_hash(path: str) -> Optional[str]:
+        try:
+            return hash_file(path)
+        except OSError:
+            return None
+
+    def fingerprint(self, manifest: Dict[str, str]) -> str:
+        """Dosya listesinden ve node sürümünden tek parmak izi"""
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f"node {self.node_version()}\n".encode())
+        for rel in sorted(manifest):
+            digest.update(f"{rel}\0{manifest[rel]}\n".encode("utf-8", errors="surrogateescape"))
+        return digest.hexdigest()
+
+    def flush(self) -> None:
+        """Değişen dosya özetlerini kaydet"""
+        if not self.dirty:
+            return
+        try:
+            self._save(self.files_path, {"files": self.file_hashes})
+            self.dirty = False
+        except OSError:
+            pass
+
+    def check(self, step_name: str) -> Dict:
+        """Adımın durumu: fresh (atlanabilir), stale, missing (çıktı yok) ya da never"""
+        step = STEPS[step_name]
+        manifest = self.manifest(step_name)
+        fingerprint = self.fingerprint(manifest)
+        self.flush()
+        record = self._load(self.state_path).get("steps", {}).get(step_name)
+        missing = [rel for rel in step.outputs
+                   if not os.path.exists(os.path.join(self.project_root, rel))]
+        result = {"step": step_name, "fingerprint": fingerprint, "files": len(manifest),
+                  "manifest": manifest, "missing_outputs": missing,
+                  "changed": [], "added": [], "removed": [], "recorded_at": None}
+        if record is None:
+            result["state"] = "missing" if missing else "never"
+            return result
+        previous = record.get("manifest", {})
+        result["recorded_at"] = record.get("at")
+        result["changed"] = sorted(rel for rel in manifest if rel in previous and previous[rel] != manifest[rel])
+        result["added"] = sorted(rel for rel in manifest if rel not in previous)
+        result["removed"] = sorted(rel for rel in previous if rel not in manifest)
+        if missing:
+            result["state"] = "missing"
+        elif record.get("fingerprint") == fingerprint:
+            result["state"] = "fresh"
+        else:
+            result["state"] = "stale"
+        return result
+
+    def record(self, step_name: str, check: Dict, duration: Optional[float] = None) -> None:
+        """Başarılı çalışmanın (çalışmadan önce alınmış) parmak izini kaydet"""
+        state = self._load(self.state_path)
+        steps = state.get("steps", {})
+        steps[step_name] = {"fingerprint": check["fingerprint"], "manifest": check["manifest"],
+                            "at": time.time(), "duration": duration}
+        self._save(self.state_path, {"steps": steps})
+
+    def status(self) -> Dict[str, str]:
+        """Her adımın durumu (TUI durum paneli için)"""
+        return {name: self.check(name)["state"] for name in STEPS}
+
+
+def describe_changes(check: Dict) -> List[str]:
+    """Son başarılı çalışmadan bu yana değişen girdilerin satırları"""
+    lines = []
+    for label, key in (("değişti", "changed"), ("eklendi", "added"), ("silindi", "removed")):
+        paths = check[key]
+        if paths:
+            shown = ", ".join(paths[:MAX_LISTED_CHANGES])
+            more = f" (+{len(paths) - MAX_LISTED_CHANGES})" if len(paths) > MAX_LISTED_CHANGES else ""
+            lines.append(f"   {label}: {shown}{more}")
+    if not lines and check["state"] == "stale":
+        lines.append("   node sürümü değişti")
+    for rel in check["missing_outputs"]:
+        lines.append(f"   çıktı yok: {rel}")
+    return lines
+
+
+def step_commands(project_root: str, step_name: str) -> List[Tuple[List[str], str]]:
+    """Adımı çalıştıran komutlar (argv, çalışma dizini)"""
+    bot = os.path.join(project_root, "epicentra-bot.sh")
+    if step_name == "build" or not os.path.isdir(os.path.join(project_root, "node_modules")):
+        # İlk kurulumda bot gereksinimleri (node, npm, pm2) de denetler
+        return [(["bash", bot, step_name], project_root)]
+    # Bot node_modules varken kurulumu atlar; girdiler değiştiyse npm doğrudan çalıştırılır
+    commands = [(["npm", "install"], project_root)]
+    monitoring = os.path.join(project_root, "monitoring")
+    if os.path.exists(os.path.join(monitoring, "package.json")):
+        commands.append((["npm", "install"], monitoring))
+    return commands
+
+
+def run_step(cache: BuildCache, step_name: str, force: bool = False, log=print) -> int:
+    """Gerekliyse adımı çalıştır ve başarılıysa parmak izini kaydet; çıkış kodu"""
+    started = time.monotonic()
+    check = cache.check(step_name)
+    elapsed = (time.monotonic() - started) * 1000
+    log(f"🔎 {step_name} girdileri: {check['files']} dosya, {cache.stats['hashed']} dosya okundu ({elapsed:.0f}ms)")
+    if check["state"] == "fresh" and not force:
+        log(f"⏭️ {step_name} atlandı: son başarılı çalışmadan bu yana girdiler değişmedi "
+            f"(zorlamak için --force)")
+        return 0
+    if check["state"] == "fresh":
+        log(f"⚠️ Girdiler değişmedi, {step_name} --force ile yine de çalıştırılıyor")
+    elif check["state"] == "never":
+        log(f"▶️ {step_name}: önceki başarılı çalışma kaydı yok")
+    else:
+        log(f"▶️ {step_name} gerekli:")
+        for line in describe_changes(check):
+            log(line)
+    run_started = time.monotonic()
+    for argv, cwd in step_commands(cache.project_root, step_name):
+        try:
+            returncode = subprocess.call(argv, cwd=cwd)
+        except OSError as e:
+            log(f"❌ {' '.join(argv)}: {e}")
+            return 1
+        if returncode != 0:
+            log(f"❌ {step_name} başarısız (çıkış kodu {returncode}), parmak izi kaydedilmedi")
+            return returncode
+    duration = time.monotonic() - run_started
+    missing = [rel for rel in STEPS[step_name].outputs
+               if not os.path.exists(os.path.join(cache.project_root, rel))]
+    if missing:
+        log(f"⚠️ {step_name} bitti ama çıktı yok ({', '.join(missing)}), parmak izi kaydedilmedi")
+        return 0
+    cache.record(step_name, check, duration)
+    log(f"💾 {step_name} parmak izi kaydedildi ({duration:.1f}s)")
+    return 0
+
+
+def main(argv=None) -> int:
+    """Komut satırı girişi"""
+    default_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description="Epicentra build/install önbelleği")
+    parser.add_argument("--project-root", default=default_root, help="proje dizini")
+    parser.add_argument("--cache-dir", help="önbellek dizini (varsayılan logs/build-cache)")
+    sub = parser.add_subparsers(dest="action", required=True)
+    run = sub.add_parser("run", help="girdiler değiştiyse adımı çalıştır")
+    run.add_argument("step", choices=sorted(STEPS))
+    run.add_argument("--force", action="store_true", help="girdiler aynı olsa da çalıştır")
+    check = sub.add_parser("check", help="adım güncel mi (güncelse çıkış kodu 0, değilse 1)")
+    check.add_argument("step", choices=sorted(STEPS))
+    sub.add_parser("status", help="tüm adımların durumu (JSON)")
+    args = parser.parse_args(argv)
+
+    cache = BuildCache(args.project_root, args.cache_dir)
+    log = lambda message: print(message, flush=True)
+    if args.action == "run":
+        return run_step(cache, args.step, args.force, log)
+    if args.action == "check":
+        result = cache.check(args.step)
+        log(f"{args.step}: {result['state']} ({result['files']} dosya)")
+        for line in describe_changes(result):
+            log(line)
+        return 0 if result["state"] == "fresh" else 1
+    print(json.dumps(cache.status(), ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
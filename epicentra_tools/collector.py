@@ -0,0 +1,384 @@
+"""
+Veri toplayıcı motoru - pm2, psutil ve proje kontrollerini event loop'u bloklamadan çalıştırır
+"""
+
+import asyncio
+import os
+import select
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import psutil
+
+from epicentra_tools.build_cache import BuildCache
+from epicentra_tools.collector_client import CallbackErrors
+from epicentra_tools.health_prober import HealthProber
+from epicentra_tools.metric_history import MetricHistory, snapshot_metrics
+from epicentra_tools.metrics_scraper import MetricsScraper
+from epicentra_tools.pm2_client import Pm2EventListener, Pm2RpcClient, get_pm2_processes
+from epicentra_tools.process_sampler import ProcessSampler
+
+
+Snapshot = Dict[str, Any]
+SnapshotCallback = Callable[[Snapshot], Any]
+
+
+class Probe:
+    """Tek bir veri kaynağı tanımı"""
+
+    def __init__(self, name: str, func: Callable, timeout: float,
+                 blocking: bool = True, default: Any = None):
+        self.name = name
+        self.func = func
+        self.timeout = timeout
+        self.blocking = blocking
+        self.default = default
+        self.last_value = default
+        self.last_duration = 0.0
+        self.last_error: Optional[str] = None
+        self.in_flight: Optional[asyncio.Future] = None
+
+
+def default_history_path(project_root: str) -> str:
+    """Metrik geçmişi dosyası (TUI ve toplayıcı daemon'u aynı dosyayı kullanır)"""
+    return os.path.join(project_root, "logs", "tui-metric-history.bin")
+
+
+def get_project_status(project_root: str, build_cache: Optional[BuildCache] = None) -> Dict:
+    """Proje dosyalarının durumunu kontrol et
+
+    build_cache verilirse install/build adımlarının son başarılı çalışmaya
+    göre güncel olup olmadığı da eklenir (yalnızca değişen dosyalar okunur).
+    """
+    status = {
+        "project_exists": os.path.exists(os.path.join(project_root, "package.json")),
+        "node_modules_exists": os.path.exists(os.path.join(project_root, "node_modules")),
+        "build_exists": os.path.exists(os.path.join(project_root, ".output")),
+    }
+    if build_cache is not None:
+        status["steps"] = build_cache.status()
+    return status
+
+
+def get_system_info() -> Dict:
+    """Sistem bilgilerini al (CPU, son çağrıdan bu yana geçen süreye göre ölçülür)"""
+    cpu_percent = psutil.cpu_percent(interval=None)
+    memory = psutil.virtual_memory()
+    disk = psutil.disk_usage('/')
+
+    return {
+        "cpu_percent": cpu_percent,
+        "memory_percent": memory.percent,
+        "memory_used": memory.used // (1024**3),  # GB
+        "memory_total": memory.total // (1024**3),  # GB
+        "disk_percent": disk.percent,
+        "disk_used": disk.used // (1024**3),  # GB
+        "disk_total": disk.total // (1024**3),  # GB
+    }
+
+
+EMPTY_SYSTEM_INFO = {
+    "cpu_percent": 0,
+    "memory_percent": 0,
+    "memory_used": 0,
+    "memory_total": 0,
+    "disk_percent": 0,
+    "disk_used": 0,
+    "disk_total": 0,
+}
+
+
+class Collector:
+    """Probeları eşzamanlı çalıştırıp snapshot yayınlayan toplayıcı"""
+
+    def __init__(self, project_root: str, interval: float = 5.0, max_workers: int = 4,
+                 history_path: Optional[str] = None, history_flush_interval: float = 60.0):
+        self.project_root = project_root
+        self.interval = interval
+        self.paused = False
+        self.probes: Dict[str, Probe] = {}
+        self.subscribers: List[SnapshotCallback] = []
+        self.event_subscribers: List[Callable[[Dict], Any]] = []
+        # Abone hataları sayılır ve sonraki snapshot'ın "errors" alanında görünür
+        self.callback_errors = CallbackErrors()
+        self.snapshot: Snapshot = {}
+        self.version = 0
+        # Sayısal metriklerin sabit bellekli geçmişi (grafikler için); dosya verilirse
+        # mmap ile kalıcıdır ve yeniden başlatmada son 24 saat hemen görünür
+        self.history_error: Optional[str] = None
+        try:
+            self.history = MetricHistory(path=history_path)
+        except (OSError, ValueError) as e:
+            self.history_error = str(e)
+            self.history = MetricHistory()
+        self.history_flush_interval = history_flush_interval
+        self._last_flush = time.monotonic()
+        self._flush_future: Optional[asyncio.Future] = None
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix="epicentra-collector")
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._force = False
+        self._loop_ref: Optional[asyncio.AbstractEventLoop] = None
+        self.metrics_scraper: Optional[MetricsScraper] = None
+        self.health_prober: Optional[HealthProber] = None
+
+        # PM2 daemon'una kalıcı bağlantı; soket yoksa `pm2 jlist`'e düşülür
+        self.pm2_client = Pm2RpcClient()
+        self.pm2_events = Pm2EventListener(self._on_pm2_event, pm2_home=self.pm2_client.pm2_home)
+
+        # CPU ölçümü delta tabanlı: ilk çağrı referans noktasını oluşturur
+        psutil.cpu_percent(interval=None)
+
+        self.build_cache = BuildCache(project_root)
+        self.add_probe("project", lambda: get_project_status(self.project_root, self.build_cache),
+                       timeout=2.0, default={})
+        self.add_probe("pm2", lambda: get_pm2_processes(self.pm2_client, timeout=8.0),
+                       timeout=8.0, default=[])
+        self.add_probe("system", get_system_info, timeout=3.0,
+                       default=dict(EMPTY_SYSTEM_INFO))
+        # pm2 pid'lerinin ayrıntılı ölçümü; probelar eşzamanlı çalıştığı için bir önceki
+        # turun süreç listesi kullanılır (yeni başlayan süreç bir tur sonra görünür)
+        self.process_sampler = ProcessSampler()
+        self.add_probe("process_stats",
+                       lambda: self.process_sampler.sample(self.probes["pm2"].last_value or []),
+                       timeout=5.0, default={})
+
+    def add_probe(self, name: str, func: Callable, timeout: float,
+                  blocking: bool = True, default: Any = None) -> None:
+        """Probe ekle; blocking=True ise fonksiyon thread havuzunda çalışır, değilse
+        timeout parametresi alan bir coroutine fonksiyonu olmalıdır"""
+        self.probes[name] = Probe(name, func, timeout, blocking, default)
+
+    def enable_metrics(self, base_url: str) -> None:
+        """Sunucunun /api/metrics'ini engellemeyen "metrics" probe'u olarak kazı"""
+        self.metrics_scraper = MetricsScraper(base_url)
+        self.add_probe("metrics", self.metrics_scraper.scrape, timeout=4.0,
+                       blocking=False, default={})
+
+    def enable_health(self, targets: Dict[str, str], interval: float = 15.0) -> None:
+        """Uygulama uç noktalarını kendi takviminde yokla; sonuçlar "health" probe'uyla snapshot'a girer"""
+        self.health_prober = HealthProber(targets, interval=interval)
+        self.add_probe("health", self.health_prober.report_probe, timeout=1.0,
+                       blocking=False, default={})
+
+    def subscribe(self, callback: SnapshotCallback) -> None:
+        """Yeni snapshot'larda çağrılacak fonksiyonu kaydet"""
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback: SnapshotCallback) -> None:
+        """Aboneliği kaldır"""
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    def subscribe_events(self, callback: Callable[[Dict], Any]) -> None:
+        """PM2 süreç olaylarında (restart, exit, online...) çağrılacak fonksiyonu kaydet"""
+        self.event_subscribers.append(callback)
+
+    def _on_pm2_event(self, name: str, data: Dict) -> None:
+        """pub.sock thread'inden gelen olayı event loop'a aktar"""
+        if self._loop_ref is not None and not self._loop_ref.is_closed():
+            self._loop_ref.call_soon_threadsafe(self._dispatch_pm2_event, data)
+
+    def _dispatch_pm2_event(self, data: Dict) -> None:
+        """Olayı abonelere ilet ve süreç listesini hemen yenile"""
+        for callback in list(self.event_subscribers):
+            self.callback_errors.call(callback, data)
+        self.refresh()
+
+    async def _run_probe(self, probe: Probe) -> None:
+        """Tek probe'u zaman aşımıyla çalıştır; hata olursa son değeri koru"""
+        # Önceki çağrı hâlâ sürüyorsa üst üste binmesin
+        if probe.in_flight is not None and not probe.in_flight.done():
+            probe.last_error = "önceki ölçüm sürüyor"
+            return
+
+        loop = asyncio.get_running_loop()
+        start = time.monotonic()
+        try:
+            if probe.blocking:
+                probe.in_flight = loop.run_in_executor(self.executor, probe.func)
+                value = await asyncio.wait_for(asyncio.shield(probe.in_flight), probe.timeout)
+            else:
+                value = await asyncio.wait_for(probe.func(probe.timeout), probe.timeout + 1.0)
+            probe.last_value = value
+            probe.last_error = None
+        except asyncio.TimeoutError:
+            probe.last_error = f"zaman aşımı ({probe.timeout:.0f}s)"
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            probe.last_error = str(e) or e.__class__.__name__
+        finally:
+            probe.last_duration = time.monotonic() - start
+
+    async def collect(self) -> Snapshot:
+        """Tüm probeları eşzamanlı çalıştır ve snapshot yayınla"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            await asyncio.gather(*(self._run_probe(p) for p in self.probes.values()))
+
+            self.version += 1
+            snapshot: Snapshot = {
+                "timestamp": time.time(),
+                "version": self.version,
+                "durations": {},
+                "errors": {},
+            }
+            for name, probe in self.probes.items():
+                snapshot[name] = probe.last_value
+                snapshot["durations"][name] = probe.last_duration
+                if probe.last_error:
+                    snapshot["errors"][name] = probe.last_error
+            snapshot["errors"].update(self.callback_errors.report())
+            self.snapshot = snapshot
+
+            # Hatalı probeların eski değerleri geçmişe tekrar yazılmasın
+            fresh = {key: value for key, value in snapshot.items() if key not in snapshot["errors"]}
+            self.history.record(snapshot["timestamp"], snapshot_metrics(fresh))
+            if time.monotonic() - self._last_flush >= self.history_flush_interval:
+                self._last_flush = time.monotonic()
+                self._flush_future = asyncio.get_running_loop().run_in_executor(
+                    self.executor, self.history.flush)
+
+        self.publish(snapshot)
+        return snapshot
+
+    def publish(self, snapshot: Snapshot) -> None:
+        """Snapshot'ı abonelere ilet"""
+        for callback in list(self.subscribers):
+            self.callback_errors.call(callback, snapshot)
+
+    def refresh(self) -> None:
+        """Bir sonraki turu beklemeden hemen ölçüm yap"""
+        self._force = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _loop(self) -> None:
+        """Periyodik toplama döngüsü"""
+        while True:
+            if not self.paused or self._force:
+                self._force = False
+                await self.collect()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def start(self) -> None:
+        """Toplama döngüsünü çalışan event loop üzerinde başlat"""
+        if self._task is None or self._task.done():
+            self._loop_ref = asyncio.get_event_loop()
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.ensure_future(self._loop())
+            self.pm2_events.start()
+            if self.health_prober is not None:
+                self.health_prober.start()
+
+    async def stop(self) -> None:
+        """Döngüyü durdur ve thread havuzunu kapat"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.pm2_events.stop()
+        self.pm2_client.close()
+        if self.metrics_scraper is not None:
+            await self.metrics_scraper.close()
+        if self.health_prober is not None:
+            await self.health_prober.stop()
+        self.executor.shutdown(wait=False)
+        # Süren diske yazma bitmeden eşleme kapatılmasın
+        if self._flush_future is not None:
+            await asyncio.wait([self._flush_future])
+        self.history.close()
+
+
+class CollectorThread:
+    """Collector'ı ayrı thread'deki event loop'ta çalıştırır (senkron arayüzler için)
+
+    Yeni snapshot geldiğinde bir pipe'a bayt yazılır; fileno() select()
+    döngülerine eklenebilir, read() son snapshot'ı alır. Arayüzü
+    collector_client.SnapshotStream ile aynıdır.
+    """
+
+    def __init__(self, collector: Collector):
+        self.collector = collector
+        self.snapshot: Snapshot = {}
+        self.loop = asyncio.new_event_loop()
+        self._pending: Optional[Snapshot] = None
+        self._pending_lock = threading.Lock()
+        self._read_fd, self._write_fd = os.pipe()
+        os.set_blocking(self._read_fd, False)
+        os.set_blocking(self._write_fd, False)
+        self.thread = threading.Thread(target=self._run, name="epicentra-collector-loop", daemon=True)
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.collector.subscribe(self._on_snapshot)
+        self.collector.start()
+        self.loop.run_forever()
+
+    def _on_snapshot(self, snapshot: Snapshot) -> None:
+        with self._pending_lock:
+            self._pending = snapshot
+        try:
+            os.write(self._write_fd, b"\0")
+        except BlockingIOError:
+            # Pipe dolu: okuyucu zaten uyandırılmış
+            pass
+
+    def start(self) -> None:
+        """Thread'i başlat"""
+        if not self.thread.is_alive():
+            self.thread.start()
+
+    def fileno(self) -> int:
+        return self._read_fd
+
+    def read(self, timeout: float = 0.0) -> bool:
+        """Yeni snapshot geldiyse al ve True döndür"""
+        ready, _, _ = select.select([self._read_fd], [], [], timeout)
+        if not ready:
+            return False
+        try:
+            os.read(self._read_fd, 4096)
+        except BlockingIOError:
+            pass
+        with self._pending_lock:
+            pending, self._pending = self._pending, None
+        if pending is None:
+            return False
+        self.snapshot = pending
+        return True
+
+    def refresh(self) -> None:
+        """Bir sonraki turu beklemeden ölçüm yaptır"""
+        self.loop.call_soon_threadsafe(self.collector.refresh)
+
+    def close(self) -> None:
+        """Toplayıcıyı durdur ve thread'i kapat"""
+        if self.thread.is_alive():
+            try:
+                asyncio.run_coroutine_threadsafe(self.collector.stop(), self.loop).result(timeout=10)
+            except Exception:
+                pass
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(timeout=5)
+        if not self.loop.is_running():
+            self.loop.close()
+        for fd in (self._read_fd, self._write_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
@@ -0,0 +1,479 @@
+"""
+Toplayıcı daemon istemcisi - ortak snapshot'ı Unix soketi üzerinden okur
+
+Daemon (collector_daemon.py) pm2/psutil ölçümünü tek kez yapar; TUI'lar
+kendi döngülerini çalıştırmak yerine ona bağlanır. Protokol satır başına
+bir JSON nesnesidir:
+
+    istemci -> {"op": "ping" | "snapshot" | "subscribe" | "refresh" | "history", ...}
+    daemon  -> {"type": "pong" | "snapshot" | "hello" | "delta" | "event" | "ok" | "history" | "error", ...}
+
+Abonelikte önce tam snapshot, sonra yalnızca değişen alanları taşıyan
+delta'lar gelir. Bu modül yalnızca standart kütüphaneyi kullanır (debug
+TUI bağımlılıksız kalmalı).
+"""
+
+import asyncio
+import json
+import os
+import select
+import socket
+import traceback
+from typing import Any, Callable, Dict, List, Optional
+
+from epicentra_tools.metric_history import MetricHistory
+
+
+SOCKET_ENV = "EPICENTRA_COLLECTOR_SOCKET"
+MAX_LINE_BYTES = 16 * 1024 * 1024
+
+# Soket üzerinden gönderilen pm2_env alanları (tam ortam değişkenleri gönderilmez)
+PM2_ENV_FIELDS = (
+    "status", "restart_time", "unstable_restarts", "pm_uptime", "created_at",
+    "exec_mode", "instances", "version", "node_version", "autorestart", "watch",
+    "pm_exec_path", "pm_out_log_path", "pm_err_log_path", "NODE_APP_INSTANCE",
+)
+
+
+class CollectorError(Exception):
+    """Daemon hata cevabı ya da protokol hatası"""
+
+
+def default_socket_path(project_root: str) -> str:
+    """Daemon soketinin yolu; EPICENTRA_COLLECTOR_SOCKET ortam değişkeni önceliklidir"""
+    return os.environ.get(SOCKET_ENV) or os.path.join(project_root, "logs", "collector.sock")
+
+
+def encode(message: Dict) -> bytes:
+    """Mesajı tek JSON satırına çevir"""
+    return json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def slim_process(process: Dict) -> Dict:
+    """pm2 süreç kaydının TUI'ların kullandığı kısmı"""
+    env = process.get("pm2_env") or {}
+    return {
+        "name": process.get("name"),
+        "pm_id": process.get("pm_id"),
+        "pid": process.get("pid"),
+        "monit": process.get("monit") or {},
+        "pm2_env": {key: env[key] for key in PM2_ENV_FIELDS if key in env},
+    }
+
+
+def slim_snapshot(snapshot: Dict) -> Dict:
+    """Snapshot'taki pm2 kayıtlarını inceltilmiş haliyle döndür"""
+    result = dict(snapshot)
+    if isinstance(result.get("pm2"), list):
+        result["pm2"] = [slim_process(p) for p in result["pm2"]]
+    return result
+
+
+def slim_event(event: Dict) -> Dict:
+    """pm2 olayının (restart, exit...) inceltilmiş hali"""
+    result = {key: value for key, value in event.items() if key != "process"}
+    if isinstance(event.get("process"), dict):
+        result["process"] = slim_process(event["process"])
+    return result
+
+
+class CallbackErrors:
+    """Abone geri çağrılarının hataları
+
+    Bir abonenin hatası diğerlerini durdurmaz ama yutulmaz da: her geri çağrı
+    için hata sayısı ve son hata (tür, mesaj, oluştuğu satır) tutulur.
+    report() hâlâ hata veren abonelerin iletilerini snapshot'ın "errors"
+    alanına "abone:<ad>" anahtarıyla eklenecek biçimde döndürür; ileti yalnızca
+    hata değiştiğinde değişir, abone düzelince kaybolur.
+    """
+
+    def __init__(self):
+        self.counts: Dict[str, int] = {}
+        self.last: Dict[str, str] = {}
+
+    def call(self, callback: Callable, *args: Any) -> None:
+        """Geri çağrıyı çalıştır; coroutine dönerse sonucu görev bitince kaydedilir"""
+        try:
+            result = callback(*args)
+        except Exception as e:
+            self.record(callback, e)
+            return
+        if asyncio.iscoroutine(result):
+            future = asyncio.ensure_future(result)
+            future.add_done_callback(lambda done: self._finished(callback, done))
+        else:
+            self.last.pop(callback_name(callback), None)
+
+    def _finished(self, callback: Callable, future: asyncio.Future) -> None:
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is None:
+            self.last.pop(callback_name(callback), None)
+        elif isinstance(error, Exception):
+            self.record(callback, error)
+
+    def record(self, callback: Callable, error: Exception) -> None:
+        name = callback_name(callback)
+        self.counts[name] = self.counts.get(name, 0) + 1
+        message = f"{error.__class__.__name__}: {error}"
+        frames = traceback.extract_tb(error.__traceback__)
+        if frames:
+            message += f" ({os.path.basename(frames[-1].filename)}:{frames[-1].lineno})"
+        self.last[name] = message
+
+    def report(self) -> Dict[str, str]:
+        return {f"abone:{name}": message for name, message in self.last.items()}
+
+
+def callback_name(callback: Callable) -> str:
+    """Geri çağrının okunur adı (bağlı metotlarda Sınıf.metot)"""
+    return getattr(callback, "__qualname__", None) or repr(callback)
+
+
+def _process_ids(processes: List[Dict]) -> Optional[List[Any]]:
+    ids = [p.get("pm_id") for p in processes]
+    return ids if len(set(ids)) == len(ids) and None not in ids else None
+
+
+def snapshot_delta(old: Dict, new: Dict) -> Dict:
+    """İki snapshot arasındaki fark
+
+    Üst düzeyde değişen anahtarlar "set", silinenler "unset" ile taşınır.
+    pm2 listesi pm_id ile eşlenir: yalnızca değişen süreçler ("upsert") ve
+    yeni sıra ("order") gönderilir.
+    """
+    delta: Dict[str, Any] = {"base": old.get("version"), "set": {}, "unset": []}
+    old_pm2, new_pm2 = old.get("pm2"), new.get("pm2")
+    diff_pm2 = isinstance(old_pm2, list) and isinstance(new_pm2, list)
+    order = _process_ids(new_pm2) if diff_pm2 else None
+    if diff_pm2 and order is not None and _process_ids(old_pm2) is not None:
+        previous = {p["pm_id"]: p for p in old_pm2}
+        upsert = [p for p in new_pm2 if previous.get(p["pm_id"]) != p]
+        if upsert or order != [p["pm_id"] for p in old_pm2]:
+            delta["pm2"] = {"order": order, "upsert": upsert}
+        skip = "pm2"
+    else:
+        skip = None
+    for key, value in new.items():
+        if key != skip and (key not in old or old[key] != value):
+            delta["set"][key] = value
+    delta["unset"] = [key for key in old if key not in new]
+    return delta
+
+
+def apply_delta(snapshot: Dict, delta: Dict) -> Dict:
+    """Delta'yı snapshot'a uygulayıp yeni snapshot döndür
+
+    Delta başka bir sürüme göre hesaplanmışsa ValueError fırlatılır; istemci
+    bu durumda tam snapshot istemelidir.
+    """
+    if delta.get("base") != snapshot.get("version"):
+        raise ValueError(f"delta tabanı {delta.get('base')}, snapshot sürümü {snapshot.get('version')}")
+    result = dict(snapshot)
+    result.update(delta.get("set") or {})
+    for key in delta.get("unset") or ():
+        result.pop(key, None)
+    if "pm2" in delta:
+        by_id = {p.get("pm_id"): p for p in snapshot.get("pm2") or []}
+        by_id.update((p["pm_id"], p) for p in delta["pm2"]["upsert"])
+        result["pm2"] = [by_id[pm_id] for pm_id in delta["pm2"]["order"] if pm_id in by_id]
+    return result
+
+
+class CollectorClient:
+    """Daemon'a engelleyen (senkron) istemci - basit ve debug TUI'lar için"""
+
+    def __init__(self, socket_path: str, timeout: float = 2.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.sock: Optional[socket.socket] = None
+        self.buffer = b""
+
+    def _connect(self) -> socket.socket:
+        if self.sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.socket_path)
+            except OSError:
+                sock.close()
+                raise
+            self.sock = sock
+            self.buffer = b""
+        return self.sock
+
+    def close(self) -> None:
+        """Bağlantıyı kapat"""
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+            self.sock = None
+
+    def _readline(self) -> Dict:
+        while b"\n" not in self.buffer:
+            data = self.sock.recv(65536)
+            if not data:
+                raise ConnectionError("Toplayıcı daemon bağlantıyı kapattı")
+            self.buffer += data
+            if len(self.buffer) > MAX_LINE_BYTES:
+                raise CollectorError("Daemon cevabı çok uzun")
+        line, self.buffer = self.buffer.split(b"\n", 1)
+        return json.loads(line.decode("utf-8"))
+
+    def request(self, op: str, **params: Any) -> Dict:
+        """Tek istek gönder ve cevabı döndür; kopmuş bağlantıda bir kez yeniden bağlanır"""
+        for attempt in range(2):
+            try:
+                self._connect().sendall(encode(dict(params, op=op)))
+                reply = self._readline()
+                break
+            except (OSError, ValueError):
+                self.close()
+                if attempt == 1:
+                    raise
+        if reply.get("type") == "error":
+            raise CollectorError(reply.get("message", "bilinmeyen hata"))
+        return reply
+
+    def available(self) -> bool:
+        """Daemon çalışıyor ve cevap veriyor mu?"""
+        if not os.path.exists(self.socket_path):
+            return False
+        try:
+            self.request("ping")
+            return True
+        except (OSError, ValueError, CollectorError):
+            return False
+
+    def ping(self) -> Dict:
+        """Daemon bilgisi (pid, sürüm, istemci sayısı)"""
+        return self.request("ping")
+
+    def snapshot(self) -> Dict:
+        """Son snapshot"""
+        return self.request("snapshot")["snapshot"]
+
+    def refresh(self) -> None:
+        """Daemon'dan hemen ölçüm yapmasını iste"""
+        self.request("refresh")
+
+    def history(self, series: Optional[str] = None, span: float = 3600) -> Dict:
+        """Serinin son `span` saniyelik kovaları: {"resolution", "buckets"}; seri
+        verilmezse kayıtlı seri adları: {"series": [...]}"""
+        return self.request("history", series=series, span=span)
+
+    def subscribe(self) -> "SnapshotStream":
+        """Ayrı bir bağlantı üzerinden canlı snapshot akışı aç"""
+        return SnapshotStream(self.socket_path, self.timeout)
+
+
+class SnapshotStream:
+    """Abonelik bağlantısı; fileno() ile select() döngülerine eklenebilir"""
+
+    def __init__(self, socket_path: str, timeout: float = 2.0):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        try:
+            self.sock.connect(socket_path)
+        except OSError:
+            self.sock.close()
+            raise
+        self.sock.setblocking(False)
+        self.buffer = b""
+        self.snapshot: Dict = {}
+        self.events: List[Dict] = []
+        self.info: Dict = {}
+        self.sock.sendall(encode({"op": "subscribe"}))
+
+    def fileno(self) -> int:
+        return self.sock.fileno()
+
+    def refresh(self) -> None:
+        """Daemon'dan hemen ölçüm iste (cevap akış içinde gelir ve yok sayılır)"""
+        self.sock.sendall(encode({"op": "refresh"}))
+
+    def close(self) -> None:
+        """Aboneliği kapat"""
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+    def read(self, timeout: float = 0.0) -> bool:
+        """Gelen mesajları işle; snapshot değiştiyse True
+
+        Bağlantı koparsa ConnectionError fırlatılır. Gelen pm2 olayları
+        `events` listesinde biriktirilir.
+        """
+        ready, _, _ = select.select([self.sock], [], [], timeout)
+        if not ready:
+            return False
+        changed = False
+        while True:
+            try:
+                data = self.sock.recv(65536)
+            except BlockingIOError:
+                break
+            if not data:
+                raise ConnectionError("Toplayıcı daemon bağlantıyı kapattı")
+            self.buffer += data
+        *lines, self.buffer = self.buffer.split(b"\n")
+        for line in lines:
+            message = json.loads(line.decode("utf-8"))
+            kind = message.get("type")
+            if kind == "hello":
+                self.info = message
+            elif kind == "snapshot":
+                self.snapshot = message["snapshot"]
+                changed = True
+            elif kind == "delta":
+                try:
+                    self.snapshot = apply_delta(self.snapshot, message["delta"])
+                    changed = True
+                except ValueError:
+                    # Sürüm kaçtı: tam snapshot iste
+                    self.sock.sendall(encode({"op": "subscribe"}))
+            elif kind == "event":
+                self.events.append(message["event"])
+        return changed
+
+
+class RemoteCollector:
+    """Daemon'a bağlanıp Collector ile aynı arayüzü sunan asenkron istemci
+
+    Textual TUI yerel Collector yerine bunu kullanabilir: subscribe(),
+    subscribe_events(), refresh(), paused, history ve start()/stop() aynıdır.
+    Geçmiş daemon'un mmap dosyasından salt okunur açılır.
+    """
+
+    def __init__(self, socket_path: str, reconnect_delay: float = 2.0):
+        self.socket_path = socket_path
+        self.reconnect_delay = reconnect_delay
+        self.paused = False
+        self.subscribers: List[Callable[[Dict], Any]] = []
+        self.event_subscribers: List[Callable[[Dict], Any]] = []
+        self.snapshot: Dict = {}
+        self.info: Dict = {}
+        self.history = None
+        self.history_error: Optional[str] = None
+        self.connected = False
+        self.callback_errors = CallbackErrors()
+        self._force = False
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, callback: Callable[[Dict], Any]) -> None:
+        """Yeni snapshot'larda çağrılacak fonksiyonu kaydet"""
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Dict], Any]) -> None:
+        """Aboneliği kaldır"""
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    def subscribe_events(self, callback: Callable[[Dict], Any]) -> None:
+        """PM2 süreç olaylarında çağrılacak fonksiyonu kaydet"""
+        self.event_subscribers.append(callback)
+
+    def refresh(self) -> None:
+        """Daemon'dan hemen ölçüm iste; duraklatılmış olsa da sonuç yayınlanır"""
+        self._force = True
+        if self._writer is not None and not self._writer.is_closing():
+            self._writer.write(encode({"op": "refresh"}))
+
+    def publish(self, snapshot: Dict) -> None:
+        """Snapshot'ı abonelere ilet"""
+        if self.paused and not self._force:
+            return
+        self._force = False
+        # Yerel abonelerin hataları daemon'dan gelen hatalarla birlikte görünsün
+        report = self.callback_errors.report()
+        if report:
+            snapshot = dict(snapshot, errors=dict(snapshot.get("errors") or {}, **report))
+        for callback in list(self.subscribers):
+            self.callback_errors.call(callback, snapshot)
+
+    def _open_history(self, path: Optional[str]) -> None:
+        if self.history is not None or not path:
+            return
+        try:
+            self.history = MetricHistory(path=path, readonly=True)
+            self.history_error = None
+        except (OSError, ValueError) as e:
+            self.history_error = str(e)
+
+    def _handle(self, message: Dict) -> None:
+        kind = message.get("type")
+        if kind == "hello":
+            self.info = message
+            self._open_history(message.get("history_path"))
+        elif kind == "snapshot":
+            self.snapshot = message["snapshot"]
+            if self.snapshot:
+                self.publish(self.snapshot)
+        elif kind == "delta":
+            try:
+                self.snapshot = apply_delta(self.snapshot, message["delta"])
+            except ValueError:
+                self._writer.write(encode({"op": "subscribe"}))
+                return
+            self.publish(self.snapshot)
+        elif kind == "event":
+            for callback in list(self.event_subscribers):
+                self.callback_errors.call(callback, message["event"])
+
+    async def _session(self) -> None:
+        reader, writer = await asyncio.open_unix_connection(self.socket_path, limit=MAX_LINE_BYTES)
+        self._writer = writer
+        try:
+            writer.write(encode({"op": "subscribe"}))
+            await writer.drain()
+            self.connected = True
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                self._handle(json.loads(line.decode("utf-8")))
+        finally:
+            self.connected = False
+            self._writer = None
+            writer.close()
+
+    async def _loop(self) -> None:
+        """Bağlan, akışı oku, koparsa tekrar dene"""
+        while True:
+            try:
+                await self._session()
+            except asyncio.CancelledError:
+                raise
+            except (OSError, ValueError):
+                pass
+            # Bağlantı koptuğunda son veri hata işaretiyle yeniden yayınlanır
+            if self.snapshot:
+                stale = dict(self.snapshot, version=None)
+                stale["errors"] = dict(self.snapshot.get("errors") or {},
+                                       collector="toplayıcı daemon'una bağlanılamıyor")
+                self._force = True
+                self.publish(stale)
+            await asyncio.sleep(self.reconnect_delay)
+
+    def start(self) -> None:
+        """Bağlantı döngüsünü çalışan event loop üzerinde başlat"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._loop())
+
+    async def stop(self) -> None:
+        """Bağlantıyı kapat"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.history is not None:
+            self.history.close()
+
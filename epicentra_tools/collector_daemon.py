@@ -0,0 +1,222 @@
+"""
+Toplayıcı daemon'u - pm2/psutil ölçümünü tek kez yapıp tüm TUI'lara Unix soketiyle dağıtır
+
+Aynı sunucuya farklı arayüzlerle bağlanan her operatör kendi ölçüm
+döngüsünü çalıştırmaz; daemon son snapshot'ı ve metrik geçmişini tutar,
+istemcilere tam snapshot ya da abonelik üzerinden delta gönderir.
+
+    python3 -m epicentra_tools.collector_daemon [--interval 5] [--socket yol]
+
+Protokol için collector_client.py'ye bakın.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+from typing import Dict, Optional, Set
+
+from epicentra_tools.collector import Collector, default_history_path
+from epicentra_tools.collector_client import (
+    MAX_LINE_BYTES, CollectorClient, default_socket_path, encode,
+    slim_event, slim_snapshot, snapshot_delta,
+)
+from epicentra_tools.ecosystem import get_server_url
+from epicentra_tools.health_prober import default_targets
+
+
+def daemon_running(socket_path: str) -> bool:
+    """Sokette cevap veren bir daemon var mı?"""
+    client = CollectorClient(socket_path, timeout=1.0)
+    try:
+        return client.available()
+    finally:
+        client.close()
+
+
+class CollectorDaemon:
+    """Collector'ı Unix soketi üzerinden sunan sunucu"""
+
+    def __init__(self, collector: Collector, socket_path: str,
+                 max_buffer: int = 4 * 1024 * 1024):
+        self.collector = collector
+        self.socket_path = socket_path
+        # Okumayan (takılmış) istemcinin tamponu bu sınırı aşarsa bağlantısı kesilir
+        self.max_buffer = max_buffer
+        self.published: Dict = {}
+        self.clients = 0
+        self.subscribers: Set[asyncio.StreamWriter] = set()
+        self.dropped = 0
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    def _hello(self) -> Dict:
+        return {
+            "type": "hello",
+            "pid": os.getpid(),
+            "interval": self.collector.interval,
+            "history_path": self.collector.history.path,
+        }
+
+    async def start(self) -> None:
+        """Soketi aç ve toplayıcıyı başlat"""
+        if os.path.exists(self.socket_path):
+            if daemon_running(self.socket_path):
+                raise RuntimeError(f"{self.socket_path} üzerinde çalışan bir toplayıcı daemon'u var")
+            # Çökmüş bir daemon'dan kalan soket dosyası
+            os.unlink(self.socket_path)
+        os.makedirs(os.path.dirname(self.socket_path) or ".", exist_ok=True)
+        self.server = await asyncio.start_unix_server(self._handle, path=self.socket_path,
+                                                      limit=MAX_LINE_BYTES)
+        os.chmod(self.socket_path, 0o600)
+        self.collector.subscribe(self._on_snapshot)
+        self.collector.subscribe_events(self._on_event)
+        self.collector.start()
+
+    async def stop(self) -> None:
+        """İstemcileri kapat, soketi sil ve toplayıcıyı durdur"""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        for writer in list(self.subscribers):
+            writer.close()
+        self.subscribers.clear()
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
+        await self.collector.stop()
+
+    def _on_snapshot(self, snapshot: Dict) -> None:
+        """Yeni snapshot'ı abonelere delta olarak gönder"""
+        slim = slim_snapshot(snapshot)
+        if self.subscribers:
+            # Delta bir kez kodlanır, aynı baytlar her aboneye yazılır
+            self._broadcast(encode({"type": "delta", "delta": snapshot_delta(self.published, slim)}))
+        self.published = slim
+
+    def _on_event(self, event: Dict) -> None:
+        """pm2 olayını abonelere ilet"""
+        if self.subscribers:
+            self._broadcast(encode({"type": "event", "event": slim_event(event)}))
+
+    def _broadcast(self, line: bytes) -> None:
+        for writer in list(self.subscribers):
+            if writer.transport.get_write_buffer_size() > self.max_buffer:
+                self.subscribers.discard(writer)
+                self.dropped += 1
+                writer.close()
+                continue
+            writer.write(line)
+
+    def _reply(self, request: Dict, writer: asyncio.StreamWriter) -> Optional[Dict]:
+        """İsteğin cevabı; abonelikte mesajlar doğrudan yazılır ve None döner"""
+        op = request.get("op")
+        if op == "ping":
+            return {"type": "pong", "pid": os.getpid(), "version": self.published.get("version"),
+                    "clients": self.clients, "subscribers": len(self.subscribers),
+                    "dropped": self.dropped}
+        if op == "snapshot":
+            return {"type": "snapshot", "snapshot": self.published}
+        if op == "subscribe":
+            # Tam snapshot ile sonraki delta'ların tabanı aynı olsun diye araya await girmez
+            writer.write(encode(self._hello()))
+            writer.write(encode({"type": "snapshot", "snapshot": self.published}))
+            self.subscribers.add(writer)
+            return None
+        if op == "refresh":
+            self.collector.refresh()
+            return {"type": "ok"}
+        if op == "history":
+            history = self.collector.history
+            series = request.get("series")
+            if not series:
+                return {"type": "history", "series": sorted(history.series)}
+            try:
+                span = float(request.get("span", 3600))
+            except (TypeError, ValueError):
+                return {"type": "error", "message": "span sayı olmalı"}
+            resolution, buckets = history.query(series, span)
+            return {"type": "history", "series": series, "resolution": resolution, "buckets": buckets}
+        return {"type": "error", "message": f"bilinmeyen işlem: {op}"}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Tek istemci bağlantısı"""
+        self.clients += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line.decode("utf-8"))
+                    if not isinstance(request, dict):
+                        raise ValueError("istek bir JSON nesnesi olmalı")
+                except ValueError as e:
+                    reply = {"type": "error", "message": f"geçersiz istek: {e}"}
+                else:
+                    reply = self._reply(request, writer)
+                if reply is not None:
+                    writer.write(encode(reply))
+                if writer not in self.subscribers:
+                    await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            self.clients -= 1
+            self.subscribers.discard(writer)
+            writer.close()
+
+
+async def serve(project_root: str, socket_path: str, interval: float) -> None:
+    """Daemon'u SIGINT/SIGTERM gelene kadar çalıştır"""
+    # Geçmiş dosyası açılmadan önce: ikinci daemon yazıcı kilidine hiç dokunmasın
+    if daemon_running(socket_path):
+        raise RuntimeError(f"{socket_path} üzerinde çalışan bir toplayıcı daemon'u var")
+    collector = Collector(project_root, interval=interval,
+                          history_path=default_history_path(project_root))
+    collector.enable_metrics(get_server_url(project_root))
+    collector.enable_health(default_targets(project_root))
+    if collector.history_error:
+        print(f"⚠️ Metrik geçmişi yalnızca bellekte: {collector.history_error}", file=sys.stderr)
+
+    daemon = CollectorDaemon(collector, socket_path)
+    try:
+        await daemon.start()
+    except RuntimeError:
+        await collector.stop()
+        raise
+
+    stopped = asyncio.Event()
+    loop = asyncio.get_event_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopped.set)
+    print(f"📡 Toplayıcı daemon'u çalışıyor: {socket_path} (pid {os.getpid()}, {interval:g}s)")
+    try:
+        await stopped.wait()
+    finally:
+        await daemon.stop()
+
+
+def main(argv=None) -> int:
+    """Komut satırı girişi"""
+    default_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description="Epicentra toplayıcı daemon'u")
+    parser.add_argument("--project-root", default=default_root, help="proje dizini")
+    parser.add_argument("--socket", help="Unix soket yolu (varsayılan logs/collector.sock)")
+    parser.add_argument("--interval", type=float, default=5.0, help="ölçüm aralığı (saniye)")
+    args = parser.parse_args(argv)
+
+    socket_path = args.socket or default_socket_path(args.project_root)
+    try:
+        asyncio.get_event_loop().run_until_complete(serve(args.project_root, socket_path, args.interval))
+    except RuntimeError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""
+Komut çıktısı akışı - stdout/stderr satırlarını üretildikleri anda, sınırlı tamponla iletir
+"""
+
+import asyncio
+import codecs
+import os
+import signal
+import time
+from typing import AsyncIterator, List, Optional, Tuple
+
+
+# (geçen süre saniye, "stdout" | "stderr", satır)
+OutputLine = Tuple[float, str, str]
+
+MAX_LINE_BYTES = 64 * 1024
+
+
+class CommandStream:
+    """Alt süreci başlatıp çıktısını satır satır okuyan akış"""
+
+    def __init__(self, argv: List[str], cwd: Optional[str] = None,
+                 timeout: Optional[float] = None, max_pending: int = 1000,
+                 kill_grace: float = 5.0):
+        self.argv = argv
+        self.cwd = cwd
+        self.timeout = timeout
+        self.max_pending = max_pending
+        self.kill_grace = kill_grace
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.started_at = 0.0
+        self.finished_at = 0.0
+        self.timed_out = False
+        self.cancelled = False
+        self._queue: Optional[asyncio.Queue] = None
+        self._readers: List[asyncio.Task] = []
+        self._watchdog: Optional[asyncio.Task] = None
+
+    @property
+    def elapsed(self) -> float:
+        """Başlangıçtan bu yana geçen süre"""
+        if not self.started_at:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    @property
+    def returncode(self) -> Optional[int]:
+        """Sürecin çıkış kodu (bitmediyse None)"""
+        return self.process.returncode if self.process else None
+
+    async def start(self) -> None:
+        """Süreci kendi süreç grubunda başlat ve okuyucuları kur"""
+        # Kuyruk doluysa okuyucular bekler, pipe dolunca alt süreç de yavaşlar
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self.process = await asyncio.create_subprocess_exec(
+            *self.argv,
+            cwd=self.cwd,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,
+            limit=MAX_LINE_BYTES
+        )
+        self.started_at = time.monotonic()
+        self._readers = [
+            asyncio.ensure_future(self._read(self.process.stdout, "stdout")),
+            asyncio.ensure_future(self._read(self.process.stderr, "stderr")),
+        ]
+        if self.timeout:
+            self._watchdog = asyncio.ensure_future(self._expire(self.timeout))
+
+    async def _read(self, reader: asyncio.StreamReader, name: str) -> None:
+        """Tek pipe'ı satır satır kuyruğa aktar
+
+        Sınırı (MAX_LINE_BYTES) aşan satır kaybolmaz: satır sonu gelene dek
+        sınır boyutunda parçalar halinde iletilir.
+        """
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        continued = False
+        at_eof = False
+        try:
+            while not at_eof:
+                try:
+                    raw = await reader.readuntil(b"\n")
+                except asyncio.IncompleteReadError as error:
+                    # EOF: satır sonu olmayan son parça
+                    raw, at_eof = error.partial, True
+                except asyncio.LimitOverrunError as error:
+                    # Çok uzun satır: tüketilebilen kısmı parça olarak gönder
+                    chunk = decoder.decode(await reader.read(min(error.consumed, MAX_LINE_BYTES)))
+                    continued = True
+                    await self._queue.put((time.monotonic() - self.started_at, name, chunk))
+                    continue
+                line = decoder.decode(raw, final=at_eof).rstrip('\r\n')
+                if not line and (continued or at_eof):
+                    # Uzun satırın yalnızca satır sonu kaldıysa boş satır üretme
+                    continued = False
+                    continue
+                continued = False
+                await self._queue.put((time.monotonic() - self.started_at, name, line))
+        finally:
+            await self._queue.put(None)
+
+    async def _expire(self, timeout: float) -> None:
+        """Süre dolunca süreci sonlandır"""
+        await asyncio.sleep(timeout)
+        if self.process.returncode is None:
+            self.timed_out = True
+            await self.terminate()
+
+    def _signal_group(self, sig: int) -> None:
+        """Sinyali tüm süreç grubuna gönder"""
+        try:
+            os.killpg(self.process.pid, sig)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    async def terminate(self) -> None:
+        """SIGTERM gönder, süre içinde kapanmazsa SIGKILL"""
+        if self.process is None or self.process.returncode is not None:
+            return
+        self._signal_group(signal.SIGTERM)
+        try:
+            await asyncio.wait_for(self.process.wait(), self.kill_grace)
+        except asyncio.TimeoutError:
+            self._signal_group(signal.SIGKILL)
+            await self.process.wait()
+
+    def cancel(self) -> None:
+        """Komutu iptal et"""
+        if self.process is not None and self.process.returncode is None:
+            self.cancelled = True
+            asyncio.ensure_future(self.terminate())
+
+    async def lines(self) -> AsyncIterator[OutputLine]:
+        """Çıktı satırlarını geliş sırasıyla üret, süreç bitince dön"""
+        open_pipes = len(self._readers)
+        while open_pipes:
+            item = await self._queue.get()
+            if item is None:
+                open_pipes -= 1
+                continue
+            yield item
+
+        await self.process.wait()
+        self.finished_at = time.monotonic()
+        if self._watchdog is not None:
+            self._watchdog.cancel()
+
+    async def close(self) -> None:
+        """Yarım kalan akışı temizle"""
+        if self.process is not None and self.process.returncode is None:
+            await self.terminate()
+        for task in self._readers:
+            task.cancel()
+        if self._watchdog is not None:
+            self._watchdog.cancel()
@@ -0,0 +1,77 @@
+"""
+ecosystem.config.js okuyucu - pm2 uygulama adları, portlar ve log dosyaları
+"""
+
+import os
+import re
+from typing import Dict, List, Optional
+
+
+def parse_ecosystem(project_root: str) -> List[Dict]:
+    """ecosystem.config.js'teki uygulamaları sözlük listesi olarak döndür
+
+    Dosya JavaScript olduğu için tam çözümleme yapılmaz; her uygulama bloğundan
+    name, PORT, out_file, error_file, log_date_format ve max_memory_restart
+    alanları okunur.
+    """
+    config_path = os.path.join(project_root, "ecosystem.config.js")
+    try:
+        with open(config_path, encoding="utf-8") as f:
+            source = f.read()
+    except OSError:
+        return []
+
+    apps = []
+    # Her uygulama bloğu "name:" ile başlar
+    for block in re.split(r"(?=\bname:\s*['\"])", source)[1:]:
+        name = re.match(r"name:\s*['\"]([^'\"]+)['\"]", block)
+        app = {"name": name.group(1), "port": None,
+               "out_file": None, "error_file": None, "log_date_format": None,
+               "max_memory_restart": None}
+        port = re.search(r"\bPORT:\s*['\"]?(\d+)", block)
+        if port:
+            app["port"] = int(port.group(1))
+        for key in ("out_file", "error_file", "log_date_format"):
+            value = re.search(r"\b" + key + r":\s*['\"]([^'\"]+)['\"]", block)
+            if value:
+                app[key] = value.group(1)
+                if key != "log_date_format":
+                    app[key] = os.path.normpath(os.path.join(project_root, value.group(1)))
+        memory = re.search(r"\bmax_memory_restart:\s*['\"]?([\w.]+)", block)
+        if memory:
+            app["max_memory_restart"] = parse_size(memory.group(1))
+        apps.append(app)
+    return apps
+
+
+def parse_size(text: str) -> Optional[int]:
+    """pm2 boyut biçimi (ör. "1G", "500M", "300K", "1024") -> bayt"""
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)\s*([KMG]?)B?", text.strip(), re.IGNORECASE)
+    if not match:
+        return None
+    factor = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}[match.group(2).upper()]
+    return int(float(match.group(1)) * factor)
+
+
+def get_app_port(project_root: str, name: str, default: Optional[int] = None) -> Optional[int]:
+    """Uygulamanın PORT ortam değişkeni"""
+    for app in parse_ecosystem(project_root):
+        if app["name"] == name and app["port"]:
+            return app["port"]
+    return default
+
+
+def get_app(project_root: str, name: str) -> Optional[Dict]:
+    """Adı verilen uygulamanın bilgileri"""
+    for app in parse_ecosystem(project_root):
+        if app["name"] == name:
+            return app
+    return None
+
+
+def get_server_url(project_root: str, app: str = "epicentra-server", default_port: int = 8080) -> str:
+    """Sunucunun temel adresi; EPICENTRA_SERVER_URL ortam değişkeni önceliklidir"""
+    override = os.environ.get("EPICENTRA_SERVER_URL")
+    if override and app == "epicentra-server":
+        return override.rstrip("/")
+    return f"http://127.0.0.1:{get_app_port(project_root, app, default_port)}"
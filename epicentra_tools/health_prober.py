@@ -0,0 +1,378 @@
+"""
+Sağlık yoklayıcı - pm2 uygulamalarının API uç noktalarını sürekli yoklar
+
+server/api/status.ts yalnızca çağrıldığında AFAD/KOERI'yi yoklar; TUI ise
+`.output` dizinine ve pm2 listesine bakar. Burada ecosystem.config.js'teki
+her uygulamaya (8080, 3001) kalıcı (keep-alive) bağlantı havuzu açılır,
+uç noktalar sabit aralıkla ve birbirine göre kaydırılmış olarak yoklanır.
+Her uç nokta için gecikme histogramı, zaman aşımı/hata sayıları ve gövde
+boyutu tutulur; pencere içindeki p95 ya da hata oranı SLO'yu aşarsa ihlal
+olayı üretilir.
+
+    python3 -m epicentra_tools.health_prober [--target ad=http://127.0.0.1:8080] [--interval 5]
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import sys
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from epicentra_tools.ecosystem import get_server_url, parse_ecosystem
+from epicentra_tools.http_pool import HttpConnectionPool, HttpError
+from epicentra_tools.metrics_scraper import histogram_quantile
+
+
+DEFAULT_ENDPOINTS = ("/api/status", "/api/earthquakes-combined", "/api/push/status")
+
+# Histogram kova üst sınırları (ms); son kova +Inf
+LATENCY_BOUNDS = (5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0,
+                  2500.0, 5000.0, 10000.0, math.inf)
+
+MAX_EVENTS = 50
+
+
+class Slo:
+    """Uç nokta hizmet hedefi: pencere içindeki p95 gecikme ve hata oranı sınırı"""
+
+    def __init__(self, p95_ms: float, max_error_rate: float = 0.05,
+                 window: float = 300.0, min_samples: int = 3):
+        self.p95_ms = p95_ms
+        self.max_error_rate = max_error_rate
+        self.window = window
+        # Tek yavaş cevap ihlal sayılmasın diye pencerede en az bu kadar ölçüm aranır
+        self.min_samples = min_samples
+
+    def to_dict(self) -> Dict:
+        return {"p95_ms": self.p95_ms, "max_error_rate": self.max_error_rate, "window": self.window}
+
+
+DEFAULT_SLOS = {
+    # status.ts AFAD/KOERI'yi 4-6 saniye zaman aşımıyla yokluyor
+    "/api/status": Slo(3000.0),
+    "/api/earthquakes-combined": Slo(2500.0),
+    "/api/push/status": Slo(1000.0),
+}
+DEFAULT_SLO = Slo(2000.0)
+
+
+def default_targets(project_root: str) -> Dict[str, str]:
+    """ecosystem.config.js'teki portu olan uygulamalar -> temel adres"""
+    targets = {}
+    for app in parse_ecosystem(project_root):
+        if app["port"]:
+            targets[app["name"]] = get_server_url(project_root, app["name"], app["port"])
+    return targets
+
+
+class LatencyHistogram:
+    """Sabit kovalı gecikme histogramı (başlangıçtan bu yana)"""
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BOUNDS):
+        self.bounds = bounds
+        self.counts = [0] * len(bounds)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, ms: float) -> None:
+        for i, bound in enumerate(self.bounds):
+            if ms <= bound:
+                self.counts[i] += 1
+                break
+        self.total += 1
+        self.sum += ms
+
+    def cumulative(self) -> List[Tuple[float, float]]:
+        """(üst sınır, birikimli sayı) listesi"""
+        result, running = [], 0
+        for bound, count in zip(self.bounds, self.counts):
+            running += count
+            result.append((bound, float(running)))
+        return result
+
+    def quantile(self, q: float) -> Optional[float]:
+        return histogram_quantile(q, self.cumulative())
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Sıralı listeden en yakın sıra yöntemiyle yüzdelik"""
+    if not values:
+        return None
+    index = min(len(values) - 1, max(0, math.ceil(q * len(values)) - 1))
+    return values[index]
+
+
+class EndpointStats:
+    """Tek uygulama + uç nokta için sayaçlar, histogram ve SLO durumu"""
+
+    def __init__(self, app: str, path: str, slo: Slo):
+        self.app = app
+        self.path = path
+        self.slo = slo
+        self.requests = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.consecutive_failures = 0
+        self.last_status: Optional[int] = None
+        self.last_ms: Optional[float] = None
+        self.last_bytes: Optional[int] = None
+        self.last_error: Optional[str] = None
+        self.last_at: Optional[float] = None
+        self.bytes_total = 0
+        self.histogram = LatencyHistogram()
+        # (monotonic zaman, gecikme ms ya da None, başarılı mı); SLO penceresi için
+        self.recent: Deque[Tuple[float, Optional[float], bool]] = deque()
+        self.breach: Optional[str] = None
+
+    def record(self, now: float, ms: Optional[float], status: Optional[int],
+               size: Optional[int], error: Optional[str], timeout: bool = False) -> None:
+        """Bir yoklamanın sonucunu ekle"""
+        ok = error is None and status is not None and 200 <= status < 300
+        self.requests += 1
+        self.last_status = status
+        self.last_ms = ms
+        self.last_error = error
+        self.last_at = time.time()
+        if size is not None:
+            self.last_bytes = size
+            self.bytes_total += size
+        if timeout:
+            self.timeouts += 1
+        if ok:
+            self.consecutive_failures = 0
+        else:
+            self.failures += 1
+            self.consecutive_failures += 1
+        # Gecikme yalnızca cevap geldiyse ölçülür (hata kodlu cevap dahil)
+        if ms is not None and status is not None:
+            self.histogram.observe(ms)
+        self.recent.append((now, ms if status is not None else None, ok))
+        while self.recent and now - self.recent[0][0] > self.slo.window:
+            self.recent.popleft()
+
+    def window_stats(self) -> Dict:
+        """SLO penceresindeki ölçümler"""
+        latencies = sorted(ms for _, ms, _ in self.recent if ms is not None)
+        failed = sum(1 for _, _, ok in self.recent if not ok)
+        count = len(self.recent)
+        return {
+            "samples": count,
+            "p50": percentile(latencies, 0.5),
+            "p95": percentile(latencies, 0.95),
+            "error_rate": failed / count if count else None,
+        }
+
+    def check_slo(self) -> Optional[str]:
+        """Pencere SLO'yu aşıyorsa nedenini döndür"""
+        window = self.window_stats()
+        if window["samples"] < self.slo.min_samples:
+            return None
+        reasons = []
+        if window["error_rate"] > self.slo.max_error_rate:
+            reasons.append(f"hata oranı %{window['error_rate'] * 100:.0f} > "
+                           f"%{self.slo.max_error_rate * 100:.0f}")
+        if window["p95"] is not None and window["p95"] > self.slo.p95_ms:
+            reasons.append(f"p95 {window['p95']:.0f}ms > {self.slo.p95_ms:.0f}ms")
+        return ", ".join(reasons) or None
+
+    def to_dict(self) -> Dict:
+        return {
+            "app": self.app,
+            "path": self.path,
+            "requests": self.requests,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "last_status": self.last_status,
+            "last_ms": self.last_ms,
+            "last_bytes": self.last_bytes,
+            "last_error": self.last_error,
+            "last_at": self.last_at,
+            "avg_bytes": self.bytes_total / (self.requests - self.failures)
+                         if self.requests > self.failures else None,
+            "histogram": [[bound if not math.isinf(bound) else None, count]
+                          for bound, count in zip(self.histogram.bounds, self.histogram.counts)],
+            "p50_total": self.histogram.quantile(0.5),
+            "p99_total": self.histogram.quantile(0.99),
+            "window": self.window_stats(),
+            "slo": self.slo.to_dict(),
+            "breach": self.breach,
+        }
+
+
+class HealthProber:
+    """Uygulama uç noktalarını kalıcı bağlantılarla sürekli yoklayan sınıf"""
+
+    def __init__(self, targets: Dict[str, str], endpoints: Tuple[str, ...] = DEFAULT_ENDPOINTS,
+                 interval: float = 15.0, timeout: float = 8.0,
+                 slos: Optional[Dict[str, Slo]] = None):
+        self.targets = dict(targets)
+        self.endpoints = tuple(endpoints)
+        self.interval = interval
+        self.timeout = timeout
+        slos = DEFAULT_SLOS if slos is None else slos
+        # Uygulama başına tek havuz; aynı uygulamanın uç noktaları bağlantıları paylaşır
+        self.pools = {app: HttpConnectionPool(url, max_connections=2, timeout=timeout)
+                      for app, url in self.targets.items()}
+        self.stats: Dict[Tuple[str, str], EndpointStats] = {
+            (app, path): EndpointStats(app, path, slos.get(path, DEFAULT_SLO))
+            for app in self.targets for path in self.endpoints
+        }
+        self.events: Deque[Dict] = deque(maxlen=MAX_EVENTS)
+        self.event_seq = 0
+        self.listeners: List[Callable[[Dict], None]] = []
+        self._tasks: List[asyncio.Task] = []
+
+    def subscribe(self, callback: Callable[[Dict], None]) -> None:
+        """SLO ihlali / düzelme olaylarında çağrılacak fonksiyonu kaydet"""
+        self.listeners.append(callback)
+
+    def _emit(self, kind: str, stats: EndpointStats, reason: Optional[str]) -> None:
+        self.event_seq += 1
+        event = {"seq": self.event_seq, "timestamp": time.time(), "kind": kind,
+                 "app": stats.app, "path": stats.path, "reason": reason}
+        self.events.append(event)
+        for callback in list(self.listeners):
+            try:
+                callback(event)
+            except Exception:
+                pass
+
+    async def probe(self, stats: EndpointStats) -> None:
+        """Uç noktayı bir kez yokla; gövde biriktirilmez, yalnızca boyutu sayılır"""
+        pool = self.pools[stats.app]
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        status = size = error = None
+        timeout = False
+        try:
+            response = await pool.get(stats.path, on_chunk=lambda data: None)
+            status, size = response.status, response.size
+            if not response.ok:
+                error = f"HTTP {response.status}"
+        except asyncio.TimeoutError:
+            timeout = True
+            error = f"zaman aşımı ({self.timeout:.0f}s)"
+        except ConnectionRefusedError:
+            error = "bağlantı reddedildi"
+        except (OSError, HttpError, asyncio.IncompleteReadError) as e:
+            error = str(e) or e.__class__.__name__
+        elapsed_ms = (loop.time() - start) * 1000
+        now = time.monotonic()
+        stats.record(now, elapsed_ms if status is not None else None, status, size, error, timeout)
+
+        breach = stats.check_slo()
+        if breach and not stats.breach:
+            self._emit("breach", stats, breach)
+        elif stats.breach and not breach:
+            self._emit("recovered", stats, None)
+        stats.breach = breach
+
+    async def _schedule(self, stats: EndpointStats, offset: float) -> None:
+        """Sabit aralıkla yokla; yoklama aralıktan uzun sürerse kaçan turlar atlanır"""
+        loop = asyncio.get_running_loop()
+        next_at = loop.time() + offset
+        while True:
+            await asyncio.sleep(max(0.0, next_at - loop.time()))
+            await self.probe(stats)
+            next_at += self.interval
+            now = loop.time()
+            if next_at < now:
+                next_at += math.ceil((now - next_at) / self.interval) * self.interval
+
+    def start(self) -> None:
+        """Yoklama görevlerini çalışan event loop'ta başlat"""
+        if self._tasks:
+            return
+        # Uç noktalar aralık boyunca eşit kaydırılır; hepsi aynı anda sunucuya yüklenmez
+        count = len(self.stats)
+        for i, stats in enumerate(self.stats.values()):
+            offset = self.interval * i / count
+            self._tasks.append(asyncio.ensure_future(self._schedule(stats, offset)))
+
+    async def stop(self) -> None:
+        """Görevleri durdur ve bağlantıları kapat"""
+        for task in self._tasks:
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for pool in self.pools.values():
+            await pool.close()
+
+    def report(self) -> Dict:
+        """Anlık durum (snapshot'a konur)"""
+        return {
+            "timestamp": time.time(),
+            "interval": self.interval,
+            "endpoints": [stats.to_dict() for stats in self.stats.values()],
+            "breaches": sum(1 for stats in self.stats.values() if stats.breach),
+            "connections": {app: pool.connections_opened for app, pool in self.pools.items()},
+            "events": list(self.events),
+        }
+
+    async def report_probe(self, timeout: float) -> Dict:
+        """Collector'da engellemeyen probe: yoklama kendi takviminde sürer, burada yalnızca rapor alınır"""
+        return self.report()
+
+
+def format_event(event: Dict) -> str:
+    """İhlal olayının log satırı"""
+    where = f"{event['app']} {event['path']}"
+    if event["kind"] == "breach":
+        return f"🚨 SLO ihlali: {where}: {event['reason']}"
+    return f"✅ SLO normale döndü: {where}"
+
+
+async def _watch(prober: HealthProber, report_every: float) -> None:
+    prober.subscribe(lambda event: print(format_event(event), flush=True))
+    prober.start()
+    fmt = lambda value, unit="": "-" if value is None else f"{value:.0f}{unit}"
+    while True:
+        await asyncio.sleep(report_every)
+        for item in prober.report()["endpoints"]:
+            window = item["window"]
+            print(f"{item['app']:<18} {item['path']:<28} {fmt(item['last_status']):>4} "
+                  f"son {fmt(item['last_ms'], 'ms'):>7} p50 {fmt(window['p50'], 'ms'):>7} "
+                  f"p95 {fmt(window['p95'], 'ms'):>7} zaman aşımı {item['timeouts']} "
+                  f"hata {item['failures']}/{item['requests']} {fmt(item['last_bytes'], 'B'):>8}"
+                  f"{'  ⚠️ ' + item['breach'] if item['breach'] else ''}", flush=True)
+
+
+def main(argv=None) -> int:
+    """Komut satırı girişi: yoklayıcıyı tek başına çalıştırıp konsola yaz"""
+    default_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description="Epicentra uç nokta sağlık yoklayıcısı")
+    parser.add_argument("--project-root", default=default_root, help="proje dizini")
+    parser.add_argument("--target", action="append", default=[],
+                        help="ad=http://host:port (varsayılan ecosystem.config.js)")
+    parser.add_argument("--interval", type=float, default=15.0, help="yoklama aralığı (saniye)")
+    parser.add_argument("--timeout", type=float, default=8.0, help="istek zaman aşımı (saniye)")
+    args = parser.parse_args(argv)
+
+    targets = {}
+    for item in args.target:
+        name, sep, url = item.partition("=")
+        if not sep:
+            parser.error(f"--target ad=adres biçiminde olmalı: {item}")
+        targets[name] = url
+    targets = targets or default_targets(args.project_root)
+    if not targets:
+        print("❌ Yoklanacak uygulama bulunamadı", file=sys.stderr)
+        return 1
+
+    prober = HealthProber(targets, interval=args.interval, timeout=args.timeout)
+    loop = asyncio.get_event_loop()
+    try:
+        loop.run_until_complete(_watch(prober, args.interval))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        loop.run_until_complete(prober.stop())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+"""
+Asenkron HTTP/1.1 istemcisi - sunucuya kalıcı (keep-alive) bağlantı havuzu
+
+Her kazıma ya da sağlık kontrolünde yeni TCP bağlantısı açmamak için
+bağlantılar havuzda tutulur ve tekrar kullanılır. Gövde Content-Length,
+chunked ya da bağlantı kapanana kadar okunur; istenirse parça parça
+bir geri çağırmaya aktarılır.
+"""
+
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+MAX_HEADER_BYTES = 64 * 1024
+READ_CHUNK = 64 * 1024
+
+
+class HttpError(Exception):
+    """HTTP protokol ya da bağlantı hatası"""
+
+
+class HttpResponse:
+    """Tamamlanmış HTTP cevabı"""
+
+    def __init__(self, status: int, reason: str, headers: Dict[str, str],
+                 body: bytes, elapsed: float, size: int):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+        self.elapsed = elapsed
+        self.size = size
+
+    @property
+    def ok(self) -> bool:
+        """2xx cevabı mı?"""
+        return 200 <= self.status < 300
+
+    def text(self) -> str:
+        """Gövdeyi metin olarak çöz"""
+        return self.body.decode("utf-8", errors="replace")
+
+
+def parse_base_url(url: str) -> Tuple[str, int, str]:
+    """http://host:port/yol -> (host, port, yol öneki)"""
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", ""):
+        raise ValueError(f"Yalnızca http destekleniyor: {url}")
+    return parts.hostname or "127.0.0.1", parts.port or 80, parts.path.rstrip("/")
+
+
+class _Connection:
+    """Havuzdaki tek TCP bağlantısı"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.last_used = time.monotonic()
+        self.requests = 0
+
+    def close(self) -> None:
+        try:
+            self.writer.close()
+        except Exception:
+            pass
+
+    @property
+    def closed(self) -> bool:
+        return self.reader.at_eof() or self.writer.is_closing()
+
+
+class HttpConnectionPool:
+    """Tek sunucuya keep-alive bağlantı havuzu"""
+
+    def __init__(self, base_url: str, max_connections: int = 4,
+                 timeout: float = 5.0, idle_timeout: float = 30.0):
+        self.host, self.port, self.prefix = parse_base_url(base_url)
+        self.base_url = base_url.rstrip("/")
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.idle: List[_Connection] = []
+        self.connections_opened = 0
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # Semaphore çalışan döngüye bağlanmalı, bu yüzden ilk istekte kurulur
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_connections)
+        return self._slots
+
+    async def _acquire(self) -> _Connection:
+        """Boştaki bağlantıyı al ya da yenisini aç"""
+        now = time.monotonic()
+        while self.idle:
+            conn = self.idle.pop()
+            if not conn.closed and now - conn.last_used < self.idle_timeout:
+                return conn
+            conn.close()
+        reader, writer = await asyncio.open_connection(self.host, self.port, limit=MAX_HEADER_BYTES)
+        self.connections_opened += 1
+        return _Connection(reader, writer)
+
+    def _release(self, conn: _Connection, reusable: bool) -> None:
+        if reusable and not conn.closed:
+            conn.last_used = time.monotonic()
+            self.idle.append(conn)
+        else:
+            conn.close()
+
+    async def request(self, method: str, path: str, body: Optional[bytes] = None,
+                      headers: Optional[Dict[str, str]] = None,
+                      timeout: Optional[float] = None,
+                      on_chunk: Optional[Callable[[bytes], None]] = None) -> HttpResponse:
+        """İstek gönder ve cevabı döndür
+
+        on_chunk verilirse gövde biriktirilmez, gelen her parça ona aktarılır.
+        Havuzdan alınan bağlantı sunucu tarafından kapatılmışsa istek yeni
+        bağlantıyla bir kez tekrarlanır.
+        """
+        async with self._semaphore():
+            for attempt in range(2):
+                conn = await self._acquire()
+                reused = conn.requests > 0
+                try:
+                    response, reusable = await asyncio.wait_for(
+                        self._exchange(conn, method, path, body, headers or {}, on_chunk),
+                        timeout or self.timeout
+                    )
+                except (ConnectionError, asyncio.IncompleteReadError, HttpError) as e:
+                    conn.close()
+                    if reused and attempt == 0 and not isinstance(e, HttpError):
+                        continue
+                    raise
+                except BaseException:
+                    conn.close()
+                    raise
+                conn.requests += 1
+                self._release(conn, reusable)
+                return response
+        raise HttpError("İstek gönderilemedi")
+
+    async def get(self, path: str, **kwargs) -> HttpResponse:
+        """GET isteği"""
+        return await self.request("GET", path, **kwargs)
+
+    async def post_json(self, path: str, payload: bytes, **kwargs) -> HttpResponse:
+        """JSON gövdeli POST isteği"""
+        headers = dict(kwargs.pop("headers", None) or {})
+        headers.setdefault("Content-Type", "application/json")
+        return await self.request("POST", path, body=payload, headers=headers, **kwargs)
+
+    async def _exchange(self, conn: _Connection, method: str, path: str,
+                        body: Optional[bytes], headers: Dict[str, str],
+                        on_chunk: Optional[Callable[[bytes], None]]) -> Tuple[HttpResponse, bool]:
+        started = time.monotonic()
+        lines = [f"{method} {self.prefix}{path} HTTP/1.1",
+                 f"Host: {self.host}:{self.port}",
+                 "Connection: keep-alive",
+                 "User-Agent: epicentra-tui"]
+        for key, value in headers.items():
+            lines.append(f"{key}: {value}")
+        if body is not None:
+            lines.append(f"Content-Length: {len(body)}")
+        conn.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (body or b""))
+        await conn.writer.drain()
+
+        status, reason, response_headers = await self._read_head(conn.reader)
+        chunks: List[bytes] = []
+        size = 0
+
+        def deliver(data: bytes) -> None:
+            nonlocal size
+            size += len(data)
+            if on_chunk is not None:
+                on_chunk(data)
+            else:
+                chunks.append(data)
+
+        keep_alive = response_headers.get("connection", "").lower() != "close"
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            pass
+        elif response_headers.get("transfer-encoding", "").lower() == "chunked":
+            await self._read_chunked(conn.reader, deliver)
+        elif "content-length" in response_headers:
+            remaining = int(response_headers["content-length"])
+            while remaining > 0:
+                data = await conn.reader.read(min(remaining, READ_CHUNK))
+                if not data:
+                    raise asyncio.IncompleteReadError(b"", remaining)
+                remaining -= len(data)
+                deliver(data)
+        else:
+            # Uzunluk belirtilmemiş: bağlantı kapanana kadar oku
+            keep_alive = False
+            while True:
+                data = await conn.reader.read(READ_CHUNK)
+                if not data:
+                    break
+                deliver(data)
+
+        response = HttpResponse(status, reason, response_headers, b"".join(chunks),
+                                time.monotonic() - started, size)
+        return response, keep_alive
+
+    @staticmethod
+    async def _read_head(reader: asyncio.StreamReader) -> Tuple[int, str, Dict[str, str]]:
+        """Durum satırı ve başlıkları oku"""
+        try:
+            raw = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.LimitOverrunError:
+            raise HttpError("Başlıklar çok uzun")
+        head = raw.decode("latin-1").split("\r\n")
+        parts = head[0].split(" ", 2)
+        if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+            raise HttpError(f"Geçersiz durum satırı: {head[0][:80]}")
+        headers = {}
+        for line in head[1:]:
+            if ":" in line:
+                key, value = line.split(":", 1)
+                headers[key.strip().lower()] = value.strip()
+        return int(parts[1]), parts[2] if len(parts) > 2 else "", headers
+
+    @staticmethod
+    async def _read_chunked(reader: asyncio.StreamReader, deliver: Callable[[bytes], None]) -> None:
+        """Transfer-Encoding: chunked gövdesini oku"""
+        while True:
+            size_line = await reader.readuntil(b"\r\n")
+            size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                # Son parçadan sonraki (boş) trailer satırları
+                while (await reader.readuntil(b"\r\n")) != b"\r\n":
+                    pass
+                return
+            deliver(await reader.readexactly(size))
+            await reader.readexactly(2)
+
+    async def close(self) -> None:
+        """Boştaki tüm bağlantıları kapat"""
+        for conn in self.idle:
+            conn.close()
+        self.idle.clear()
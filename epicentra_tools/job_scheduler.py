@@ -0,0 +1,333 @@
+"""
+İş zamanlayıcı - kontrol paneli komutlarını kuyruğa alır, çakışanları sıraya koyar
+
+Her komut ortak kaynaklardan hangilerini okuduğunu/yazdığını bildirir
+(node_modules, kaynak kod, .nuxt/.output, pm2 süreçleri...). Bir iş,
+çalışan işlerle ve kendisinden önce kuyruğa girmiş işlerle çakışmıyorsa
+başlar; aynı kaynağı yalnızca okuyan işler paralel çalışır. Böylece Build
+ardından Restart'a basmak Restart'ı Build bitene kadar bekletir, Build ile
+Katalog ise aynı anda çalışır. Kuyruk sırası korunur: bekleyen bir yazar,
+arkasından gelen okurların onu geçmesine izin vermez.
+
+İptal edilen ya da zaman aşımına uğrayan işin tüm süreç grubu önce
+SIGTERM, süre içinde kapanmazsa SIGKILL ile sonlandırılır (CommandStream).
+Başarılı çalışmaların süreleri saklanır ve sonraki çalışmanın ilerlemesi
+bunlardan tahmin edilir.
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, FrozenSet, List, Optional, Tuple
+
+
+# Komutun (okuduğu, yazdığı) kaynaklar
+#   deps: node_modules   source: git çalışma ağacı   build: .nuxt/.output
+#   pm2: pm2 süreç listesi   server: çalışan epicentra-server'a yük bindiren testler
+COMMAND_RESOURCES: Dict[str, Tuple[FrozenSet[str], FrozenSet[str]]] = {
+    "install": (frozenset(), frozenset({"deps"})),
+    "update": (frozenset(), frozenset({"deps", "source"})),
+    "build": (frozenset({"deps", "source"}), frozenset({"build"})),
+    # clean .nuxt/.output ile node_modules'u siler ve pm2 loglarını boşaltır
+    "clean": (frozenset(), frozenset({"deps", "build", "pm2"})),
+    "start": (frozenset({"deps", "build"}), frozenset({"pm2"})),
+    "restart": (frozenset({"deps", "build"}), frozenset({"pm2"})),
+    "stop": (frozenset(), frozenset({"pm2"})),
+    # nuxt dev .nuxt'u yeniden üretir
+    "dev": (frozenset({"deps", "source"}), frozenset({"build"})),
+    # Ölçümler birbirini bozmasın diye testler tek tek çalışır; push testi abonelik dosyasını değiştirir
+    "bench": (frozenset({"pm2"}), frozenset({"server"})),
+    "synth": (frozenset({"pm2"}), frozenset({"server"})),
+    "push": (frozenset({"pm2"}), frozenset({"server"})),
+    "catalog": (frozenset(), frozenset({"catalog"})),
+}
+
+# Bilinmeyen komutlar her şeyle çakışır
+EXCLUSIVE = (frozenset(), frozenset({"*"}))
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+TIMED_OUT = "timed_out"
+FINISHED_STATES = (DONE, FAILED, CANCELLED, TIMED_OUT)
+
+# Komut başına saklanan başarılı çalışma süresi sayısı
+DURATION_SAMPLES = 5
+
+OutputCallback = Callable[["Job", float, str, str], None]
+JobListener = Callable[["Job"], None]
+# run(komut, on_output(elapsed, pipe, line), on_start(stream)) -> CommandRunner sonucu
+JobRunner = Callable[[str, Callable[[float, str, str], None], Callable[[object], None]], Awaitable[Dict]]
+
+
+def conflicts(first: str, second: str,
+              resources: Dict[str, Tuple[FrozenSet[str], FrozenSet[str]]] = COMMAND_RESOURCES) -> bool:
+    """İki komut aynı anda çalışamıyorsa True (biri diğerinin kullandığı kaynağa yazıyor)"""
+    reads_a, writes_a = resources.get(first, EXCLUSIVE)
+    reads_b, writes_b = resources.get(second, EXCLUSIVE)
+    if "*" in writes_a or "*" in writes_b:
+        return True
+    return bool(writes_a & (reads_b | writes_b) or writes_b & reads_a)
+
+
+class Job:
+    """Kuyruktaki ya da çalışan tek komut"""
+
+    def __init__(self, job_id: int, command: str, timeout: Optional[float] = None):
+        self.id = job_id
+        self.command = command
+        self.timeout = timeout
+        self.state = QUEUED
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.lines = 0
+        self.last_line = ""
+        self.result: Optional[Dict] = None
+        self.stream = None
+        self.task: Optional[asyncio.Task] = None
+        # Stream başlamadan gelen iptal isteği, başlar başlamaz uygulanır
+        self.cancel_requested = False
+        self.blocked_by: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        """Çalışma süresi (kuyrukta bekleme hariç)"""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    @property
+    def finished(self) -> bool:
+        return self.state in FINISHED_STATES
+
+    def progress(self, expected: Optional[float]) -> Optional[float]:
+        """0-1 arası tahmini ilerleme; önceki süre bilinmiyorsa None"""
+        if self.state == DONE:
+            return 1.0
+        if self.state != RUNNING or not expected:
+            return None
+        # Beklenenden uzun süren iş %99'da bekler
+        return min(self.duration / expected, 0.99)
+
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "command": self.command,
+            "state": self.state,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration": self.duration,
+            "lines": self.lines,
+            "last_line": self.last_line,
+            "blocked_by": self.blocked_by,
+        }
+
+
+class JobScheduler:
+    """Çakışma kurallarına ve paralellik sınırına göre iş çalıştıran kuyruk
+
+    Zamanlayıcı çağıranın olay döngüsünde çalışır; `submit` hemen döner,
+    iş uygun olduğunda görev olarak başlatılır. Durum değişikliklerinde
+    dinleyiciler çağrılır.
+    """
+
+    def __init__(self, run: JobRunner, max_parallel: int = 3,
+                 timeouts: Optional[Dict[str, Optional[float]]] = None,
+                 resources: Optional[Dict[str, Tuple[FrozenSet[str], FrozenSet[str]]]] = None,
+                 history_path: Optional[str] = None, max_finished: int = 50,
+                 on_output: Optional[OutputCallback] = None):
+        self.run = run
+        self.max_parallel = max_parallel
+        self.timeouts = timeouts or {}
+        self.resources = resources if resources is not None else COMMAND_RESOURCES
+        self.history_path = history_path
+        self.on_output = on_output
+        self.queue: List[Job] = []
+        self.running: Dict[int, Job] = {}
+        self.finished: Deque[Job] = deque(maxlen=max_finished)
+        self.listeners: List[JobListener] = []
+        self.durations: Dict[str, List[float]] = self._load_history()
+        self.next_id = 1
+
+    def subscribe(self, callback: JobListener) -> None:
+        """İş durumu her değiştiğinde çağrılacak fonksiyonu kaydet"""
+        self.listeners.append(callback)
+
+    def _notify(self, job: Job) -> None:
+        for callback in list(self.listeners):
+            try:
+                callback(job)
+            except Exception:
+                pass
+
+    @property
+    def jobs(self) -> List[Job]:
+        """Biten, çalışan ve bekleyen işler (eskiden yeniye)"""
+        return sorted(list(self.finished) + list(self.running.values()) + self.queue,
+                      key=lambda job: job.id)
+
+    def get(self, job_id: int) -> Optional[Job]:
+        for job in self.jobs:
+            if job.id == job_id:
+                return job
+        return None
+
+    def expected_duration(self, command: str) -> Optional[float]:
+        """Önceki başarılı çalışmaların medyanı"""
+        samples = sorted(self.durations.get(command, ()))
+        if not samples:
+            return None
+        return samples[len(samples) // 2]
+
+    def submit(self, command: str) -> Tuple[Job, bool]:
+        """Komutu kuyruğa al; aynı komut zaten bekliyorsa o iş döner (ikinci değer False)"""
+        for job in self.queue:
+            if job.command == command:
+                return job, False
+        job = Job(self.next_id, command, self.timeouts.get(command))
+        self.next_id += 1
+        self.queue.append(job)
+        self._notify(job)
+        self._pump()
+        return job, True
+
+    def _blocker(self, job: Job, ahead: List[Job]) -> Optional[str]:
+        """İşin başlamasını engelleyen komut (yoksa None)"""
+        for other in list(self.running.values()) + ahead:
+            if conflicts(job.command, other.command, self.resources):
+                return other.command
+        return None
+
+    def _pump(self) -> None:
+        """Başlayabilecek işleri kuyruk sırasıyla başlat"""
+        ahead: List[Job] = []
+        for job in list(self.queue):
+            blocker = self._blocker(job, ahead)
+            if blocker is None and len(self.running) >= self.max_parallel:
+                blocker = f"en çok {self.max_parallel} paralel iş"
+            if blocker is None:
+                self.queue.remove(job)
+                self._start(job)
+            else:
+                if blocker != job.blocked_by:
+                    job.blocked_by = blocker
+                    self._notify(job)
+                ahead.append(job)
+
+    def _start(self, job: Job) -> None:
+        job.state = RUNNING
+        job.blocked_by = None
+        job.started_at = time.time()
+        self.running[job.id] = job
+        job.task = asyncio.ensure_future(self._execute(job))
+        self._notify(job)
+
+    async def _execute(self, job: Job) -> None:
+        def on_start(stream) -> None:
+            job.stream = stream
+            if job.cancel_requested:
+                stream.cancel()
+
+        def on_output(elapsed: float, pipe: str, line: str) -> None:
+            if line.strip():
+                job.lines += 1
+                job.last_line = line
+            if self.on_output is not None:
+                self.on_output(job, elapsed, pipe, line)
+
+        try:
+            result = await self.run(job.command, on_output, on_start)
+        except asyncio.CancelledError:
+            result = {"success": False, "cancelled": True, "timed_out": False,
+                      "error": None, "returncode": None, "duration": job.duration}
+        except Exception as e:
+            result = {"success": False, "cancelled": False, "timed_out": False,
+                      "error": str(e), "returncode": None, "duration": job.duration}
+        job.result = result
+        job.finished_at = time.time()
+        job.stream = None
+        if result.get("success"):
+            job.state = DONE
+            self._record_duration(job.command, result.get("duration") or job.duration)
+        elif result.get("cancelled") or job.cancel_requested:
+            job.state = CANCELLED
+        elif result.get("timed_out"):
+            job.state = TIMED_OUT
+        else:
+            job.state = FAILED
+        del self.running[job.id]
+        self.finished.append(job)
+        self._notify(job)
+        self._pump()
+
+    def cancel(self, job_id: int) -> bool:
+        """İşi iptal et: bekliyorsa kuyruktan çıkar, çalışıyorsa süreç grubunu sonlandır"""
+        for job in self.queue:
+            if job.id == job_id:
+                self.queue.remove(job)
+                job.state = CANCELLED
+                job.cancel_requested = True
+                job.finished_at = time.time()
+                self.finished.append(job)
+                self._notify(job)
+                # Bu iş arkasındakileri bekletiyor olabilir
+                self._pump()
+                return True
+        job = self.running.get(job_id)
+        if job is None or job.cancel_requested:
+            return False
+        job.cancel_requested = True
+        if job.stream is not None:
+            job.stream.cancel()
+        self._notify(job)
+        return True
+
+    def cancel_all(self) -> int:
+        """Bekleyen ve çalışan tüm işleri iptal et; iptal edilen iş sayısı"""
+        # Önce kuyruk boşaltılır, yoksa biten işin yerine bekleyen başlar
+        ids = [job.id for job in self.queue] + list(self.running)
+        return sum(self.cancel(job_id) for job_id in ids)
+
+    async def shutdown(self, timeout: float = 10.0) -> None:
+        """Tüm işleri iptal et ve süreçlerin kapanmasını bekle"""
+        self.cancel_all()
+        tasks = [job.task for job in self.running.values() if job.task is not None]
+        if tasks:
+            done, pending = await asyncio.wait(tasks, timeout=timeout)
+            for task in pending:
+                # Görev iptali CommandRunner'ın finally bloğunda süreç grubunu öldürür
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending, timeout=timeout)
+
+    def _load_history(self) -> Dict[str, List[float]]:
+        if not self.history_path:
+            return {}
+        try:
+            with open(self.history_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return {str(command): [float(value) for value in values][-DURATION_SAMPLES:]
+                    for command, values in data.items() if isinstance(values, list)}
+        except (OSError, ValueError, AttributeError, TypeError):
+            return {}
+
+    def _record_duration(self, command: str, duration: float) -> None:
+        samples = self.durations.setdefault(command, [])
+        samples.append(round(duration, 2))
+        del samples[:-DURATION_SAMPLES]
+        if not self.history_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.history_path), exist_ok=True)
+            temp = self.history_path + ".tmp"
+            with open(temp, "w", encoding="utf-8") as f:
+                json.dump(self.durations, f)
+            os.replace(temp, self.history_path)
+        except OSError:
+            pass
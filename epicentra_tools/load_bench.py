@@ -0,0 +1,436 @@
+"""
+Yük testi - deprem API'sine kademeli eşzamanlılıkla istek gönderip kapasiteyi ölçer
+
+Her uç nokta için eşzamanlılık basamakları (ör. 1, 4, 16, 32) sırayla
+çalıştırılır; her basamakta sabit sayıda işçi kalıcı bağlantılarla art
+arda istek gönderir (kapalı döngü). Basamak başına istek/s, gecikme
+yüzdelikleri, hata oranı ve aynı anda örneklenen epicentra-server süreç
+ağacının RSS/CPU değerleri kaydedilir. RSS pm2'nin max_memory_restart
+sınırına yaklaşırsa test durdurulur; sunucu yeniden başlatılmadan önce
+kesilir. Raporlar logs/bench/ altına JSON olarak yazılır ve önceki bir
+raporla karşılaştırılabilir.
+
+    python3 -m epicentra_tools.load_bench [--ramp 1,4,16,32] [--duration 10] [--baseline eski.json]
+    python3 -m epicentra_tools.load_bench --compare eski.json yeni.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from epicentra_tools.ecosystem import get_app, get_server_url
+from epicentra_tools.health_prober import percentile
+from epicentra_tools.http_pool import HttpConnectionPool, HttpError
+from epicentra_tools.pm2_client import Pm2RpcClient, get_pm2_processes
+from epicentra_tools.process_sampler import ProcessSampler
+
+
+DEFAULT_PATHS = (
+    "/api/earthquakes",
+    "/api/earthquakes-combined?source=both",
+    "/api/earthquakes-export?format=csv",
+)
+DEFAULT_RAMP = (1, 4, 16, 32)
+REPORT_VERSION = 1
+
+
+def default_report_dir(project_root: str) -> str:
+    """Rapor dizini"""
+    return os.path.join(project_root, "logs", "bench")
+
+
+def git_revision(project_root: str) -> Optional[str]:
+    """Raporların hangi sürüme ait olduğu (git yoksa None)"""
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=project_root,
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                universal_newlines=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def find_app_pid(app: str, timeout: float = 5.0) -> Optional[int]:
+    """pm2'deki uygulamanın pid'i (çalışmıyorsa None)"""
+    client = Pm2RpcClient()
+    try:
+        processes = get_pm2_processes(client, timeout=timeout)
+    except Exception:
+        return None
+    finally:
+        client.close()
+    for process in processes:
+        if process.get("name") == app and process.get("pid"):
+            return process["pid"]
+    return None
+
+
+class StepResult:
+    """Tek basamağın (uç nokta + eşzamanlılık) ölçümleri"""
+
+    def __init__(self, path: str, concurrency: int):
+        self.path = path
+        self.concurrency = concurrency
+        self.latencies = array("d")
+        self.requests = 0
+        self.errors: Dict[str, int] = {}
+        self.timeouts = 0
+        self.bytes = 0
+        self.started = 0.0
+        self.elapsed = 0.0
+        self.client_cpu = 0.0
+        self.connections = 0
+        self.process_samples: List[Dict] = []
+        self.stopped: Optional[str] = None
+
+    def record(self, ms: float, status: Optional[int], size: int, error: Optional[str]) -> None:
+        self.requests += 1
+        self.bytes += size
+        if status is not None:
+            self.latencies.append(ms)
+        if error is not None:
+            self.errors[error] = self.errors.get(error, 0) + 1
+
+    @property
+    def error_count(self) -> int:
+        return sum(self.errors.values())
+
+    def process_summary(self) -> Optional[Dict]:
+        """Basamak boyunca sunucu süreç ağacının RSS/CPU özeti"""
+        samples = self.process_samples
+        if not samples:
+            return None
+        rss = [s["rss"] for s in samples]
+        cpu = [s["cpu_percent"] for s in samples if s.get("cpu_percent") is not None]
+        return {
+            "samples": len(samples),
+            "rss_start": rss[0],
+            "rss_end": rss[-1],
+            "rss_peak": max(rss),
+            "cpu_avg": sum(cpu) / len(cpu) if cpu else None,
+            "cpu_peak": max(cpu) if cpu else None,
+            "threads_peak": max(s["threads"] for s in samples),
+            "processes": samples[-1]["processes"],
+        }
+
+    def to_dict(self) -> Dict:
+        latencies = sorted(self.latencies)
+        elapsed = self.elapsed or None
+        return {
+            "path": self.path,
+            "concurrency": self.concurrency,
+            "duration": self.elapsed,
+            "requests": self.requests,
+            "rps": self.requests / elapsed if elapsed else None,
+            "errors": self.error_count,
+            "error_rate": self.error_count / self.requests if self.requests else None,
+            "errors_by_kind": dict(self.errors),
+            "timeouts": self.timeouts,
+            "bytes": self.bytes,
+            "mb_per_s": self.bytes / elapsed / 1024 ** 2 if elapsed else None,
+            "latency_ms": {
+                "min": latencies[0] if latencies else None,
+                "p50": percentile(latencies, 0.5),
+                "p90": percentile(latencies, 0.9),
+                "p95": percentile(latencies, 0.95),
+                "p99": percentile(latencies, 0.99),
+                "max": latencies[-1] if latencies else None,
+                "mean": sum(latencies) / len(latencies) if latencies else None,
+            },
+            # İstemci CPU'su %100'e yakınsa ölçülen sınır sunucunun değil istemcinin olabilir
+            "client_cpu_percent": self.client_cpu,
+            "connections": self.connections,
+            "process": self.process_summary(),
+            "stopped": self.stopped,
+        }
+
+
+class LoadBenchmark:
+    """Kademeli yük testi"""
+
+    def __init__(self, base_url: str, paths: Tuple[str, ...] = DEFAULT_PATHS,
+                 ramp: Tuple[int, ...] = DEFAULT_RAMP, duration: float = 10.0,
+                 timeout: float = 10.0, pid: Optional[int] = None,
+                 memory_limit: Optional[int] = None, memory_stop: float = 0.9,
+                 max_error_rate: float = 0.5, sample_interval: float = 0.5,
+                 log=print):
+        self.base_url = base_url.rstrip("/")
+        self.paths = tuple(paths)
+        self.ramp = tuple(ramp)
+        self.duration = duration
+        self.timeout = timeout
+        self.pid = pid
+        self.memory_limit = memory_limit
+        # RSS sınırın bu oranını geçince test kesilir (pm2 yeniden başlatmasın)
+        self.memory_stop = memory_stop
+        self.max_error_rate = max_error_rate
+        self.sample_interval = sample_interval
+        self.log = log
+        self.sampler = ProcessSampler(children_every=4, full_memory=False)
+        self.process_lost = False
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bench-sampler")
+
+    async def _worker(self, pool: HttpConnectionPool, step: StepResult, deadline: float,
+                      stop: asyncio.Event) -> None:
+        loop = asyncio.get_running_loop()
+        discard = lambda data: None
+        while not stop.is_set() and loop.time() < deadline:
+            start = loop.time()
+            status, size, error = None, 0, None
+            try:
+                response = await pool.get(step.path, on_chunk=discard)
+                status, size = response.status, response.size
+                if response.status >= 400:
+                    error = f"HTTP {response.status}"
+            except asyncio.TimeoutError:
+                step.timeouts += 1
+                error = "zaman aşımı"
+            except ConnectionRefusedError:
+                error = "bağlantı reddedildi"
+                # Sunucu kapalıyken boş döngüye girilmesin
+                await asyncio.sleep(0.1)
+            except (OSError, HttpError, asyncio.IncompleteReadError) as e:
+                error = e.__class__.__name__
+            step.record((loop.time() - start) * 1000, status, size, error)
+
+    async def _monitor(self, step: StepResult, stop: asyncio.Event) -> None:
+        """Sunucu süreç ağacını basamak boyunca örnekle; bellek sınırında testi kes"""
+        loop = asyncio.get_running_loop()
+        target = [{"pid": self.pid, "pm_id": "server"}]
+        while not stop.is_set():
+            stats = await loop.run_in_executor(self.executor, self.sampler.sample, target)
+            item = stats.get("server")
+            if item is None:
+                step.stopped = f"sunucu süreci (pid {self.pid}) kayboldu"
+                self.process_lost = True
+                stop.set()
+                return
+            step.process_samples.append(item)
+            if self.memory_limit and item["rss"] >= self.memory_limit * self.memory_stop:
+                step.stopped = (f"RSS {item['rss'] / 1024 ** 2:.0f}MB, max_memory_restart sınırının "
+                                f"%{self.memory_stop * 100:.0f}'ını geçti")
+                stop.set()
+                return
+            try:
+                await asyncio.wait_for(stop.wait(), self.sample_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run_step(self, path: str, concurrency: int) -> StepResult:
+        """Tek basamak: `concurrency` işçi `duration` saniye boyunca istek gönderir"""
+        step = StepResult(path, concurrency)
+        pool = HttpConnectionPool(self.base_url, max_connections=concurrency, timeout=self.timeout)
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        monitor = None
+        if self.pid:
+            # Oranlar (CPU) bir önceki örneğe göre hesaplandığı için başlangıç örneği alınır
+            await loop.run_in_executor(self.executor, self.sampler.sample,
+                                       [{"pid": self.pid, "pm_id": "server"}])
+            monitor = asyncio.ensure_future(self._monitor(step, stop))
+        cpu_before = sum(os.times()[:2])
+        step.started = time.time()
+        start = loop.time()
+        deadline = start + self.duration
+        try:
+            await asyncio.gather(*(self._worker(pool, step, deadline, stop) for _ in range(concurrency)))
+        finally:
+            step.elapsed = loop.time() - start
+            stop.set()
+            if monitor is not None:
+                await monitor
+            step.connections = pool.connections_opened
+            await pool.close()
+        step.client_cpu = (sum(os.times()[:2]) - cpu_before) / step.elapsed * 100 if step.elapsed else 0.0
+        return step
+
+    async def preflight(self) -> None:
+        """Sunucu hiç cevap vermiyorsa basamaklara başlamadan hata ver"""
+        pool = HttpConnectionPool(self.base_url, max_connections=1, timeout=self.timeout)
+        try:
+            await pool.get(self.paths[0], on_chunk=lambda data: None)
+        except (OSError, HttpError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+            raise RuntimeError(f"{self.base_url} cevap vermiyor: {e or e.__class__.__name__}")
+        finally:
+            await pool.close()
+
+    async def run(self) -> Dict:
+        """Tüm uç noktalar için basamakları çalıştır ve raporu döndür"""
+        await self.preflight()
+        started = time.time()
+        results = []
+        for path in self.paths:
+            steps = []
+            stopped = None
+            for concurrency in self.ramp:
+                self.log(f"▶️ {path} eşzamanlılık {concurrency} ({self.duration:g}s)")
+                step = await self.run_step(path, concurrency)
+                data = step.to_dict()
+                steps.append(data)
+                self.log(format_step(data))
+                if step.stopped:
+                    stopped = step.stopped
+                elif data["error_rate"] is not None and data["error_rate"] > self.max_error_rate:
+                    stopped = f"hata oranı %{data['error_rate'] * 100:.0f}"
+                if stopped:
+                    self.log(f"⛔ {path} için artış durduruldu: {stopped}")
+                    break
+            results.append({"path": path, "steps": steps, "stopped": stopped})
+            if self.process_lost:
+                # Sunucu yeniden başladı: sonraki uç noktaların ölçümü karşılaştırılamaz
+                break
+        self.executor.shutdown(wait=False)
+        return {
+            "version": REPORT_VERSION,
+            "started_at": started,
+            "finished_at": time.time(),
+            "base_url": self.base_url,
+            "pid": self.pid,
+            "memory_limit": self.memory_limit,
+            "ramp": list(self.ramp),
+            "duration": self.duration,
+            "timeout": self.timeout,
+            "results": results,
+        }
+
+
+def format_step(step: Dict) -> str:
+    """Basamak özetinin tek satırlık hali"""
+    fmt = lambda value, spec=".0f": "-" if value is None else format(value, spec)
+    latency = step["latency_ms"]
+    line = (f"   c={step['concurrency']:<3} {fmt(step['rps'], '.1f'):>8} istek/s  "
+            f"p50 {fmt(latency['p50'])}ms p95 {fmt(latency['p95'])}ms p99 {fmt(latency['p99'])}ms  "
+            f"hata %{fmt((step['error_rate'] or 0) * 100, '.1f')}  {fmt(step['mb_per_s'], '.2f')}MB/s  "
+            f"istemci CPU %{step['client_cpu_percent']:.0f}")
+    process = step["process"]
+    if process:
+        line += (f"  | sunucu RSS {process['rss_start'] / 1024 ** 2:.0f}->{process['rss_peak'] / 1024 ** 2:.0f}MB "
+                 f"CPU ort %{fmt(process['cpu_avg'])} tepe %{fmt(process['cpu_peak'])}")
+    return line
+
+
+def save_report(report: Dict, directory: str) -> str:
+    """Raporu zaman damgalı dosyaya yaz ve yolunu döndür"""
+    os.makedirs(directory, exist_ok=True)
+    name = datetime.fromtimestamp(report["started_at"]).strftime("bench-%Y%m%d-%H%M%S.json")
+    path = os.path.join(directory, name)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def compare_reports(old: Dict, new: Dict) -> List[str]:
+    """Aynı uç nokta ve eşzamanlılıktaki basamakların farkları"""
+    def change(before: Optional[float], after: Optional[float]) -> str:
+        if before is None or after is None:
+            return "-"
+        if before == 0:
+            return f"{after:.1f}"
+        return f"{(after - before) / before * 100:+.0f}%"
+
+    def index(report: Dict) -> Dict[Tuple[str, int], Dict]:
+        return {(result["path"], step["concurrency"]): step
+                for result in report["results"] for step in result["steps"]}
+
+    old_steps, new_steps = index(old), index(new)
+    lines = [f"📊 {old.get('git') or '?'} -> {new.get('git') or '?'}"]
+    for key in sorted(set(old_steps) & set(new_steps)):
+        before, after = old_steps[key], new_steps[key]
+        rss = lambda step: (step["process"] or {}).get("rss_peak")
+        lines.append(
+            f"   {key[0]} c={key[1]}: istek/s {change(before['rps'], after['rps'])}, "
+            f"p95 {change(before['latency_ms']['p95'], after['latency_ms']['p95'])}, "
+            f"p99 {change(before['latency_ms']['p99'], after['latency_ms']['p99'])}, "
+            f"hata %{(before['error_rate'] or 0) * 100:.1f} -> %{(after['error_rate'] or 0) * 100:.1f}, "
+            f"RSS tepe {change(rss(before), rss(after))}"
+        )
+    for key in sorted(set(new_steps) - set(old_steps)):
+        lines.append(f"   {key[0]} c={key[1]}: eski raporda yok")
+    return lines
+
+
+def load_report(path: str) -> Dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main(argv=None) -> int:
+    """Komut satırı girişi"""
+    default_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description="Epicentra API yük testi")
+    parser.add_argument("--project-root", default=default_root, help="proje dizini")
+    parser.add_argument("--app", default="epicentra-server", help="pm2 uygulama adı")
+    parser.add_argument("--url", help="temel adres (varsayılan uygulamanın portu)")
+    parser.add_argument("--path", action="append", dest="paths",
+                        help="test edilecek yol (birden fazla verilebilir)")
+    parser.add_argument("--ramp", default=",".join(map(str, DEFAULT_RAMP)),
+                        help="eşzamanlılık basamakları, ör. 1,4,16,32")
+    parser.add_argument("--duration", type=float, default=10.0, help="basamak süresi (saniye)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="istek zaman aşımı (saniye)")
+    parser.add_argument("--pid", type=int, help="izlenecek sunucu pid'i (varsayılan pm2'den)")
+    parser.add_argument("--memory-stop", type=float, default=0.9,
+                        help="RSS max_memory_restart'ın bu oranını geçince dur")
+    parser.add_argument("--output", help="rapor dizini (varsayılan logs/bench)")
+    parser.add_argument("--baseline", help="sonuçları karşılaştırılacak eski rapor")
+    parser.add_argument("--compare", nargs=2, metavar=("ESKİ", "YENİ"),
+                        help="test çalıştırmadan iki raporu karşılaştır")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        for line in compare_reports(load_report(args.compare[0]), load_report(args.compare[1])):
+            print(line)
+        return 0
+
+    try:
+        ramp = tuple(int(value) for value in args.ramp.split(",") if value.strip())
+    except ValueError:
+        parser.error(f"--ramp sayı listesi olmalı: {args.ramp}")
+    if not ramp or min(ramp) < 1:
+        parser.error("--ramp en az bir pozitif sayı içermeli")
+
+    app = get_app(args.project_root, args.app) or {}
+    base_url = args.url or get_server_url(args.project_root, args.app, app.get("port") or 8080)
+    pid = args.pid or find_app_pid(args.app)
+    log = lambda message: print(message, flush=True)
+    log(f"🏋️ Yük testi: {base_url}, basamaklar {list(ramp)}, {args.duration:g}s")
+    if pid:
+        log(f"🔬 {args.app} süreç ağacı izleniyor (pid {pid}), bellek sınırı "
+            f"{(app.get('max_memory_restart') or 0) / 1024 ** 2:.0f}MB")
+    else:
+        log(f"⚠️ {args.app} pm2'de bulunamadı; sunucu bellek/CPU ölçülmeyecek (--pid ile verilebilir)")
+
+    bench = LoadBenchmark(base_url, tuple(args.paths or DEFAULT_PATHS), ramp, args.duration,
+                          args.timeout, pid, app.get("max_memory_restart"), args.memory_stop,
+                          log=log)
+    # TUI'daki iptal butonu SIGTERM gönderir; Ctrl+C gibi işlensin
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    loop = asyncio.get_event_loop()
+    try:
+        report = loop.run_until_complete(bench.run())
+    except KeyboardInterrupt:
+        log("⛔ Yük testi kesildi")
+        return 130
+    except RuntimeError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    report["app"] = args.app
+    report["git"] = git_revision(args.project_root)
+    path = save_report(report, args.output or default_report_dir(args.project_root))
+    log(f"💾 Rapor kaydedildi: {path}")
+    if args.baseline:
+        for line in compare_reports(load_report(args.baseline), report):
+            log(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,468 @@
+"""
+Log deposu - saatlerce log geçmişini sıkıştırılmış sütunlarda tutar ve hızlı sorgular
+
+Her kayıt tamsayı zaman damgası (ms), tekilleştirilmiş seviye/kaynak numarası ve
+UTF-8 bayt olarak saklanır. Kayıtlar sabit boyutlu segmentlerde toplanır; dolan
+segment diske yazılır ve bellekte yalnızca özeti (zaman aralığı, seviye/kaynak
+kümeleri, korelasyon kimlikleri için bloom filtresi) kalır. Regex aramaları satır
+satır değil, segmentin birleşik bayt bloğu üzerinde tek geçişte yapılır.
+"""
+
+import bisect
+import hashlib
+import mmap
+import os
+import pickle
+import re
+import shutil
+import tempfile
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# (zaman damgası ms, seviye, kaynak, mesaj)
+LogEntry = Tuple[int, str, str, str]
+
+# server/middleware/request-logger.ts: "[HTTP] id=<12 karakter> GET ..."
+CORRELATION_RE = re.compile(r"\bid=([A-Za-z0-9_-]{6,64})\b")
+
+BLOOM_BITS = 1 << 16
+BLOOM_HASHES = 3
+
+
+def _bloom_positions(key: str) -> List[int]:
+    """Anahtar için bloom filtresi bit konumları"""
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8 * BLOOM_HASHES).digest()
+    return [int.from_bytes(digest[i * 8:(i + 1) * 8], "little") % BLOOM_BITS
+            for i in range(BLOOM_HASHES)]
+
+
+class Segment:
+    """Sütun tabanlı log segmenti"""
+
+    # Diske yazılan sütunlar; mesaj bloğu ayrı dosyada durur ve mmap ile okunur
+    COLUMNS = ("times", "levels", "sources", "offsets", "level_rows", "source_rows")
+
+    def __init__(self):
+        self.times = array("q")
+        self.levels = array("B")
+        self.sources = array("H")
+        self.offsets = array("Q")
+        self.payloads: List[bytes] = []
+        self.blob = None
+        self.payload_size = 0
+        self.level_rows: Dict[int, array] = {}
+        self.source_rows: Dict[int, array] = {}
+        # Korelasyon kimlikleri yalnızca sıcak segmentte tam indekslenir;
+        # diskteki segmentler bloom filtresi + blok araması kullanır
+        self.id_rows: Dict[str, array] = {}
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def append(self, ts_ms: int, level_id: int, source_id: int,
+               payload: bytes, correlation_id: Optional[str]) -> None:
+        """Satırı sütunlara ekle ve indeksleri güncelle"""
+        row = len(self.times)
+        self.times.append(ts_ms)
+        self.levels.append(level_id)
+        self.sources.append(source_id)
+        self.offsets.append(self.payload_size)
+        self.payloads.append(payload)
+        self.payload_size += len(payload) + 1
+        self.blob = None
+        self.level_rows.setdefault(level_id, array("I")).append(row)
+        self.source_rows.setdefault(source_id, array("I")).append(row)
+        if correlation_id:
+            self.id_rows.setdefault(correlation_id, array("I")).append(row)
+
+    def get_blob(self):
+        """Tüm mesajları satır sonlarıyla birleştirilmiş tek blok olarak döndür"""
+        if self.blob is None:
+            self.blob = b"\n".join(self.payloads) + b"\n" if self.payloads else b""
+        return self.blob
+
+    def payload(self, row: int) -> bytes:
+        """Tek satırın mesajı"""
+        if self.payloads:
+            return self.payloads[row]
+        start = self.offsets[row]
+        end = self.offsets[row + 1] - 1 if row + 1 < len(self.offsets) else len(self.blob) - 1
+        return self.blob[start:end]
+
+    def freeze(self) -> None:
+        """Diske yazmadan önce mesajları tek bloğa indir"""
+        self.get_blob()
+        self.payloads = []
+
+    def save(self, path: str) -> None:
+        """Sütunları ve mesaj bloğunu diske yaz"""
+        with open(path + ".blob", "wb") as f:
+            f.write(self.get_blob())
+        with open(path, "wb") as f:
+            pickle.dump({name: getattr(self, name) for name in self.COLUMNS}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str) -> "Segment":
+        """Diskteki segmenti aç; mesaj bloğu belleğe kopyalanmaz"""
+        segment = cls()
+        with open(path, "rb") as f:
+            segment.__dict__.update(pickle.load(f))
+        with open(path + ".blob", "rb") as f:
+            if os.fstat(f.fileno()).st_size:
+                segment.blob = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                segment.blob = b""
+        return segment
+
+    def rows_for_id(self, correlation_id: str) -> List[int]:
+        """Korelasyon kimliğini içeren satırlar"""
+        if self.payloads or correlation_id in self.id_rows:
+            return list(self.id_rows.get(correlation_id, ()))
+        needle = re.compile(b"id=" + re.escape(correlation_id.encode("utf-8")) + rb"\b")
+        return list(self.search_rows(needle))
+
+    def search_rows(self, pattern: "re.Pattern") -> array:
+        """Regex'i birleşik blok üzerinde çalıştırıp eşleşen satır numaralarını bul
+
+        Desen re.MULTILINE ile derlenmiş olmalı (^/$ satır başı/sonu). Satır
+        sonunu aşan eşleşmeler (\\s, [^x] gibi) yalnızca o satırda yeniden
+        denenir.
+        """
+        blob = self.get_blob()
+        rows = array("I")
+        offsets = self.offsets
+        position = 0
+        while True:
+            match = pattern.search(blob, position)
+            if match is None:
+                break
+            row = bisect.bisect_right(offsets, match.start()) - 1
+            if b"\n" not in blob[match.start():match.end()] or pattern.search(self.payload(row)):
+                rows.append(row)
+            # Aynı satırda tekrar aramamak için sonraki satıra atla
+            position = offsets[row + 1] if row + 1 < len(offsets) else len(blob)
+        return rows
+
+
+class SegmentInfo:
+    """Diske yazılmış segmentin bellekteki özeti"""
+
+    def __init__(self, path: str, segment: Segment):
+        self.path = path
+        self.count = len(segment)
+        self.t_min = min(segment.times)
+        self.t_max = max(segment.times)
+        self.level_ids = set(segment.level_rows)
+        self.source_ids = set(segment.source_rows)
+        self.bloom = bytearray(BLOOM_BITS // 8)
+        for key in segment.id_rows:
+            for bit in _bloom_positions(key):
+                self.bloom[bit >> 3] |= 1 << (bit & 7)
+
+    def may_contain_id(self, key: str) -> bool:
+        """Bloom filtresi: kimlik kesinlikle yoksa False"""
+        return all(self.bloom[bit >> 3] & (1 << (bit & 7)) for bit in _bloom_positions(key))
+
+
+class LogQuery:
+    """Sorgu ölçütleri"""
+
+    def __init__(self, pattern: Optional[str] = None, levels: Optional[List[str]] = None,
+                 sources: Optional[List[str]] = None, correlation_id: Optional[str] = None,
+                 since: Optional[float] = None, until: Optional[float] = None,
+                 limit: int = 500, ignore_case: bool = False):
+        self.pattern = pattern
+        self.levels = levels
+        self.sources = sources
+        self.correlation_id = correlation_id
+        self.since = since
+        self.until = until
+        self.limit = limit
+        self.ignore_case = ignore_case
+
+
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_query(text: str, now: Optional[float] = None) -> LogQuery:
+    """TUI arama kutusundaki ifadeyi çöz
+
+    Örnek: `timeout level:error,warning source:epicentra-server id:abc123 since:30m until:5m`
+    Anahtar kelime olmayan parçalar regex olarak birleştirilir; `-i` büyük/küçük
+    harf duyarsız arar.
+    """
+    now = time.time() if now is None else now
+    query = LogQuery()
+    words = []
+    for token in text.split():
+        if token == "-i":
+            query.ignore_case = True
+            continue
+        key, sep, value = token.partition(":")
+        key = key.lower()
+        if sep and value and key in ("level", "source", "id", "since", "until", "limit"):
+            if key == "level":
+                query.levels = [v.lower() for v in value.split(",")]
+            elif key == "source":
+                query.sources = value.split(",")
+            elif key == "id":
+                query.correlation_id = value
+            elif key == "limit":
+                query.limit = int(value)
+            else:
+                unit = DURATION_UNITS.get(value[-1].lower())
+                seconds = float(value[:-1]) * unit if unit else float(value)
+                setattr(query, key, now - seconds)
+        else:
+            words.append(token)
+    if words:
+        query.pattern = " ".join(words)
+    return query
+
+
+class LogStore:
+    """Diske taşan, indeksli log deposu"""
+
+    def __init__(self, segment_size: int = 65536, spill_dir: Optional[str] = None,
+                 max_segments: int = 400, cache_segments: int = 8):
+        self.segment_size = segment_size
+        self.max_segments = max_segments
+        self.cache_segments = cache_segments
+        self._own_dir = spill_dir is None
+        self.spill_dir = spill_dir or tempfile.mkdtemp(prefix="epicentra-logs-")
+        os.makedirs(self.spill_dir, exist_ok=True)
+        self.level_names: List[str] = []
+        self.level_ids: Dict[str, int] = {}
+        self.source_names: List[str] = []
+        self.source_ids: Dict[str, int] = {}
+        self.hot = Segment()
+        self.spilled: List[SegmentInfo] = []
+        self.cache: "OrderedDict[str, Segment]" = OrderedDict()
+        self.total = 0
+        self.dropped = 0
+        self._seq = 0
+        self.lock = threading.RLock()
+
+    def _intern(self, names: List[str], ids: Dict[str, int], value: str, limit: int) -> int:
+        """Tekrarlanan metni numaraya çevir"""
+        key = ids.get(value)
+        if key is None:
+            if len(names) >= limit:
+                # Tablo doldu: taşan değerler son numarayı paylaşır
+                return len(names) - 1
+            key = len(names)
+            names.append(value)
+            ids[value] = key
+        return key
+
+    def append(self, timestamp: float, level: str, source: str, message: str) -> None:
+        """Kayıt ekle"""
+        payload = message.replace("\n", " ").encode("utf-8", errors="replace")
+        match = CORRELATION_RE.search(message)
+        with self.lock:
+            level_id = self._intern(self.level_names, self.level_ids, level.lower(), 255)
+            source_id = self._intern(self.source_names, self.source_ids, source, 65535)
+            self.hot.append(int(timestamp * 1000), level_id, source_id, payload,
+                            match.group(1) if match else None)
+            self.total += 1
+            if len(self.hot) >= self.segment_size:
+                self._spill()
+
+    def extend(self, entries: List[Tuple[float, str, str, str]]) -> None:
+        """Birden fazla (zaman damgası, seviye, kaynak, mesaj) kaydını tek kilitle ekle"""
+        with self.lock:
+            for timestamp, level, source, message in entries:
+                self.append(timestamp, level, source, message)
+
+    def _spill(self) -> None:
+        """Dolan segmenti diske yaz"""
+        segment = self.hot
+        self.hot = Segment()
+        segment.freeze()
+        self._seq += 1
+        path = os.path.join(self.spill_dir, f"segment-{self._seq:06d}.cols")
+        segment.save(path)
+        self.spilled.append(SegmentInfo(path, segment))
+
+        # Disk sınırı: en eski segmentleri sil
+        while len(self.spilled) > self.max_segments:
+            oldest = self.spilled.pop(0)
+            self.dropped += oldest.count
+            self.cache.pop(oldest.path, None)
+            self._remove_files(oldest.path)
+
+    @staticmethod
+    def _remove_files(path: str) -> None:
+        """Segment dosyalarını sil"""
+        for name in (path, path + ".blob"):
+            try:
+                os.remove(name)
+            except OSError:
+                pass
+
+    def _load(self, info: SegmentInfo) -> Segment:
+        """Diskteki segmenti oku (son kullanılanlar önbellekte tutulur)"""
+        segment = self.cache.get(info.path)
+        if segment is not None:
+            self.cache.move_to_end(info.path)
+            return segment
+        segment = Segment.load(info.path)
+        self.cache[info.path] = segment
+        while len(self.cache) > self.cache_segments:
+            self.cache.popitem(last=False)
+        return segment
+
+    def _matching_rows(self, segment: Segment, query: LogQuery,
+                       level_ids: Optional[set], source_ids: Optional[set],
+                       regex: Optional["re.Pattern"]) -> List[int]:
+        """Segmentte sorguya uyan satırları artan sırada bul
+
+        En seçici ölçüt aday listesini üretir (kimlik, regex, en küçük indeks
+        listesi); kalan ölçütler sütunlardan satır başına kontrol edilir.
+        """
+        candidates: Optional[List[int]] = None
+        if query.correlation_id is not None:
+            candidates = segment.rows_for_id(query.correlation_id)
+        if regex is not None:
+            found = segment.search_rows(regex)
+            candidates = list(found) if candidates is None else \
+                sorted(set(candidates).intersection(found))
+
+        check_levels = level_ids is not None
+        check_sources = source_ids is not None
+        if candidates is None:
+            options = []
+            if check_levels:
+                options.append(("level", sorted(r for key in level_ids
+                                                for r in segment.level_rows.get(key, ()))))
+            if check_sources:
+                options.append(("source", sorted(r for key in source_ids
+                                                 for r in segment.source_rows.get(key, ()))))
+            if options:
+                kind, candidates = min(options, key=lambda option: len(option[1]))
+                if kind == "level":
+                    check_levels = False
+                else:
+                    check_sources = False
+            else:
+                candidates = range(len(segment))
+
+        since = int(query.since * 1000) if query.since is not None else None
+        until = int(query.until * 1000) if query.until is not None else None
+        times, levels, sources = segment.times, segment.levels, segment.sources
+        return [row for row in candidates
+                if (not check_levels or levels[row] in level_ids)
+                and (not check_sources or sources[row] in source_ids)
+                and (since is None or times[row] >= since)
+                and (until is None or times[row] <= until)]
+
+    def query(self, query: LogQuery) -> List[LogEntry]:
+        """Sorguya uyan en yeni `limit` kaydı zaman sırasıyla döndür"""
+        # Büyük/küçük harf duyarsız arama re'nin hızlı sabit metin aramasını kapatır,
+        # bu yüzden yalnızca istenirse (-i) açılır
+        # Mesajlar tek blokta aranır: ^/$ satır başı ve sonunda eşleşmeli
+        flags = re.MULTILINE | (re.IGNORECASE if query.ignore_case else 0)
+        regex = re.compile(query.pattern.encode("utf-8"), flags) if query.pattern else None
+
+        with self.lock:
+            level_ids = None
+            if query.levels is not None:
+                level_ids = {self.level_ids[l] for l in query.levels if l in self.level_ids}
+            source_ids = None
+            if query.sources is not None:
+                source_ids = {self.source_ids[s] for s in query.sources if s in self.source_ids}
+            since = int(query.since * 1000) if query.since is not None else None
+            until = int(query.until * 1000) if query.until is not None else None
+
+            results: List[LogEntry] = []
+            # En yeni segmentten geriye doğru tara, limit dolunca dur
+            segments: List[Tuple[Optional[SegmentInfo], Segment]] = [(None, self.hot)]
+            for info in reversed(self.spilled):
+                segments.append((info, None))
+
+            for info, segment in segments:
+                if info is not None:
+                    if since is not None and info.t_max < since:
+                        continue
+                    if until is not None and info.t_min > until:
+                        continue
+                    if level_ids is not None and not (level_ids & info.level_ids):
+                        continue
+                    if source_ids is not None and not (source_ids & info.source_ids):
+                        continue
+                    if query.correlation_id is not None and not info.may_contain_id(query.correlation_id):
+                        continue
+                    segment = self._load(info)
+                if not len(segment):
+                    continue
+
+                rows = self._matching_rows(segment, query, level_ids, source_ids, regex)
+                for row in reversed(rows):
+                    results.append((
+                        segment.times[row],
+                        self.level_names[segment.levels[row]],
+                        self.source_names[segment.sources[row]],
+                        segment.payload(row).decode("utf-8", errors="replace"),
+                    ))
+                    if len(results) >= query.limit:
+                        break
+                if len(results) >= query.limit:
+                    break
+
+        results.sort(key=lambda entry: entry[0])
+        return results
+
+    def iter_all(self) -> Iterator[LogEntry]:
+        """Tüm kayıtları eskiden yeniye dolaş (kaydetme için)"""
+        with self.lock:
+            infos = list(self.spilled)
+            hot = self.hot
+        for info in infos:
+            with self.lock:
+                segment = self._load(info)
+            for row in range(len(segment)):
+                yield (segment.times[row], self.level_names[segment.levels[row]],
+                       self.source_names[segment.sources[row]],
+                       segment.payload(row).decode("utf-8", errors="replace"))
+        for row in range(len(hot)):
+            yield (hot.times[row], self.level_names[hot.levels[row]],
+                   self.source_names[hot.sources[row]],
+                   hot.payload(row).decode("utf-8", errors="replace"))
+
+    def export(self, path: str) -> int:
+        """Tüm geçmişi metin dosyasına yaz, yazılan satır sayısını döndür"""
+        count = 0
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("# Epicentra TUI Bot Logları\n")
+            f.write(f"# Oluşturulma Tarihi: {datetime.now()}\n")
+            if self.dropped:
+                f.write(f"# Disk sınırı nedeniyle silinen eski kayıt: {self.dropped}\n")
+            f.write("\n")
+            for ts_ms, level, source, message in self.iter_all():
+                clock = datetime.fromtimestamp(ts_ms / 1000).strftime("%Y-%m-%d %H:%M:%S")
+                f.write(f"[{clock}] [{level.upper()}] [{source}] {message}\n")
+                count += 1
+        return count
+
+    def clear(self) -> None:
+        """Tüm kayıtları ve disk segmentlerini sil"""
+        with self.lock:
+            self.cache.clear()
+            for info in self.spilled:
+                self._remove_files(info.path)
+            self.spilled = []
+            self.hot = Segment()
+            self.total = 0
+            self.dropped = 0
+
+    def close(self) -> None:
+        """Depoyu kapat; geçici dizini kendimiz açtıysak sil"""
+        self.clear()
+        if self._own_dir:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
@@ -0,0 +1,365 @@
+"""
+PM2 log takipçisi - ecosystem.config.js'teki log dosyalarını doğrudan okur
+
+Dosyalar ofset tabanlı okunur (yalnızca yeni baytlar), değişiklikler Linux'ta
+inotify ile, diğer sistemlerde periyodik kontrolle yakalanır. Log döndürme
+(inode değişimi) ve kırpma (boyut küçülmesi ya da dosyanın ilk baytlarının
+değişmesi) algılanır. Farklı dosyalardan
+gelen satırlar pm2'nin `log_date_format` zaman damgasına göre sıralanarak
+birleştirilir.
+"""
+
+import asyncio
+import ctypes
+import ctypes.util
+import heapq
+import os
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional, Tuple
+
+from epicentra_tools.ecosystem import parse_ecosystem
+
+
+# (zaman damgası epoch, uygulama adı, "out" | "err", satır)
+LogLine = Tuple[float, str, str, str]
+
+# 'YYYY-MM-DD HH:mm:ss Z' -> "2025-10-02 19:53:59 +03:00: mesaj"
+TIMESTAMP_RE = re.compile(
+    r"^(\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2})(?:\.\d+)?\s*(Z|[+-]\d{2}:?\d{2})?:\s?"
+)
+
+READ_CHUNK = 256 * 1024
+# Kırpmayı algılamak için saklanan baştaki bayt sayısı (pm2 satırları zaman damgasıyla başlar)
+HEAD_BYTES = 256
+
+
+def parse_log_timestamp(line: str) -> Tuple[Optional[float], str]:
+    """Satırın başındaki pm2 zaman damgasını ayıkla"""
+    match = TIMESTAMP_RE.match(line)
+    if not match:
+        return None, line
+    try:
+        moment = datetime.strptime(match.group(1).replace("T", " "), "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        return None, line
+    zone = match.group(2)
+    if zone and zone != "Z":
+        sign = 1 if zone[0] == "+" else -1
+        digits = zone[1:].replace(":", "")
+        offset = timedelta(hours=int(digits[:2]), minutes=int(digits[2:]))
+        moment = moment.replace(tzinfo=timezone(sign * offset))
+    elif zone == "Z":
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp(), line[match.end():]
+
+
+def parse_ecosystem_logs(project_root: str) -> List[Tuple[str, str, str]]:
+    """ecosystem.config.js'ten (uygulama, akış, dosya yolu) listesini çıkar"""
+    files = []
+    for app in parse_ecosystem(project_root):
+        for key, stream in (("out_file", "out"), ("error_file", "err")):
+            if app[key]:
+                files.append((app["name"], stream, app[key]))
+    return files
+
+
+class TailedFile:
+    """Tek log dosyasını ofsetten okuyan takipçi"""
+
+    def __init__(self, app: str, stream: str, path: str, from_end: bool = True):
+        self.app = app
+        self.stream = stream
+        self.path = path
+        self.fd: Optional[int] = None
+        self.inode: Optional[Tuple[int, int]] = None
+        self.offset = 0
+        self.partial = b""
+        # Okunmuş bölgenin ilk baytları; kırpılıp ofsetin ötesine büyüyen dosyada değişir
+        self.head = b""
+        self.last_timestamp = 0.0
+        self._open(from_end)
+
+    def _open(self, from_end: bool) -> None:
+        """Dosyayı aç; ilk açılışta sonundan başla"""
+        try:
+            fd = os.open(self.path, os.O_RDONLY)
+        except OSError:
+            self.fd = None
+            self.inode = None
+            return
+        st = os.fstat(fd)
+        self.fd = fd
+        self.inode = (st.st_dev, st.st_ino)
+        self.offset = st.st_size if from_end else 0
+        self.partial = b""
+        self.head = b""
+        self._remember_head()
+
+    def close(self) -> None:
+        """Dosyayı kapat"""
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    def _remember_head(self) -> None:
+        """Okunmuş bölgenin ilk baytlarını (en çok HEAD_BYTES) sakla"""
+        if len(self.head) < HEAD_BYTES and self.offset > len(self.head):
+            self.head = os.pread(self.fd, min(HEAD_BYTES, self.offset), 0)
+
+    def _truncated(self, size: int) -> bool:
+        """Dosya ofsetten sonra kırpıldıysa True (yeniden büyümüş olsa da)"""
+        if size < self.offset:
+            return True
+        # copytruncate/pm2 flush sonrası dosya iki yoklama arasında eski ofseti geçebilir
+        return bool(self.head) and os.pread(self.fd, len(self.head), 0) != self.head
+
+    def _read_available(self) -> List[str]:
+        """Açık dosyadan ofsetten sonraki tüm tam satırları oku"""
+        lines = []
+        while True:
+            data = os.pread(self.fd, READ_CHUNK, self.offset)
+            if not data:
+                break
+            self.offset += len(data)
+            chunk = self.partial + data
+            parts = chunk.split(b"\n")
+            self.partial = parts.pop()
+            lines.extend(p.decode("utf-8", errors="replace").rstrip("\r") for p in parts)
+        return lines
+
+    def read_new(self) -> List[str]:
+        """Yeni satırları oku; döndürme ve kırpmayı ele al"""
+        if self.fd is None:
+            # Dosya sonradan oluşturulduysa baştan oku
+            self._open(from_end=False)
+            if self.fd is None:
+                return []
+
+        lines = []
+        try:
+            st = os.stat(self.path)
+            current = (st.st_dev, st.st_ino)
+        except OSError:
+            current = None
+
+        if current != self.inode:
+            # Döndürüldü: eski dosyada kalanları bitir, yenisine geç
+            lines.extend(self._read_available())
+            self.close()
+            if current is not None:
+                self._open(from_end=False)
+            if self.fd is None:
+                return lines
+        elif self._truncated(st.st_size):
+            # Kırpıldı (pm2 flush, copytruncate vb.): baştan oku
+            self.offset = 0
+            self.partial = b""
+            self.head = b""
+
+        lines.extend(self._read_available())
+        self._remember_head()
+        return lines
+
+    def read_last(self, count: int) -> List[str]:
+        """Dosyanın son `count` satırını sondan geriye okuyarak al"""
+        if self.fd is None:
+            return []
+        size = os.fstat(self.fd).st_size
+        data = b""
+        position = size
+        while position > 0 and data.count(b"\n") <= count:
+            step = min(READ_CHUNK, position)
+            position -= step
+            data = os.pread(self.fd, step, position) + data
+        lines = data.decode("utf-8", errors="replace").splitlines()
+        return lines[-count:]
+
+    def stamp(self, lines: List[str]) -> List[LogLine]:
+        """Satırlara zaman damgası ver; damgasız satırlar öncekini devralır"""
+        out = []
+        for line in lines:
+            ts, text = parse_log_timestamp(line)
+            if ts is None:
+                ts = self.last_timestamp or time.time()
+            else:
+                self.last_timestamp = ts
+            out.append((ts, self.app, self.stream, text))
+        return out
+
+
+class Inotify:
+    """ctypes üzerinden minimal inotify sarmalayıcısı"""
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM
+                  | IN_MOVED_TO | IN_CREATE | IN_DELETE)
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self.libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 başarısız")
+
+    def watch(self, directory: str) -> None:
+        """Dizindeki değişiklikleri izle"""
+        wd = self.libc.inotify_add_watch(self.fd, directory.encode(), self.WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch başarısız: {directory}")
+
+    def drain(self) -> None:
+        """Bekleyen olayları boşalt (hangi dosyanın değiştiğini tek tek kontrol ediyoruz)"""
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self) -> None:
+        """inotify tanımlayıcısını kapat"""
+        os.close(self.fd)
+
+
+class LogTailer:
+    """Birden fazla log dosyasını takip edip zaman sırasına göre birleştirir"""
+
+    def __init__(self, files: List[Tuple[str, str, str]],
+                 on_lines: Callable[[List[LogLine]], None],
+                 hold: float = 0.3, poll_interval: float = 1.0,
+                 safety_interval: float = 5.0):
+        self.files = [TailedFile(app, stream, path) for app, stream, path in files]
+        self.on_lines = on_lines
+        self.hold = hold
+        self.poll_interval = poll_interval
+        self.safety_interval = safety_interval
+        self.inotify: Optional[Inotify] = None
+        self._heap: List[Tuple[float, int, float, LogLine]] = []
+        self._seq = 0
+        self._changed: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def mode(self) -> str:
+        """Değişiklik algılama yöntemi"""
+        return "inotify" if self.inotify is not None else "poll"
+
+    def _setup_inotify(self) -> None:
+        """Log dizinlerini inotify ile izle; olmazsa periyodik kontrole düş"""
+        directories = {os.path.dirname(f.path) for f in self.files}
+        try:
+            inotify = Inotify()
+        except (OSError, AttributeError):
+            return
+        try:
+            for directory in directories:
+                inotify.watch(directory)
+        except OSError:
+            inotify.close()
+            return
+        self.inotify = inotify
+
+    def _collect(self) -> None:
+        """Tüm dosyalardan yeni satırları al ve birleştirme kuyruğuna koy"""
+        arrived = time.monotonic()
+        for tailed in self.files:
+            try:
+                lines = tailed.read_new()
+            except OSError:
+                continue
+            for entry in tailed.stamp(lines):
+                heapq.heappush(self._heap, (entry[0], self._seq, arrived, entry))
+                self._seq += 1
+
+    def _emit_ready(self, force: bool = False) -> None:
+        """Bekleme süresini dolduran satırları zaman sırasıyla yayınla"""
+        cutoff = time.monotonic() - self.hold
+        ready = []
+        while self._heap and (force or self._heap[0][2] <= cutoff):
+            ready.append(heapq.heappop(self._heap)[3])
+        if ready:
+            self.on_lines(ready)
+
+    def recent(self, count: int) -> List[LogLine]:
+        """Tüm dosyaların son satırlarını zaman sırasıyla birleştir"""
+        merged = []
+        for tailed in self.files:
+            merged.extend(tailed.stamp(tailed.read_last(count)))
+        merged.sort(key=lambda entry: entry[0])
+        return merged[-count:]
+
+    async def run(self) -> None:
+        """Takip döngüsü"""
+        loop = asyncio.get_running_loop()
+        self._changed = asyncio.Event()
+        self._setup_inotify()
+        if self.inotify is not None:
+            loop.add_reader(self.inotify.fd, self._on_inotify)
+        wait = self.safety_interval if self.inotify is not None else self.poll_interval
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(self._changed.wait(),
+                                           self.hold if self._heap else wait)
+                except asyncio.TimeoutError:
+                    pass
+                self._changed.clear()
+                self._collect()
+                self._emit_ready()
+        finally:
+            if self.inotify is not None:
+                loop.remove_reader(self.inotify.fd)
+                self.inotify.close()
+                self.inotify = None
+            self._emit_ready(force=True)
+
+    def _on_inotify(self) -> None:
+        """inotify olayı geldi"""
+        self.inotify.drain()
+        self._changed.set()
+
+    def start(self) -> None:
+        """Takibi çalışan event loop üzerinde başlat"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self.run())
+
+    async def stop(self) -> None:
+        """Takibi durdur ve dosyaları kapat"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for tailed in self.files:
+            tailed.close()
+
+
+def tail_recent(project_root: str, count: int) -> List[LogLine]:
+    """ecosystem.config.js'teki log dosyalarının son `count` satırını birleştir"""
+    files = parse_ecosystem_logs(project_root)
+    tailer = LogTailer(files, on_lines=lambda lines: None)
+    try:
+        return tailer.recent(count)
+    finally:
+        for tailed in tailer.files:
+            tailed.close()
+
+
+def format_log_line(entry: LogLine) -> str:
+    """Birleştirilmiş satırı ekranda göstermek için biçimlendir"""
+    ts, app, stream, text = entry
+    clock = datetime.fromtimestamp(ts).strftime("%H:%M:%S")
+    marker = "!" if stream == "err" else "|"
+    return f"{clock} {app} {marker} {text}"
@@ -0,0 +1,537 @@
+"""
+Metrik geçmişi - sabit boyutlu halka tamponlarda çok çözünürlüklü zaman serileri
+
+Her seri için üç seviye tutulur: 1 saniyelik (son 1 saat), 1 dakikalık
+(son 24 saat) ve 1 saatlik (son 30 gün). Her örnek tüm seviyelere aynı anda
+yazılır; bir kova içindeki örnekler min/max/toplam/sayı olarak birleşir.
+Veriler tipli dizilerde (memoryview) durur, bellek kullanımı çalışma
+süresinden bağımsız olarak sabittir.
+
+Dosya yolu verilirse diziler sabit düzenli bir dosyaya bellek eşlemeli (mmap)
+yazılır; yeniden açılışta geçmiş hiçbir ayrıştırma yapılmadan hazırdır.
+Dosya düzeni (küçük endian):
+
+    0     başlık: "EPMHIST1", sürüm, seviye sayısı, en fazla seri, ad boyutu,
+          kayıtlı seri sayısı, düzen CRC32'si, ardından (çözünürlük, kapasite) çiftleri
+    4096  seri adları dizini (en fazla seri × ad boyutu bayt, NUL dolgulu;
+          ad boyutunu aşan adlar kısaltılıp sonuna özet eklenir, bkz. series_key)
+    ...   sayfa hizalı veri: her seri için her seviyede bir halka
+          halka = (sıra u64, baş i32, boyut u32) + times q[] + mins d[]
+                  + maxs d[] + sums d[] + counts I[] (8 bayta dolgulu)
+
+Halka başlığındaki sıra sayacı yazımdan önce tek, sonra çift yapılır; açılışta
+tek bulunursa yarım kalan son kova atılır. Dosyaya tek süreç yazar (flock);
+okuyucular (ör. toplayıcı servisine bağlanan TUI'lar) dosyayı salt okunur
+eşler ve halka başlıklarını her sorguda yeniden okur. Çevrimdışı okuma için:
+`python -m epicentra_tools.metric_history logs/tui-metric-history.bin`
+"""
+
+import argparse
+import fcntl
+import hashlib
+import math
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+# (kova saniyesi, kapasite)
+LEVELS: Tuple[Tuple[int, int], ...] = ((1, 3600), (60, 1440), (3600, 720))
+
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+MAGIC = b"EPMHIST1"
+FORMAT_VERSION = 1
+NAME_SIZE = 64
+PAGE = 4096
+FILE_HEADER = struct.Struct("<8sIIIIII")
+LEVEL_ENTRY = struct.Struct("<II")
+RING_HEADER = struct.Struct("<QiI")
+
+# (kova başlangıcı, min, max, ortalama)
+Bucket = Tuple[int, float, float, float]
+
+
+def _align(value: int, alignment: int) -> int:
+    return (value + alignment - 1) // alignment * alignment
+
+
+def ring_nbytes(capacity: int) -> int:
+    """Tek halkanın bayt boyutu (başlık dahil)"""
+    return RING_HEADER.size + 32 * capacity + _align(4 * capacity, 8)
+
+
+class Ring:
+    """Tek çözünürlük seviyesinin halka tamponu
+
+    Sütunlar verilen tamponun (bytearray ya da mmap) üzerine açılmış
+    memoryview'lardır; tampon verilmezse bellekte ayrılır.
+    """
+
+    def __init__(self, resolution: int, capacity: int, buffer=None, offset: int = 0):
+        self.resolution = resolution
+        self.capacity = capacity
+        if buffer is None:
+            buffer, offset = bytearray(ring_nbytes(capacity)), 0
+        base = memoryview(buffer)[offset:offset + ring_nbytes(capacity)]
+        self.header = base[:RING_HEADER.size]
+        pos = RING_HEADER.size
+        columns = []
+        for code, width in (("q", 8), ("d", 8), ("d", 8), ("d", 8), ("I", 4)):
+            columns.append(base[pos:pos + width * capacity].cast(code))
+            pos += width * capacity
+        self.times, self.mins, self.maxs, self.sums, self.counts = columns
+        self._views = [base, self.header] + columns
+        self.seq, self.head, self.size = RING_HEADER.unpack_from(self.header)
+        if self.size > capacity or not -1 <= self.head < capacity:
+            self.seq, self.head, self.size = 0, -1, 0
+        if self.seq % 2:
+            self._recover()
+
+    def _recover(self) -> None:
+        """Yazım sırasında kesilmiş halkanın son (yarım) kovasını at"""
+        if self.size:
+            self.size -= 1
+            self.head = (self.head - 1) % self.capacity if self.size else -1
+        self.seq += 1
+        if not self.header.readonly:
+            self._commit()
+
+    def _commit(self) -> None:
+        RING_HEADER.pack_into(self.header, 0, self.seq, self.head, self.size)
+
+    def sync(self) -> None:
+        """Başka bir sürecin yazdığı halkanın başlığını yeniden oku (salt okunur eşleme)"""
+        seq, head, size = RING_HEADER.unpack_from(self.header)
+        if size <= self.capacity and -1 <= head < self.capacity:
+            self.seq, self.head, self.size = seq, head, size
+            if seq % 2:
+                # Yazım sürüyor: yarım kovayı bu okumada gösterme
+                self._recover()
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Örneği ait olduğu kovaya ekle"""
+        start = int(timestamp // self.resolution) * self.resolution
+        head = self.head
+        if self.size and start < self.times[head]:
+            # Saat geri alındıysa eski kovaları bozmamak için örneği at
+            return
+
+        # Yazım sürerken sıra sayacı tektir
+        self.seq += 1
+        self._commit()
+        if self.size and self.times[head] == start:
+            if value < self.mins[head]:
+                self.mins[head] = value
+            if value > self.maxs[head]:
+                self.maxs[head] = value
+            self.sums[head] += value
+            self.counts[head] += 1
+        else:
+            head = (head + 1) % self.capacity
+            self.times[head] = start
+            self.mins[head] = value
+            self.maxs[head] = value
+            self.sums[head] = value
+            self.counts[head] = 1
+            self.head = head
+            if self.size < self.capacity:
+                self.size += 1
+        self.seq += 1
+        self._commit()
+
+    def release(self) -> None:
+        """Tampona açılan görünümleri bırak (mmap kapatılmadan önce gerekli)"""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+
+    def buckets(self, since: float = 0.0) -> List[Bucket]:
+        """`since` sonrasındaki kovaları eskiden yeniye döndür"""
+        if not self.header.readonly:
+            return self._scan(since)
+        # Yazıcı başka süreçte: okuma sırasında sayaç değiştiyse tekrar oku
+        for _ in range(3):
+            self.sync()
+            seq = self.seq
+            result = self._scan(since)
+            if RING_HEADER.unpack_from(self.header)[0] in (seq, seq - 1):
+                break
+        return result
+
+    def _scan(self, since: float) -> List[Bucket]:
+        result = []
+        capacity = self.capacity
+        # Kovalar zamana göre sıralı: baştan geriye doğru tara, eski kovada dur
+        for i in range(self.size):
+            idx = (self.head - i) % capacity
+            start = self.times[idx]
+            if start + self.resolution <= since:
+                break
+            count = self.counts[idx]
+            result.append((start, self.mins[idx], self.maxs[idx],
+                           self.sums[idx] / count if count else 0.0))
+        result.reverse()
+        return result
+
+    @property
+    def span(self) -> int:
+        """Seviyenin kapsadığı toplam süre (saniye)"""
+        return self.resolution * self.capacity
+
+
+def series_key(name: str) -> str:
+    """Serinin dizinde saklanan adı
+
+    NAME_SIZE bayta sığan adlar olduğu gibi kalır. Uzun adlar karakter
+    sınırında kısaltılıp "#" ve tam adın özetiyle biter; böylece yeniden
+    açılışta aynı seriye eşlenir ve kısaltılmış ortak önek çakışmaz.
+    """
+    encoded = name.encode("utf-8")
+    if len(encoded) <= NAME_SIZE:
+        return name
+    digest = hashlib.blake2b(encoded, digest_size=6).hexdigest()
+    prefix = encoded[:NAME_SIZE - len(digest) - 1].decode("utf-8", errors="ignore")
+    return f"{prefix}#{digest}"
+
+
+def series_nbytes(levels: Sequence[Tuple[int, int]]) -> int:
+    """Tek serinin tüm seviyeleriyle bayt boyutu"""
+    return sum(ring_nbytes(capacity) for _, capacity in levels)
+
+
+class Series:
+    """Tek metriğin tüm çözünürlük seviyeleri"""
+
+    def __init__(self, name: str, levels: Sequence[Tuple[int, int]] = LEVELS,
+                 buffer=None, offset: int = 0):
+        self.name = name
+        self.rings = []
+        for resolution, capacity in levels:
+            self.rings.append(Ring(resolution, capacity, buffer, offset))
+            offset += ring_nbytes(capacity)
+
+    def add(self, timestamp: float, value: float) -> None:
+        for ring in self.rings:
+            ring.add(timestamp, value)
+
+    def ring_for(self, span: float) -> Ring:
+        """Süreyi kapsayan en ince çözünürlüklü seviye"""
+        for ring in self.rings:
+            if ring.span >= span:
+                return ring
+        return self.rings[-1]
+
+
+def layout_crc(max_series: int, levels: Sequence[Tuple[int, int]]) -> int:
+    """Dosya düzenini belirleyen parametrelerin sağlaması"""
+    data = struct.pack("<III", FORMAT_VERSION, max_series, NAME_SIZE)
+    data += b"".join(LEVEL_ENTRY.pack(resolution, capacity) for resolution, capacity in levels)
+    return zlib.crc32(data)
+
+
+class MetricHistory:
+    """Adlandırılmış metrik serilerinin sabit bellekli deposu"""
+
+    def __init__(self, max_series: int = 64, levels: Sequence[Tuple[int, int]] = LEVELS,
+                 path: Optional[str] = None, readonly: bool = False):
+        self.max_series = max_series
+        self.levels = tuple(levels)
+        # Anahtar series_key() ile dizinde saklanan addır
+        self.series: Dict[str, Series] = {}
+        self.dropped = 0
+        self.path = path
+        self.readonly = readonly
+        self.file = None
+        self.map: Optional[mmap.mmap] = None
+        self.data_offset = 0
+        if path:
+            self._open(path)
+
+    def _open(self, path: str) -> None:
+        """Dosyayı eşle; yoksa ya da düzeni farklıysa baştan oluştur"""
+        if self.readonly:
+            self.file = open(path, "rb")
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, n_levels, max_series, name_size, _, _ = FILE_HEADER.unpack_from(self.map, 0)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError(f"Geçersiz metrik geçmişi dosyası: {path}")
+            self.max_series = max_series
+            self.levels = tuple(LEVEL_ENTRY.unpack_from(self.map, FILE_HEADER.size + i * LEVEL_ENTRY.size)
+                                for i in range(n_levels))
+        else:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.file = open(path, "a+b")
+            self._lock()
+
+        size = self._file_size()
+        if not self.readonly and (os.fstat(self.file.fileno()).st_size != size or not self._valid_header()):
+            self._create(size)
+        if self.map is None:
+            self.map = mmap.mmap(self.file.fileno(), size)
+
+        self.data_offset = _align(PAGE + self.max_series * NAME_SIZE, PAGE)
+        self._load_directory()
+
+    def _load_directory(self) -> None:
+        """Dizindeki (henüz eşlenmemiş) serileri eşle"""
+        count = min(FILE_HEADER.unpack_from(self.map, 0)[5], self.max_series)
+        for index in range(len(self.series), count):
+            raw = self.map[PAGE + index * NAME_SIZE:PAGE + (index + 1) * NAME_SIZE]
+            name = raw.rstrip(b"\0").decode("utf-8", errors="replace")
+            self.series[name] = self._map_series(name, index)
+
+    def _lock(self) -> None:
+        """Dosyaya tek yazıcı olduğunu garanti et"""
+        try:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            self.file.close()
+            self.file = None
+            raise OSError(f"{self.path} başka bir süreç tarafından yazılıyor")
+
+    def _file_size(self) -> int:
+        return (_align(PAGE + self.max_series * NAME_SIZE, PAGE)
+                + self.max_series * series_nbytes(self.levels))
+
+    def _valid_header(self) -> bool:
+        """Başlık bu sürecin beklediği düzende mi?"""
+        self.file.seek(0)
+        head = self.file.read(FILE_HEADER.size)
+        if len(head) < FILE_HEADER.size:
+            return False
+        magic, version, _, max_series, name_size, _, crc = FILE_HEADER.unpack(head)
+        return (magic == MAGIC and version == FORMAT_VERSION and name_size == NAME_SIZE
+                and crc == layout_crc(max_series, self.levels) and max_series == self.max_series)
+
+    def _create(self, size: int) -> None:
+        """Boş dosyayı oluştur (eski/bozuk dosya yanına .bad olarak taşınır)"""
+        if os.fstat(self.file.fileno()).st_size:
+            self.file.close()
+            os.replace(self.path, self.path + ".bad")
+            self.file = open(self.path, "a+b")
+            self._lock()
+        self.file.truncate(size)
+        header = FILE_HEADER.pack(MAGIC, FORMAT_VERSION, len(self.levels), self.max_series,
+                                  NAME_SIZE, 0, layout_crc(self.max_series, self.levels))
+        header += b"".join(LEVEL_ENTRY.pack(resolution, capacity) for resolution, capacity in self.levels)
+        self.map = mmap.mmap(self.file.fileno(), size)
+        self.map[0:len(header)] = header
+        # Halka başlıkları sıfır: boş halka (baş -1 olarak yorumlanır)
+        for index in range(self.max_series):
+            offset = _align(PAGE + self.max_series * NAME_SIZE, PAGE) + index * series_nbytes(self.levels)
+            for _, capacity in self.levels:
+                RING_HEADER.pack_into(self.map, offset, 0, -1, 0)
+                offset += ring_nbytes(capacity)
+
+    def _map_series(self, name: str, index: int) -> Series:
+        offset = self.data_offset + index * series_nbytes(self.levels)
+        return Series(name, self.levels, self.map, offset)
+
+    def _get(self, name: str) -> Optional[Series]:
+        name = series_key(name)
+        series = self.series.get(name)
+        if series is None:
+            if len(self.series) >= self.max_series or self.readonly:
+                self.dropped += 1
+                return None
+            if self.map is not None:
+                # Önce ad yazılır, sonra sayaç artırılır: yarım kayıt görünmez
+                index = len(self.series)
+                encoded = name.encode("utf-8")
+                self.map[PAGE + index * NAME_SIZE:PAGE + (index + 1) * NAME_SIZE] = encoded.ljust(NAME_SIZE, b"\0")
+                series = self._map_series(name, index)
+                struct.pack_into("<I", self.map, 24, index + 1)
+            else:
+                series = Series(name, self.levels)
+            self.series[name] = series
+        return series
+
+    def flush(self) -> None:
+        """Eşlenmiş sayfaları diske yaz"""
+        if self.map is not None and not self.readonly:
+            self.map.flush()
+
+    def close(self) -> None:
+        """Dosyayı kapat"""
+        for series in self.series.values():
+            for ring in series.rings:
+                ring.release()
+        self.series.clear()
+        if self.map is not None:
+            self.flush()
+            self.map.close()
+            self.map = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def record(self, timestamp: float, values: Dict[str, float]) -> None:
+        """Aynı andaki ölçümleri ekle (NaN/None değerler atlanır)"""
+        for name, value in values.items():
+            if value is None or isinstance(value, bool):
+                continue
+            value = float(value)
+            if math.isnan(value):
+                continue
+            series = self._get(name)
+            if series is not None:
+                series.add(timestamp, value)
+
+    def _lookup(self, name: str) -> Optional[Series]:
+        """Okuma için seri; salt okunur eşlemede yazıcının eklediği yeni serileri de bulur"""
+        name = series_key(name)
+        series = self.series.get(name)
+        if series is None and self.readonly and self.map is not None:
+            self._load_directory()
+            series = self.series.get(name)
+        return series
+
+    def generation(self, name: str) -> int:
+        """Serinin yazım sayacı; değişmediyse grafikler yeniden hesaplanmaya gerek duymaz"""
+        series = self._lookup(name)
+        if series is None:
+            return -1
+        ring = series.rings[0]
+        if self.readonly:
+            ring.sync()
+        return ring.seq
+
+    def query(self, name: str, span: float, now: Optional[float] = None) -> Tuple[int, List[Bucket]]:
+        """Son `span` saniyenin kovaları ve kullanılan çözünürlük"""
+        series = self._lookup(name)
+        if series is None:
+            return 0, []
+        now = time.time() if now is None else now
+        ring = series.ring_for(span)
+        return ring.resolution, ring.buckets(now - span)
+
+    def stats(self, name: str, span: float, now: Optional[float] = None) -> Optional[Tuple[float, float, float]]:
+        """Son `span` saniyenin (min, max, ortalama) değeri"""
+        _, buckets = self.query(name, span, now)
+        if not buckets:
+            return None
+        return (min(b[1] for b in buckets), max(b[2] for b in buckets),
+                sum(b[3] for b in buckets) / len(buckets))
+
+    def sparkline(self, name: str, span: float, width: int = 30,
+                  low: Optional[float] = None, high: Optional[float] = None,
+                  now: Optional[float] = None) -> str:
+        """Son `span` saniyeyi `width` karakterlik grafik olarak çiz
+
+        Zaman ekseni eşit aralıklıdır; veri olmayan aralıklar boşluk kalır.
+        """
+        now = time.time() if now is None else now
+        _, buckets = self.query(name, span, now)
+        if not buckets:
+            return " " * width
+        start = now - span
+        sums = [0.0] * width
+        counts = [0] * width
+        for bucket_start, _, _, avg in buckets:
+            slot = int((bucket_start - start) * width / span)
+            slot = min(max(slot, 0), width - 1)
+            sums[slot] += avg
+            counts[slot] += 1
+        points = [sums[i] / counts[i] if counts[i] else None for i in range(width)]
+        present = [p for p in points if p is not None]
+        low = min(present) if low is None else low
+        high = max(present) if high is None else high
+        return render_sparkline(points, low, high)
+
+
+def render_sparkline(points: Sequence[Optional[float]], low: float, high: float) -> str:
+    """Değerleri blok karakterlerine çevir (None = boşluk)"""
+    scale = high - low
+    top = len(SPARK_CHARS) - 1
+    chars = []
+    for point in points:
+        if point is None:
+            chars.append(" ")
+        elif scale <= 0:
+            chars.append(SPARK_CHARS[0])
+        else:
+            level = int(round((point - low) / scale * top))
+            chars.append(SPARK_CHARS[min(max(level, 0), top)])
+    return "".join(chars)
+
+
+def process_series(process: Dict) -> Optional[str]:
+    """pm2 sürecinin seri öneki
+
+    Süreçler pm_id yerine adla izlenir; yeniden oluşturulsa da geçmiş devam
+    eder. Küme (cluster_mode) örneklerinin adı aynıdır, her biri ayrı seri
+    olsun diye öneke örnek numarası (NODE_APP_INSTANCE, yoksa pm_id) eklenir.
+    """
+    name = process.get("name")
+    if not name:
+        return None
+    env = process.get("pm2_env") or {}
+    if env.get("exec_mode") == "cluster_mode":
+        instance = env.get("NODE_APP_INSTANCE", process.get("pm_id"))
+        return f"pm2.{name}[{instance}]"
+    return f"pm2.{name}"
+
+
+def snapshot_metrics(snapshot: Dict) -> Dict[str, float]:
+    """Collector snapshot'ından kaydedilecek sayısal metrikleri çıkar"""
+    values: Dict[str, float] = {}
+    system = snapshot.get("system") or {}
+    for key in ("cpu_percent", "memory_percent", "disk_percent"):
+        if key in system:
+            values[f"system.{key}"] = system[key]
+
+    for process in snapshot.get("pm2") or []:
+        prefix = process_series(process)
+        if prefix is None:
+            continue
+        monit = process.get("monit") or {}
+        env = process.get("pm2_env") or {}
+        if "cpu" in monit:
+            values[f"{prefix}.cpu"] = monit["cpu"]
+        if "memory" in monit:
+            values[f"{prefix}.memory_mb"] = monit["memory"] / (1024 * 1024)
+        if "restart_time" in env:
+            values[f"{prefix}.restart_time"] = env["restart_time"]
+    return values
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Geçmiş dosyasını çevrimdışı oku"""
+    parser = argparse.ArgumentParser(description="Epicentra TUI metrik geçmişi okuyucu")
+    parser.add_argument("path", help="metrik geçmişi dosyası")
+    parser.add_argument("--series", help="yalnızca bu serinin kovalarını yazdır")
+    parser.add_argument("--span", type=float, default=3600, help="saniye cinsinden süre (varsayılan 3600)")
+    args = parser.parse_args(argv)
+
+    history = MetricHistory(path=args.path, readonly=True)
+    try:
+        if args.series:
+            resolution, buckets = history.query(args.series, args.span)
+            print(f"# {args.series} çözünürlük={resolution}s")
+            print("timestamp,min,max,avg")
+            for start, low, high, avg in buckets:
+                print(f"{start},{low:.3f},{high:.3f},{avg:.3f}")
+            return 0
+
+        print(f"{'seri':<48} {'son':>10} {'min':>10} {'ort':>10} {'maks':>10}")
+        for name in history.series:
+            _, buckets = history.query(name, args.span)
+            stats = history.stats(name, args.span)
+            if not buckets or stats is None:
+                print(f"{name:<48} {'-':>10}")
+                continue
+            print(f"{name:<48} {buckets[-1][3]:>10.2f} {stats[0]:>10.2f} {stats[2]:>10.2f} {stats[1]:>10.2f}")
+        return 0
+    finally:
+        history.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,288 @@
+"""
+/api/metrics kazıyıcı - Prometheus metin formatını artımlı çözer, oran ve yüzdelik hesaplar
+
+Sunucu yalnızca birikimli sayaçlar yayınlar (http_requests_total,
+http_request_errors_total, http_request_duration_ms_bucket). Saniye başına
+oranlar ardışık iki kazıma arasındaki farktan, p50/p95/p99 ise pencere
+içindeki kova (bucket) farklarından Prometheus'un histogram_quantile
+yöntemiyle (kova içinde doğrusal ara değer) hesaplanır.
+"""
+
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from epicentra_tools.http_pool import HttpConnectionPool
+
+
+# (metrik adı, sıralı etiket çiftleri)
+SeriesKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+Samples = Dict[SeriesKey, float]
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+REQUESTS = "http_requests_total"
+ERRORS = "http_request_errors_total"
+DURATION_BUCKET = "http_request_duration_ms_bucket"
+
+
+def parse_labels(text: str) -> Dict[str, str]:
+    """`a="1",b="x\\"y"` biçimindeki etiketleri çöz"""
+    labels = {}
+    i, n = 0, len(text)
+    while i < n:
+        eq = text.find("=", i)
+        if eq < 0:
+            break
+        key = text[i:eq].strip().lstrip(",").strip()
+        i = eq + 1
+        if i >= n or text[i] != '"':
+            raise ValueError(f"Etiket değeri tırnaksız: {text}")
+        i += 1
+        value = []
+        while i < n and text[i] != '"':
+            if text[i] == "\\" and i + 1 < n:
+                i += 1
+                value.append("\n" if text[i] == "n" else text[i])
+            else:
+                value.append(text[i])
+            i += 1
+        labels[key] = "".join(value)
+        i += 1
+        while i < n and text[i] in ", ":
+            i += 1
+    return labels
+
+
+def parse_value(text: str) -> float:
+    """Prometheus sayı değeri (+Inf, -Inf, NaN dahil)"""
+    if text == "+Inf":
+        return math.inf
+    if text == "-Inf":
+        return -math.inf
+    return float(text)
+
+
+class ExpositionParser:
+    """Prometheus metin formatını parça parça besleyerek çözen ayrıştırıcı
+
+    Gövde ağdan geldikçe feed() çağrılır; yalnızca tamamlanmış satırlar
+    işlenir, yarım satır sonraki parçayı bekler.
+    """
+
+    def __init__(self):
+        self.samples: Samples = {}
+        self.types: Dict[str, str] = {}
+        self.errors = 0
+        self._partial = b""
+
+    def feed(self, data: bytes) -> None:
+        """Yeni baytları ekle ve tam satırları çöz"""
+        data = self._partial + data
+        lines = data.split(b"\n")
+        self._partial = lines.pop()
+        for raw in lines:
+            self._parse_line(raw.decode("utf-8", errors="replace"))
+
+    def finish(self) -> Samples:
+        """Kalan yarım satırı işle ve örnekleri döndür"""
+        if self._partial:
+            self._parse_line(self._partial.decode("utf-8", errors="replace"))
+            self._partial = b""
+        return self.samples
+
+    def _parse_line(self, line: str) -> None:
+        line = line.strip()
+        if not line:
+            return
+        if line.startswith("#"):
+            parts = line.split(None, 3)
+            if len(parts) >= 4 and parts[1] == "TYPE":
+                self.types[parts[2]] = parts[3]
+            return
+        try:
+            brace = line.find("{")
+            if brace >= 0:
+                close = line.rindex("}")
+                name = line[:brace]
+                labels = parse_labels(line[brace + 1:close])
+                rest = line[close + 1:].split()
+            else:
+                fields = line.split()
+                name, labels, rest = fields[0], {}, fields[1:]
+            value = parse_value(rest[0])
+        except (ValueError, IndexError):
+            self.errors += 1
+            return
+        self.samples[(name, tuple(sorted(labels.items())))] = value
+
+
+def parse_exposition(text: str) -> Samples:
+    """Tüm metni tek seferde çöz"""
+    parser = ExpositionParser()
+    parser.feed(text.encode("utf-8"))
+    return parser.finish()
+
+
+def counter_delta(current: Samples, previous: Samples, key: SeriesKey) -> float:
+    """Sayaç farkı; sunucu yeniden başladıysa (değer düştüyse) yeni değer kullanılır"""
+    now = current.get(key, 0.0)
+    before = previous.get(key, 0.0)
+    return now - before if now >= before else now
+
+
+def histogram_quantile(q: float, buckets: List[Tuple[float, float]]) -> Optional[float]:
+    """Birikimli (üst sınır, sayı) kovalarından yüzdelik tahmini
+
+    Sıralama +Inf kovasına düşerse son sonlu sınır döndürülür.
+    """
+    if not buckets:
+        return None
+    total = buckets[-1][1]
+    if total <= 0:
+        return None
+    rank = q * total
+    lower_bound, lower_count = 0.0, 0.0
+    for bound, count in buckets:
+        if count >= rank:
+            if math.isinf(bound):
+                return lower_bound
+            if count == lower_count:
+                return bound
+            return lower_bound + (bound - lower_bound) * (rank - lower_count) / (count - lower_count)
+        lower_bound, lower_count = bound, count
+    return lower_bound
+
+
+def _provider_of(key: SeriesKey) -> str:
+    return dict(key[1]).get("provider", "unknown")
+
+
+class MetricsScraper:
+    """/api/metrics'i kalıcı bağlantıyla kazıyıp oran ve gecikme raporu üreten sınıf"""
+
+    def __init__(self, base_url: str, path: str = "/api/metrics",
+                 window: float = 60.0, pool: Optional[HttpConnectionPool] = None):
+        self.base_url = base_url
+        self.path = path
+        self.window = window
+        self.pool = pool or HttpConnectionPool(base_url, max_connections=1)
+        # (monotonic zaman, örnekler); oranlar son iki, yüzdelikler pencere başı ile hesaplanır
+        self.history: Deque[Tuple[float, Samples]] = deque()
+        self.report: Dict = {}
+
+    async def fetch(self, timeout: Optional[float] = None) -> Tuple[Samples, Dict]:
+        """Tek kazıma; örnekleri ve istek bilgisini döndür"""
+        parser = ExpositionParser()
+        response = await self.pool.get(self.path, timeout=timeout, on_chunk=parser.feed)
+        if response.status != 200:
+            raise RuntimeError(f"HTTP {response.status}")
+        samples = parser.finish()
+        return samples, {
+            "scrape_ms": response.elapsed * 1000,
+            "bytes": response.size,
+            "parse_errors": parser.errors,
+        }
+
+    async def scrape(self, timeout: float = 4.0) -> Dict:
+        """Kazı ve raporu güncelle (Collector'da engellemeyen probe olarak kullanılır)"""
+        samples, info = await self.fetch(timeout)
+        now = time.monotonic()
+        self.history.append((now, samples))
+        # Pencereden eski kazımaları at, en az iki kazıma kalsın
+        while len(self.history) > 2 and now - self.history[1][0] >= self.window:
+            self.history.popleft()
+        self.report = self.build_report(info)
+        return self.report
+
+    def build_report(self, info: Dict) -> Dict:
+        """Geçmişteki kazımalardan sağlayıcı bazlı rapor oluştur"""
+        now, current = self.history[-1]
+        providers: Dict[str, Dict] = {}
+
+        def entry(name: str) -> Dict:
+            if name not in providers:
+                providers[name] = {
+                    "total": 0.0, "errors_total": 0.0,
+                    "rps": None, "error_rps": None, "errors_by_status": {},
+                    "observations": 0.0,
+                    "p50": None, "p95": None, "p99": None,
+                }
+            return providers[name]
+
+        for key, value in current.items():
+            if key[0] == REQUESTS:
+                entry(_provider_of(key))["total"] += value
+            elif key[0] == ERRORS:
+                entry(_provider_of(key))["errors_total"] += value
+
+        interval = None
+        if len(self.history) >= 2:
+            before_t, before = self.history[-2]
+            interval = now - before_t
+            if interval > 0:
+                for name in providers:
+                    providers[name]["rps"] = 0.0
+                    providers[name]["error_rps"] = 0.0
+                for key in current:
+                    if key[0] == REQUESTS:
+                        rate = counter_delta(current, before, key) / interval
+                        entry(_provider_of(key))["rps"] += rate
+                    elif key[0] == ERRORS:
+                        rate = counter_delta(current, before, key) / interval
+                        item = entry(_provider_of(key))
+                        item["error_rps"] += rate
+                        status = dict(key[1]).get("status", "?")
+                        item["errors_by_status"][status] = item["errors_by_status"].get(status, 0.0) + rate
+
+        # Yüzdelikler: pencere başındaki kazımaya göre kova farkları (ilk kazımada birikimli)
+        start_t, start = self.history[0] if len(self.history) >= 2 else (now, {})
+        buckets: Dict[str, Dict[float, float]] = {}
+        for key in current:
+            if key[0] != DURATION_BUCKET:
+                continue
+            labels = dict(key[1])
+            try:
+                bound = parse_value(labels.get("le", ""))
+            except ValueError:
+                continue
+            per_provider = buckets.setdefault(labels.get("provider", "unknown"), {})
+            per_provider[bound] = per_provider.get(bound, 0.0) + counter_delta(current, start, key)
+
+        all_buckets: Dict[float, float] = {}
+        for name, per_provider in buckets.items():
+            ordered = sorted(per_provider.items())
+            item = entry(name)
+            item["observations"] = ordered[-1][1] if ordered else 0.0
+            for q in QUANTILES:
+                item[f"p{int(q * 100)}"] = histogram_quantile(q, ordered)
+            for bound, count in per_provider.items():
+                all_buckets[bound] = all_buckets.get(bound, 0.0) + count
+
+        overall = {
+            "total": sum(p["total"] for p in providers.values()),
+            "errors_total": sum(p["errors_total"] for p in providers.values()),
+            "rps": sum(p["rps"] or 0.0 for p in providers.values()) if interval else None,
+            "error_rps": sum(p["error_rps"] or 0.0 for p in providers.values()) if interval else None,
+            "observations": 0.0,
+        }
+        ordered_all = sorted(all_buckets.items())
+        overall["observations"] = ordered_all[-1][1] if ordered_all else 0.0
+        for q in QUANTILES:
+            overall[f"p{int(q * 100)}"] = histogram_quantile(q, ordered_all)
+
+        return {
+            "timestamp": time.time(),
+            "url": self.base_url + self.path,
+            "interval": interval,
+            "window": now - start_t,
+            "series": len(current),
+            "providers": providers,
+            "overall": overall,
+            **info,
+        }
+
+    async def close(self) -> None:
+        """Bağlantıları kapat"""
+        await self.pool.close()
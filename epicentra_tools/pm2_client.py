@@ -0,0 +1,275 @@
+"""
+PM2 daemon istemcisi - `pm2 jlist` yerine ~/.pm2/rpc.sock ve pub.sock üzerinden kalıcı bağlantı
+
+PM2 daemon'u axon soketleri kullanır. Her mesaj amp formatında kodlanır:
+ilk bayt (sürüm << 4 | argüman sayısı), ardından her argüman için 4 bayt
+big-endian uzunluk ve veri. Argümanlar "s:" (string) veya "j:" (JSON) önekli,
+önek yoksa ham bayttır.
+"""
+
+import json
+import os
+import socket
+import struct
+import subprocess
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+AMP_VERSION = 1
+MAX_ARGS = 15
+
+
+def get_pm2_home() -> str:
+    """PM2 ana dizinini bul"""
+    return os.environ.get("PM2_HOME") or os.path.join(os.path.expanduser("~"), ".pm2")
+
+
+def pack_arg(arg: Any) -> bytes:
+    """Tek argümanı amp formatına çevir"""
+    if isinstance(arg, (bytes, bytearray)):
+        return bytes(arg)
+    if isinstance(arg, str):
+        return b"s:" + arg.encode("utf-8")
+    return b"j:" + json.dumps(arg, separators=(",", ":")).encode("utf-8")
+
+
+def unpack_arg(data: bytes) -> Any:
+    """amp argümanını Python değerine çevir"""
+    if data[:2] == b"s:":
+        return data[2:].decode("utf-8", errors="replace")
+    if data[:2] == b"j:":
+        return json.loads(data[2:].decode("utf-8", errors="replace"))
+    return data
+
+
+def pack_message(args: List[Any]) -> bytes:
+    """Argüman listesini tek amp mesajına kodla"""
+    if len(args) > MAX_ARGS:
+        raise ValueError(f"amp en fazla {MAX_ARGS} argüman taşıyabilir")
+    parts = [bytes([AMP_VERSION << 4 | len(args)])]
+    for arg in args:
+        data = pack_arg(arg)
+        parts.append(struct.pack(">I", len(data)))
+        parts.append(data)
+    return b"".join(parts)
+
+
+class AmpParser:
+    """Soketten gelen baytları parça parça mesajlara ayırır"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def feed(self, data: bytes) -> List[List[Any]]:
+        """Yeni veriyi ekle, tamamlanan mesajları döndür"""
+        self.buffer.extend(data)
+        messages = []
+        while True:
+            message, consumed = self._parse_one()
+            if message is None:
+                break
+            del self.buffer[:consumed]
+            messages.append(message)
+        return messages
+
+    def _parse_one(self):
+        """Tampondaki ilk tam mesajı çöz; eksikse (None, 0) döndür"""
+        buf = self.buffer
+        if not buf:
+            return None, 0
+        meta = buf[0]
+        if meta >> 4 != AMP_VERSION:
+            raise ValueError(f"Desteklenmeyen amp sürümü: {meta >> 4}")
+        argc = meta & 0x0F
+        offset = 1
+        args = []
+        for _ in range(argc):
+            if len(buf) < offset + 4:
+                return None, 0
+            (length,) = struct.unpack_from(">I", buf, offset)
+            offset += 4
+            if len(buf) < offset + length:
+                return None, 0
+            args.append(unpack_arg(bytes(buf[offset:offset + length])))
+            offset += length
+        return args, offset
+
+
+class Pm2Error(Exception):
+    """PM2 daemon hatası"""
+
+
+class Pm2RpcClient:
+    """rpc.sock'a kalıcı bağlantı tutan istemci"""
+
+    def __init__(self, pm2_home: Optional[str] = None, timeout: float = 5.0):
+        self.pm2_home = pm2_home or get_pm2_home()
+        self.rpc_path = os.path.join(self.pm2_home, "rpc.sock")
+        self.timeout = timeout
+        self.identity = str(os.getpid())
+        self.sock: Optional[socket.socket] = None
+        self.parser = AmpParser()
+        self.next_id = 0
+        self.lock = threading.Lock()
+
+    def available(self) -> bool:
+        """Daemon soketi mevcut mu?"""
+        return os.path.exists(self.rpc_path)
+
+    def connect(self) -> None:
+        """Daemon'a bağlan (bağlıysa bir şey yapma)"""
+        if self.sock is not None:
+            return
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.rpc_path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+        self.parser = AmpParser()
+
+    def close(self) -> None:
+        """Bağlantıyı kapat"""
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+            self.sock = None
+
+    def _request(self, method: str, args: List[Any]) -> Any:
+        """Tek RPC çağrısı gönder ve cevabını bekle"""
+        self.connect()
+        request_id = f"{self.identity}:{self.next_id}"
+        self.next_id += 1
+        self.sock.sendall(pack_message([
+            {"type": "call", "method": method, "args": args},
+            request_id
+        ]))
+
+        deadline = time.monotonic() + self.timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise socket.timeout(f"{method} cevabı gelmedi")
+            self.sock.settimeout(remaining)
+            data = self.sock.recv(65536)
+            if not data:
+                raise ConnectionError("PM2 daemon bağlantıyı kapattı")
+            for message in self.parser.feed(data):
+                # Cevap: [hata, sonuç..., istek kimliği]
+                if not message or message[-1] != request_id:
+                    continue
+                error = message[0] if len(message) > 1 else None
+                if error:
+                    text = error.get("message") if isinstance(error, dict) else str(error)
+                    raise Pm2Error(text)
+                return message[1] if len(message) > 2 else None
+
+    def call(self, method: str, *args: Any) -> Any:
+        """RPC metodu çağır; kopmuş bağlantıda bir kez yeniden bağlanır"""
+        with self.lock:
+            for attempt in range(2):
+                try:
+                    return self._request(method, list(args))
+                except Pm2Error:
+                    raise
+                except (OSError, ValueError):
+                    self.close()
+                    if attempt == 1:
+                        raise
+
+    def list_processes(self) -> List[Dict]:
+        """`pm2 jlist` ile aynı süreç listesini al"""
+        result = self.call("getMonitorData", {})
+        return result if isinstance(result, list) else []
+
+
+class Pm2EventListener:
+    """pub.sock'a abone olup süreç olaylarını (restart, exit, online...) iletir"""
+
+    def __init__(self, callback: Callable[[str, Dict], None],
+                 pm2_home: Optional[str] = None,
+                 events: tuple = ("process:event",),
+                 reconnect_delay: float = 2.0):
+        self.callback = callback
+        self.pm2_home = pm2_home or get_pm2_home()
+        self.pub_path = os.path.join(self.pm2_home, "pub.sock")
+        self.events = events
+        self.reconnect_delay = reconnect_delay
+        self.running = False
+        self.connected = False
+        self.sock: Optional[socket.socket] = None
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Dinleme thread'ini başlat"""
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="pm2-events", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """Dinlemeyi durdur"""
+        self.running = False
+        if self.sock is not None:
+            try:
+                self.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def _run(self) -> None:
+        """Bağlan, mesajları oku, koparsa tekrar dene"""
+        while self.running:
+            try:
+                self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self.sock.connect(self.pub_path)
+                self.connected = True
+                parser = AmpParser()
+                while self.running:
+                    data = self.sock.recv(65536)
+                    if not data:
+                        break
+                    for message in parser.feed(data):
+                        if len(message) >= 2 and message[0] in self.events:
+                            try:
+                                self.callback(message[0], message[1])
+                            except Exception:
+                                pass
+            except (OSError, ValueError):
+                pass
+            finally:
+                self.connected = False
+                if self.sock is not None:
+                    self.sock.close()
+                    self.sock = None
+            if self.running:
+                time.sleep(self.reconnect_delay)
+
+
+def get_pm2_status_cli(timeout: float = 10.0) -> List[Dict]:
+    """Yedek yol: `pm2 jlist` alt sürecini çalıştır"""
+    result = subprocess.run(
+        ["pm2", "jlist"],
+        capture_output=True,
+        text=True,
+        timeout=timeout
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"pm2 jlist çıkış kodu {result.returncode}")
+    return json.loads(result.stdout)
+
+
+def get_pm2_processes(client: Optional[Pm2RpcClient], timeout: float = 10.0) -> List[Dict]:
+    """Süreç listesini önce daemon'dan, olmazsa CLI'dan al"""
+    if client is not None and client.available():
+        try:
+            return client.list_processes()
+        except (OSError, ValueError, Pm2Error):
+            pass
+    return get_pm2_status_cli(timeout)
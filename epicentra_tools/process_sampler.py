@@ -0,0 +1,185 @@
+"""
+PM2 süreç örnekleyici - pm2 pid'leri ve alt süreçleri için ayrıntılı psutil ölçümü
+
+pm2'nin monit.cpu / monit.memory değerleri kabadır. Burada her pid için
+psutil.Process nesnesi turlar arasında saklanır (her seferinde /proc
+taraması yapılmaz), okumalar oneshot() ile toplu yapılır ve alt süreçler
+(ör. `npm run dev` altındaki node) ana sürece eklenir. Oranlar (CPU, bağlam
+değişimi, disk G/Ç) ardışık iki ölçümün farkından hesaplanır.
+"""
+
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+import psutil
+
+
+PROC_FD = "/proc/{}/fd"
+
+
+def count_fds(proc: psutil.Process) -> Tuple[int, int]:
+    """(açık dosya tanımlayıcısı, soket) sayısı
+
+    Linux'ta /proc/<pid>/fd tek geçişte okunur; soket sayısı için
+    connections() gibi tüm /proc/net tablolarını taramaya gerek kalmaz.
+    """
+    fd_dir = PROC_FD.format(proc.pid)
+    try:
+        names = os.listdir(fd_dir)
+    except FileNotFoundError:
+        raise psutil.NoSuchProcess(proc.pid)
+    except PermissionError:
+        raise psutil.AccessDenied(proc.pid)
+    except OSError:
+        return proc.num_fds(), 0
+    sockets = 0
+    for name in names:
+        try:
+            if os.readlink(os.path.join(fd_dir, name)).startswith("socket:"):
+                sockets += 1
+        except OSError:
+            # Okuma sırasında kapanan tanımlayıcı
+            continue
+    return len(names), sockets
+
+
+class _Tracked:
+    """Saklanan psutil nesnesi ve son sayaçları"""
+
+    def __init__(self, proc: psutil.Process):
+        self.proc = proc
+        self.sampled_at: Optional[float] = None
+        self.cpu_time = 0.0
+        self.ctx_switches = 0
+        self.read_bytes = 0
+        self.write_bytes = 0
+
+
+class ProcessSampler:
+    """PM2 süreç ağaçlarını örnekleyen sınıf (Collector'da engelleyen probe olarak çalışır)"""
+
+    def __init__(self, include_children: bool = True, children_every: int = 6,
+                 full_memory: bool = True):
+        self.include_children = include_children
+        # Alt süreç listesi tüm süreç tablosunu taradığı için her N turda bir yenilenir
+        self.children_every = children_every
+        self.full_memory = full_memory
+        self.tracked: Dict[int, _Tracked] = {}
+        self.children: Dict[int, List[int]] = {}
+        self.rounds = 0
+
+    def _track(self, pid: int) -> Optional[_Tracked]:
+        tracked = self.tracked.get(pid)
+        if tracked is not None and tracked.proc.is_running():
+            return tracked
+        try:
+            tracked = _Tracked(psutil.Process(pid))
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            self.tracked.pop(pid, None)
+            return None
+        self.tracked[pid] = tracked
+        return tracked
+
+    def _members(self, root: _Tracked) -> List[_Tracked]:
+        """Kök süreç ve (önbellekteki) alt süreçleri"""
+        pid = root.proc.pid
+        if self.include_children and (pid not in self.children or self.rounds % self.children_every == 0):
+            try:
+                self.children[pid] = [child.pid for child in root.proc.children(recursive=True)]
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                self.children[pid] = []
+        members = [root]
+        for child_pid in self.children.get(pid, ()):
+            child = self._track(child_pid)
+            if child is not None:
+                members.append(child)
+        return members
+
+    def _read(self, tracked: _Tracked, now: float) -> Dict:
+        """Tek sürecin ölçümü; sayaç farkları için önceki değerleri günceller"""
+        proc = tracked.proc
+        stats = {"rss": 0, "uss": None, "threads": 0, "fds": None, "sockets": None,
+                 "cpu_percent": None, "ctx_rate": None, "read_rate": None, "write_rate": None}
+        with proc.oneshot():
+            # Zombi süreç /proc'ta sıfır değerlerle görünür; sonlanmış sayılır
+            if proc.status() == psutil.STATUS_ZOMBIE:
+                raise psutil.ZombieProcess(proc.pid)
+            if self.full_memory:
+                try:
+                    memory = proc.memory_full_info()
+                    stats["uss"] = memory.uss
+                except psutil.AccessDenied:
+                    memory = proc.memory_info()
+            else:
+                memory = proc.memory_info()
+            stats["rss"] = memory.rss
+            stats["threads"] = proc.num_threads()
+            cpu = proc.cpu_times()
+            cpu_total = cpu.user + cpu.system
+            ctx = proc.num_ctx_switches()
+            ctx_total = ctx.voluntary + ctx.involuntary
+            try:
+                io = proc.io_counters()
+            except (psutil.AccessDenied, AttributeError):
+                io = None
+        try:
+            stats["fds"], stats["sockets"] = count_fds(proc)
+        except psutil.AccessDenied:
+            pass
+
+        elapsed = now - tracked.sampled_at if tracked.sampled_at is not None else 0.0
+        if elapsed > 0:
+            stats["cpu_percent"] = max(0.0, cpu_total - tracked.cpu_time) / elapsed * 100
+            stats["ctx_rate"] = max(0, ctx_total - tracked.ctx_switches) / elapsed
+            if io is not None:
+                stats["read_rate"] = max(0, io.read_bytes - tracked.read_bytes) / elapsed
+                stats["write_rate"] = max(0, io.write_bytes - tracked.write_bytes) / elapsed
+        tracked.sampled_at = now
+        tracked.cpu_time = cpu_total
+        tracked.ctx_switches = ctx_total
+        if io is not None:
+            tracked.read_bytes, tracked.write_bytes = io.read_bytes, io.write_bytes
+        return stats
+
+    def sample(self, processes: List[Dict]) -> Dict[str, Dict]:
+        """pm_id -> toplu ölçüm (alt süreçler dahil); JSON'a uygun olsun diye anahtarlar metin"""
+        now = time.monotonic()
+        result: Dict[str, Dict] = {}
+        seen = set()
+        for process in processes:
+            pid = process.get("pid")
+            if not pid:
+                continue
+            root = self._track(pid)
+            if root is None:
+                continue
+            total = {"pid": pid, "processes": 0, "rss": 0, "uss": None, "threads": 0,
+                     "fds": None, "sockets": None, "cpu_percent": None, "ctx_rate": None,
+                     "read_rate": None, "write_rate": None}
+            for member in self._members(root):
+                try:
+                    stats = self._read(member, now)
+                except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                    self.tracked.pop(member.proc.pid, None)
+                    continue
+                except psutil.AccessDenied:
+                    continue
+                seen.add(member.proc.pid)
+                total["processes"] += 1
+                for key, value in stats.items():
+                    if value is None:
+                        continue
+                    total[key] = value if total.get(key) is None else total[key] + value
+            if total["processes"]:
+                result[str(process.get("pm_id", process.get("name")))] = total
+
+        # Artık pm2'de olmayan ya da sonlanmış süreçlerin nesnelerini bırak
+        for pid in list(self.tracked):
+            if pid not in seen:
+                del self.tracked[pid]
+        for pid in list(self.children):
+            if pid not in seen:
+                del self.children[pid]
+        self.rounds += 1
+        return result
@@ -0,0 +1,815 @@
+"""
+Push dağıtım testi - sahte Web Push alıcısıyla bildirim dağıtım hızını ölçer
+
+Varsayılan olarak test için ayrı bir sunucu örneği (.output/server/index.mjs)
+boş bir portta başlatılır: abonelik ve gönderildi önbelleği dosyaları
+logs/push-bench/data/ altındadır (PUSH_SUBSCRIPTIONS_FILE,
+PUSH_SENT_CACHE_FILE), deprem poller'ı kapalıdır (EARTHQUAKE_POLLER=off) ve
+alıcının sertifikasına NODE_EXTRA_CA_CERTS ile güvenir. Canlı sunucu ve
+gerçek abonelikler etkilenmez.
+
+UYARI: --allow-live ile canlı sunucunun .data/push-subscriptions.json
+dosyası test boyunca sentetik aboneliklerle değiştirilir. Bu sürede poller
+gerçek bir deprem yakalarsa bildirim sentetik uç noktalara gider ve
+depremin anahtarı push-sent-cache.json'a yazılır: gerçek aboneler o
+uyarıyı dosya geri konduktan sonra da hiç almaz.
+
+Her basamakta abonelik dosyasına `count` adet sentetik abonelik yazılır;
+uç noktaları yerel TLS'li sahte alıcıyı (varsayılan https://127.0.0.1:8443)
+gösterir. Ardından /api/push/test-notification'a
+`channels: ["webpush"]` ile test depremi gönderilir ve sunucunun
+sendPushForEarthquake ile yaptığı dağıtım alıcı tarafında izlenir:
+mesaj/s, tetiklemeden varışa gecikme yüzdelikleri, eksik mesajlar ve aynı
+anda örneklenen epicentra-server süreç ağacının RSS/CPU/soket değerleri.
+Gerçek abonelik dosyası test boyunca yedekte tutulur ve sonunda geri
+konur. Test süresince abonelik dosyasının yanındaki kilit dosyası flock ile
+tutulur; ikinci bir test (CLI ya da başka bir TUI) kilit boşalana kadar
+başlamaz. Kilit boşken kalmış bir yedek, yarıda kalan testten kalmıştır ve
+geri yüklenir.
+
+web-push yalnızca HTTPS ile gönderir: --url ya da --allow-live ile hedeflenen
+sunucu alıcının sertifikasına güvensin diye
+NODE_EXTRA_CA_CERTS=logs/push-bench/tls/cert.pem ile başlatılmalıdır. FCM token'ları Firestore'da durduğu ve firebase-admin'in
+uç noktası değiştirilemediği için FCM dağıtımı bu testin dışındadır.
+
+    python3 -m epicentra_tools.push_bench [--counts 1000,10000,100000] [--receiver-delay 20]
+    python3 -m epicentra_tools.push_bench --url http://127.0.0.1:8090 --subscriptions /yol/abonelikler.json
+    python3 -m epicentra_tools.push_bench --allow-live
+    python3 -m epicentra_tools.push_bench --restore
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import random
+import signal
+import socket
+import ssl
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from array import array
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from epicentra_tools.ecosystem import get_app, get_server_url
+from epicentra_tools.health_prober import percentile
+from epicentra_tools.http_pool import HttpConnectionPool, HttpError
+from epicentra_tools.load_bench import find_app_pid, git_revision
+from epicentra_tools.process_sampler import ProcessSampler
+
+
+DEFAULT_COUNTS = (1000, 10000)
+DEFAULT_PORT = 8443
+TRIGGER_PATH = "/api/push/test-notification"
+BACKUP_SUFFIX = ".bench-backup"
+LOCK_SUFFIX = ".bench-lock"
+MAX_REQUEST_HEAD = 16 * 1024
+# Farklı p256dh anahtarı sayısı; web-push her mesaj için zaten yeni ECDH anahtarı üretir
+KEY_POOL = 16
+REPORT_VERSION = 1
+
+
+def default_report_dir(project_root: str) -> str:
+    """Rapor dizini"""
+    return os.path.join(project_root, "logs", "push-bench")
+
+
+def subscriptions_path(project_root: str) -> str:
+    """push-notifier.ts'in okuduğu abonelik dosyası"""
+    return os.path.join(project_root, ".data", "push-subscriptions.json")
+
+
+def isolated_data_dir(project_root: str) -> str:
+    """Ayrı test örneğinin abonelik ve gönderildi önbelleği dizini"""
+    return os.path.join(default_report_dir(project_root), "data")
+
+
+def free_port(host: str = "127.0.0.1") -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+def b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _openssl(args: List[str], data: Optional[bytes] = None) -> bytes:
+    try:
+        result = subprocess.run(["openssl"] + args, input=data, stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE, timeout=30)
+    except FileNotFoundError:
+        raise RuntimeError("openssl bulunamadı (sertifika ve anahtar üretimi için gerekli)")
+    if result.returncode != 0:
+        raise RuntimeError(f"openssl {args[0]}: {result.stderr.decode(errors='replace').strip()}")
+    return result.stdout
+
+
+def ensure_tls(directory: str) -> Tuple[str, str]:
+    """127.0.0.1 için öz imzalı sertifika (yoksa üret); (sertifika, anahtar)
+
+    Sertifika çalıştırmalar arasında korunur, böylece sunucunun
+    NODE_EXTRA_CA_CERTS ayarı her testte değişmez.
+    """
+    cert = os.path.join(directory, "cert.pem")
+    key = os.path.join(directory, "key.pem")
+    if os.path.exists(cert) and os.path.exists(key):
+        return cert, key
+    os.makedirs(directory, exist_ok=True)
+    _openssl(["req", "-x509", "-newkey", "ec", "-pkeyopt", "ec_paramgen_curve:prime256v1",
+              "-nodes", "-keyout", key, "-out", cert, "-days", "3650",
+              "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1,DNS:localhost"])
+    return cert, key
+
+
+def generate_p256_keys(count: int) -> List[str]:
+    """Geçerli P-256 açık anahtarları (sıkıştırılmamış nokta, base64url)
+
+    web-push her abonelik için ECDH yapar; anahtar eğri üzerinde değilse
+    şifreleme hata verir, bu yüzden rastgele bayt kullanılamaz.
+    """
+    keys = []
+    for _ in range(count):
+        private = _openssl(["ecparam", "-name", "prime256v1", "-genkey", "-noout", "-outform", "DER"])
+        public = _openssl(["ec", "-inform", "DER", "-pubout", "-outform", "DER"], private)
+        # SubjectPublicKeyInfo'nun son 65 baytı 0x04 || X || Y noktasıdır
+        keys.append(b64url(public[-65:]))
+    return keys
+
+
+def build_subscriptions(count: int, base: str, run_id: str, keys: List[str],
+                        rng: random.Random) -> List[Dict]:
+    """Sahte alıcıyı gösteren etkin abonelikler (push-notifier.ts biçimi)"""
+    return [{
+        "endpoint": f"{base}/wp/{run_id}/{index}",
+        "keys": {"p256dh": keys[index % len(keys)], "auth": b64url(rng.getrandbits(128).to_bytes(16, "big"))},
+        "userSettings": {"active": True, "minMag": 3},
+    } for index in range(count)]
+
+
+class BenchLock:
+    """Aynı abonelik dosyasıyla çakışan testleri engelleyen flock kilidi
+
+    Kilit süreç ölünce çekirdek tarafından bırakılır; dosyada sahibin pid'i durur.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fd: Optional[int] = None
+
+    def acquire(self) -> Optional[int]:
+        """Kilidi al; başka test tutuyorsa onun pid'ini döndür (alındıysa None)"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                owner = os.read(fd, 32).decode("ascii", errors="replace").strip()
+                os.close(fd)
+                return int(owner) if owner.isdigit() else -1
+        os.ftruncate(fd, 0)
+        os.pwrite(fd, str(os.getpid()).encode("ascii"), 0)
+        self.fd = fd
+        return None
+
+    def release(self) -> None:
+        if self.fd is not None:
+            os.ftruncate(self.fd, 0)
+            os.close(self.fd)
+            self.fd = None
+
+
+class SubscriptionSwap:
+    """Gerçek abonelik dosyasını test boyunca yedekte tutar"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.backup = path + BACKUP_SUFFIX
+        self.swapped = False
+
+    def recover(self) -> bool:
+        """Yarıda kalmış bir testin yedeğini geri koy; yedek varsa True
+
+        Yalnızca BenchLock alınmışken çağrılmalı: kilit başkasındaysa yedek
+        çalışan bir teste aittir.
+        """
+        if not os.path.exists(self.backup):
+            return False
+        os.replace(self.backup, self.path)
+        return True
+
+    def seed(self, subscriptions: List[Dict]) -> None:
+        """Sentetik abonelikleri yaz (sunucu dosyayı her depremde okur, yazım atomik)"""
+        if not self.swapped:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            if os.path.exists(self.path):
+                os.replace(self.path, self.backup)
+            else:
+                # Dosya yoksa yedek boş liste olur (push-notifier.ts için dosyasızla aynı)
+                with open(self.backup, "w", encoding="utf-8") as f:
+                    f.write("[]")
+            self.swapped = True
+        temp = self.path + ".tmp"
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump(subscriptions, f, separators=(",", ":"))
+        os.replace(temp, self.path)
+
+    def restore(self) -> None:
+        if self.swapped:
+            self.swapped = False
+            try:
+                os.replace(self.backup, self.path)
+            except FileNotFoundError:
+                # Yedek zaten geri konmuş (ör. dışarıdan --restore)
+                pass
+
+
+class MockPushReceiver:
+    """Web Push servisi taklidi: her POST'un varış zamanını kaydeder
+
+    Gövde okunur ama çözülmez; cevap gerçek servisler gibi 201'dir.
+    `fail_rate` oranında 410 Gone (süresi dolmuş abonelik) döner, `delay`
+    servisin cevap gecikmesini taklit eder.
+    """
+
+    def __init__(self, host: str, port: int, cert: str, key: str,
+                 delay: float = 0.0, fail_rate: float = 0.0, seed: Optional[int] = None):
+        self.host = host
+        self.port = port
+        self.context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        self.context.load_cert_chain(cert, key)
+        self.delay = delay
+        self.fail_rate = fail_rate
+        self.rng = random.Random(seed)
+        self.prefix = ""
+        self.arrivals = array("d")
+        self.seen: set = set()
+        self.duplicates = 0
+        self.statuses: Counter = Counter()
+        self.connections = 0
+        self.active = 0
+        self.peak_active = 0
+        self.bytes = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    def reset(self, prefix: str) -> None:
+        """Yeni basamak: yalnızca `prefix` ile başlayan yollar sayılır"""
+        self.prefix = prefix
+        self.arrivals = array("d")
+        self.seen = set()
+        self.duplicates = 0
+        self.statuses = Counter()
+        self.connections = 0
+        self.peak_active = self.active
+        self.bytes = 0
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, ssl=self.context,
+                                                  limit=MAX_REQUEST_HEAD, backlog=4096)
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self.active += 1
+        self.peak_active = max(self.peak_active, self.active)
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    return
+                lines = head.decode("latin-1").split("\r\n")
+                parts = lines[0].split(" ")
+                if len(parts) < 3:
+                    return
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length") or 0)
+                if length:
+                    await reader.readexactly(length)
+                arrived = time.time()
+                path = parts[1]
+                if parts[0] == "POST" and path.startswith(self.prefix):
+                    self.bytes += length
+                    if path in self.seen:
+                        self.duplicates += 1
+                    else:
+                        self.seen.add(path)
+                        self.arrivals.append(arrived)
+                    status = "410 Gone" if self.fail_rate and self.rng.random() < self.fail_rate else "201 Created"
+                elif parts[0] == "POST":
+                    status = "404 Not Found"
+                else:
+                    status = "405 Method Not Allowed"
+                self.statuses[status.split(" ", 1)[0]] += 1
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write((f"HTTP/1.1 {status}\r\nContent-Length: 0\r\n"
+                              f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode("latin-1"))
+                await writer.drain()
+                if not keep_alive:
+                    return
+        except (ConnectionError, ssl.SSLError, asyncio.IncompleteReadError):
+            return
+        finally:
+            self.active -= 1
+            writer.close()
+
+
+class IsolatedServer:
+    """Test için canlı sunucudan ayrı çalışan epicentra-server örneği
+
+    Kendi abonelik/önbellek dosyalarını kullanır, poller'ı kapalıdır; gerçek
+    depremler için bildirim göndermez ve gerçek abonelere dokunmaz.
+    """
+
+    def __init__(self, project_root: str, cert: str, data_dir: str, log_path: str,
+                 host: str = "127.0.0.1", port: Optional[int] = None, startup_timeout: float = 60.0):
+        self.project_root = project_root
+        self.entry = os.path.join(project_root, ".output", "server", "index.mjs")
+        self.cert = cert
+        self.data_dir = data_dir
+        self.log_path = log_path
+        self.host = host
+        self.port = port or free_port(host)
+        self.startup_timeout = startup_timeout
+        self.process: Optional[subprocess.Popen] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def subscriptions_path(self) -> str:
+        return os.path.join(self.data_dir, "push-subscriptions.json")
+
+    def start(self) -> None:
+        """Örneği başlat ve HTTP cevabı verene kadar bekle"""
+        if not os.path.exists(self.entry):
+            raise RuntimeError(f"{self.entry} yok; önce build alınmalı")
+        os.makedirs(self.data_dir, exist_ok=True)
+        os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+        env = dict(os.environ,
+                   NODE_ENV="production",
+                   PORT=str(self.port), NITRO_PORT=str(self.port),
+                   HOST=self.host, NITRO_HOST=self.host,
+                   EARTHQUAKE_POLLER="off",
+                   PUSH_SUBSCRIPTIONS_FILE=self.subscriptions_path,
+                   PUSH_SENT_CACHE_FILE=os.path.join(self.data_dir, "push-sent-cache.json"),
+                   NODE_EXTRA_CA_CERTS=self.cert)
+        with open(self.log_path, "ab") as log_file:
+            try:
+                self.process = subprocess.Popen(["node", self.entry], cwd=self.project_root, env=env,
+                                                stdin=subprocess.DEVNULL, stdout=log_file,
+                                                stderr=subprocess.STDOUT, start_new_session=True)
+            except FileNotFoundError:
+                raise RuntimeError("node bulunamadı")
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"test sunucusu başlamadan çıktı (kod {self.process.returncode}), "
+                                   f"bkz. {self.log_path}")
+            try:
+                with urllib.request.urlopen(self.url + "/api/push/status", timeout=2):
+                    return
+            except urllib.error.HTTPError:
+                # Cevap veriyor; durum kodu önemli değil
+                return
+            except (urllib.error.URLError, OSError):
+                time.sleep(0.5)
+        self.stop()
+        raise RuntimeError(f"test sunucusu {self.startup_timeout:.0f} s içinde cevap vermedi, bkz. {self.log_path}")
+
+    def stop(self) -> None:
+        """Süreç grubunu SIGTERM, kapanmazsa SIGKILL ile sonlandır"""
+        if self.process is None or self.process.poll() is not None:
+            return
+        for sig, wait in ((signal.SIGTERM, 5.0), (signal.SIGKILL, 5.0)):
+            try:
+                os.killpg(self.process.pid, sig)
+            except (ProcessLookupError, PermissionError):
+                return
+            try:
+                self.process.wait(wait)
+                return
+            except subprocess.TimeoutExpired:
+                continue
+
+
+class PushBenchmark:
+    """Abonelik sayısı basamaklarıyla Web Push dağıtım testi"""
+
+    def __init__(self, base_url: str, receiver: MockPushReceiver, swap: SubscriptionSwap,
+                 keys: List[str], pid: Optional[int] = None, memory_limit: Optional[int] = None,
+                 memory_stop: float = 0.9, magnitude: float = 5.0, settle: float = 5.0,
+                 timeout: float = 600.0, sample_interval: float = 0.25,
+                 seed: Optional[int] = None, log=print):
+        self.base_url = base_url.rstrip("/")
+        self.receiver = receiver
+        self.swap = swap
+        self.keys = keys
+        self.pid = pid
+        self.memory_limit = memory_limit
+        # Sonraki basamağın tahmini RSS'i sınırın bu oranını geçerse durulur (pm2 yeniden başlatmasın)
+        self.memory_stop = memory_stop
+        self.magnitude = magnitude
+        # Tetikleme cevabından sonra geç gelen mesajlar için bekleme (saniye)
+        self.settle = settle
+        self.timeout = timeout
+        self.sample_interval = sample_interval
+        self.rng = random.Random(seed)
+        self.log = log
+        self.sampler = ProcessSampler(children_every=4, full_memory=False)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="push-bench-sampler")
+
+    async def _monitor(self, samples: List[Dict], stop: asyncio.Event) -> None:
+        """Sunucu süreç ağacını dağıtım boyunca örnekle"""
+        loop = asyncio.get_running_loop()
+        target = [{"pid": self.pid, "pm_id": "server"}]
+        while not stop.is_set():
+            stats = await loop.run_in_executor(self.executor, self.sampler.sample, target)
+            if "server" in stats:
+                samples.append(dict(stats["server"], t=time.time()))
+            try:
+                await asyncio.wait_for(stop.wait(), self.sample_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run_step(self, count: int) -> Dict:
+        """Tek basamak: `count` abonelik yaz, tetikle ve varışları bekle"""
+        loop = asyncio.get_running_loop()
+        run_id = f"{datetime.now().strftime('%H%M%S')}-{count}"
+        base = f"https://{self.receiver.host}:{self.receiver.port}"
+        subscriptions = await loop.run_in_executor(
+            self.executor, build_subscriptions, count, base, run_id, self.keys, self.rng)
+        await loop.run_in_executor(self.executor, self.swap.seed, subscriptions)
+        del subscriptions
+        self.receiver.reset(f"/wp/{run_id}/")
+
+        samples: List[Dict] = []
+        stop = asyncio.Event()
+        monitor = None
+        if self.pid:
+            # CPU oranı bir önceki örneğe göre hesaplandığı için başlangıç örneği alınır
+            await loop.run_in_executor(self.executor, self.sampler.sample,
+                                       [{"pid": self.pid, "pm_id": "server"}])
+            monitor = asyncio.ensure_future(self._monitor(samples, stop))
+        cpu_before = sum(os.times()[:2])
+        payload = json.dumps({"magnitude": self.magnitude, "city": "Push Testi",
+                              "district": f"{count} abonelik", "channels": ["webpush"],
+                              "cache": False}).encode("utf-8")
+        pool = HttpConnectionPool(self.base_url, max_connections=1, timeout=self.timeout)
+        triggered = time.time()
+        trigger_error, durations = None, {}
+        try:
+            response = await pool.post_json(TRIGGER_PATH, payload)
+            if response.status != 200:
+                trigger_error = f"HTTP {response.status}"
+            else:
+                durations = json.loads(response.body.decode("utf-8")).get("durations") or {}
+        except asyncio.TimeoutError:
+            trigger_error = "zaman aşımı"
+        except (OSError, HttpError, asyncio.IncompleteReadError, ValueError) as e:
+            trigger_error = f"{e.__class__.__name__}: {e}"
+        finally:
+            await pool.close()
+        responded = time.time()
+
+        # Sunucu dağıtımı bekleyip cevap verir; yine de geç varışlar için kısa süre beklenir
+        deadline = responded + self.settle
+        while time.time() < deadline and len(self.receiver.arrivals) < count:
+            await asyncio.sleep(0.1)
+        finished = time.time()
+        stop.set()
+        if monitor is not None:
+            await monitor
+        return self._result(count, triggered, responded, finished, trigger_error, durations,
+                            samples, sum(os.times()[:2]) - cpu_before)
+
+    def _result(self, count: int, triggered: float, responded: float, finished: float,
+                trigger_error: Optional[str], durations: Dict, samples: List[Dict],
+                receiver_cpu: float) -> Dict:
+        receiver = self.receiver
+        arrivals = sorted(receiver.arrivals)
+        latencies = [(t - triggered) * 1000 for t in arrivals]
+        span = arrivals[-1] - arrivals[0] if len(arrivals) > 1 else 0.0
+        process = None
+        if samples:
+            rss = [s["rss"] for s in samples]
+            cpu = [s["cpu_percent"] for s in samples if s.get("cpu_percent") is not None]
+            sockets = [s["sockets"] for s in samples if s.get("sockets") is not None]
+            process = {
+                "samples": len(samples),
+                "rss_start": rss[0],
+                "rss_peak": max(rss),
+                "rss_end": rss[-1],
+                "cpu_avg": sum(cpu) / len(cpu) if cpu else None,
+                "cpu_peak": max(cpu) if cpu else None,
+                "sockets_peak": max(sockets) if sockets else None,
+                "threads_peak": max(s["threads"] for s in samples),
+            }
+        elapsed = finished - triggered
+        return {
+            "subscriptions": count,
+            "received": len(arrivals),
+            "missing": count - len(arrivals),
+            "duplicates": receiver.duplicates,
+            "statuses": dict(receiver.statuses),
+            "trigger_ms": (responded - triggered) * 1000,
+            "trigger_error": trigger_error,
+            "server_durations_ms": durations,
+            # İlk ve son varış arası; dosya okuma/filtreleme süresi bunun dışında kalır
+            "messages_per_s": (len(arrivals) - 1) / span if span else None,
+            "end_to_end_per_s": len(arrivals) / (arrivals[-1] - triggered) if arrivals else None,
+            "latency_ms": {
+                "first": latencies[0] if latencies else None,
+                "p50": percentile(latencies, 0.5),
+                "p95": percentile(latencies, 0.95),
+                "p99": percentile(latencies, 0.99),
+                "max": latencies[-1] if latencies else None,
+            },
+            "receiver": {
+                "connections": receiver.connections,
+                "peak_concurrent": receiver.peak_active,
+                "mb": receiver.bytes / 1024 ** 2,
+                # %100'e yakınsa ölçülen hız sunucunun değil alıcının sınırıdır
+                "cpu_percent": receiver_cpu / elapsed * 100 if elapsed else None,
+            },
+            "process": process,
+        }
+
+    def _memory_stop(self, step: Dict, next_count: Optional[int]) -> Optional[str]:
+        """Sonraki basamak bellek sınırını aşacaksa nedeni
+
+        Dağıtım tek bir istekle tetiklendiği için yarıda kesilemez; artış
+        abonelik sayısıyla doğrusal varsayılarak önceden tahmin edilir.
+        """
+        process = step["process"]
+        if not self.memory_limit or not process:
+            return None
+        limit = self.memory_limit * self.memory_stop
+        if process["rss_peak"] >= limit:
+            return (f"RSS {process['rss_peak'] / 1024 ** 2:.0f}MB, max_memory_restart sınırının "
+                    f"%{self.memory_stop * 100:.0f}'ını geçti")
+        if next_count is None:
+            return None
+        growth = max(0, process["rss_peak"] - process["rss_start"])
+        estimate = process["rss_start"] + growth * next_count / step["subscriptions"]
+        if estimate >= limit:
+            return (f"{next_count} abonelikte tahmini RSS {estimate / 1024 ** 2:.0f}MB, "
+                    f"sınır {self.memory_limit / 1024 ** 2:.0f}MB")
+        return None
+
+    async def run(self, counts: Tuple[int, ...]) -> Dict:
+        """Tüm basamakları sırayla çalıştır ve raporu döndür"""
+        started = time.time()
+        steps = []
+        stopped = None
+        await self.receiver.start()
+        try:
+            for position, count in enumerate(counts):
+                self.log(f"▶️ {count} abonelik")
+                step = await self.run_step(count)
+                steps.append(step)
+                for line in format_step(step):
+                    self.log(line)
+                if step["trigger_error"] and not step["received"]:
+                    stopped = "tetikleme başarısız"
+                else:
+                    stopped = self._memory_stop(step, counts[position + 1] if position + 1 < len(counts) else None)
+                if stopped:
+                    if position + 1 < len(counts):
+                        self.log(f"⛔ Sonraki basamaklar atlandı: {stopped}")
+                    break
+        finally:
+            await self.receiver.close()
+            self.swap.restore()
+            self.executor.shutdown(wait=False)
+        return {
+            "version": REPORT_VERSION,
+            "started_at": started,
+            "finished_at": time.time(),
+            "base_url": self.base_url,
+            "receiver": f"https://{self.receiver.host}:{self.receiver.port}",
+            "receiver_delay": self.receiver.delay,
+            "fail_rate": self.receiver.fail_rate,
+            "pid": self.pid,
+            "memory_limit": self.memory_limit,
+            "counts": list(counts),
+            "steps": steps,
+            "stopped": stopped,
+        }
+
+
+def format_step(step: Dict) -> List[str]:
+    """Basamak özetinin satırları"""
+    fmt = lambda value, spec=".0f": "-" if value is None else format(value, spec)
+    latency = step["latency_ms"]
+    durations = step["server_durations_ms"]
+    lines = [f"   {step['received']}/{step['subscriptions']} mesaj, {fmt(step['messages_per_s'])} mesaj/s "
+             f"(uçtan uca {fmt(step['end_to_end_per_s'])}/s), ilk {fmt(latency['first'])}ms "
+             f"p50 {fmt(latency['p50'])}ms p95 {fmt(latency['p95'])}ms p99 {fmt(latency['p99'])}ms "
+             f"en son {fmt(latency['max'])}ms"]
+    detail = (f"   tetikleme {fmt(step['trigger_ms'])}ms"
+              + (f" (sendPushForEarthquake {durations['webpush']}ms)" if "webpush" in durations else "")
+              + f", eksik {step['missing']}, tekrar {step['duplicates']}, "
+              f"alıcı {step['receiver']['connections']} bağlantı (aynı anda en çok "
+              f"{step['receiver']['peak_concurrent']}), alıcı CPU %{fmt(step['receiver']['cpu_percent'])}")
+    lines.append(detail)
+    process = step["process"]
+    if process:
+        lines.append(f"   sunucu RSS {process['rss_start'] / 1024 ** 2:.0f}->{process['rss_peak'] / 1024 ** 2:.0f}MB, "
+                     f"CPU ort %{fmt(process['cpu_avg'])} tepe %{fmt(process['cpu_peak'])}, "
+                     f"soket tepe {fmt(process['sockets_peak'])}")
+    if step["trigger_error"]:
+        lines.append(f"   ❌ tetikleme: {step['trigger_error']}")
+    if step["trigger_error"] is None and not step["received"]:
+        lines.append("   ⚠️ Hiç mesaj gelmedi: hedef sunucu NODE_EXTRA_CA_CERTS ile alıcı sertifikasına "
+                     "güvenecek şekilde başlatılmalı (bkz. README-TUI.md)")
+    return lines
+
+
+def save_report(report: Dict, directory: str) -> str:
+    """Raporu zaman damgalı dosyaya yaz ve yolunu döndür"""
+    os.makedirs(directory, exist_ok=True)
+    name = datetime.fromtimestamp(report["started_at"]).strftime("push-%Y%m%d-%H%M%S.json")
+    path = os.path.join(directory, name)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def raise_fd_limit() -> None:
+    """Aynı anda binlerce bağlantı kabul edebilmek için açık dosya sınırını yükselt"""
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != hard and (hard == resource.RLIM_INFINITY or soft < hard):
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard if hard != resource.RLIM_INFINITY else 1 << 20, hard))
+        except (ValueError, OSError):
+            pass
+
+
+def main(argv=None) -> int:
+    """Komut satırı girişi"""
+    default_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description="Epicentra Web Push dağıtım testi")
+    parser.add_argument("--project-root", default=default_root, help="proje dizini")
+    parser.add_argument("--app", default="epicentra-server", help="pm2 uygulama adı")
+    parser.add_argument("--url", help="ayrı test örneği yerine bu sunucuyu hedefle")
+    parser.add_argument("--subscriptions",
+                        help="--url'deki sunucunun PUSH_SUBSCRIPTIONS_FILE yolu (varsayılan canlı dosya)")
+    parser.add_argument("--allow-live", action="store_true",
+                        help="canlı sunucunun abonelik dosyasını değiştir; test süresince gerçek "
+                             "depremlerin bildirimleri gerçek abonelere gitmez")
+    parser.add_argument("--counts", default=",".join(map(str, DEFAULT_COUNTS)),
+                        help="abonelik sayısı basamakları, ör. 1000,10000,100000")
+    parser.add_argument("--host", default="127.0.0.1", help="sahte alıcı adresi")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="sahte alıcı portu")
+    parser.add_argument("--receiver-delay", type=float, default=0.0,
+                        help="alıcının cevap gecikmesi (ms), gerçek push servisini taklit eder")
+    parser.add_argument("--fail-rate", type=float, default=0.0,
+                        help="410 Gone dönen abonelik oranı (0-1)")
+    parser.add_argument("--magnitude", type=float, default=5.0, help="test depremi büyüklüğü")
+    parser.add_argument("--settle", type=float, default=5.0,
+                        help="tetikleme cevabından sonra geç mesajlar için bekleme (saniye)")
+    parser.add_argument("--timeout", type=float, default=600.0, help="tetikleme zaman aşımı (saniye)")
+    parser.add_argument("--pid", type=int, help="izlenecek sunucu pid'i (--url/--allow-live ile; varsayılan pm2'den)")
+    parser.add_argument("--memory-stop", type=float, default=0.9,
+                        help="tahmini RSS max_memory_restart'ın bu oranını geçecekse dur")
+    parser.add_argument("--seed", type=int, help="rastgelelik tohumu")
+    parser.add_argument("--output", help="rapor dizini (varsayılan logs/push-bench)")
+    parser.add_argument("--restore", action="store_true",
+                        help="yarıda kalmış testin abonelik yedeğini geri koy ve çık")
+    args = parser.parse_args(argv)
+
+    try:
+        counts = tuple(int(value) for value in args.counts.split(",") if value.strip())
+    except ValueError:
+        parser.error(f"--counts sayı listesi olmalı: {args.counts}")
+    if not counts or min(counts) < 1:
+        parser.error("--counts en az bir pozitif sayı içermeli")
+    if not 0 <= args.fail_rate <= 1:
+        parser.error("--fail-rate 0 ile 1 arasında olmalı")
+
+    live_path = subscriptions_path(args.project_root)
+    isolated = args.url is None and not args.allow_live and not args.restore
+    if args.subscriptions:
+        path = os.path.abspath(args.subscriptions)
+    elif isolated:
+        path = os.path.join(isolated_data_dir(args.project_root), "push-subscriptions.json")
+    else:
+        path = live_path
+    if path == live_path and not (args.allow_live or args.restore):
+        parser.error("--url verilip --subscriptions verilmezse canlı abonelik dosyası değiştirilir: "
+                     "test süresince poller'ın yakaladığı gerçek depremler gerçek abonelere hiç "
+                     "gitmez. Bilerek yapılıyorsa --allow-live ekleyin")
+
+    swap = SubscriptionSwap(path)
+    log = lambda message: print(message, flush=True)
+    lock = BenchLock(swap.path + LOCK_SUFFIX)
+    owner = lock.acquire()
+    if owner is not None:
+        print(f"❌ Başka bir push testi çalışıyor (pid {owner}); bitmesini bekleyin", file=sys.stderr)
+        return 1
+    try:
+        if swap.recover():
+            log(f"♻️ Yarıda kalmış testin yedeği geri konuldu: {swap.path}")
+        if args.restore:
+            return 0
+        return run_bench(args, counts, swap, isolated, log)
+    finally:
+        lock.release()
+
+
+def run_bench(args, counts: Tuple[int, ...], swap: SubscriptionSwap, isolated: bool, log) -> int:
+    """Kilit alındıktan sonra testi çalıştır"""
+    output = args.output or default_report_dir(args.project_root)
+    try:
+        cert, key = ensure_tls(os.path.join(default_report_dir(args.project_root), "tls"))
+        keys = generate_p256_keys(KEY_POOL)
+    except RuntimeError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    raise_fd_limit()
+
+    # max_memory_restart, ayrı örnekte de canlı sunucunun sınırına göre tahmin için kullanılır
+    app = get_app(args.project_root, args.app) or {}
+    # TUI'daki iptal butonu SIGTERM gönderir; Ctrl+C gibi işlensin (yedek geri konur, örnek kapanır)
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    server = None
+    try:
+        if isolated:
+            server = IsolatedServer(args.project_root, cert, os.path.dirname(swap.path),
+                                    os.path.join(default_report_dir(args.project_root), "server.log"))
+            log(f"🧪 Ayrı test sunucusu başlatılıyor: {server.url} (poller kapalı, abonelikler {swap.path})")
+            try:
+                server.start()
+            except RuntimeError as e:
+                print(f"❌ {e}", file=sys.stderr)
+                return 1
+            base_url, pid = server.url, server.process.pid
+        else:
+            base_url = args.url or get_server_url(args.project_root, args.app, app.get("port") or 8080)
+            pid = args.pid or (None if args.url else find_app_pid(args.app))
+            if swap.path == subscriptions_path(args.project_root):
+                log("⚠️ Canlı abonelik dosyası değiştiriliyor: test süresince yakalanan gerçek depremler "
+                    "gerçek abonelere gitmeyecek")
+            log(f"🔐 Sunucu NODE_EXTRA_CA_CERTS={cert} ile başlatılmış olmalı")
+            if not pid:
+                log("⚠️ Sunucu süreci bulunamadı; bellek/CPU ölçülmeyecek (--pid ile verilebilir)")
+        log(f"📨 Push dağıtım testi: {base_url}, basamaklar {list(counts)}, alıcı https://{args.host}:{args.port}")
+
+        receiver = MockPushReceiver(args.host, args.port, cert, key, args.receiver_delay / 1000,
+                                    args.fail_rate, args.seed)
+        bench = PushBenchmark(base_url, receiver, swap, keys, pid, app.get("max_memory_restart"),
+                              args.memory_stop, args.magnitude, args.settle, args.timeout,
+                              seed=args.seed, log=log)
+        loop = asyncio.get_event_loop()
+        report = loop.run_until_complete(bench.run(counts))
+    except KeyboardInterrupt:
+        swap.restore()
+        log("⛔ Push testi kesildi, abonelik dosyası geri konuldu")
+        return 130
+    except OSError as e:
+        swap.restore()
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    finally:
+        if server is not None:
+            server.stop()
+    report["isolated"] = isolated
+    report["app"] = args.app
+    report["git"] = git_revision(args.project_root)
+    path = save_report(report, output)
+    log(f"💾 Rapor kaydedildi: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
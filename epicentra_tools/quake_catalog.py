@@ -0,0 +1,586 @@
+"""
+Yerel deprem kataloğu - sütun dosyalarında, kimliğe göre tekilleştirilmiş
+
+/api/earthquakes-export (ya da .data/test-earthquakes.json biçimindeki
+dosyalar) her alındığında yalnızca görülmemiş depremler eklenir; katalog
+zamanla çok yıllık bir arşive dönüşür. Dizin düzeni (varsayılan
+logs/quake-catalog):
+
+    meta.json      sürüm, satır sayısı, ids.txt boyutu, metin sözlükleri
+    ids.txt        satır başına bir deprem kimliği (tekilleştirme için)
+    <sütun>.bin    tipli dizi (array.tofile): time q (epoch ms), magnitude d,
+                   depth d, latitude d, longitude d, city/district/source/type I
+                   (metin sözlüğündeki sıra)
+
+Eklemeler önce sütun dosyalarının sonuna yazılır, ardından meta.json atomik
+olarak değiştirilir; yarıda kalan bir eklemenin artıkları okunmaz ve bir
+sonraki eklemede kesilir. Dosyaya tek süreç yazar (flock).
+
+Analizler (şehir sayıları, büyüklük dağılımı, Gutenberg-Richter b değeri,
+saatlik oranlar) sütunların üzerinde map/compress/Counter ile C döngülerinde
+çalışır; büyük kataloglarda satır aralıkları süreç havuzuna dağıtılır ve
+kısmi sonuçlar birleştirilir. Komut satırından:
+`python -m epicentra_tools.quake_catalog update` (sunucudan al ve özetle)
+"""
+
+import argparse
+import asyncio
+import fcntl
+import json
+import math
+import os
+import re
+import sys
+import time
+import unicodedata
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from itertools import compress, repeat
+from operator import eq, floordiv, ge, le
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from epicentra_tools.ecosystem import get_server_url
+from epicentra_tools.http_pool import HttpConnectionPool, HttpError
+from epicentra_tools.log_store import DURATION_UNITS
+from epicentra_tools.metric_history import render_sparkline
+
+
+FORMAT_VERSION = 1
+
+COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("time", "q"),
+    ("magnitude", "d"),
+    ("depth", "d"),
+    ("latitude", "d"),
+    ("longitude", "d"),
+    ("city", "I"),
+    ("district", "I"),
+    ("source", "I"),
+    ("type", "I"),
+)
+TEXT_COLUMNS = ("city", "district", "source", "type")
+
+EXPORT_PATH = "/api/earthquakes-export?format=json&source=both"
+
+# AFAD/KOERI tarihleri saat dilimi olmadan Türkiye saatiyle (UTC+3) gelir
+TURKEY_TZ = timezone(timedelta(hours=3))
+DATE_PATTERN = re.compile(
+    r"^(\d{4})[-./](\d{2})[-./](\d{2})[T ](\d{2}):(\d{2})(?::(\d{2})(?:\.(\d+))?)?"
+    r"\s*(Z|[+-]\d{2}:?\d{2})?$"
+)
+
+HOUR_MS = 3600 * 1000
+# Büyüklükler bu çözünürlükte kovalanır (kataloglar 0.1 hassasiyetle yayınlar)
+MAGNITUDE_BIN = 0.1
+# Bu satır sayısının altında süreç havuzu açmak taramadan pahalıdır
+PARALLEL_MIN_ROWS = 200000
+
+
+def parse_time(text: object) -> Optional[int]:
+    """Deprem tarihini epoch milisaniyeye çevir; çözülemezse None"""
+    match = DATE_PATTERN.match(str(text or "").strip())
+    if not match:
+        return None
+    year, month, day, hour, minute, second, fraction, zone = match.groups()
+    if zone is None:
+        tz = TURKEY_TZ
+    elif zone == "Z":
+        tz = timezone.utc
+    else:
+        sign = -1 if zone[0] == "-" else 1
+        digits = zone[1:].replace(":", "")
+        tz = timezone(sign * timedelta(hours=int(digits[:2]), minutes=int(digits[2:])))
+    try:
+        moment = datetime(int(year), int(month), int(day), int(hour), int(minute),
+                          int(second or 0), tzinfo=tz)
+    except ValueError:
+        return None
+    millis = int((fraction or "0")[:3].ljust(3, "0"))
+    return int(moment.timestamp()) * 1000 + millis
+
+
+def _number(value: object) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def normalize_city(name: str) -> str:
+    """Şehir adını karşılaştırma için sadeleştir (earthquakes-export.ts'teki norm gibi)
+
+    Türkçe büyük/küçük harf kuralıyla küçültülür, aksanlar atılır: "İZMİR",
+    "izmir" ve "Izmir" aynı anahtarı verir.
+    """
+    lowered = name.replace("I", "ı").replace("İ", "i").lower().replace("ı", "i")
+    decomposed = unicodedata.normalize("NFKD", lowered)
+    return "".join(char for char in decomposed if char.isalnum() and char.isascii())
+
+
+def default_catalog_dir(project_root: str) -> str:
+    return os.path.join(project_root, "logs", "quake-catalog")
+
+
+class QuakeCatalog:
+    """Sütun dosyalarında tutulan deprem kataloğu"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.rows = 0
+        self.ids_bytes = 0
+        self.dictionaries: Dict[str, List[str]] = {name: [] for name in TEXT_COLUMNS}
+        self._ids: Optional[Set[str]] = None
+        self._reload()
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _reload(self) -> None:
+        """meta.json'u oku (başka bir süreç eklemiş olabilir)"""
+        try:
+            with open(self._path("meta.json"), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"desteklenmeyen katalog sürümü: {meta.get('version')}")
+        if meta["rows"] != self.rows:
+            self._ids = None
+        self.rows = meta["rows"]
+        self.ids_bytes = meta["ids_bytes"]
+        self.dictionaries = {name: list(meta["dictionaries"].get(name, [])) for name in TEXT_COLUMNS}
+
+    def _write_meta(self) -> None:
+        temp = self._path("meta.json.tmp")
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump({"version": FORMAT_VERSION, "rows": self.rows, "ids_bytes": self.ids_bytes,
+                       "dictionaries": self.dictionaries}, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, self._path("meta.json"))
+
+    def ids(self) -> Set[str]:
+        """Katalogdaki deprem kimlikleri"""
+        if self._ids is None:
+            try:
+                with open(self._path("ids.txt"), "rb") as f:
+                    data = f.read(self.ids_bytes)
+            except FileNotFoundError:
+                data = b""
+            self._ids = set(data.decode("utf-8").splitlines())
+        return self._ids
+
+    def column(self, name: str, start: int = 0, stop: Optional[int] = None) -> array:
+        """Sütunun [start, stop) satırları"""
+        return read_column(self.directory, name, start, self.rows if stop is None else stop)
+
+    def ingest(self, quakes: Iterable[Dict]) -> Dict[str, int]:
+        """Görülmemiş depremleri ekle; eklenen/yinelenen/geçersiz sayılarını döndür"""
+        with open(self._path("catalog.lock"), "w") as lock:
+            try:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                raise OSError(f"{self.directory} başka bir süreç tarafından yazılıyor")
+            self._reload()
+            try:
+                return self._ingest_locked(quakes)
+            except BaseException:
+                # Bellekteki kimlik kümesi ve sözlükler diskle uyuşmayabilir: meta.json'dan yeniden kur
+                self.rows, self.ids_bytes, self._ids = 0, 0, None
+                self.dictionaries = {name: [] for name in TEXT_COLUMNS}
+                self._reload()
+                raise
+
+    def _ingest_locked(self, quakes: Iterable[Dict]) -> Dict[str, int]:
+        seen = self.ids()
+        codes = {name: {text: code for code, text in enumerate(values)}
+                 for name, values in self.dictionaries.items()}
+        columns = {name: array(typecode) for name, typecode in COLUMNS}
+        new_ids: List[str] = []
+        stats = {"added": 0, "duplicate": 0, "invalid": 0}
+
+        for quake in quakes:
+            quake_id = quake.get("ID") if isinstance(quake, dict) else None
+            moment = parse_time(quake.get("Date")) if quake_id is not None else None
+            if moment is None or "\n" in str(quake_id):
+                stats["invalid"] += 1
+                continue
+            quake_id = str(quake_id)
+            if quake_id in seen:
+                stats["duplicate"] += 1
+                continue
+            seen.add(quake_id)
+            new_ids.append(quake_id)
+            region = quake.get("Region") or {}
+            texts = {
+                "city": str(region.get("City") or ""),
+                "district": str(region.get("District") or ""),
+                "source": str(quake.get("Source") or ""),
+                "type": str(quake.get("Type") or ""),
+            }
+            columns["time"].append(moment)
+            columns["magnitude"].append(_number(quake.get("Magnitude")))
+            columns["depth"].append(_number(quake.get("Depth")))
+            columns["latitude"].append(_number(quake.get("Latitude")))
+            columns["longitude"].append(_number(quake.get("Longitude")))
+            for name, text in texts.items():
+                code = codes[name].get(text)
+                if code is None:
+                    code = codes[name][text] = len(self.dictionaries[name])
+                    self.dictionaries[name].append(text)
+                columns[name].append(code)
+
+        if not new_ids:
+            return stats
+        # Yarıda kalmış eski eklemelerin artıkları kesilir, sonra sona yazılır
+        for name, typecode in COLUMNS:
+            with open(self._path(f"{name}.bin"), "ab") as f:
+                f.truncate(self.rows * array(typecode).itemsize)
+                columns[name].tofile(f)
+        payload = "".join(f"{quake_id}\n" for quake_id in new_ids).encode("utf-8")
+        with open(self._path("ids.txt"), "ab") as f:
+            f.truncate(self.ids_bytes)
+            f.write(payload)
+        self.rows += len(new_ids)
+        self.ids_bytes += len(payload)
+        self._write_meta()
+        stats["added"] = len(new_ids)
+        return stats
+
+    def ingest_file(self, path: str) -> Dict[str, int]:
+        """JSON dosyasından ekle (dizi ya da satır başına bir deprem)"""
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        stripped = text.lstrip()
+        if stripped.startswith("["):
+            quakes = json.loads(stripped)
+        else:
+            quakes = [json.loads(line) for line in text.splitlines() if line.strip()]
+        return self.ingest(quakes)
+
+    def city_code(self, name: str) -> Optional[int]:
+        """Şehir adının sözlük kodu (büyük/küçük harf ve aksan duyarsız)"""
+        wanted = normalize_city(name)
+        for code, city in enumerate(self.dictionaries["city"]):
+            if normalize_city(city) == wanted:
+                return code
+        return None
+
+    def summarize(self, since: Optional[int] = None, until: Optional[int] = None,
+                  min_magnitude: Optional[float] = None, city: Optional[str] = None,
+                  workers: Optional[int] = None) -> "CatalogSummary":
+        """Süzülmüş satırların özetini çıkar (büyük kataloglarda süreç havuzunda)"""
+        city_code = None
+        if city:
+            city_code = self.city_code(city)
+            if city_code is None:
+                return CatalogSummary(self.dictionaries["city"])
+        filters = (since, until, min_magnitude, city_code)
+        rows = self.rows
+        workers = workers or os.cpu_count() or 1
+        if rows < PARALLEL_MIN_ROWS or workers < 2:
+            parts = [summarize_range(self.directory, 0, rows, filters)]
+        else:
+            step = -(-rows // workers)
+            ranges = [(start, min(rows, start + step)) for start in range(0, rows, step)]
+            with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+                parts = list(pool.map(summarize_range, repeat(self.directory),
+                                      *zip(*ranges), repeat(filters)))
+        summary = CatalogSummary(self.dictionaries["city"])
+        for part in parts:
+            summary.merge(part)
+        return summary
+
+
+def read_column(directory: str, name: str, start: int, stop: int) -> array:
+    """Sütun dosyasından satır aralığını oku"""
+    typecode = dict(COLUMNS)[name]
+    values = array(typecode)
+    if stop <= start:
+        return values
+    with open(os.path.join(directory, f"{name}.bin"), "rb") as f:
+        f.seek(start * values.itemsize)
+        values.fromfile(f, stop - start)
+    return values
+
+
+def summarize_range(directory: str, start: int, stop: int,
+                    filters: Tuple[Optional[int], Optional[int], Optional[float], Optional[int]]) -> Dict:
+    """Satır aralığının kısmi özeti (süreç havuzunda da çalışır)
+
+    Süzgeçler bayt maskesine çevrilir ve sütunlar compress ile daraltılır;
+    tüm döngüler map/compress/Counter içinde (C'de) döner.
+    """
+    since, until, min_magnitude, city_code = filters
+    times = read_column(directory, "time", start, stop)
+    magnitudes = read_column(directory, "magnitude", start, stop)
+    cities = read_column(directory, "city", start, stop)
+
+    mask: Optional[bytes] = None
+    conditions = []
+    if since is not None:
+        conditions.append(map(ge, times, repeat(since)))
+    if until is not None:
+        conditions.append(map(le, times, repeat(until)))
+    if min_magnitude is not None:
+        conditions.append(map(ge, magnitudes, repeat(min_magnitude)))
+    if city_code is not None:
+        conditions.append(map(eq, cities, repeat(city_code)))
+    if conditions:
+        mask = bytes(map(all, zip(*conditions))) if len(conditions) > 1 else bytes(conditions[0])
+        times = array("q", compress(times, mask))
+        magnitudes = array("d", compress(magnitudes, mask))
+        cities = array("I", compress(cities, mask))
+
+    # Büyüklüğü olmayan (NaN) satırlar dağılıma girmez; NaN kendisine eşit olmadığından
+    # eq ile ayıklanır (toplam NaN değilse bu geçişe gerek yok)
+    if math.isnan(sum(magnitudes)):
+        magnitudes = array("d", compress(magnitudes, map(eq, magnitudes, magnitudes)))
+    # Büyüklükler 0.1 hassasiyetle az sayıda farklı değer alır: önce değerler sayılır,
+    # kovalara yalnızca farklı değerler yuvarlanır
+    bins: Counter = Counter()
+    for value, count in Counter(magnitudes).items():
+        bins[round(value / MAGNITUDE_BIN)] += count
+    return {
+        "count": len(times),
+        "first": min(times) if times else None,
+        "last": max(times) if times else None,
+        "cities": Counter(cities),
+        "magnitudes": bins,
+        "hours": Counter(map(floordiv, times, repeat(HOUR_MS))),
+    }
+
+
+class CatalogSummary:
+    """Birleştirilmiş özet ve türetilen analizler"""
+
+    def __init__(self, city_names: List[str]):
+        self.city_names = city_names
+        self.count = 0
+        self.first: Optional[int] = None
+        self.last: Optional[int] = None
+        self.cities: Counter = Counter()
+        # Büyüklük kovası (M / MAGNITUDE_BIN, tam sayı) -> sayı
+        self.magnitudes: Counter = Counter()
+        # Saat (epoch ms // HOUR_MS) -> sayı
+        self.hours: Counter = Counter()
+
+    def merge(self, part: Dict) -> None:
+        self.count += part["count"]
+        if part["first"] is not None:
+            self.first = part["first"] if self.first is None else min(self.first, part["first"])
+            self.last = part["last"] if self.last is None else max(self.last, part["last"])
+        self.cities.update(part["cities"])
+        self.magnitudes.update(part["magnitudes"])
+        self.hours.update(part["hours"])
+
+    def top_cities(self, limit: int = 10) -> List[Tuple[str, int]]:
+        return [(self.city_names[code] or "?", count)
+                for code, count in self.cities.most_common(limit)]
+
+    def magnitude_distribution(self, width: float = 0.5) -> List[Tuple[float, int]]:
+        """(alt sınır, sayı) listesi, `width` genişliğinde kovalar"""
+        per_bin = max(1, int(round(width / MAGNITUDE_BIN)))
+        grouped: Counter = Counter()
+        for key, count in self.magnitudes.items():
+            grouped[key // per_bin] += count
+        return [(key * per_bin * MAGNITUDE_BIN, grouped[key]) for key in sorted(grouped)]
+
+    def b_value(self, mc: Optional[float] = None, min_events: int = 50) -> Optional[Dict]:
+        """Gutenberg-Richter b değeri (Aki 1965 en çok olabilirlik, Utsu kova düzeltmesi)
+
+        Tamamlanma büyüklüğü (Mc) verilmezse en büyük eğrilik yöntemiyle
+        (en kalabalık büyüklük kovası) seçilir. Belirsizlik b/√n.
+        """
+        if not self.magnitudes:
+            return None
+        if mc is None:
+            mc_key = max(self.magnitudes.items(), key=lambda item: (item[1], -item[0]))[0]
+        else:
+            mc_key = int(round(mc / MAGNITUDE_BIN))
+        complete = [(key, count) for key, count in self.magnitudes.items() if key >= mc_key]
+        n = sum(count for _, count in complete)
+        if n < min_events:
+            return None
+        mean = sum(key * count for key, count in complete) * MAGNITUDE_BIN / n
+        mc_value = mc_key * MAGNITUDE_BIN
+        spread = mean - (mc_value - MAGNITUDE_BIN / 2)
+        if spread <= 0:
+            return None
+        b = math.log10(math.e) / spread
+        return {"b": b, "sigma": b / math.sqrt(n), "mc": mc_value, "n": n, "a": math.log10(n) + b * mc_value}
+
+    def hourly_rates(self) -> Dict:
+        """Saatlik oran: ortalama, en yoğun saat ve saat sayısı"""
+        if not self.hours:
+            return {"mean": 0.0, "peak_hour": None, "peak": 0, "hours": 0}
+        first, last = min(self.hours), max(self.hours)
+        span = last - first + 1
+        peak_hour, peak = max(self.hours.items(), key=lambda item: (item[1], item[0]))
+        return {"mean": self.count / span, "peak_hour": peak_hour * HOUR_MS, "peak": peak, "hours": span}
+
+    def hourly_series(self, hours: int = 48, end: Optional[int] = None) -> List[int]:
+        """Son `hours` saatin deprem sayıları (eskiden yeniye)"""
+        end_hour = (end if end is not None else self.last or 0) // HOUR_MS
+        return [self.hours.get(hour, 0) for hour in range(end_hour - hours + 1, end_hour + 1)]
+
+    def to_dict(self, mc: Optional[float] = None) -> Dict:
+        return {
+            "count": self.count,
+            "first": self.first,
+            "last": self.last,
+            "cities": self.top_cities(len(self.cities)),
+            "magnitudes": [[round(low, 1), count] for low, count in self.magnitude_distribution(MAGNITUDE_BIN)],
+            "b_value": self.b_value(mc),
+            "hourly": self.hourly_rates(),
+        }
+
+
+def format_time(millis: Optional[int]) -> str:
+    if millis is None:
+        return "-"
+    return datetime.fromtimestamp(millis / 1000, TURKEY_TZ).strftime("%Y-%m-%d %H:%M")
+
+
+def format_summary(summary: CatalogSummary, top: int = 10, mc: Optional[float] = None) -> List[str]:
+    """Özeti okunur satırlara çevir"""
+    lines = [f"📚 {summary.count} deprem ({format_time(summary.first)} – {format_time(summary.last)}, TSİ)"]
+    if not summary.count:
+        return lines
+    lines.append(f"🏙️ Şehirlere göre (ilk {top}):")
+    for name, count in summary.top_cities(top):
+        lines.append(f"   {name:<20} {count:>8}")
+
+    distribution = summary.magnitude_distribution(0.5)
+    most = max(count for _, count in distribution)
+    lines.append("📏 Büyüklük dağılımı:")
+    for low, count in distribution:
+        bar = "█" * max(1, int(round(count / most * 30))) if count else ""
+        lines.append(f"   M{low:4.1f}–{low + 0.5:<4.1f} {count:>8} {bar}")
+
+    b = summary.b_value(mc)
+    if b:
+        lines.append(f"📉 Gutenberg–Richter: b = {b['b']:.2f} ± {b['sigma']:.2f} "
+                     f"(Mc {b['mc']:.1f}, n={b['n']}, a = {b['a']:.2f})")
+    else:
+        lines.append("📉 Gutenberg–Richter: b değeri için yeterli deprem yok")
+
+    rates = summary.hourly_rates()
+    series = summary.hourly_series(48)
+    lines.append(f"⏱️ Saatlik oran: ortalama {rates['mean']:.2f}/saat ({rates['hours']} saat), "
+                 f"en yoğun {format_time(rates['peak_hour'])} ({rates['peak']} deprem)")
+    lines.append(f"   son 48 saat: {render_sparkline(series, 0, max(series) or 1)}")
+    return lines
+
+
+async def fetch_export(base_url: str, timeout: float = 30.0) -> List[Dict]:
+    """Sunucunun dışa aktarım uç noktasından deprem listesini al"""
+    pool = HttpConnectionPool(base_url, max_connections=1, timeout=timeout)
+    try:
+        response = await pool.get(EXPORT_PATH)
+    finally:
+        await pool.close()
+    if response.status != 200:
+        raise HttpError(f"HTTP {response.status}")
+    quakes = json.loads(response.body.decode("utf-8"))
+    if not isinstance(quakes, list):
+        raise HttpError("beklenmeyen cevap (liste değil)")
+    return quakes
+
+
+def parse_since(value: str, now: Optional[float] = None) -> int:
+    """`30d`, `12h` gibi süreyi ya da tarihi epoch ms'ye çevir"""
+    moment = parse_time(value if " " in value or "T" in value else f"{value} 00:00")
+    if moment is not None:
+        return moment
+    unit = DURATION_UNITS.get(value[-1].lower())
+    seconds = float(value[:-1]) * unit if unit else float(value)
+    return int(((time.time() if now is None else now) - seconds) * 1000)
+
+
+def main(argv=None) -> int:
+    """Komut satırı girişi"""
+    default_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description="Yerel deprem kataloğu")
+    parser.add_argument("--project-root", default=default_root, help="proje dizini")
+    parser.add_argument("--catalog", help="katalog dizini (varsayılan logs/quake-catalog)")
+    sub = parser.add_subparsers(dest="command")
+
+    ingest = sub.add_parser("ingest", help="dosyadan ya da sunucudan ekle")
+    ingest.add_argument("files", nargs="*", help="JSON dosyaları (verilmezse sunucudan)")
+    ingest.add_argument("--url", help="sunucu adresi (varsayılan epicentra-server'ın portu)")
+
+    for name, description in (("stats", "özet analizler"), ("update", "sunucudan ekle ve özetle")):
+        command = sub.add_parser(name, help=description)
+        command.add_argument("--since", help="başlangıç: süre (30d, 12h) ya da tarih (2024-01-01)")
+        command.add_argument("--until", help="bitiş: süre ya da tarih")
+        command.add_argument("--min-mag", type=float, help="en küçük büyüklük")
+        command.add_argument("--city", help="şehir")
+        command.add_argument("--mc", type=float, help="b değeri için tamamlanma büyüklüğü")
+        command.add_argument("--workers", type=int, help="süreç sayısı (varsayılan CPU sayısı)")
+        command.add_argument("--json", action="store_true", help="özeti JSON olarak yazdır")
+        if name == "update":
+            command.add_argument("--url", help="sunucu adresi")
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return 2
+
+    directory = args.catalog or default_catalog_dir(args.project_root)
+    try:
+        catalog = QuakeCatalog(directory)
+    except (OSError, ValueError) as e:
+        print(f"❌ Katalog açılamadı: {e}", file=sys.stderr)
+        return 1
+
+    failed = False
+    if args.command in ("ingest", "update"):
+        sources = list(getattr(args, "files", None) or [])
+        try:
+            if sources:
+                results = [(path, catalog.ingest_file(path)) for path in sources]
+            else:
+                base_url = args.url or get_server_url(args.project_root)
+                quakes = asyncio.get_event_loop().run_until_complete(fetch_export(base_url))
+                results = [(base_url + EXPORT_PATH, catalog.ingest(quakes))]
+        except (OSError, ValueError, HttpError, asyncio.TimeoutError) as e:
+            print(f"❌ Alınamadı: {e or e.__class__.__name__}", file=sys.stderr)
+            if args.command == "ingest" or not len(catalog):
+                return 1
+            # Sunucuya ulaşılamasa da eldeki katalog özetlenir
+            print(f"⚠️ Mevcut katalog özetleniyor ({len(catalog)} deprem)", flush=True)
+            failed = True
+            results = []
+        for source, stats in results:
+            print(f"📥 {source}: {stats['added']} yeni, {stats['duplicate']} zaten katalogda"
+                  + (f", {stats['invalid']} geçersiz (kimlik/tarih yok)" if stats["invalid"] else ""),
+                  flush=True)
+        print(f"📚 Katalog: {len(catalog)} deprem ({directory})", flush=True)
+        if args.command == "ingest":
+            return 0
+
+    try:
+        since = parse_since(args.since) if args.since else None
+        until = parse_since(args.until) if args.until else None
+    except ValueError:
+        parser.error("--since/--until süre (30d, 12h) ya da tarih (2024-01-01) olmalı")
+    started = time.perf_counter()
+    summary = catalog.summarize(since, until, args.min_mag, args.city, args.workers)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if args.json:
+        print(json.dumps(summary.to_dict(args.mc), ensure_ascii=False, indent=2))
+        return 1 if failed else 0
+    for line in format_summary(summary, mc=args.mc):
+        print(line)
+    print(f"⚡ {len(catalog)} satır {elapsed_ms:.0f}ms'de tarandı")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,321 @@
+"""
+Deprem akışı - /api/early-warning-sse'yi dinler, olmazsa /api/earthquakes-combined'ı yoklar
+
+SSE akışı geldikçe parça parça çözülür; yarım kalan olay sonraki parçayı
+bekler. Uç nokta kapalıysa (ör. derlemede devre dışı bırakılan SSE JSON
+döndürür) ya da bağlantı koparsa birleşik liste kalıcı bağlantıyla
+yoklanır ve SSE belirli aralıklarla yeniden denenir. Görülen deprem
+kimlikleri sınırlı bir LRU'da tutulur (earthquake-poller.ts'teki
+LAST_CHECK_IDS gibi); yalnızca yeni depremler geri çağırmaya iletilir.
+"""
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from epicentra_tools.http_pool import (
+    MAX_HEADER_BYTES, READ_CHUNK, HttpConnectionPool, HttpError, parse_base_url,
+)
+
+
+SSE_PATH = "/api/early-warning-sse"
+POLL_PATH = "/api/earthquakes-combined?source=both"
+
+QuakeCallback = Callable[[List[Dict]], None]
+# (kanal "poll" | "sse", tekilleştirilmemiş depremler, alınma zamanı epoch)
+DeliveryListener = Callable[[str, List[Dict], float], None]
+
+
+class SseUnavailable(Exception):
+    """Uç nokta olay akışı döndürmüyor (kapalı ya da farklı içerik türü)"""
+
+
+class SseParser:
+    """text/event-stream ayrıştırıcısı (parça parça beslenir)
+
+    Boş satır olayı bitirir; birden fazla `data:` satırı satır sonuyla
+    birleştirilir, `:` ile başlayan satırlar (canlılık yorumları) atlanır.
+    """
+
+    def __init__(self):
+        self.last_id: Optional[str] = None
+        self.retry: Optional[int] = None
+        self._partial = b""
+        self._event = "message"
+        self._data: List[str] = []
+
+    def feed(self, data: bytes) -> List[Tuple[str, str]]:
+        """Yeni baytları ekle; tamamlanan (olay adı, veri) çiftlerini döndür"""
+        data = self._partial + data
+        lines = data.split(b"\n")
+        self._partial = lines.pop()
+        events = []
+        for raw in lines:
+            line = raw.decode("utf-8", errors="replace").rstrip("\r")
+            if not line:
+                if self._data:
+                    events.append((self._event, "\n".join(self._data)))
+                self._event, self._data = "message", []
+                continue
+            if line.startswith(":"):
+                continue
+            field, _, value = line.partition(":")
+            if value.startswith(" "):
+                value = value[1:]
+            if field == "data":
+                self._data.append(value)
+            elif field == "event":
+                self._event = value or "message"
+            elif field == "id":
+                self.last_id = value
+            elif field == "retry" and value.isdigit():
+                self.retry = int(value)
+        return events
+
+
+class SeenIds:
+    """Sınırlı LRU kimlik kümesi
+
+    Yoklanan listede duran kimlikler her turda tazelenir; yalnızca listeden
+    düşmüş eski kimlikler atılır, böylece atılan kimlik "yeni" diye geri
+    gelmez. Kapasite yoklanan listenin iki katından küçükse büyütülür.
+    """
+
+    def __init__(self, capacity: int = 2000):
+        self.capacity = capacity
+        self.ids: "OrderedDict[str, None]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.ids
+
+    def ensure_capacity(self, batch_size: int) -> None:
+        self.capacity = max(self.capacity, batch_size * 2)
+
+    def add(self, key: str) -> bool:
+        """Kimliği ekle; daha önce görülmediyse True"""
+        if key in self.ids:
+            self.ids.move_to_end(key)
+            return False
+        self.ids[key] = None
+        while len(self.ids) > self.capacity:
+            self.ids.popitem(last=False)
+        return True
+
+
+def quake_time(quake: Dict) -> str:
+    """Sıralama anahtarı (ISO tarih metni)"""
+    return str(quake.get("Date") or "")
+
+
+async def _body_chunks(reader: asyncio.StreamReader, headers: Dict[str, str]) -> AsyncIterator[bytes]:
+    """Akış gövdesini parça parça oku (chunked ya da bağlantı sonuna kadar)"""
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size_line = await reader.readuntil(b"\r\n")
+            size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                return
+            yield await reader.readexactly(size)
+            await reader.readexactly(2)
+    else:
+        while True:
+            data = await reader.read(READ_CHUNK)
+            if not data:
+                return
+            yield data
+
+
+class QuakeFeed:
+    """Deprem akışı: SSE varsa onu, yoksa yoklamayı kullanır"""
+
+    def __init__(self, base_url: str, callback: QuakeCallback,
+                 poll_interval: float = 10.0, sse_retry: float = 300.0,
+                 idle_timeout: float = 90.0, timeout: float = 10.0,
+                 capacity: int = 2000, poll_during_sse: bool = False):
+        self.base_url = base_url.rstrip("/")
+        self.callback = callback
+        self.poll_interval = poll_interval
+        # SSE kullanılamıyorsa bu aralıkla yeniden denenir
+        self.sse_retry = sse_retry
+        # Bu süre boyunca hiç bayt gelmezse (canlılık yorumu dahil) bağlantı yenilenir
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        # SSE açıkken de liste yoklanır (listeye düşme gecikmesini ölçmek için)
+        self.poll_during_sse = poll_during_sse
+        self.seen = SeenIds(capacity)
+        self.pool = HttpConnectionPool(base_url, max_connections=1, timeout=timeout)
+        self.mode = "başlıyor"
+        self.last_error: Optional[str] = None
+        self.last_update: Optional[float] = None
+        self.received = 0
+        self.polls = 0
+        self.events = 0
+        self._next_sse = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self.listeners: List[DeliveryListener] = []
+
+    def subscribe(self, callback: DeliveryListener) -> None:
+        """Her teslimatı (tekilleştirmeden önce, kanal adıyla) alacak fonksiyonu kaydet"""
+        self.listeners.append(callback)
+
+    def _accept(self, quakes: List[Dict]) -> List[Dict]:
+        """Görülmemiş depremleri eskiden yeniye sıralı döndür"""
+        fresh = []
+        for quake in quakes:
+            if not isinstance(quake, dict):
+                continue
+            quake_id = quake.get("ID")
+            if quake_id is None:
+                continue
+            if self.seen.add(str(quake_id)):
+                fresh.append(quake)
+        fresh.sort(key=quake_time)
+        return fresh
+
+    def _deliver(self, quakes: List[Dict], channel: str) -> None:
+        self.last_update = time.time()
+        for callback in list(self.listeners):
+            try:
+                callback(channel, quakes, self.last_update)
+            except Exception:
+                pass
+        fresh = self._accept(quakes)
+        if fresh:
+            self.received += len(fresh)
+            self.callback(fresh)
+
+    async def poll(self) -> None:
+        """Birleşik listeyi bir kez yokla"""
+        response = await self.pool.get(POLL_PATH)
+        if response.status != 200:
+            raise HttpError(f"HTTP {response.status}")
+        quakes = json.loads(response.body.decode("utf-8"))
+        if not isinstance(quakes, list):
+            raise HttpError("beklenmeyen cevap (liste değil)")
+        self.polls += 1
+        self.seen.ensure_capacity(len(quakes))
+        self._deliver(quakes, "poll")
+
+    async def stream(self) -> None:
+        """SSE akışını bağlantı kopana kadar oku"""
+        host, port, prefix = parse_base_url(self.base_url)
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port, limit=MAX_HEADER_BYTES), self.timeout)
+        try:
+            parser = SseParser()
+            lines = [f"GET {prefix}{SSE_PATH} HTTP/1.1",
+                     f"Host: {host}:{port}",
+                     "Accept: text/event-stream",
+                     "Cache-Control: no-cache",
+                     "User-Agent: epicentra-tui"]
+            writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+            await writer.drain()
+            status, _, headers = await asyncio.wait_for(
+                HttpConnectionPool._read_head(reader), self.timeout)
+            content_type = headers.get("content-type", "")
+            if status != 200 or not content_type.startswith("text/event-stream"):
+                raise SseUnavailable(f"HTTP {status}, {content_type or 'içerik türü yok'}")
+
+            self.mode = "SSE"
+            self.last_error = None
+            chunks = _body_chunks(reader, headers)
+            while True:
+                try:
+                    data = await asyncio.wait_for(chunks.__anext__(), self.idle_timeout)
+                except StopAsyncIteration:
+                    return
+                for event, payload in parser.feed(data):
+                    if event not in ("message", "earthquake"):
+                        continue
+                    try:
+                        value = json.loads(payload)
+                    except ValueError:
+                        continue
+                    self.events += 1
+                    self._deliver(value if isinstance(value, list) else [value], "sse")
+        finally:
+            writer.close()
+
+    async def _poll_loop(self) -> None:
+        """SSE akışı sürerken listeyi aralıkla yokla"""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = f"yoklama: {e or e.__class__.__name__}"
+
+    async def run(self) -> None:
+        """Önce listeyi doldur, sonra SSE'yi dene; olmazsa yoklamaya düş"""
+        loop = asyncio.get_running_loop()
+        while True:
+            # Açılışta ve her kopmadan sonra aradaki depremler kaçmasın diye liste yoklanır
+            try:
+                await self.poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = f"yoklama: {e or e.__class__.__name__}"
+
+            if loop.time() >= self._next_sse:
+                side = asyncio.ensure_future(self._poll_loop()) if self.poll_during_sse else None
+                try:
+                    await self.stream()
+                    self.last_error = "SSE bağlantısı kapandı"
+                except asyncio.CancelledError:
+                    raise
+                except SseUnavailable as e:
+                    self.last_error = f"SSE kullanılamıyor ({e})"
+                    self._next_sse = loop.time() + self.sse_retry
+                except asyncio.TimeoutError:
+                    self.last_error = "SSE zaman aşımı"
+                    self._next_sse = loop.time() + self.poll_interval
+                except Exception as e:
+                    self.last_error = f"SSE: {e or e.__class__.__name__}"
+                    self._next_sse = loop.time() + self.poll_interval
+                finally:
+                    if side is not None:
+                        side.cancel()
+
+            if self.mode == "SSE":
+                # Akış yeni koptu: kısa beklemeyle yokla ve yeniden bağlan
+                self.mode = "yeniden bağlanıyor"
+                self._next_sse = loop.time() + 1.0
+            else:
+                self.mode = "yoklama"
+            await asyncio.sleep(min(self.poll_interval, max(0.0, self._next_sse - loop.time())))
+
+    def status(self) -> Dict:
+        """Akış durumu (başlık satırı için)"""
+        return {
+            "mode": self.mode,
+            "received": self.received,
+            "seen": len(self.seen),
+            "polls": self.polls,
+            "events": self.events,
+            "last_update": self.last_update,
+            "error": self.last_error,
+        }
+
+    def start(self) -> None:
+        """Akışı çalışan event loop'ta başlat"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self.run())
+
+    async def stop(self) -> None:
+        """Akışı durdur ve bağlantıyı kapat"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.pool.close()
@@ -0,0 +1,385 @@
+"""
+Deprem konum dizini - yarıçap, kutu ve en yakın N sorguları
+
+Depremler enlem/boylam ızgarasında hücrelere dağıtılır (varsayılan 0.5°).
+Sorgu yalnızca aranan bölgeyi örten hücrelere bakar; adaylar önceden
+hesaplanmış birim küre vektörleriyle (tipli dizilerde) karşılaştırılır:
+yarıçap, kiriş uzunluğuna çevrildiği için aday başına trigonometri yapılmaz,
+haversine mesafesi yalnızca sonuçlar için hesaplanır.
+
+Komut satırından (katalog dosyası ya da sunucudaki birleşik liste):
+`python -m epicentra_tools.quake_index --radius 38.42,27.14,100 [--file katalog.json]`
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from epicentra_tools.ecosystem import get_server_url
+from epicentra_tools.http_pool import HttpConnectionPool, HttpError
+
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180.0
+# Yarım çevre: bundan büyük yarıçap tüm küreyi kapsar
+MAX_DISTANCE_KM = math.pi * EARTH_RADIUS_KM
+
+CATALOG_PATH = "/api/earthquakes-combined?source=both"
+
+# (mesafe km, deprem)
+Hit = Tuple[float, Dict]
+
+
+def coordinates(quake: Dict) -> Optional[Tuple[float, float]]:
+    """Depremin (enlem, boylam) değeri; geçersizse None"""
+    try:
+        lat = float(quake.get("Latitude"))
+        lon = float(quake.get("Longitude"))
+    except (TypeError, ValueError):
+        return None
+    if not (-90.0 <= lat <= 90.0) or not math.isfinite(lon):
+        return None
+    return lat, normalize_lon(lon)
+
+
+def normalize_lon(lon: float) -> float:
+    """Boylamı [-180, 180) aralığına getir"""
+    return (lon + 180.0) % 360.0 - 180.0
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """İki nokta arasındaki büyük daire mesafesi (km)"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _unit_vector(lat: float, lon: float) -> Tuple[float, float, float]:
+    phi, lam = math.radians(lat), math.radians(lon)
+    cos_phi = math.cos(phi)
+    return cos_phi * math.cos(lam), cos_phi * math.sin(lam), math.sin(phi)
+
+
+class QuakeIndex:
+    """Izgara tabanlı deprem konum dizini
+
+    Depremler eklendikçe dizine girer (canlı akış için); aynı kimlik ikinci
+    kez eklenmez. Koordinatı olmayan kayıtlar atlanır.
+    """
+
+    def __init__(self, quakes: Iterable[Dict] = (), cell_deg: float = 0.5):
+        self.cell_deg = cell_deg
+        self.columns = int(round(360.0 / cell_deg))
+        self.quakes: List[Dict] = []
+        self.ids: Dict[str, int] = {}
+        self.lats = array("d")
+        self.lons = array("d")
+        # Birim küre vektörleri (kiriş karşılaştırması için)
+        self.xs = array("d")
+        self.ys = array("d")
+        self.zs = array("d")
+        self.cells: Dict[Tuple[int, int], array] = {}
+        self.extend(quakes)
+
+    def __len__(self) -> int:
+        return len(self.quakes)
+
+    def _row(self, lat: float) -> int:
+        return int((lat + 90.0) // self.cell_deg)
+
+    def _column(self, lon: float) -> int:
+        return int((lon + 180.0) // self.cell_deg) % self.columns
+
+    def add(self, quake: Dict) -> bool:
+        """Depremi dizine ekle; eklendiyse True"""
+        point = coordinates(quake)
+        if point is None:
+            return False
+        quake_id = quake.get("ID")
+        if quake_id is not None:
+            key = str(quake_id)
+            if key in self.ids:
+                return False
+            self.ids[key] = len(self.quakes)
+        lat, lon = point
+        index = len(self.quakes)
+        self.quakes.append(quake)
+        self.lats.append(lat)
+        self.lons.append(lon)
+        x, y, z = _unit_vector(lat, lon)
+        self.xs.append(x)
+        self.ys.append(y)
+        self.zs.append(z)
+        cell = (self._row(lat), self._column(lon))
+        bucket = self.cells.get(cell)
+        if bucket is None:
+            bucket = self.cells[cell] = array("I")
+        bucket.append(index)
+        return True
+
+    def extend(self, quakes: Iterable[Dict]) -> int:
+        """Birden fazla depremi ekle; eklenen sayıyı döndür"""
+        return sum(1 for quake in quakes if self.add(quake))
+
+    def _column_span(self, lon_min: float, lon_max: float) -> Optional[List[int]]:
+        """Boylam aralığını örten sütunlar (tarih çizgisini aşabilir); hepsiyse None"""
+        first = int((lon_min + 180.0) // self.cell_deg)
+        last = int((lon_max + 180.0) // self.cell_deg)
+        if last - first + 1 >= self.columns:
+            return None
+        return [column % self.columns for column in range(first, last + 1)]
+
+    def _buckets(self, lat_min: float, lat_max: float,
+                 columns: Optional[List[int]]) -> List[array]:
+        """Bölgeyi örten dolu hücreler"""
+        rows = range(self._row(max(-90.0, lat_min)), self._row(min(90.0, lat_max)) + 1)
+        if columns is None or len(rows) * len(columns) > len(self.cells):
+            # Bölge dolu hücre sayısından genişse hücreleri tek tek dolaş
+            wanted = None if columns is None else set(columns)
+            return [bucket for (row, column), bucket in self.cells.items()
+                    if row in rows and (wanted is None or column in wanted)]
+        buckets = []
+        for row in rows:
+            for column in columns:
+                bucket = self.cells.get((row, column))
+                if bucket is not None:
+                    buckets.append(bucket)
+        return buckets
+
+    def _radius_hits(self, lat: float, lon: float, radius_km: float) -> List[Tuple[float, int]]:
+        """Yarıçap içindeki (kiriş karesi, sıra) çiftleri (sırasız)"""
+        if radius_km < 0:
+            return []
+        lon = normalize_lon(lon)
+        angle = min(radius_km, MAX_DISTANCE_KM) / EARTH_RADIUS_KM
+        dlat = math.degrees(angle)
+        if abs(lat) + dlat >= 90.0:
+            # Daire kutbu içeriyor: tüm boylamlar
+            columns = None
+        else:
+            dlon = math.degrees(math.asin(math.sin(angle) / math.cos(math.radians(lat))))
+            columns = self._column_span(lon - dlon, lon + dlon)
+        # Açı -> kiriş uzunluğunun karesi (küçük kayan nokta payıyla)
+        limit = (2.0 * math.sin(angle / 2.0)) ** 2 * (1.0 + 1e-12)
+        x0, y0, z0 = _unit_vector(lat, lon)
+        xs, ys, zs = self.xs, self.ys, self.zs
+        hits: List[Tuple[float, int]] = []
+        append = hits.append
+        for bucket in self._buckets(lat - dlat, lat + dlat, columns):
+            for i in bucket:
+                dx = xs[i] - x0
+                dy = ys[i] - y0
+                dz = zs[i] - z0
+                chord = dx * dx + dy * dy + dz * dz
+                if chord <= limit:
+                    append((chord, i))
+        return hits
+
+    def _ranked(self, hits: List[Tuple[float, int]], count: Optional[int] = None) -> List[Hit]:
+        """Kiriş sırasına göre (mesafe km, deprem) listesi; kiriş mesafeyle aynı sırayı verir"""
+        hits.sort()
+        if count is not None:
+            hits = hits[:count]
+        diameter = 2 * EARTH_RADIUS_KM
+        return [(diameter * math.asin(min(1.0, math.sqrt(chord) / 2)), self.quakes[i])
+                for chord, i in hits]
+
+    def within_radius(self, lat: float, lon: float, radius_km: float) -> List[Hit]:
+        """Noktaya `radius_km` uzaklıktaki depremler (yakından uzağa)"""
+        return self._ranked(self._radius_hits(lat, lon, radius_km))
+
+    def within_box(self, min_lat: float, min_lon: float,
+                   max_lat: float, max_lon: float) -> List[Dict]:
+        """Kutu içindeki depremler (eklenme sırasıyla)
+
+        `min_lon > max_lon` ise kutu tarih çizgisini aşar (ör. 170 ile -170).
+        """
+        min_lon, max_lon = normalize_lon(min_lon), normalize_lon(max_lon)
+        wraps = min_lon > max_lon
+        columns = self._column_span(min_lon, max_lon + 360.0 if wraps else max_lon)
+        lats, lons = self.lats, self.lons
+        indices: List[int] = []
+        append = indices.append
+        for bucket in self._buckets(min_lat, max_lat, columns):
+            for i in bucket:
+                lat = lats[i]
+                if lat < min_lat or lat > max_lat:
+                    continue
+                lon = lons[i]
+                if (lon >= min_lon or lon <= max_lon) if wraps else (min_lon <= lon <= max_lon):
+                    append(i)
+        indices.sort()
+        return [self.quakes[i] for i in indices]
+
+    def nearest(self, lat: float, lon: float, count: int) -> List[Hit]:
+        """Noktaya en yakın `count` deprem (yakından uzağa)
+
+        Yarıçap bir hücre boyundan başlayıp yeterli deprem bulunana kadar
+        ikiye katlanır; yarıçap içindeki her deprem bulunduğu için en yakın
+        N deprem her zaman bu kümenin içindedir.
+        """
+        if count <= 0 or not self.quakes:
+            return []
+        radius = self.cell_deg * KM_PER_DEGREE
+        while True:
+            hits = self._radius_hits(lat, lon, radius)
+            if len(hits) >= count or radius >= MAX_DISTANCE_KM:
+                break
+            radius *= 2
+        return self._ranked(hits, count)
+
+
+class SpatialQuery:
+    """Ayrıştırılmış konum sorgusu (TUI filtre kutusu için)
+
+    Biçimler:
+        `38.42,27.14 100`         noktaya 100 km içindekiler
+        `36,26,42,45`             kutu (min enlem, min boylam, maks enlem, maks boylam)
+        `yakın 38.42,27.14 10`    noktaya en yakın 10 deprem
+    """
+
+    def __init__(self, kind: str, values: Tuple[float, ...], text: str):
+        self.kind = kind
+        self.values = values
+        self.text = text
+
+    @classmethod
+    def parse(cls, text: str) -> "SpatialQuery":
+        """Sorgu metnini ayrıştır; geçersizse ValueError"""
+        text = text.strip()
+        words = text.replace(", ", ",").split()
+        kind = "radius"
+        if words and words[0].lower() in ("yakın", "yakin", "near"):
+            kind = "nearest"
+            words = words[1:]
+        try:
+            numbers = [float(value) for word in words for value in word.split(",") if value]
+        except ValueError:
+            raise ValueError(f"sayı bekleniyordu: {text}")
+        if kind == "radius" and len(numbers) == 4:
+            kind = "box"
+        elif len(numbers) != 3:
+            raise ValueError("biçim: 'enlem,boylam km', 'yakın enlem,boylam N' "
+                             "ya da 'minEnlem,minBoylam,maksEnlem,maksBoylam'")
+        if kind == "nearest" and (numbers[2] < 1 or numbers[2] != int(numbers[2])):
+            raise ValueError("en yakın sayısı pozitif tam sayı olmalı")
+        if kind != "box" and not -90 <= numbers[0] <= 90:
+            raise ValueError("enlem -90 ile 90 arasında olmalı")
+        return cls(kind, tuple(numbers), text)
+
+    def run(self, index: QuakeIndex) -> List[Tuple[Optional[float], Dict]]:
+        """Sorguyu dizinde çalıştır (kutu sonuçlarında mesafe None)"""
+        if self.kind == "box":
+            return [(None, quake) for quake in index.within_box(*self.values)]
+        lat, lon, value = self.values
+        if self.kind == "nearest":
+            return index.nearest(lat, lon, int(value))
+        return index.within_radius(lat, lon, value)
+
+    def describe(self) -> str:
+        """Sorgunun okunur açıklaması"""
+        if self.kind == "box":
+            return "kutu {:g},{:g} – {:g},{:g}".format(*self.values)
+        lat, lon, value = self.values
+        if self.kind == "nearest":
+            return f"{lat:g},{lon:g} noktasına en yakın {int(value)}"
+        return f"{lat:g},{lon:g} çevresinde {value:g} km"
+
+
+def load_catalog(path: str) -> List[Dict]:
+    """JSON katalog dosyasını oku (dizi ya da satır başına bir deprem)"""
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    stripped = text.lstrip()
+    if stripped.startswith("["):
+        return json.loads(stripped)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+async def fetch_catalog(base_url: str, timeout: float = 15.0) -> List[Dict]:
+    """Sunucudaki birleşik deprem listesini çek"""
+    pool = HttpConnectionPool(base_url, max_connections=1, timeout=timeout)
+    try:
+        response = await pool.get(CATALOG_PATH)
+    finally:
+        await pool.close()
+    if response.status != 200:
+        raise HttpError(f"HTTP {response.status}")
+    quakes = json.loads(response.body.decode("utf-8"))
+    if not isinstance(quakes, list):
+        raise HttpError("beklenmeyen cevap (liste değil)")
+    return quakes
+
+
+def format_hit(distance: Optional[float], quake: Dict) -> str:
+    """Sonuç satırı"""
+    region = quake.get("Region") or {}
+    place = ", ".join(part for part in (region.get("District"), region.get("City")) if part)
+    line = (f"{str(quake.get('Date') or '-')[:19]:19}  M{quake.get('Magnitude', '-')!s:>4}  "
+            f"{quake.get('Latitude')},{quake.get('Longitude')}  {place or '-'}")
+    if distance is not None:
+        line = f"{distance:8.1f} km  " + line
+    return line
+
+
+def main(argv=None) -> int:
+    """Komut satırı girişi"""
+    default_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description="Deprem konum sorgusu")
+    parser.add_argument("--project-root", default=default_root, help="proje dizini")
+    parser.add_argument("--file", help="JSON katalog dosyası (varsayılan sunucudaki birleşik liste)")
+    parser.add_argument("--url", help="sunucu adresi (varsayılan epicentra-server'ın portu)")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--radius", metavar="ENLEM,BOYLAM,KM", help="noktaya uzaklık")
+    group.add_argument("--box", metavar="MINENLEM,MINBOYLAM,MAKSENLEM,MAKSBOYLAM", help="kutu")
+    group.add_argument("--nearest", metavar="ENLEM,BOYLAM,N", help="en yakın N deprem")
+    parser.add_argument("--cell", type=float, default=0.5, help="ızgara hücre boyu (derece)")
+    parser.add_argument("--limit", type=int, default=50, help="yazdırılacak en fazla sonuç")
+    parser.add_argument("--json", action="store_true", help="sonuçları JSON olarak yazdır")
+    args = parser.parse_args(argv)
+
+    text = args.radius or args.box or "yakın " + args.nearest
+    try:
+        query = SpatialQuery.parse(text)
+    except ValueError as e:
+        parser.error(str(e))
+
+    try:
+        if args.file:
+            quakes = load_catalog(args.file)
+        else:
+            base_url = args.url or get_server_url(args.project_root)
+            quakes = asyncio.get_event_loop().run_until_complete(fetch_catalog(base_url))
+    except (OSError, ValueError, HttpError, asyncio.TimeoutError) as e:
+        print(f"❌ Katalog okunamadı: {e or e.__class__.__name__}", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    index = QuakeIndex(quakes, args.cell)
+    built = time.perf_counter()
+    hits = query.run(index)
+    finished = time.perf_counter()
+
+    if args.json:
+        print(json.dumps([quake if distance is None else dict(quake, DistanceKm=round(distance, 3))
+                          for distance, quake in hits[:args.limit]], ensure_ascii=False, indent=2))
+        return 0
+    print(f"🗺️ {query.describe()}: {len(hits)} deprem "
+          f"({len(index)} kayıt, dizin {(built - started) * 1000:.0f}ms, "
+          f"sorgu {(finished - built) * 1000:.1f}ms)")
+    for distance, quake in hits[:args.limit]:
+        print(format_hit(distance, quake))
+    if len(hits) > args.limit:
+        print(f"... {len(hits) - args.limit} sonuç daha (--limit)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
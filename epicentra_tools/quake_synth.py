@@ -0,0 +1,932 @@
+"""
+Sentetik artçı deprem üreticisi - uyarı hattını patlama yüküyle sınamak için
+
+Ana şoktan sonraki dizi üç kuralla üretilir:
+
+    zaman     Omori–Utsu azalması, Reasenberg & Jones (1989) genel parametreleriyle
+              λ(t) = 10^(a + b(Mana − Mmin)) · (t + c)^−p   (t gün)
+    büyüklük  Gutenberg–Richter, [Mmin, Mana) aralığında kesilmiş
+    konum     Wells & Coppersmith (1994) kırılma uzunluğu boyunca, fay doğrultusuna
+              dik Gauss saçılımıyla
+
+Depremler EarthquakeInterface biçiminde (ID, Date, Magnitude, Region, ...)
+hızlandırılmış zamanla yeniden oynatılır:
+
+    stub    yerel sahte sağlayıcı (/api/earthquakes-combined ve /api/early-warning-sse).
+            Sunucu NUXT_PUBLIC_API_BASE=http://127.0.0.1:8099 ile başlatılırsa
+            earthquake-poller.ts depremleri buradan okur
+    report  /api/seismic/report'a telefon sensörü raporu olarak POST
+
+Oynatma sürerken pm2 logundaki poller satırları izlenir: yoklama hızı,
+toleranslı tekilleştirme yüzünden listede hiç görünmeyen depremler, aynı
+deprem için tekrarlanan bildirimler, kaçan uyarılar ve deprem -> bildirim
+gecikmesi raporlanır. Raporlar logs/quake-synth/ altına yazılır.
+
+    python3 -m epicentra_tools.quake_synth generate [--magnitude 6.0] [--hours 6] [--output dosya.json]
+    python3 -m epicentra_tools.quake_synth replay [--speed 60] [--max-rate 5] [--twins 0.2]
+    python3 -m epicentra_tools.quake_synth replay --target report [--url http://127.0.0.1:8080]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import signal
+import sys
+import time
+from array import array
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from epicentra_tools.alert_latency import (
+    DETECTED_RE, POLLER_WINDOW, AlertLatencyMonitor, P2Quantile, format_event,
+)
+from epicentra_tools.ecosystem import get_server_url
+from epicentra_tools.http_pool import HttpConnectionPool, HttpError
+from epicentra_tools.log_tailer import LogLine, LogTailer, parse_ecosystem_logs
+from epicentra_tools.quake_catalog import parse_time
+
+
+# Reasenberg & Jones (1989) genel parametreleri (a, b, p, c gün)
+GENERIC_A = -1.67
+GENERIC_B = 0.91
+GENERIC_P = 1.08
+GENERIC_C = 0.05
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+# earthquakes-combined.ts varsayılanları (COMBINED_TOL_SECONDS / COMBINED_TOL_KM)
+COMBINED_TOL_SECONDS = 10.0
+COMBINED_TOL_KM = 3.0
+
+# seismic/report.post.ts: bu büyüklüğün üstü yakındaki kullanıcılara FCM gönderir
+REPORT_ALERT_MAGNITUDE = 3.0
+
+DEFAULT_STUB_PORT = 8099
+MAX_REQUEST_HEAD = 16 * 1024
+SSE_HEARTBEAT = 15.0
+ID_PREFIX = "synthetic-"
+
+
+def default_report_dir(project_root: str) -> str:
+    """Rapor dizini"""
+    return os.path.join(project_root, "logs", "quake-synth")
+
+
+def iso_utc(epoch: float) -> str:
+    """Epoch saniyeyi AFAD/test dosyalarındaki gibi ISO UTC metnine çevir"""
+    moment = datetime.fromtimestamp(epoch, timezone.utc)
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.") + f"{moment.microsecond // 1000:03d}Z"
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """İki nokta arası büyük daire uzaklığı (km)"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    x = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(x)))
+
+
+def rupture_length_km(magnitude: float) -> float:
+    """Yüzey kırılma uzunluğu, Wells & Coppersmith (1994) tüm fay türleri"""
+    return 10 ** (-2.44 + 0.59 * magnitude)
+
+
+class SyntheticEvent:
+    """Dizideki tek deprem (zaman ana şoka göre saniye)"""
+
+    def __init__(self, offset: float, magnitude: float, latitude: float, longitude: float,
+                 depth: float, source: str = "AFAD", twin_of: Optional[int] = None):
+        self.offset = offset
+        self.magnitude = magnitude
+        self.latitude = latitude
+        self.longitude = longitude
+        self.depth = depth
+        self.source = source
+        # Diğer sağlayıcının aynı depremi için verdiği kayıt (asıl olayın sırası)
+        self.twin_of = twin_of
+
+
+class AftershockSequence:
+    """Ana şok ve Omori / Gutenberg–Richter artçı dizisi"""
+
+    def __init__(self, magnitude: float = 6.0, latitude: float = 38.0, longitude: float = 26.8,
+                 depth: float = 10.0, hours: float = 6.0, min_magnitude: float = 2.0,
+                 a: float = GENERIC_A, b: float = GENERIC_B, p: float = GENERIC_P,
+                 c: float = GENERIC_C, strike: float = 90.0, seed: Optional[int] = None):
+        if min_magnitude >= magnitude:
+            raise ValueError("en küçük büyüklük ana şoktan küçük olmalı")
+        self.magnitude = magnitude
+        self.latitude = latitude
+        self.longitude = longitude
+        self.depth = depth
+        self.hours = hours
+        self.min_magnitude = min_magnitude
+        self.a, self.b, self.p, self.c = a, b, p, c
+        self.strike = strike
+        self.rng = random.Random(seed)
+
+    @property
+    def productivity(self) -> float:
+        """Mmin üstü artçı hızı katsayısı (gün^-1)"""
+        return 10 ** (self.a + self.b * (self.magnitude - self.min_magnitude))
+
+    def cumulative(self, days: float) -> float:
+        """[0, t] aralığında beklenen artçı sayısı"""
+        k, c, p = self.productivity, self.c, self.p
+        if abs(p - 1.0) < 1e-9:
+            return k * math.log((days + c) / c)
+        return k * (c ** (1 - p) - (days + c) ** (1 - p)) / (p - 1)
+
+    def _inverse(self, count: float) -> float:
+        """cumulative'in tersi: beklenen sayıya ulaşılan zaman (gün)"""
+        k, c, p = self.productivity, self.c, self.p
+        if abs(p - 1.0) < 1e-9:
+            return c * math.exp(count / k) - c
+        base = c ** (1 - p) - count * (p - 1) / k
+        if base <= 0:
+            # p > 1'de toplam sayı sonludur; bu sayıya hiç ulaşılmaz
+            return math.inf
+        return base ** (1 / (1 - p)) - c
+
+    def _magnitude(self) -> float:
+        """Kesilmiş Gutenberg–Richter dağılımından büyüklük (0.1 yuvarlamalı)
+
+        Kataloglardaki gibi en küçük kutu da tam genişlikte olsun diye
+        Mmin - 0.05'ten örneklenir (Aki–Utsu yarım kutu düzeltmesiyle uyumlu).
+        """
+        beta = self.b * math.log(10)
+        lower = self.min_magnitude - 0.05
+        span = 1 - math.exp(-beta * (self.magnitude - lower))
+        value = lower - math.log(1 - self.rng.random() * span) / beta
+        # Yuvarlama ana şoka eşit bir artçı üretmesin
+        return min(round(value, 1), round(self.magnitude - 0.1, 1))
+
+    def _location(self) -> Tuple[float, float, float]:
+        """Kırılma boyunca düzgün, doğrultuya dik Gauss saçılımlı konum"""
+        length = rupture_length_km(self.magnitude)
+        along = self.rng.uniform(-length / 2, length / 2)
+        across = self.rng.gauss(0.0, max(1.0, length / 10))
+        theta = math.radians(self.strike)
+        east = along * math.sin(theta) + across * math.cos(theta)
+        north = along * math.cos(theta) - across * math.sin(theta)
+        latitude = self.latitude + north / KM_PER_DEGREE
+        longitude = self.longitude + east / (KM_PER_DEGREE * max(0.01, math.cos(math.radians(self.latitude))))
+        depth = min(40.0, max(1.0, self.rng.gauss(self.depth, 3.0)))
+        return latitude, longitude, depth
+
+    def generate(self) -> List[SyntheticEvent]:
+        """Ana şok + artçılar, zamana göre sıralı
+
+        Dönüştürülmüş zamanda (τ = beklenen sayı) olaylar birim hızlı Poisson
+        sürecidir: üstel aralıklarla τ ilerletilip tersine çevrilir.
+        """
+        events = [SyntheticEvent(0.0, round(self.magnitude, 1), self.latitude,
+                                 self.longitude, self.depth)]
+        limit = self.hours / 24
+        tau = 0.0
+        while True:
+            tau += self.rng.expovariate(1.0)
+            days = self._inverse(tau)
+            if days > limit:
+                break
+            latitude, longitude, depth = self._location()
+            events.append(SyntheticEvent(days * 86400, self._magnitude(), latitude, longitude, depth))
+        return events
+
+    def add_twins(self, events: List[SyntheticEvent], fraction: float) -> List[SyntheticEvent]:
+        """Olayların bir kısmına diğer sağlayıcıdan (KOERI) ikinci kayıt ekle
+
+        İkizler birkaç saniye ve ~1 km sapmayla gelir; earthquakes-combined'ın
+        toleranslı tekilleştirmesinin bunları ayıklaması beklenir.
+        """
+        if fraction <= 0:
+            return events
+        result = list(events)
+        for index, event in enumerate(events):
+            if self.rng.random() >= fraction:
+                continue
+            bearing = self.rng.uniform(0, 2 * math.pi)
+            shift = self.rng.uniform(0, 1.5)
+            result.append(SyntheticEvent(
+                max(0.0, event.offset + self.rng.uniform(-2.0, 2.0)),
+                round(max(self.min_magnitude, event.magnitude + self.rng.choice((-0.1, 0.0, 0.1))), 1),
+                event.latitude + shift * math.cos(bearing) / KM_PER_DEGREE,
+                event.longitude + shift * math.sin(bearing) / (KM_PER_DEGREE * math.cos(math.radians(event.latitude))),
+                min(40.0, max(1.0, event.depth + self.rng.uniform(-2.0, 2.0))),
+                source="KOERI", twin_of=index,
+            ))
+        result.sort(key=lambda event: event.offset)
+        return result
+
+
+def to_quake(event: SyntheticEvent, quake_id: str, origin: float,
+             city: str, district: str) -> Dict:
+    """Olayı EarthquakeInterface biçimine çevir (`origin` epoch saniye)"""
+    return {
+        "ID": quake_id,
+        "Date": iso_utc(origin),
+        "Magnitude": event.magnitude,
+        "Type": "ML",
+        "Latitude": round(event.latitude, 4),
+        "Longitude": round(event.longitude, 4),
+        "Depth": round(event.depth, 1),
+        "Region": {"City": city, "District": district},
+        "Source": event.source,
+        "ProviderURL": "synthetic",
+    }
+
+
+def dedupe_tolerant(quakes: List[Dict], tol_seconds: float = COMBINED_TOL_SECONDS,
+                    tol_km: float = COMBINED_TOL_KM) -> Tuple[List[Dict], List[Dict]]:
+    """earthquakes-combined.ts'teki toleranslı tekilleştirme: (kalanlar, elenenler)
+
+    Sonuç TypeScript sürümüyle aynıdır; kalanlar zamana göre azalan sıralı
+    olduğundan yalnızca tolerans içindeki son kayıtlarla karşılaştırılır.
+    """
+    timed = sorted(((parse_time(quake.get("Date")) or 0, quake) for quake in quakes),
+                   key=lambda item: item[0], reverse=True)
+    kept: List[Tuple[int, Dict]] = []
+    dropped = []
+    window = tol_seconds * 1000
+    for moment, quake in timed:
+        duplicate = False
+        for kept_moment, other in reversed(kept):
+            if kept_moment - moment > window:
+                break
+            if haversine_km(quake["Latitude"], quake["Longitude"],
+                            other["Latitude"], other["Longitude"]) <= tol_km:
+                duplicate = True
+                break
+        if duplicate:
+            dropped.append(quake)
+        else:
+            kept.append((moment, quake))
+    return [quake for _, quake in kept], dropped
+
+
+class StubProvider:
+    """Yayınlanan sentetik depremleri sunan yerel sağlayıcı
+
+    /api/earthquakes-combined (sorgu ne olursa olsun) son `list_size` depremi
+    toleranslı tekilleştirmeden geçirip yeniden eskiye döndürür;
+    /api/early-warning-sse her yayınlanan depremi olay olarak iter.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = DEFAULT_STUB_PORT,
+                 list_size: int = 500, tol_seconds: float = COMBINED_TOL_SECONDS,
+                 tol_km: float = COMBINED_TOL_KM,
+                 on_served: Optional[Callable[[str, List[Dict], float], None]] = None):
+        self.host = host
+        self.port = port
+        self.list_size = list_size
+        self.tol_seconds = tol_seconds
+        self.tol_km = tol_km
+        self.on_served = on_served
+        self.released: List[Dict] = []
+        # Bir an için bile listede görünmüş / tekilleştirmede elenmiş kimlikler
+        self.listed: Set[str] = set()
+        self.dropped: Set[str] = set()
+        self.list_requests = 0
+        self.list_times = array("d")
+        self.user_agents: Counter = Counter()
+        self.sse_clients: List[asyncio.Queue] = []
+        self.sse_connections = 0
+        self._body: Optional[bytes] = None
+        self._listing: List[Dict] = []
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    def release(self, quakes: List[Dict]) -> None:
+        """Depremleri yayınla (listeye ekle ve SSE'ye gönder)"""
+        self.released.extend(quakes)
+        if len(self.released) > self.list_size:
+            del self.released[:len(self.released) - self.list_size]
+        self._body = None
+        for queue in self.sse_clients:
+            for quake in quakes:
+                queue.put_nowait(quake)
+
+    def _list_body(self) -> bytes:
+        if self._body is None:
+            kept, dropped = dedupe_tolerant(self.released, self.tol_seconds, self.tol_km)
+            self.dropped.update(str(quake["ID"]) for quake in dropped)
+            self._listing = kept
+            self._body = json.dumps(kept, ensure_ascii=False).encode("utf-8")
+        self.listed.update(str(quake["ID"]) for quake in self._listing)
+        return self._body
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port,
+                                                  limit=MAX_REQUEST_HEAD)
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    return
+                lines = head.decode("latin-1").split("\r\n")
+                parts = lines[0].split(" ")
+                if len(parts) < 3:
+                    return
+                method, target = parts[0], parts[1]
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length") or 0)
+                if length:
+                    await reader.readexactly(length)
+                path = target.split("?", 1)[0]
+                if method == "GET" and path == "/api/early-warning-sse":
+                    await self._stream(writer)
+                    return
+                if method == "GET" and path == "/api/earthquakes-combined":
+                    now = time.time()
+                    body = self._list_body()
+                    self.list_requests += 1
+                    self.list_times.append(now)
+                    self.user_agents[headers.get("user-agent") or "?"] += 1
+                    if self.on_served is not None:
+                        self.on_served("poll", self._listing, now)
+                    status = "200 OK"
+                else:
+                    body, status = b'{"error":"not found"}', "404 Not Found"
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write((f"HTTP/1.1 {status}\r\n"
+                              "Content-Type: application/json; charset=utf-8\r\n"
+                              "Cache-Control: no-cache, no-store, must-revalidate\r\n"
+                              f"Content-Length: {len(body)}\r\n"
+                              f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode("latin-1")
+                             + body)
+                await writer.drain()
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            return
+        finally:
+            writer.close()
+
+    async def _stream(self, writer: asyncio.StreamWriter) -> None:
+        """SSE bağlantısı: yayınlanan depremleri chunked olay olarak it"""
+        queue: asyncio.Queue = asyncio.Queue()
+        self.sse_clients.append(queue)
+        self.sse_connections += 1
+
+        def chunk(data: bytes) -> None:
+            writer.write(b"%x\r\n" % len(data) + data + b"\r\n")
+
+        try:
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                         b"Cache-Control: no-cache\r\nTransfer-Encoding: chunked\r\n\r\n")
+            chunk(b": connected\n\n")
+            await writer.drain()
+            while True:
+                try:
+                    quake = await asyncio.wait_for(queue.get(), SSE_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    chunk(b": ping\n\n")
+                else:
+                    batch = [quake]
+                    while not queue.empty():
+                        batch.append(queue.get_nowait())
+                    for item in batch:
+                        chunk(b"event: earthquake\ndata: "
+                              + json.dumps(item, ensure_ascii=False).encode("utf-8") + b"\n\n")
+                    if self.on_served is not None:
+                        self.on_served("sse", batch, time.time())
+                await writer.drain()
+        finally:
+            self.sse_clients.remove(queue)
+
+
+class BurstRecorder:
+    """Oynatma boyunca poller davranışını kaydeder
+
+    Gecikmeler AlertLatencyMonitor'la ölçülür (liste = deprem anından poller'a
+    ilk sunulma); ayrıca sunulmadan bildirime geçen süre (kuyruk), aynı
+    kimlik için tekrarlanan "New earthquake detected" satırları ve saniyelik
+    bildirim hızı tutulur.
+    """
+
+    def __init__(self, run_id: str, log: Callable[[str], None] = print):
+        self.prefix = f"{ID_PREFIX}{run_id}-"
+        self.log = log
+        self.monitor = AlertLatencyMonitor()
+        # Oynatmadan önceki liste boş: sonraki her deprem ölçülür
+        self.monitor.observe("poll", [], time.time())
+        # Patlamada yüzlerce kaçan uyarı olabilir: tek tek değil özette sayılır
+        self.monitor.subscribe(lambda event: event["kind"] != "missed" and self.log(format_event(event)))
+        self.released: Dict[str, float] = {}
+        self.first_served: Dict[str, float] = {}
+        self.detections: Counter = Counter()
+        self.detect_times = array("d")
+        self.queue_p50 = P2Quantile(0.5)
+        self.queue_p95 = P2Quantile(0.95)
+        self.queue_max = 0.0
+        self.poller_errors = 0
+        self.foreign_detections = 0
+
+    def on_release(self, quakes: List[Dict], now: float) -> None:
+        for quake in quakes:
+            self.released[str(quake["ID"])] = now
+
+    def on_served(self, channel: str, quakes: List[Dict], now: float) -> None:
+        if channel == "poll":
+            for quake in quakes:
+                self.first_served.setdefault(str(quake["ID"]), now)
+        self.monitor.observe(channel, quakes, now)
+
+    def on_log_lines(self, lines: List[LogLine]) -> None:
+        for timestamp, app, stream, text in lines:
+            if "[earthquake-poller]" not in text:
+                continue
+            if "error" in text.lower():
+                self.poller_errors += 1
+            match = DETECTED_RE.search(text)
+            if not match:
+                continue
+            quake_id = match.group(3) or ""
+            if not quake_id.startswith(self.prefix):
+                self.foreign_detections += 1
+                continue
+            self.detections[quake_id] += 1
+            if self.detections[quake_id] == 1:
+                self.detect_times.append(timestamp)
+                served = self.first_served.get(quake_id)
+                if served is not None:
+                    # pm2 zaman damgası saniye çözünürlüklü: küçük negatifler sıfırlanır
+                    delay = max(0.0, timestamp - served)
+                    self.queue_p50.add(delay)
+                    self.queue_p95.add(delay)
+                    self.queue_max = max(self.queue_max, delay)
+            self.monitor.observe_log(timestamp, app, text)
+
+    def peak_rate(self, window: float = 10.0) -> float:
+        """En yoğun `window` saniyedeki bildirim hızı (deprem/s)"""
+        times = sorted(self.detect_times)
+        best, start = 0, 0
+        for end in range(len(times)):
+            while times[end] - times[start] >= window:
+                start += 1
+            best = max(best, end - start + 1)
+        return best / window
+
+    def summary(self, stub: Optional[StubProvider] = None) -> Dict:
+        released = set(self.released)
+        detected = set(self.detections)
+        duplicates = {quake_id: count - 1 for quake_id, count in self.detections.items() if count > 1}
+        result = {
+            "released": len(released),
+            "detected": len(detected),
+            "undetected": len(released - detected),
+            "duplicate_notifications": sum(duplicates.values()),
+            "duplicated_ids": len(duplicates),
+            "poller_errors": self.poller_errors,
+            "foreign_detections": self.foreign_detections,
+            "detections_per_s_peak": self.peak_rate(),
+            "queue_s": {
+                "p50": self.queue_p50.value(),
+                "p95": self.queue_p95.value(),
+                "max": self.queue_max if self.queue_p50.count else None,
+            },
+            "latency": self.monitor.report()["stages"],
+        }
+        if stub is not None:
+            span = (stub.list_times[-1] - stub.list_times[0]) if len(stub.list_times) > 1 else 0.0
+            result["stub"] = {
+                "list_requests": stub.list_requests,
+                "polls_per_min": (len(stub.list_times) - 1) / span * 60 if span else None,
+                "user_agents": dict(stub.user_agents),
+                "sse_connections": stub.sse_connections,
+                # Listede bir kez bile görünmeden tekilleştirmede elenenler
+                "never_listed": len(released - stub.listed),
+                "dropped_by_dedupe": len(stub.dropped & released),
+            }
+        return result
+
+
+def seismic_report(quake: Dict, event: SyntheticEvent, device: str, rng: random.Random,
+                   max_magnitude: float) -> Dict:
+    """Depremi bir telefonun sensör raporuna çevir (seismic/report.post.ts gövdesi)
+
+    Cihaz merkez üssünden 10 km içinde rastgele bir noktadadır; ivme Joyner &
+    Boore (1981) azalım ilişkisiyle, sarsıntı süresi kırılma uzunluğundan
+    (2.5 km/s) kabaca hesaplanır.
+    """
+    bearing = rng.uniform(0, 2 * math.pi)
+    distance = rng.uniform(0, 10.0)
+    latitude = event.latitude + distance * math.cos(bearing) / KM_PER_DEGREE
+    longitude = event.longitude + distance * math.sin(bearing) / (KM_PER_DEGREE * math.cos(math.radians(event.latitude)))
+    radius = math.hypot(distance, 7.3)
+    pga_g = 10 ** (-1.02 + 0.249 * event.magnitude - math.log10(radius) - 0.00255 * radius)
+    return {
+        "timestamp": int(parse_time(quake["Date"]) or time.time() * 1000),
+        "magnitude": min(event.magnitude, max_magnitude),
+        "duration": round(2.0 + rupture_length_km(event.magnitude) / 2.5, 1),
+        "maxAcceleration": round(pga_g * 9.81, 3),
+        "location": {"latitude": round(latitude, 5), "longitude": round(longitude, 5)},
+        "deviceId": device,
+    }
+
+
+class ReportSender:
+    """Raporları /api/seismic/report'a eşzamanlı gönderir"""
+
+    def __init__(self, base_url: str, concurrency: int = 4, timeout: float = 15.0):
+        self.pool = HttpConnectionPool(base_url, max_connections=concurrency, timeout=timeout)
+        self.latencies = array("d")
+        self.statuses: Counter = Counter()
+        self.tasks: Set[asyncio.Future] = set()
+
+    def submit(self, reports: List[Dict]) -> None:
+        for report in reports:
+            task = asyncio.ensure_future(self._send(report))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def _send(self, report: Dict) -> None:
+        start = time.monotonic()
+        try:
+            response = await self.pool.post_json("/api/seismic/report",
+                                                  json.dumps(report).encode("utf-8"))
+            self.statuses[f"HTTP {response.status}"] += 1
+        except asyncio.TimeoutError:
+            self.statuses["zaman aşımı"] += 1
+        except (OSError, HttpError, asyncio.IncompleteReadError) as e:
+            self.statuses[e.__class__.__name__] += 1
+        self.latencies.append((time.monotonic() - start) * 1000)
+
+    async def close(self) -> None:
+        if self.tasks:
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+        await self.pool.close()
+
+    def summary(self) -> Dict:
+        latencies = sorted(self.latencies)
+        pick = lambda q: latencies[min(len(latencies) - 1, max(0, math.ceil(q * len(latencies)) - 1))] if latencies else None
+        return {
+            "sent": len(latencies),
+            "statuses": dict(self.statuses),
+            "latency_ms": {"p50": pick(0.5), "p95": pick(0.95), "p99": pick(0.99),
+                           "max": latencies[-1] if latencies else None},
+        }
+
+
+def release_schedule(events: List[SyntheticEvent], speed: float,
+                     max_rate: Optional[float]) -> List[float]:
+    """Olayların oynatma başından itibaren yayın anları (saniye)
+
+    Hız sınırı aşılırsa olaylar sırayla ertelenir; dizinin biçimi korunur
+    ama ertelenen olayın `Date`'i gerçek yayın anı olur.
+    """
+    gap = 1.0 / max_rate if max_rate else 0.0
+    times = []
+    last = -math.inf
+    for event in events:
+        due = max(event.offset / speed, last + gap)
+        times.append(due)
+        last = due
+    return times
+
+
+class Replay:
+    """Diziyi hızlandırılmış zamanla hedefe oynatır"""
+
+    def __init__(self, sequence: AftershockSequence, events: List[SyntheticEvent],
+                 speed: float = 60.0, max_rate: Optional[float] = None,
+                 provider_delay: float = 0.0, city: str = "İzmir",
+                 district: str = "Sentetik", log: Callable[[str], None] = print):
+        self.sequence = sequence
+        self.events = events
+        self.speed = speed
+        self.max_rate = max_rate
+        # Sağlayıcının depremi kaç saniye geç yayınladığı (Date = yayın - gecikme)
+        self.provider_delay = provider_delay
+        self.city = city
+        self.district = district
+        self.log = log
+        self.run_id = datetime.now().strftime("%Y%m%d%H%M%S")
+        self.released = 0
+
+    def quake_id(self, index: int) -> str:
+        return f"{ID_PREFIX}{self.run_id}-{index:05d}"
+
+    async def run(self, on_release: Callable[[List[Tuple[int, Dict]]], None],
+                  progress: Optional[Callable[[float], None]] = None,
+                  progress_every: float = 5.0) -> None:
+        """Zamanı gelen olayları toplu yayınla; `progress` aralıkla çağrılır"""
+        loop = asyncio.get_running_loop()
+        schedule = release_schedule(self.events, self.speed, self.max_rate)
+        start = loop.time()
+        next_progress = start + progress_every
+        index = 0
+        while index < len(self.events):
+            now = loop.time()
+            wake = start + schedule[index]
+            if progress is not None:
+                wake = min(wake, next_progress)
+            if wake > now:
+                await asyncio.sleep(wake - now)
+                now = loop.time()
+            if progress is not None and now >= next_progress:
+                progress(now - start)
+                next_progress += progress_every
+            batch = []
+            epoch = time.time()
+            while index < len(self.events) and start + schedule[index] <= now:
+                event = self.events[index]
+                batch.append((index, to_quake(event, self.quake_id(index), epoch - self.provider_delay,
+                                              self.city, self.district)))
+                index += 1
+            if batch:
+                self.released += len(batch)
+                on_release(batch)
+
+
+def format_progress(elapsed: float, released: int, total: int, summary: Dict) -> str:
+    stub = summary.get("stub") or {}
+    line = f"⏱️ {elapsed:.0f}s: {released}/{total} yayınlandı"
+    if stub:
+        line += f", {stub['list_requests']} yoklama, {stub['dropped_by_dedupe']} tekilleştirmede elendi"
+    poller = next(stage for stage in summary["latency"] if stage["name"] == "poller")
+    return (line + f", {summary['detected']} bildirim, {summary['duplicate_notifications']} tekrar, "
+            f"{poller['missed']} kaçan")
+
+
+def format_summary(summary: Dict) -> List[str]:
+    """Oynatma raporunun satırları"""
+    fmt = lambda value, spec=".1f": "-" if value is None else format(value, spec)
+    reports = summary.get("reports")
+    if reports:
+        # Raporlar poller'dan geçmez; yalnızca istek sonuçları anlamlıdır
+        latency = reports["latency_ms"]
+        statuses = ", ".join(f"{key} ×{value}" for key, value in sorted(reports["statuses"].items()))
+        return [f"🌋 {summary['released']} deprem yayınlandı",
+                f"   Sensör raporu: {reports['sent']} gönderildi ({statuses or 'cevap yok'}), "
+                f"p50 {fmt(latency['p50'], '.0f')}ms p95 {fmt(latency['p95'], '.0f')}ms "
+                f"p99 {fmt(latency['p99'], '.0f')}ms en çok {fmt(latency['max'], '.0f')}ms"]
+    lines = [f"🌋 {summary['released']} deprem yayınlandı, {summary['detected']} bildirildi, "
+             f"{summary['undetected']} bildirilmedi"]
+    stub = summary.get("stub")
+    if stub:
+        agents = ", ".join(f"{agent} ×{count}" for agent, count in stub["user_agents"].items()) or "yok"
+        lines.append(f"   Yoklama: {stub['list_requests']} istek ({fmt(stub['polls_per_min'])}/dk; {agents}), "
+                     f"SSE bağlantısı {stub['sse_connections']}")
+        lines.append(f"   Tekilleştirme: {stub['dropped_by_dedupe']} kayıt elendi, "
+                     f"{stub['never_listed']} deprem listede hiç görünmedi")
+        if not stub["list_requests"]:
+            lines.append("   ⚠️ Poller hiç yoklamadı: sunucu NUXT_PUBLIC_API_BASE ile bu sağlayıcıya yönlendirilmeli")
+    lines.append(f"   Tekrarlanan bildirim: {summary['duplicate_notifications']} "
+                 f"({summary['duplicated_ids']} deprem), poller hatası {summary['poller_errors']}")
+    queue = summary["queue_s"]
+    lines.append(f"   Bildirim hızı tepe {summary['detections_per_s_peak']:.1f}/s, listeden bildirime "
+                 f"p50 {fmt(queue['p50'])}s p95 {fmt(queue['p95'])}s en çok {fmt(queue['max'])}s")
+    for stage in summary["latency"]:
+        if not stage["count"] and not stage["missed"]:
+            continue
+        lines.append(f"   {stage['label']}: {stage['count']} deprem, p50 {fmt(stage['p50'])}s "
+                     f"p95 {fmt(stage['p95'])}s p99 {fmt(stage['p99'])}s, kaçan {stage['missed']}"
+                     + (f" — {stage['breach']}" if stage["breach"] else ""))
+    return lines
+
+
+def save_report(report: Dict, directory: str) -> str:
+    """Raporu zaman damgalı dosyaya yaz ve yolunu döndür"""
+    os.makedirs(directory, exist_ok=True)
+    name = datetime.fromtimestamp(report["started_at"]).strftime("synth-%Y%m%d-%H%M%S.json")
+    path = os.path.join(directory, name)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return path
+
+
+async def run_replay(args, sequence: AftershockSequence, events: List[SyntheticEvent],
+                     log: Callable[[str], None]) -> Dict:
+    """Oynatmayı hedefe göre kur, çalıştır ve raporu döndür"""
+    replay = Replay(sequence, events, args.speed, args.max_rate, args.provider_delay,
+                    args.city, args.district, log=log)
+    recorder = BurstRecorder(replay.run_id, log=log)
+    stub: Optional[StubProvider] = None
+    sender: Optional[ReportSender] = None
+    tailer: Optional[LogTailer] = None
+    device_rng = random.Random(args.seed)
+    devices = [f"{ID_PREFIX}device-{replay.run_id}-{n}" for n in range(args.devices)]
+
+    if args.target == "stub":
+        stub = StubProvider(args.host, args.port, on_served=recorder.on_served)
+        await stub.start()
+        log(f"📡 Sahte sağlayıcı: http://{args.host}:{args.port} "
+            f"(poller için NUXT_PUBLIC_API_BASE=http://{args.host}:{args.port})")
+    else:
+        sender = ReportSender(args.url, args.concurrency)
+        log(f"📡 Sensör raporları: {args.url}/api/seismic/report, {args.devices} cihaz, "
+            f"büyüklük en çok {args.report_max_magnitude:g}")
+
+    def on_release(batch: List[Tuple[int, Dict]]) -> None:
+        now = time.time()
+        quakes = [quake for _, quake in batch]
+        recorder.on_release(quakes, now)
+        if stub is not None:
+            stub.release(quakes)
+        if sender is not None:
+            sender.submit([seismic_report(quake, events[index], device, device_rng,
+                                          args.report_max_magnitude)
+                           for index, quake in batch for device in devices])
+
+    def progress(elapsed: float) -> None:
+        if sender is not None:
+            log(f"⏱️ {elapsed:.0f}s: {replay.released}/{len(events)} yayınlandı, "
+                f"{len(sender.latencies)} rapor cevaplandı")
+            return
+        recorder.monitor.tick()
+        log(format_progress(elapsed, replay.released, len(events), recorder.summary(stub)))
+
+    # Sensör raporları poller'dan geçmez; log yalnızca sahte sağlayıcıyla izlenir
+    files = [] if args.no_logs or stub is None else [
+        entry for entry in parse_ecosystem_logs(args.project_root) if entry[0] == args.app]
+    if files:
+        tailer = LogTailer(files, on_lines=recorder.on_log_lines)
+        tailer.start()
+    elif stub is not None and not args.no_logs:
+        log(f"⚠️ {args.app} log dosyası yok; poller bildirimleri ölçülmeyecek")
+
+    started = time.time()
+    try:
+        await replay.run(on_release, progress)
+        if args.drain > 0:
+            log(f"⏳ Oynatma bitti; poller için {args.drain:g}s bekleniyor")
+            deadline = time.time() + args.drain
+            while time.time() < deadline:
+                await asyncio.sleep(min(1.0, deadline - time.time()))
+                recorder.monitor.tick()
+    finally:
+        if tailer is not None:
+            await tailer.stop()
+        if stub is not None:
+            await stub.close()
+        if sender is not None:
+            await sender.close()
+    recorder.monitor.tick()
+
+    report = {
+        "started_at": started,
+        "finished_at": time.time(),
+        "run_id": replay.run_id,
+        "target": args.target,
+        "sequence": {
+            "magnitude": sequence.magnitude, "latitude": sequence.latitude,
+            "longitude": sequence.longitude, "depth": sequence.depth, "hours": sequence.hours,
+            "min_magnitude": sequence.min_magnitude, "a": sequence.a, "b": sequence.b,
+            "p": sequence.p, "c": sequence.c, "strike": sequence.strike, "seed": args.seed,
+            "events": len(events), "twins": sum(1 for event in events if event.twin_of is not None),
+        },
+        "replay": {"speed": args.speed, "max_rate": args.max_rate,
+                   "provider_delay": args.provider_delay, "drain": args.drain},
+        "summary": recorder.summary(stub),
+    }
+    if sender is not None:
+        report["summary"]["reports"] = sender.summary()
+    return report
+
+
+def build_sequence(args) -> Tuple[AftershockSequence, List[SyntheticEvent]]:
+    sequence = AftershockSequence(args.magnitude, args.lat, args.lon, args.depth, args.hours,
+                                  args.min_magnitude, b=args.b, p=args.p, strike=args.strike,
+                                  seed=args.seed)
+    events = sequence.generate()
+    return sequence, sequence.add_twins(events, args.twins)
+
+
+def main(argv=None) -> int:
+    """Komut satırı girişi"""
+    default_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description="Sentetik artçı deprem üreticisi")
+    parser.add_argument("--project-root", default=default_root, help="proje dizini")
+    sub = parser.add_subparsers(dest="command")
+    sub.required = True
+
+    def sequence_args(command):
+        command.add_argument("--magnitude", type=float, default=6.0, help="ana şok büyüklüğü")
+        command.add_argument("--lat", type=float, default=38.0, help="merkez üssü enlemi")
+        command.add_argument("--lon", type=float, default=26.8, help="merkez üssü boylamı")
+        command.add_argument("--depth", type=float, default=10.0, help="ana şok derinliği (km)")
+        command.add_argument("--hours", type=float, default=6.0, help="dizi süresi (saat, sıkıştırmadan önce)")
+        command.add_argument("--min-magnitude", type=float, default=2.0, help="en küçük artçı büyüklüğü")
+        command.add_argument("--b", type=float, default=GENERIC_B, help="Gutenberg–Richter b değeri")
+        command.add_argument("--p", type=float, default=GENERIC_P, help="Omori p değeri")
+        command.add_argument("--strike", type=float, default=90.0, help="fay doğrultusu (derece)")
+        command.add_argument("--twins", type=float, default=0.0,
+                             help="KOERI'den ikinci kaydı gelen olay oranı (0-1)")
+        command.add_argument("--city", default="İzmir", help="Region.City")
+        command.add_argument("--district", default="Sentetik", help="Region.District")
+        command.add_argument("--seed", type=int, help="rastgelelik tohumu (aynı dizi için)")
+
+    generate = sub.add_parser("generate", help="diziyi üret ve yaz")
+    sequence_args(generate)
+    generate.add_argument("--start", help="ana şok zamanı (ISO, varsayılan şimdi)")
+    generate.add_argument("--output", help="JSON dosyası (ör. .data/test-earthquakes.json)")
+    generate.add_argument("--json", action="store_true", help="JSON olarak yazdır")
+
+    replay = sub.add_parser("replay", help="diziyi hızlandırarak oynat ve poller'ı izle")
+    sequence_args(replay)
+    replay.add_argument("--target", choices=("stub", "report"), default="stub", help="hedef")
+    replay.add_argument("--speed", type=float, default=60.0,
+                        help="hızlandırma (dizi saniyesi / gerçek saniye)")
+    replay.add_argument("--max-rate", type=float, help="saniyede en çok yayın (aşanlar ertelenir)")
+    replay.add_argument("--provider-delay", type=float, default=0.0,
+                        help="sağlayıcının yayın gecikmesi; Date bu kadar geriye alınır (saniye)")
+    replay.add_argument("--drain", type=float, default=POLLER_WINDOW + 15.0,
+                        help="oynatmadan sonra poller'ı bekleme süresi (saniye)")
+    replay.add_argument("--host", default="127.0.0.1", help="sahte sağlayıcı adresi")
+    replay.add_argument("--port", type=int, default=DEFAULT_STUB_PORT, help="sahte sağlayıcı portu")
+    replay.add_argument("--url", help="report hedefi için sunucu adresi (varsayılan uygulamanın portu)")
+    replay.add_argument("--devices", type=int, default=1,
+                        help="deprem başına rapor gönderen cihaz sayısı (report hedefi)")
+    replay.add_argument("--report-max-magnitude", type=float, default=REPORT_ALERT_MAGNITUDE,
+                        help="rapor büyüklüğü üst sınırı; 3.0 üstü gerçek FCM bildirimi gönderir")
+    replay.add_argument("--concurrency", type=int, default=4, help="eşzamanlı rapor isteği")
+    replay.add_argument("--app", default="epicentra-server", help="logu izlenecek pm2 uygulaması")
+    replay.add_argument("--no-logs", action="store_true", help="pm2 loglarını izleme")
+    replay.add_argument("--output", help="rapor dizini (varsayılan logs/quake-synth)")
+    args = parser.parse_args(argv)
+
+    if args.command == "replay":
+        if args.speed <= 0:
+            parser.error("--speed pozitif olmalı")
+        if args.max_rate is not None and args.max_rate <= 0:
+            parser.error("--max-rate pozitif olmalı")
+        if args.devices < 1:
+            parser.error("--devices en az 1 olmalı")
+    try:
+        sequence, events = build_sequence(args)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.command == "generate":
+        origin = time.time()
+        if args.start:
+            moment = parse_time(args.start)
+            if moment is None:
+                parser.error(f"tarih anlaşılamadı: {args.start}")
+            origin = moment / 1000
+        quakes = [to_quake(event, f"{ID_PREFIX}{index:05d}", origin + event.offset,
+                           args.city, args.district) for index, event in enumerate(events)]
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(quakes, f, ensure_ascii=False, indent=2)
+            print(f"💾 {len(quakes)} deprem yazıldı: {args.output}")
+        elif args.json:
+            json.dump(quakes, sys.stdout, ensure_ascii=False, indent=2)
+            print()
+        else:
+            magnitudes = Counter(math.floor(quake["Magnitude"]) for quake in quakes)
+            first_hour = sum(1 for event in events if event.offset < 3600)
+            print(f"🌋 M{sequence.magnitude:.1f} ({sequence.latitude:.2f}, {sequence.longitude:.2f}), "
+                  f"{args.hours:g} saat: {len(quakes)} deprem, ilk saatte {first_hour}, "
+                  f"kırılma ~{rupture_length_km(sequence.magnitude):.0f} km")
+            for whole in sorted(magnitudes):
+                print(f"   M{whole}-{whole + 1}: {magnitudes[whole]}")
+        return 0
+
+    log = lambda message: print(message, flush=True)
+    if args.target == "report" and not args.url:
+        args.url = get_server_url(args.project_root, args.app)
+    # M3 üstü rapor ya da aynı bölgeden ikinci bir cihaz (kalabalık tespiti) gerçek FCM uyarısı tetikler
+    if args.target == "report" and (args.report_max_magnitude > REPORT_ALERT_MAGNITUDE or args.devices > 1):
+        log("⚠️ Bu ayarlarla sunucu yakındaki gerçek kullanıcılara FCM uyarısı gönderebilir")
+    log(f"🌋 M{sequence.magnitude:.1f} dizisi: {len(events)} deprem, {args.hours:g} saat -> "
+        f"{release_schedule(events, args.speed, args.max_rate)[-1]:.0f}s oynatma (×{args.speed:g})")
+    # TUI'daki iptal butonu SIGTERM gönderir; Ctrl+C gibi işlensin
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    loop = asyncio.get_event_loop()
+    try:
+        report = loop.run_until_complete(run_replay(args, sequence, events, log))
+    except KeyboardInterrupt:
+        log("⛔ Oynatma kesildi")
+        return 130
+    except OSError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    for line in format_summary(report["summary"]):
+        log(line)
+    path = save_report(report, args.output or default_report_dir(args.project_root))
+    log(f"💾 Rapor kaydedildi: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
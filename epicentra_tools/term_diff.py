@@ -0,0 +1,196 @@
+"""
+Terminal fark çizici - kareler arasında yalnızca değişen hücreleri ANSI ile yazar
+
+Yavaş SSH bağlantılarında (mobil, 3G) her karede ekranı silip baştan
+yazmak yerine önceki kare hücre hücre hatırlanır; değişen hücre grupları
+için imleç konumlanır ve yalnızca onlar yazılır. Yalnızca standart
+kütüphane kullanılır.
+"""
+
+import time
+import unicodedata
+from typing import List, Optional, Sequence, Tuple
+
+
+# (metin, SGR parametreleri) ör. ("CPU", "1;36"); "" varsayılan stil
+Segment = Tuple[str, str]
+# Tek hücre: (karakter, SGR); geniş karakterin ikinci hücresi ("", SGR)
+Cell = Tuple[str, str]
+
+CSI = "\x1b["
+# Aradaki aynı hücre sayısı bundan azsa iki grup birleştirilir (imleç taşıma ~8 bayt)
+MERGE_GAP = 6
+
+
+def char_width(ch: str) -> int:
+    """Karakterin terminal hücre genişliği (0, 1 ya da 2)"""
+    if unicodedata.combining(ch) or unicodedata.category(ch) in ("Mn", "Me", "Cf"):
+        return 0
+    return 2 if unicodedata.east_asian_width(ch) in ("W", "F") else 1
+
+
+def layout_row(segments: Sequence[Segment], width: int) -> List[Cell]:
+    """Satır parçalarını en fazla `width` hücreye yerleştir"""
+    cells: List[Cell] = []
+    for text, style in segments:
+        for ch in text:
+            w = char_width(ch)
+            if w == 0:
+                # Birleşen işaretler önceki hücreye eklenir
+                if cells:
+                    prev, prev_style = cells[-1]
+                    cells[-1] = (prev + ch, prev_style)
+                continue
+            if len(cells) + w > width:
+                return cells
+            cells.append((ch, style))
+            if w == 2:
+                cells.append(("", style))
+    return cells
+
+
+def _changed_runs(row: List[Cell], old: List[Cell]) -> List[Tuple[int, int]]:
+    """Satırda değişen [başlangıç, bitiş) hücre aralıkları"""
+    runs = []
+    n, old_n = len(row), len(old)
+    x = 0
+    while x < n:
+        if x < old_n and row[x] == old[x]:
+            x += 1
+            continue
+        start = x
+        end, same = x, 0
+        while end < n and same < MERGE_GAP:
+            same = same + 1 if end < old_n and row[end] == old[end] else 0
+            end += 1
+        end -= same
+        # Geniş karakterin ikinci hücresinden başlanmaz
+        if row[start][0] == "" and start > 0:
+            start -= 1
+        runs.append((start, end))
+        x = end
+    return runs
+
+
+class DiffRenderer:
+    """Önceki kareyi tutup yeni kare için en kısa ANSI çıktısını üreten çizici"""
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.previous: Optional[List[List[Cell]]] = None
+
+    def resize(self, width: int, height: int) -> None:
+        """Boyut değişti: sonraki kare tam çizilir"""
+        self.width, self.height = width, height
+        self.previous = None
+
+    def invalidate(self) -> None:
+        """Ekranın bozulduğu varsayılır (ör. kullanıcı isteği); sonraki kare tam çizilir"""
+        self.previous = None
+
+    def grid(self, rows: Sequence[Sequence[Segment]]) -> List[List[Cell]]:
+        """Satırları ekran boyutundaki hücre ızgarasına çevir"""
+        grid = [layout_row(row, self.width) for row in rows[:self.height]]
+        grid.extend([] for _ in range(self.height - len(grid)))
+        return grid
+
+    def render(self, rows: Sequence[Sequence[Segment]]) -> str:
+        """Yeni kare için terminale yazılacak metin (değişiklik yoksa boş)"""
+        grid = self.grid(rows)
+        out: List[str] = []
+        if self.previous is None:
+            out.append(f"{CSI}0m{CSI}H{CSI}2J")
+            previous: List[List[Cell]] = [[] for _ in range(self.height)]
+        else:
+            previous = self.previous
+        style: Optional[str] = "" if self.previous is None else None
+
+        for y, row in enumerate(grid):
+            old = previous[y]
+            if row == old:
+                continue
+            for start, end in _changed_runs(row, old):
+                out.append(f"{CSI}{y + 1};{start + 1}H")
+                for ch, cell_style in row[start:end]:
+                    if cell_style != style:
+                        out.append(f"{CSI}0;{cell_style}m" if cell_style else f"{CSI}0m")
+                        style = cell_style
+                    out.append(ch)
+            if len(row) < len(old):
+                # Satır kısaldı: kalan eski hücreleri sil
+                out.append(f"{CSI}{y + 1};{len(row) + 1}H")
+                if style != "":
+                    out.append(f"{CSI}0m")
+                    style = ""
+                out.append(f"{CSI}K")
+        if style:
+            out.append(f"{CSI}0m")
+        self.previous = grid
+        return "".join(out)
+
+    @staticmethod
+    def full_size(grid: List[List[Cell]]) -> int:
+        """Aynı karenin ekran silinip baştan yazılsaydı tutacağı bayt (karşılaştırma için)"""
+        out = [f"{CSI}H{CSI}2J"]
+        style = ""
+        for y, row in enumerate(grid):
+            if y:
+                out.append("\r\n")
+            for ch, cell_style in row:
+                if cell_style != style:
+                    out.append(f"{CSI}0;{cell_style}m" if cell_style else f"{CSI}0m")
+                    style = cell_style
+                out.append(ch)
+        return len("".join(out).encode("utf-8"))
+
+
+class AdaptiveRate:
+    """Çıkış bant genişliğine göre kare aralığını ayarlar
+
+    Ortalama kare boyutu bütçeye (bayt/s) bölünerek aralık bulunur. Terminale
+    yazma bloklanıyorsa (SSH penceresi dolu) ölçülen hız bütçeyi düşürür.
+    """
+
+    def __init__(self, budget: float = 2048.0, min_interval: float = 1.0,
+                 max_interval: float = 30.0, smoothing: float = 0.3):
+        self.budget = budget
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.smoothing = smoothing
+        self.frames = 0
+        self.total_bytes = 0
+        self.last_bytes = 0
+        self.avg_bytes = 0.0
+        self.throughput: Optional[float] = None
+        self.started = time.monotonic()
+
+    def record(self, nbytes: int, write_seconds: float) -> None:
+        """Bir karenin boyutunu ve yazma süresini kaydet"""
+        self.frames += 1
+        self.total_bytes += nbytes
+        self.last_bytes = nbytes
+        a = self.smoothing
+        self.avg_bytes = nbytes if self.frames == 1 else a * nbytes + (1 - a) * self.avg_bytes
+        # Çekirdek tamponuna sığan yazmalar anlık biter; yalnızca bloklanan yazma hız ölçer
+        if nbytes and write_seconds > 0.02:
+            rate = nbytes / write_seconds
+            self.throughput = rate if self.throughput is None else a * rate + (1 - a) * self.throughput
+
+    @property
+    def effective_budget(self) -> float:
+        """Kullanılan bant (bayt/s): bütçe ya da ölçülen hızın yarısı"""
+        if self.throughput is None:
+            return self.budget
+        return min(self.budget, self.throughput * 0.5)
+
+    @property
+    def interval(self) -> float:
+        """Sonraki kareye kadar beklenecek süre (saniye)"""
+        wanted = self.avg_bytes / self.effective_budget if self.effective_budget > 0 else self.max_interval
+        return max(self.min_interval, min(self.max_interval, wanted))
+
+    def rate(self) -> float:
+        """Başlangıçtan bu yana ortalama çıkış (bayt/s)"""
+        elapsed = time.monotonic() - self.started
+        return self.total_bytes / elapsed if elapsed > 0 else 0.0
@@ -1,7 +1,10 @@
 // Test endpoint to manually trigger a push notification
-// Usage: POST /api/push/test-notification with body: { magnitude, city, district, depth }
+// Usage: POST /api/push/test-notification with body: { magnitude, city, district, depth, channels, cache }
+// channels: ['fcm'] (varsayılan), ['webpush'] ya da ikisi; süreler cevapta döner (push_bench)
+// cache: false ise deprem ana sayfadaki test listesine yazılmaz
 
 import { sendFcmForEarthquake } from '../../utils/fcm-notifier';
+import { sendPushForEarthquake } from '../../utils/push-notifier';
 import type { EarthquakeInterface } from '~~/interfaces/earthquake.interface';
 
 export default defineEventHandler(async (event) => {
@@ -9,7 +12,8 @@ export default defineEventHandler(async (event) => {
     return { error: 'Method not allowed' };
   }
   const body = await readBody(event);
-  const { magnitude = 4.5, city = 'Test Şehir', district = 'Test İlçe', depth = 10 } = body;
+  const { magnitude = 4.5, city = 'Test Şehir', district = 'Test İlçe', depth = 10, channels = ['fcm'], cache: saveToCache = true } = body;
+  const selected: string[] = Array.isArray(channels) ? channels.map(String) : ['fcm'];
   
   const testEarthquake: EarthquakeInterface = {
     ID: `test-${Date.now()}`,
@@ -24,30 +28,42 @@ export default defineEventHandler(async (event) => {
     ProviderURL: 'test',
   };
 
-  await sendFcmForEarthquake(testEarthquake);
+  const durations: Record<string, number> = {};
+  const timed = async (name: string, send: (eq: EarthquakeInterface) => Promise<void>) => {
+    const started = Date.now();
+    await send(testEarthquake);
+    durations[name] = Date.now() - started;
+  };
+  // Poller'daki gibi iki kanal aynı anda gönderilir
+  await Promise.all([
+    selected.includes('webpush') ? timed('webpush', sendPushForEarthquake) : null,
+    selected.includes('fcm') ? timed('fcm', sendFcmForEarthquake) : null,
+  ]);
   
   // Save to test cache for display on main page
-  try {
-    const { readFileSync, writeFileSync, existsSync } = await import('fs');
-    const { join } = await import('path');
-    const testCacheFile = join(process.cwd(), '.data', 'test-earthquakes.json');
-    let cache: any[] = [];
-    if (existsSync(testCacheFile)) {
-      const raw = readFileSync(testCacheFile, 'utf-8');
-      cache = JSON.parse(raw);
-    }
-    cache.push(testEarthquake);
-    // Keep only last 20
-    if (cache.length > 20) cache = cache.slice(-20);
-    const dir = join(process.cwd(), '.data');
-    if (!existsSync(dir)) {
-      const fs = await import('fs');
-      fs.mkdirSync(dir, { recursive: true });
+  if (saveToCache) {
+    try {
+      const { readFileSync, writeFileSync, existsSync } = await import('fs');
+      const { join } = await import('path');
+      const testCacheFile = join(process.cwd(), '.data', 'test-earthquakes.json');
+      let cache: any[] = [];
+      if (existsSync(testCacheFile)) {
+        const raw = readFileSync(testCacheFile, 'utf-8');
+        cache = JSON.parse(raw);
+      }
+      cache.push(testEarthquake);
+      // Keep only last 20
+      if (cache.length > 20) cache = cache.slice(-20);
+      const dir = join(process.cwd(), '.data');
+      if (!existsSync(dir)) {
+        const fs = await import('fs');
+        fs.mkdirSync(dir, { recursive: true });
+      }
+      writeFileSync(testCacheFile, JSON.stringify(cache, null, 2), 'utf-8');
+    } catch (e) {
+      console.error('[test-notification] cache save error:', e);
     }
-    writeFileSync(testCacheFile, JSON.stringify(cache, null, 2), 'utf-8');
-  } catch (e) {
-    console.error('[test-notification] cache save error:', e);
   }
   
-  return { success: true, earthquake: testEarthquake, message: 'Test push notification sent' };
+  return { success: true, earthquake: testEarthquake, durations, message: 'Test push notification sent' };
 });
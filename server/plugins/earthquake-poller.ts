@@ -8,6 +8,12 @@ export default defineNitroPlugin((nitroApp) => {
     return;
   }
 
+  // Test örnekleri (ör. push_bench) gerçek depremler için bildirim göndermesin
+  if (process.env.EARTHQUAKE_POLLER === 'off') {
+    console.log('[earthquake-poller] Background polling disabled (EARTHQUAKE_POLLER=off)');
+    return;
+  }
+
   // Her 10 saniyede bir yeni depremleri kontrol et (anlık bildirim için)
   const POLL_INTERVAL = 10 * 1000; // 10 saniye
 
@@ -27,7 +27,7 @@ export async function pollAndNotify() {
     for (const eq of recent) {
       if (!LAST_CHECK_IDS.has(eq.ID)) {
         LAST_CHECK_IDS.add(eq.ID);
-        console.log(`[earthquake-poller] New earthquake detected: M${eq.Magnitude} ${eq.Region?.City}`);
+        console.log(`[earthquake-poller] New earthquake detected: M${eq.Magnitude} ${eq.Region?.City} (${eq.ID})`);
         
         // hem Web Push hem FCM gönder
         await Promise.all([
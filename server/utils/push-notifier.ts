@@ -1,11 +1,12 @@
 import webpush from 'web-push';
 import { VAPID_PUBLIC_KEY, VAPID_PRIVATE_KEY, VAPID_SUBJECT } from './vapid-keys';
 import { readFileSync, existsSync } from 'fs';
-import { join } from 'path';
+import { dirname, join } from 'path';
 import type { EarthquakeInterface } from '~~/interfaces/earthquake.interface';
 
-const SUBSCRIPTIONS_FILE = join(process.cwd(), '.data', 'push-subscriptions.json');
-const SENT_CACHE_FILE = join(process.cwd(), '.data', 'push-sent-cache.json');
+// Ortam değişkenleriyle değiştirilebilir: push_bench ayrı bir sunucu örneğini kendi dosyalarıyla çalıştırır
+const SUBSCRIPTIONS_FILE = process.env.PUSH_SUBSCRIPTIONS_FILE || join(process.cwd(), '.data', 'push-subscriptions.json');
+const SENT_CACHE_FILE = process.env.PUSH_SENT_CACHE_FILE || join(process.cwd(), '.data', 'push-sent-cache.json');
 
 type PushSubscription = {
   endpoint: string;
@@ -41,7 +42,7 @@ function loadSentCache(): Set<string> {
 
 function saveSentCache(cache: Set<string>) {
   try {
-    const dir = join(process.cwd(), '.data');
+    const dir = dirname(SENT_CACHE_FILE);
     const fs = require('fs');
     if (!existsSync(dir)) fs.mkdirSync(dir, { recursive: true });
     fs.writeFileSync(SENT_CACHE_FILE, JSON.stringify([...cache]), 'utf-8');
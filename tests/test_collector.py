@@ -0,0 +1,58 @@
+"""Collector: abone hataları yutulmaz, sayılır ve snapshot'ta görünür"""
+
+import asyncio
+
+from epicentra_tools.collector import Collector
+from epicentra_tools.collector_client import CallbackErrors
+
+
+class Renderer:
+    def __init__(self):
+        self.fail = True
+        self.seen = 0
+
+    def apply(self, snapshot):
+        self.seen += 1
+        if self.fail:
+            raise KeyError("pm2")
+
+
+def test_failing_subscriber_is_reported_and_others_still_run(tmp_path):
+    async def run():
+        collector = Collector(str(tmp_path), history_path=None)
+        collector.probes.clear()
+        renderer, received = Renderer(), []
+        collector.subscribe(renderer.apply)
+        collector.subscribe(received.append)
+        try:
+            await collector.collect()
+            second = await collector.collect()
+            renderer.fail = False
+            await collector.collect()
+            fourth = await collector.collect()
+        finally:
+            await collector.stop()
+        return collector, renderer, received, second, fourth
+
+    collector, renderer, received, second, fourth = asyncio.run(run())
+    assert renderer.seen == len(received) == 4
+    assert collector.callback_errors.counts == {"Renderer.apply": 2}
+    error = second["errors"]["abone:Renderer.apply"]
+    assert error.startswith("KeyError: 'pm2' (test_collector.py:")
+    assert "abone:Renderer.apply" not in fourth["errors"]
+
+
+def test_coroutine_subscriber_error_is_recorded():
+    async def broken(snapshot):
+        raise RuntimeError("yayın hatası")
+
+    async def run():
+        errors = CallbackErrors()
+        errors.call(broken, {})
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        return errors
+
+    errors = asyncio.run(run())
+    assert errors.counts == {"test_coroutine_subscriber_error_is_recorded.<locals>.broken": 1}
+    assert list(errors.report().values())[0].startswith("RuntimeError: yayın hatası")
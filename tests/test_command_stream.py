@@ -0,0 +1,43 @@
+"""CommandStream: sınırı aşan satırlar parça parça ama eksiksiz iletilir"""
+
+import asyncio
+import sys
+
+from epicentra_tools.command_stream import MAX_LINE_BYTES, CommandStream
+
+
+def collect(code):
+    async def run():
+        stream = CommandStream([sys.executable, "-c", code], timeout=30)
+        await stream.start()
+        try:
+            return [(name, line) async for _, name, line in stream.lines()], stream.returncode
+        finally:
+            await stream.close()
+    return asyncio.run(run())
+
+
+def test_long_line_is_not_truncated():
+    size = 200_000
+    lines, returncode = collect(
+        f"import sys; sys.stdout.write('a' * {size} + '\\n'); print('tail')")
+    assert returncode == 0
+    chunks = [line for name, line in lines if name == "stdout"]
+    assert chunks[-1] == "tail"
+    assert "".join(chunks[:-1]) == "a" * size
+    assert all(len(chunk) <= MAX_LINE_BYTES for chunk in chunks)
+
+
+def test_long_multibyte_line_is_decoded_across_chunks():
+    # 3 baytlık karakterler parça sınırında bölünse de bozulmamalı
+    count = MAX_LINE_BYTES
+    lines, _ = collect(f"print('ş€' * {count}, end='')")
+    assert "".join(line for _, line in lines) == "ş€" * count
+
+
+def test_short_lines_and_stderr():
+    lines, returncode = collect(
+        "import sys; print('bir'); print(''); sys.stderr.write('hata\\n'); print('son', end='')")
+    assert returncode == 0
+    assert [line for name, line in lines if name == "stdout"] == ["bir", "", "son"]
+    assert [line for name, line in lines if name == "stderr"] == ["hata"]
@@ -0,0 +1,117 @@
+"""HealthProber: stand-in sunucuya kalıcı bağlantıyla yoklama, hata/zaman aşımı ve SLO olayları"""
+
+import asyncio
+import socket
+
+from epicentra_tools.health_prober import EndpointStats, HealthProber, Slo
+
+
+class StandInApp:
+    """Yol başına (durum kodu, gecikme) ile cevap veren keep-alive HTTP sunucusu"""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.connections = 0
+        self.server = None
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                path = head.split(b" ", 2)[1].decode()
+                status, delay = self.routes[path]
+                await asyncio.sleep(delay)
+                body = b'{"ok":true}'
+                writer.write(b"HTTP/1.1 %d X\r\nContent-Length: %d\r\n\r\n%s" % (status, len(body), body))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        return f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_probes_reuse_connection_and_classify_failures():
+    async def run():
+        app = StandInApp({"/ok": (200, 0), "/broken": (503, 0), "/slow": (200, 1.0)})
+        url = await app.start()
+        prober = HealthProber({"web": url, "down": f"http://127.0.0.1:{free_port()}"},
+                              endpoints=("/ok", "/broken", "/slow"), timeout=0.3)
+        try:
+            for _ in range(3):
+                await prober.probe(prober.stats[("web", "/ok")])
+                await prober.probe(prober.stats[("web", "/broken")])
+            await prober.probe(prober.stats[("web", "/slow")])
+            await prober.probe(prober.stats[("down", "/ok")])
+            return prober.report(), app.connections
+        finally:
+            await prober.stop()
+            await app.stop()
+
+    report, connections = asyncio.run(run())
+    endpoints = {(item["app"], item["path"]): item for item in report["endpoints"]}
+
+    ok = endpoints[("web", "/ok")]
+    assert (ok["requests"], ok["failures"], ok["last_status"], ok["last_bytes"]) == (3, 0, 200, 11)
+    broken = endpoints[("web", "/broken")]
+    assert (broken["failures"], broken["last_error"]) == (3, "HTTP 503")
+    # Hata kodlu cevabın gecikmesi de histograma girer
+    assert sum(count for _, count in broken["histogram"]) == 3
+    slow = endpoints[("web", "/slow")]
+    assert slow["timeouts"] == 1 and slow["last_error"].startswith("zaman aşımı")
+    down = endpoints[("down", "/ok")]
+    assert down["last_error"] == "bağlantı reddedildi" and down["last_ms"] is None
+
+    # Tüm yoklamalar aynı kalıcı bağlantıyı kullanır (zaman aşımında bağlantı en son düşer)
+    assert report["connections"]["web"] == connections == 1
+
+
+def test_breach_and_recovery_events():
+    async def run():
+        app = StandInApp({"/api/status": (500, 0)})
+        url = await app.start()
+        prober = HealthProber({"web": url}, endpoints=("/api/status",), timeout=2,
+                              slos={"/api/status": Slo(1000.0, max_error_rate=0.5, min_samples=3)})
+        events = []
+        prober.subscribe(events.append)
+        stats = prober.stats[("web", "/api/status")]
+        try:
+            for _ in range(3):
+                await prober.probe(stats)
+            app.routes["/api/status"] = (200, 0)
+            for _ in range(4):
+                await prober.probe(stats)
+        finally:
+            await prober.stop()
+            await app.stop()
+        return events, stats
+
+    events, stats = asyncio.run(run())
+    assert [event["kind"] for event in events] == ["breach", "recovered"]
+    assert events[0]["reason"].startswith("hata oranı %100")
+    assert stats.breach is None
+
+
+def test_slo_window_drops_old_samples():
+    stats = EndpointStats("web", "/api/status", Slo(100.0, window=60.0, min_samples=3))
+    for second in range(3):
+        stats.record(float(second), 500.0, 200, 10, None)
+    assert stats.check_slo() == "p95 500ms > 100ms"
+    for second in range(100, 103):
+        stats.record(float(second), 20.0, 200, 10, None)
+    assert stats.window_stats()["samples"] == 3
+    assert stats.check_slo() is None
@@ -0,0 +1,40 @@
+"""LogStore regex araması: ^/$ satır başına bağlı, eşleşme satır sonunu aşmaz"""
+
+import pytest
+
+from epicentra_tools.log_store import LogQuery, LogStore
+
+
+@pytest.fixture(params=[1000, 4], ids=["hot", "spilled"])
+def store(request, tmp_path):
+    # segment_size=4 ile satırların çoğu diske taşan (mmap) segmentlerde aranır
+    store = LogStore(segment_size=request.param, spill_dir=str(tmp_path))
+    for index in range(10):
+        store.append(1000.0 + index, "info", "epicentra-server",
+                     f"[HTTP] id=abc{index:05d} GET /api/status 200")
+    store.append(1100.0, "error", "epicentra-server", "timeout")
+    store.append(1101.0, "info", "epicentra-server", "GET /api/earthquakes 504")
+    store.append(1102.0, "info", "epicentra-server", "upstream timeout after 5s")
+    yield store
+    store.close()
+
+
+def messages(store, pattern):
+    return [entry[3] for entry in store.query(LogQuery(pattern=pattern))]
+
+
+def test_anchors_match_per_line(store):
+    assert messages(store, r"^\[HTTP\] id=abc00005") == ["[HTTP] id=abc00005 GET /api/status 200"]
+    assert messages(store, r"^timeout$") == ["timeout"]
+    assert messages(store, r"504$") == ["GET /api/earthquakes 504"]
+
+
+def test_match_does_not_cross_lines(store):
+    assert messages(store, r"timeout\s+GET") == []
+    assert messages(store, r"timeout[^x]+api") == []
+    assert messages(store, r"200.*timeout") == []
+
+
+def test_row_rechecked_after_cross_line_candidate(store):
+    # İlk aday "timeout\nGET" satır sonunu aşar; asıl eşleşme sonraki satırlarda
+    assert messages(store, r"timeout\s*\w*") == ["timeout", "upstream timeout after 5s"]
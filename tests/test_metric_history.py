@@ -0,0 +1,69 @@
+"""MetricHistory: uzun seri adları ve pm2 süreçlerinin seri anahtarları"""
+
+from epicentra_tools.metric_history import NAME_SIZE, MetricHistory, series_key, snapshot_metrics
+
+LEVELS = ((1, 60), (60, 10))
+LONG_NAME = "pm2.epicentra-early-warning-notification-worker-europe-west.restart_time"
+
+
+def reopen(path, values, timestamp):
+    history = MetricHistory(max_series=8, levels=LEVELS, path=path)
+    history.record(timestamp, values)
+    names = sorted(history.series)
+    history.close()
+    return names
+
+
+def test_long_name_maps_to_same_series_after_reopen(tmp_path):
+    path = str(tmp_path / "history.bin")
+    assert len(LONG_NAME.encode("utf-8")) > NAME_SIZE
+    first = reopen(path, {LONG_NAME: 1.0}, 1000.0)
+    second = reopen(path, {LONG_NAME: 2.0}, 1001.0)
+    assert first == second == [series_key(LONG_NAME)]
+
+    reader = MetricHistory(path=path, readonly=True)
+    try:
+        _, buckets = reader.query(LONG_NAME, 60, now=1002.0)
+        assert [bucket[3] for bucket in buckets] == [1.0, 2.0]
+    finally:
+        reader.close()
+
+
+def test_long_names_with_shared_prefix_stay_apart(tmp_path):
+    path = str(tmp_path / "history.bin")
+    names = reopen(path, {LONG_NAME + ".a": 1.0, LONG_NAME + ".b": 2.0}, 1000.0)
+    assert len(names) == 2
+    assert reopen(path, {LONG_NAME + ".a": 3.0, LONG_NAME + ".b": 4.0}, 1001.0) == names
+
+
+def test_series_key_fits_and_keeps_utf8_whole():
+    name = "pm2." + "ş" * 40 + ".cpu"
+    key = series_key(name)
+    assert len(key.encode("utf-8")) <= NAME_SIZE
+    assert "�" not in key
+    assert series_key(key) == key
+    assert series_key("system.cpu_percent") == "system.cpu_percent"
+
+
+def pm2_process(pm_id, name, cpu, exec_mode="fork_mode", instance=None):
+    env = {"exec_mode": exec_mode, "restart_time": 0}
+    if instance is not None:
+        env["NODE_APP_INSTANCE"] = instance
+    return {"pm_id": pm_id, "name": name, "monit": {"cpu": cpu, "memory": 0}, "pm2_env": env}
+
+
+def test_cluster_instances_get_separate_series():
+    values = snapshot_metrics({"pm2": [
+        pm2_process(0, "epicentra-server", 10, "cluster_mode", instance=0),
+        pm2_process(1, "epicentra-server", 70, "cluster_mode", instance=1),
+        pm2_process(2, "epicentra-bot", 5),
+    ]})
+    assert values["pm2.epicentra-server[0].cpu"] == 10
+    assert values["pm2.epicentra-server[1].cpu"] == 70
+    assert values["pm2.epicentra-bot.cpu"] == 5
+    assert "pm2.epicentra-server.cpu" not in values
+
+
+def test_cluster_instance_falls_back_to_pm_id():
+    values = snapshot_metrics({"pm2": [pm2_process(7, "api", 1, "cluster_mode")]})
+    assert values["pm2.api[7].cpu"] == 1
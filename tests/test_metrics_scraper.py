@@ -0,0 +1,110 @@
+"""MetricsScraper: parça parça çözümleme, oranlar, yüzdelikler ve stand-in sunucu"""
+
+import asyncio
+
+import pytest
+
+from epicentra_tools.metrics_scraper import (
+    ExpositionParser, MetricsScraper, histogram_quantile, parse_exposition
+)
+
+
+def exposition(requests, errors, buckets):
+    lines = [
+        "# TYPE http_requests_total counter",
+        f'http_requests_total{{provider="afad"}} {requests}',
+        f'http_request_errors_total{{provider="afad",status="504"}} {errors}',
+    ]
+    for bound, count in buckets:
+        lines.append(f'http_request_duration_ms_bucket{{provider="afad",le="{bound}"}} {count}')
+    return "\n".join(lines) + "\n"
+
+
+BODY = exposition(100, 4, [(50, 60), (100, 90), (250, 100), ("+Inf", 100)])
+
+
+def test_chunked_feed_matches_whole_parse():
+    data = BODY.encode("utf-8") + b'escaped{path="/a\\"b",note="x\\ny"} 1'
+    whole = parse_exposition(data.decode("utf-8"))
+    for size in (1, 2, 7):
+        parser = ExpositionParser()
+        for start in range(0, len(data), size):
+            parser.feed(data[start:start + size])
+        assert parser.finish() == whole
+    assert whole[("escaped", (("note", "x\ny"), ("path", '/a"b')))] == 1.0
+    assert whole[("http_requests_total", (("provider", "afad"),))] == 100.0
+
+
+def test_malformed_lines_are_counted_not_fatal():
+    parser = ExpositionParser()
+    parser.feed(b'ok 1\nbroken{a=1} 2\nnovalue\n')
+    assert parser.finish() == {("ok", ()): 1.0}
+    assert parser.errors == 2
+
+
+def test_histogram_quantile_interpolates_within_bucket():
+    buckets = [(50.0, 60.0), (100.0, 90.0), (250.0, 100.0), (float("inf"), 100.0)]
+    assert histogram_quantile(0.5, buckets) == pytest.approx(50 * 50 / 60)
+    assert histogram_quantile(0.95, buckets) == pytest.approx(100 + 150 * 5 / 10)
+    assert histogram_quantile(0.5, [(10.0, 0.0), (float("inf"), 0.0)]) is None
+    # Sıra +Inf kovasına düşerse son sonlu sınır
+    assert histogram_quantile(0.99, [(10.0, 1.0), (float("inf"), 10.0)]) == 10.0
+
+
+def test_rates_use_deltas_and_survive_counter_reset():
+    scraper = MetricsScraper("http://127.0.0.1:1")
+    scraper.history.append((0.0, parse_exposition(BODY)))
+    scraper.history.append((10.0, parse_exposition(
+        exposition(150, 9, [(50, 60), (100, 140), (250, 150), ("+Inf", 150)]))))
+    report = scraper.build_report({})
+    afad = report["providers"]["afad"]
+    assert afad["rps"] == pytest.approx(5.0)
+    assert afad["errors_by_status"] == {"504": pytest.approx(0.5)}
+    # Penceredeki 50 gözlemin hepsi 50-100 ms kovasında
+    assert afad["observations"] == 50
+    assert 50 < afad["p50"] < 100
+
+    # Sunucu yeniden başladı: sayaç düştüyse yeni değer oran olarak alınır
+    scraper.history.append((20.0, parse_exposition(exposition(20, 0, [("+Inf", 0)]))))
+    assert scraper.build_report({})["providers"]["afad"]["rps"] == pytest.approx(2.0)
+
+
+def test_scrape_reuses_one_keep_alive_connection():
+    async def run():
+        connections = []
+        scrapes = [BODY, exposition(130, 4, [(50, 70), (100, 110), (250, 130), ("+Inf", 130)])]
+
+        async def handle(reader, writer):
+            connections.append(writer)
+            while scrapes:
+                try:
+                    await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break
+                body = scrapes.pop(0).encode("utf-8")
+                half = len(body) // 2
+                writer.write(b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n")
+                for piece in (body[:half], body[half:]):
+                    writer.write(b"%x\r\n%s\r\n" % (len(piece), piece))
+                    await writer.drain()
+                writer.write(b"0\r\n\r\n")
+                await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        scraper = MetricsScraper(f"http://127.0.0.1:{port}")
+        try:
+            first = await scraper.scrape(timeout=5)
+            second = await scraper.scrape(timeout=5)
+        finally:
+            await scraper.close()
+            server.close()
+            await server.wait_closed()
+        return first, second, len(connections)
+
+    first, second, connections = asyncio.run(run())
+    assert connections == 1
+    assert first["overall"]["total"] == 100 and first["overall"]["rps"] is None
+    assert second["overall"]["total"] == 130 and second["overall"]["rps"] > 0
+    assert second["parse_errors"] == 0
@@ -0,0 +1,175 @@
+"""pm2_client: amp çözümleme, stand-in daemon soketi ve `pm2 jlist` yedeği"""
+
+import json
+import os
+import socket
+import stat
+import threading
+import time
+
+import pytest
+
+from epicentra_tools.pm2_client import (
+    AmpParser, Pm2EventListener, Pm2RpcClient, get_pm2_processes, pack_message
+)
+
+PROCESSES = [{"pm_id": 0, "name": "epicentra-server", "pm2_env": {"status": "online"}}]
+
+
+def test_parser_reassembles_byte_by_byte():
+    frame = pack_message(["process:event", {"event": "restart", "process": {"name": "bot"}}])
+    parser = AmpParser()
+    messages = []
+    for index in range(len(frame)):
+        messages += parser.feed(frame[index:index + 1])
+        if index < len(frame) - 1:
+            assert messages == []
+    assert messages == [["process:event", {"event": "restart", "process": {"name": "bot"}}]]
+    assert not parser.buffer
+
+
+def test_parser_splits_batched_frames_and_keeps_tail():
+    first, second = pack_message(["s", 1]), pack_message([b"raw", "x"])
+    parser = AmpParser()
+    # İkinci mesajın uzunluk başlığının ortasında kes
+    cut = len(first) + 3
+    assert parser.feed((first + second)[:cut]) == [["s", 1]]
+    assert parser.feed((first + second)[cut:]) == [[b"raw", "x"]]
+
+
+def test_parser_rejects_unknown_version():
+    with pytest.raises(ValueError):
+        AmpParser().feed(b"\x21\x00\x00\x00\x00")
+
+
+class StandInDaemon:
+    """rpc.sock/pub.sock gibi davranan tek bağlantılık Unix soketi sunucusu"""
+
+    def __init__(self, path, handler):
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(path)
+        self.server.listen(1)
+        self.handler = handler
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _serve(self):
+        try:
+            conn, _ = self.server.accept()
+        except OSError:
+            return
+        with conn:
+            self.handler(conn)
+
+    def close(self):
+        self.server.close()
+        self.thread.join(timeout=5)
+
+
+def send_in_pieces(conn, data, size=3):
+    for start in range(0, len(data), size):
+        conn.sendall(data[start:start + size])
+        time.sleep(0.001)
+
+
+def rpc_handler(reply):
+    def handle(conn):
+        parser = AmpParser()
+        while True:
+            data = conn.recv(65536)
+            if not data:
+                return
+            for request, request_id in parser.feed(data):
+                # Başka bir isteğin cevabı önce gelir, atlanmalı
+                send_in_pieces(conn, pack_message([None, ["başka"], "other:0"]))
+                send_in_pieces(conn, pack_message(reply(request) + [request_id]))
+    return handle
+
+
+@pytest.fixture
+def pm2_home(tmp_path):
+    home = tmp_path / "pm2"
+    home.mkdir()
+    return str(home)
+
+
+def test_rpc_list_processes_over_partial_frames(pm2_home):
+    seen = []
+
+    def reply(request):
+        seen.append(request)
+        return [None, PROCESSES]
+
+    daemon = StandInDaemon(os.path.join(pm2_home, "rpc.sock"), rpc_handler(reply))
+    client = Pm2RpcClient(pm2_home=pm2_home, timeout=5)
+    try:
+        assert client.list_processes() == PROCESSES
+        assert client.list_processes() == PROCESSES
+    finally:
+        client.close()
+        daemon.close()
+    assert [request["method"] for request in seen] == ["getMonitorData", "getMonitorData"]
+
+
+@pytest.fixture
+def fake_pm2_cli(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "pm2"
+    script.write_text(f"#!/bin/sh\necho '{json.dumps(PROCESSES)}'\n")
+    script.chmod(script.stat().st_mode | stat.S_IXUSR)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+
+
+def test_falls_back_to_cli_without_socket(pm2_home, fake_pm2_cli):
+    client = Pm2RpcClient(pm2_home=pm2_home)
+    assert not client.available()
+    assert get_pm2_processes(client) == PROCESSES
+    assert get_pm2_processes(None) == PROCESSES
+
+
+def test_falls_back_to_cli_when_daemon_errors(pm2_home, fake_pm2_cli):
+    daemon = StandInDaemon(os.path.join(pm2_home, "rpc.sock"),
+                           rpc_handler(lambda request: [{"message": "meşgul"}]))
+    client = Pm2RpcClient(pm2_home=pm2_home, timeout=5)
+    try:
+        assert get_pm2_processes(client) == PROCESSES
+    finally:
+        client.close()
+        daemon.close()
+
+
+def test_falls_back_to_cli_when_daemon_hangs_up(pm2_home, fake_pm2_cli):
+    path = os.path.join(pm2_home, "rpc.sock")
+    # Soket dosyası var ama dinleyen yok: bağlantı reddedilir
+    dead = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    dead.bind(path)
+    dead.close()
+    client = Pm2RpcClient(pm2_home=pm2_home, timeout=1)
+    assert client.available()
+    assert get_pm2_processes(client) == PROCESSES
+
+
+def test_event_listener_receives_split_pub_messages(pm2_home):
+    event = {"event": "restart", "process": {"name": "epicentra-server", "pm_id": 0}}
+    received = threading.Event()
+    events = []
+
+    def handle(conn):
+        send_in_pieces(conn, pack_message(["log:out", {"data": "gürültü"}])
+                       + pack_message(["process:event", event]), size=5)
+        received.wait(5)
+
+    def on_event(name, data):
+        events.append((name, data))
+        received.set()
+
+    daemon = StandInDaemon(os.path.join(pm2_home, "pub.sock"), handle)
+    listener = Pm2EventListener(on_event, pm2_home=pm2_home, reconnect_delay=0.05)
+    listener.start()
+    try:
+        assert received.wait(5)
+    finally:
+        listener.stop()
+        daemon.close()
+    assert events == [("process:event", event)]